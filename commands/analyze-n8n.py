@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+analyze-n8n.py — Critical path, fan-out and webhook latency of the local workflows
+
+Builds the node graph of each workflow file (n8n_analysis.py) and reports:
+
+    depth / longest chain    how deep the graph is, and its longest straight run
+    critical path            the trigger-to-end path with the most sequential
+                             external calls (or milliseconds, with --timings)
+    fan-out / fan-in         nodes with MIN_FAN or more successors / predecessors
+    sequential branches      one output feeding several calling branches, which
+                             n8n (executionOrder v1) runs one after another
+    side steps               calls whose output nothing after them reads: they
+                             could run in a parallel branch instead
+    independent calls        consecutive calls that don't use each other's output
+    webhooks                 what a webhook caller (e.g. Vapi tools) waits for:
+                             the heaviest path to Respond to Webhook, and branches
+                             that v1 runs before the response
+
+Timings are optional: --timings takes execution JSON saved from the API
+(GET /executions/{id}?includeData=true, one or a page of them) or a
+{workflow: {node: ms}} map, and is matched by workflow ID, then name.
+
+Usage:
+    python commands/analyze-n8n.py [FILES...] [OPTIONS]
+
+Options:
+    --timings PATH  Per-node timings to join in (repeatable)
+    --webhooks      Only workflows answering a webhook through a Respond node
+    --json          Print the reports as JSON
+
+Examples:
+    python commands/analyze-n8n.py
+    python commands/analyze-n8n.py --webhooks
+    python commands/analyze-n8n.py "MVP's/Assistente de Voz/Vapi - Book Appointment.json" --timings exec.json
+"""
+
+import argparse
+import io
+import json
+import sys
+from pathlib import Path
+
+from n8n_analysis import analyze_workflow, load_timings
+from n8n_discovery import find_workflow_files, is_workflow_file
+from n8n_workflow_map import relative_path
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+
+def cost(calls: int, ms: float, timed: bool) -> str:
+    text = f"{calls} call{'s' if calls != 1 else ''}"
+    return f"{text}, {ms:,.0f} ms" if timed else text
+
+
+def format_path(steps: list[list[str]], timings: dict[str, float]) -> str:
+    parts = []
+    for step in steps:
+        if len(step) > 1:
+            parts.append(f"{CYAN}[loop of {len(step)}]{RESET}")
+            continue
+        name = step[0]
+        ms = f" {GRAY}{timings[name]:,.0f} ms{RESET}" if name in timings else ""
+        parts.append(f"{name}{ms}")
+    return ' → '.join(parts)
+
+
+def print_report(report: dict, rel: str, timings: dict[str, float]) -> None:
+    timed = report['timed']
+    print(f"{BOLD}{report['name']}{RESET} {GRAY}{rel}{RESET}")
+    print(f"  {report['nodes']} nodes, {report['external_calls']} external calls · depth {report['depth']} · "
+          f"longest chain {len(report['longest_chain'])} · max fan-out {report['max_fan_out']} / "
+          f"fan-in {report['max_fan_in']}" + (f" · {len(report['loops'])} loop(s)" if report['loops'] else ""))
+
+    critical = report['critical_path']
+    if critical['steps']:
+        print(f"  {CYAN}critical path{RESET} ({cost(critical['calls'], critical['ms'], timed)}): "
+              f"{format_path(critical['steps'], timings)}")
+
+    for webhook in report['webhooks']:
+        if webhook['mode'] not in ('responseNode', 'lastNode'):
+            print(f"  {CYAN}webhook{RESET} '{webhook['webhook']}': answered on receipt")
+            continue
+        waits_for = cost(webhook['calls'], webhook['ms'], timed)
+        before = webhook['before_response']
+        if before:
+            waits_for += (f" + {cost(sum(b['calls'] for b in before), sum(b['ms'] for b in before), timed)}"
+                          f" in branches run first")
+        color = GREEN if webhook['calls'] + sum(b['calls'] for b in before) <= 1 else YELLOW
+        print(f"  {CYAN}webhook{RESET} '{webhook['webhook']}' ({webhook['mode']}): caller waits for "
+              f"{color}{waits_for}{RESET}: {format_path(webhook['path'], timings)}")
+        for branch in webhook['before_response']:
+            print(f"    {YELLOW}⚠{RESET} branch '{branch['start']}' ({cost(branch['calls'], branch['ms'], timed)}) "
+                  f"runs before the response: it sits above the response path after '{branch['from']}'. "
+                  f"Move it below on the canvas, or start it after the Respond node")
+
+    for fan in report['sequential_branches']:
+        branches = ' then '.join(f"'{b['start']}' ({cost(b['calls'], b['ms'], timed)})" for b in fan['branches'])
+        print(f"  {YELLOW}sequential branches{RESET} after '{fan['node']}': {branches}")
+    for step in report['side_steps']:
+        print(f"  {YELLOW}side step{RESET} '{step['node']}': '{step['next']}' doesn't read its output, "
+              f"so it could run in a parallel branch")
+    for run in report['independent_runs']:
+        print(f"  {YELLOW}independent calls{RESET} in series: {' → '.join(run)}: none uses the previous "
+              f"one's output, so they could run concurrently")
+    for label, fans in (('fan-out', report['fan_out']), ('fan-in', report['fan_in'])):
+        if fans:
+            print(f"  {GRAY}{label}: " + ', '.join(f"{name} ({count})" for name, count in fans) + RESET)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Critical path, fan-out and webhook latency of n8n workflows')
+    parser.add_argument('files', nargs='*', help='Workflow files (default: all)')
+    parser.add_argument('--timings', action='append', default=[], metavar='PATH', help='Per-node timings (JSON)')
+    parser.add_argument('--webhooks', action='store_true', help='Only workflows answering through a Respond node')
+    parser.add_argument('--json', action='store_true', help='Print the reports as JSON')
+    args = parser.parse_args()
+
+    try:
+        timings = load_timings(Path(p) for p in args.timings)
+    except (OSError, ValueError) as e:
+        parser.error(f"cannot read timings: {e}")
+
+    if args.files:
+        files = [Path(f).resolve() for f in args.files if f.endswith('.json') and is_workflow_file(Path(f))]
+    else:
+        files = find_workflow_files(PROJECT_ROOT)
+
+    reports = []
+    for path in files:
+        try:
+            workflow = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"{RED}✗{RESET} {path}: {e}", file=sys.stderr)
+            continue
+        if not isinstance(workflow, dict) or not isinstance(workflow.get('nodes'), list):
+            continue
+        node_times = timings.get(str(workflow.get('id'))) or timings.get(str(workflow.get('name'))) or {}
+        report = analyze_workflow(workflow, node_times)
+        report['name'] = report['name'] or path.stem
+        if args.webhooks and not any(w['mode'] == 'responseNode' for w in report['webhooks']):
+            continue
+        rel = relative_path(path, PROJECT_ROOT)
+        reports.append(dict(report, file=rel))
+        if not args.json:
+            print_report(report, rel, node_times)
+            print()
+
+    if args.json:
+        print(json.dumps(reports, indent=2, ensure_ascii=False))
+    else:
+        timed = sum(1 for r in reports if r['timed'])
+        print(f"{GREEN}{len(reports)} workflow(s) analysed{RESET}"
+              + (f" {GRAY}({timed} with timings){RESET}" if args.timings else ""))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+bench-n8n-hash.py — Check and benchmark the streaming workflow hash
+
+1. Digest check: every workflow in the given files (single workflows, or
+   API listings like `{"data": [...]}`) must hash the same with the streaming
+   workflow_hash() as with the original json.dumps() implementation.
+2. Memory benchmark: for each --size, a child process builds one synthetic
+   workflow of about that many MB (nodes cloned from the inputs, each
+   parsed separately so memory grows without big transient strings), then
+   hashes it with one method. The peak-RSS growth during hashing is what the
+   method costs on top of the parsed document.
+
+Usage:
+    python commands/bench-n8n-hash.py [FILES...] [--size MB ...] [--json]
+
+Options:
+    FILES        Workflow JSON files (default: the raw workflows-list.json export)
+    --size MB    Synthetic workflow sizes to measure (default: 3 30)
+    --json       Print results as JSON
+
+Examples:
+    python commands/bench-n8n-hash.py
+    python commands/bench-n8n-hash.py "MVP's/Chatbots/Hotel Concierge.json" --size 10 100
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from n8n_hash import dumps_hash, workflow_hash
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent
+DEFAULT_INPUT = PROJECT_ROOT / 'Ralph projects' / 'descomplica-workflows' / 'raw' / 'workflows-list.json'
+
+METHODS = {
+    'json.dumps': dumps_hash,
+    'streaming': workflow_hash,
+}
+
+
+def load_workflows(paths: list[Path]) -> list[dict]:
+    """Workflows in the given files (API listings are expanded)."""
+    workflows = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get('data'), list):
+            workflows += [w for w in data['data'] if isinstance(w, dict) and 'nodes' in w]
+        elif isinstance(data, dict) and 'nodes' in data:
+            workflows.append(data)
+    return workflows
+
+
+def peak_rss_kb() -> int | None:
+    """Peak resident set size of this process in KB (None where unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def build_workflow(workflows: list[dict], size_mb: float) -> tuple[dict, int]:
+    """One workflow of about ``size_mb`` canonical MB, cloned node by node.
+
+    Returns (workflow, canonical size in bytes).
+    """
+    nodes = [node for w in workflows for node in w.get('nodes', [])]
+    if not nodes:
+        raise ValueError('no nodes in the input workflows')
+    target = size_mb * 1024 * 1024
+    big = {'name': 'Benchmark workflow', 'nodes': [], 'connections': {}, 'settings': {}}
+    size = 0
+    i = 0
+    while size < target:
+        node_json = json.dumps(nodes[i % len(nodes)])
+        node = json.loads(node_json)  # fresh objects, like a parsed file
+        node['name'] = f"{node.get('name', 'Node')} #{i}"
+        node['id'] = f"bench-{i}"
+        previous = big['nodes'][-1]['name'] if big['nodes'] else None
+        big['nodes'].append(node)
+        if previous:
+            big['connections'][previous] = {'main': [[{'node': node['name'], 'type': 'main', 'index': 0}]]}
+        size += len(node_json)
+        i += 1
+    return big, size
+
+
+def measure(method: str, paths: list[Path], size_mb: float) -> dict:
+    """Child process: build the workflow, hash it once, report time and RSS growth."""
+    workflow, size = build_workflow(load_workflows(paths), size_mb)
+    before = peak_rss_kb()
+    started = time.perf_counter()
+    digest = METHODS[method](workflow)
+    seconds = time.perf_counter() - started
+    after = peak_rss_kb()
+    return {
+        'method': method,
+        'size_mb': round(size / 1024 / 1024, 1),
+        'nodes': len(workflow['nodes']),
+        'seconds': round(seconds, 3),
+        'baseline_rss_mb': round(before / 1024, 1) if before is not None else None,
+        'hash_rss_mb': round((after - before) / 1024, 1) if before is not None else None,
+        'digest': digest
+    }
+
+
+def run_child(method: str, paths: list[Path], size_mb: float) -> dict:
+    cmd = [sys.executable, __file__, *map(str, paths), '--child', method, '--size', str(size_mb)]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True,
+                            env={**os.environ, 'PYTHONIOENCODING': 'utf-8'})
+    return json.loads(result.stdout)
+
+
+def check_digests(workflows: list[dict]) -> int:
+    """Number of workflows whose streaming digest differs from json.dumps."""
+    return sum(1 for w in workflows if workflow_hash(w) != dumps_hash(w))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check and benchmark the streaming workflow hash')
+    parser.add_argument('files', nargs='*', type=Path, help='Workflow JSON files')
+    parser.add_argument('--size', nargs='+', type=float, default=[3, 30], metavar='MB',
+                        help='Synthetic workflow sizes in MB (default: 3 30)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--child', choices=list(METHODS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    paths = args.files or [DEFAULT_INPUT]
+
+    if args.child:
+        print(json.dumps(measure(args.child, paths, args.size[0])))
+        return
+
+    workflows = load_workflows(paths)
+    if not workflows:
+        print(f"{RED}✗ No workflows in {', '.join(map(str, paths))}{RESET}", file=sys.stderr)
+        sys.exit(1)
+    # Every input workflow, plus mutated copies exercising nesting and escaping
+    variants = [copy.deepcopy(w) for w in workflows[:5]]
+    for w in variants:
+        w['settings'] = {'é': 'ção ', 'nested': [{'b': 1, 'a': [None, True, 1.5e-7]}]}
+    mismatches = check_digests(workflows + variants)
+
+    results = []
+    for size_mb in args.size:
+        for method in METHODS:
+            results.append(run_child(method, paths, size_mb))
+    digests_equal = all(len({r['digest'] for r in results if r['size_mb'] == s}) == 1
+                        for s in {r['size_mb'] for r in results})
+
+    if args.json:
+        print(json.dumps({'workflows_checked': len(workflows) + len(variants), 'mismatches': mismatches,
+                          'results': results}, indent=2))
+    else:
+        status = f"{GREEN}✓ identical{RESET}" if not mismatches else f"{RED}✗ {mismatches} differ{RESET}"
+        print(f"\n{BOLD}Digest check:{RESET} {len(workflows) + len(variants)} workflows — {status}")
+        print(f"\n{BOLD}{'Size':>8}  {'Method':<11} {'Time':>8} {'Parsed RSS':>11} {'Hash +RSS':>10}{RESET}")
+        for r in results:
+            rss = f"{r['hash_rss_mb']:.1f} MB" if r['hash_rss_mb'] is not None else 'n/a'
+            base = f"{r['baseline_rss_mb']:.1f} MB" if r['baseline_rss_mb'] is not None else 'n/a'
+            print(f"{r['size_mb']:>6.1f}MB  {r['method']:<11} {r['seconds']:>7.3f}s {base:>11} {rss:>10}")
+        if not digests_equal:
+            print(f"{RED}✗ Benchmark digests differ between methods{RESET}")
+        print(f"{GRAY}Hash +RSS: peak resident memory added while hashing, on top of the parsed workflow{RESET}")
+
+    sys.exit(0 if not mismatches and digests_equal else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+bench-n8n-sync.py — Benchmark the sync scripts against a fake n8n API
+
+Runs sync-n8n-status.py, sync-n8n-export.py, sync-n8n-deploy.py and
+sync-n8n-full.py against a local FakeN8nApi (n8n_fake_api.py) at several
+corpus sizes, and reports wall time, API requests and peak RSS per run.
+
+For each size a throwaway project is built in a temp directory: a copy of
+commands/ plus a seeded synthetic corpus (n8n_corpus.py) — workflow files
+over the WORKFLOW_DIRS, the workflow map and the sync state — committed to a
+fresh git repo. A --drift share of the workflows differs between local, git
+and VM (split over --kinds). Before every script run the tree is reset (git
+reset --hard / clean, uncommitted edits re-applied) and the fake API
+reloaded, so each script starts from the same state. The API client's rate
+limit is off by default (--rate), so timings show the scripts, not the token
+bucket.
+
+Usage:
+    python commands/bench-n8n-sync.py [OPTIONS]
+
+Options:
+    --sizes N [N ...]         Corpus sizes (default: 40 500 5000)
+    --scripts NAME [NAME ...] status, export, deploy, full (default: all)
+    --drift FRACTION          Share of workflows changed since the last sync (default: 0.1)
+    --kinds K[,K...]          Drift kinds: vm, git, local (default: all three)
+    --latency MS              Fake API latency per request (default: 0)
+    --jitter MS               Extra random latency per request (default: 0)
+    --error-rate FRACTION     Share of requests answered 503 + Retry-After: 0
+    --rate N                  N8N_API_RATE for the scripts (default: 0 = unlimited)
+    --seed N                  Random seed (default: 1)
+    --timeout SECONDS         Per-run timeout (default: 1800)
+    --json                    Print results as JSON
+    --keep                    Keep the temp projects (path printed)
+    --serve                   Only serve a fake API with --sizes[0] workflows on --port
+    --port N                  Port for --serve (default: 5678)
+
+Examples:
+    python commands/bench-n8n-sync.py --sizes 40 500
+    python commands/bench-n8n-sync.py --sizes 500 --latency 30 --error-rate 0.02
+    python commands/bench-n8n-sync.py --serve --sizes 200 --port 5678
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from n8n_corpus import DRIFT_KINDS, SyntheticCorpus, generate_corpus
+from n8n_fake_api import FakeN8nApi
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+COMMANDS_DIR = Path(__file__).parent.absolute()
+API_KEY = 'bench-key'
+
+# Script runs: name → argv (after the interpreter)
+SCRIPTS = {
+    'status': ['sync-n8n-status.py', '--quiet'],
+    'export': ['sync-n8n-export.py', '--yes', '--quiet', '--no-backup'],
+    'deploy': ['sync-n8n-deploy.py', '--yes', '--quiet'],
+    'full': ['sync-n8n-full.py', '--yes', '--quiet', '--skip-git'],
+}
+
+
+def git(root: Path, *args: str) -> None:
+    subprocess.run(['git', *args], cwd=root, check=True, capture_output=True)
+
+
+def build_project(root: Path, corpus: SyntheticCorpus) -> None:
+    """Scripts plus the corpus's local side in ``root``, committed to a new git repo."""
+    (root / 'commands').mkdir(parents=True)
+    for script in COMMANDS_DIR.glob('*.py'):
+        shutil.copy2(script, root / 'commands' / script.name)
+    (root / '.gitignore').write_text('.n8n-cache/\n__pycache__/\n', encoding='utf-8')
+    corpus.write_tree(root, git=True)
+
+
+def reset_project(root: Path, corpus: SyntheticCorpus) -> None:
+    git(root, 'reset', '-q', '--hard')
+    git(root, 'clean', '-q', '-fdx')
+    corpus.write_local_edits(root)
+
+
+def run_script(root: Path, argv: list[str], env: dict, timeout: float) -> dict:
+    """Run one script; wall time, exit code and peak RSS (MB, None where unavailable)."""
+    log = tempfile.TemporaryFile()
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, str(root / 'commands' / argv[0]), *argv[1:]], cwd=root, env=env,
+                            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log)
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    peak_rss = None
+    try:
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss: KB on Linux, bytes on macOS
+            peak_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+        else:
+            proc.wait()
+    finally:
+        timer.cancel()
+    seconds = time.perf_counter() - started
+    log.seek(0)
+    stderr = log.read().decode('utf-8', errors='replace')
+    log.close()
+    return {'seconds': round(seconds, 2), 'exit_code': proc.returncode,
+            'peak_rss_mb': round(peak_rss, 1) if peak_rss is not None else None,
+            'stderr_tail': stderr.strip().splitlines()[-3:] if proc.returncode not in (0, 1) else []}
+
+
+def bench_size(size: int, scripts: list[str], args) -> list[dict]:
+    corpus = generate_corpus(size, seed=args.seed, drift=args.drift, kinds=args.kinds)
+    vm = corpus.vm_workflows()
+    root = Path(tempfile.mkdtemp(prefix='n8n-bench-'))
+    results = []
+    try:
+        build_project(root, corpus)
+        with FakeN8nApi(latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+                        api_key=API_KEY, seed=args.seed) as api:
+            env = {**os.environ, 'N8N_API_URL': api.url, 'N8N_API_KEY': API_KEY,
+                   'N8N_API_RATE': str(args.rate), 'PYTHONIOENCODING': 'utf-8'}
+            for name in scripts:
+                reset_project(root, corpus)
+                api.load(vm)
+                api.reset_stats()
+                result = run_script(root, SCRIPTS[name], env, args.timeout)
+                results.append({'size': size, 'script': name, 'requests': api.requests,
+                                'injected_errors': api.stats.get('injected_errors', 0),
+                                'routes': dict(sorted(api.stats.items())), **result})
+                if not args.json:
+                    print_result(results[-1])
+    finally:
+        if args.keep:
+            print(f"{GRAY}Kept {root}{RESET}", file=sys.stderr)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    return results
+
+
+def print_result(r: dict) -> None:
+    rss = f"{r['peak_rss_mb']:.1f} MB" if r['peak_rss_mb'] is not None else 'n/a'
+    color = GREEN if r['exit_code'] in (0, 1) else RED
+    print(f"{r['size']:>6}  {r['script']:<7} {r['seconds']:>8.2f}s {r['requests']:>9} "
+          f"{r['injected_errors']:>7} {rss:>10}  {color}{r['exit_code']}{RESET}")
+    for line in r['stderr_tail']:
+        print(f"        {GRAY}{line}{RESET}")
+
+
+def serve(args) -> None:
+    """--serve: a fake API for manual runs, until Ctrl-C."""
+    corpus = generate_corpus(args.sizes[0], seed=args.seed, drift=args.drift, kinds=args.kinds)
+    api = FakeN8nApi(corpus.vm_workflows(),
+                     latency=args.latency / 1000, jitter=args.jitter / 1000, error_rate=args.error_rate,
+                     api_key=API_KEY, seed=args.seed)
+    url = api.start(args.port)
+    print(f"{GREEN}✓ Fake n8n API with {len(api.workflows)} workflows at {url}{RESET}")
+    print(f"{GRAY}  N8N_API_URL={url} N8N_API_KEY={API_KEY}{RESET}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        api.stop()
+        print(f"\n{GRAY}{api.requests} requests served{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the sync scripts against a fake n8n API')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[40, 500, 5000], metavar='N')
+    parser.add_argument('--scripts', nargs='+', choices=list(SCRIPTS), default=list(SCRIPTS), metavar='NAME')
+    parser.add_argument('--drift', type=float, default=0.1, metavar='FRACTION')
+    parser.add_argument('--kinds', type=lambda v: [k for k in v.split(',') if k], default=list(DRIFT_KINDS),
+                        metavar='K[,K...]')
+    parser.add_argument('--latency', type=float, default=0.0, metavar='MS')
+    parser.add_argument('--jitter', type=float, default=0.0, metavar='MS')
+    parser.add_argument('--error-rate', type=float, default=0.0, metavar='FRACTION')
+    parser.add_argument('--rate', type=float, default=0, metavar='N')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--timeout', type=float, default=1800, metavar='SECONDS')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--keep', action='store_true', help='Keep the temp projects')
+    parser.add_argument('--serve', action='store_true', help='Only serve a fake API')
+    parser.add_argument('--port', type=int, default=5678)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    if not args.json:
+        print(f"\n{BOLD}{'Size':>6}  {'Script':<7} {'Wall':>9} {'Requests':>9} {'Errors':>7} {'Peak RSS':>10}  Exit{RESET}")
+    results = []
+    for size in args.sizes:
+        results += bench_size(size, args.scripts, args)
+
+    if args.json:
+        print(json.dumps({'options': {k: v for k, v in vars(args).items() if k not in ('json', 'serve', 'port')},
+                          'results': results}, indent=2))
+    else:
+        print(f"{GRAY}Errors: injected by the fake API (--error-rate); exit 1 = drift or conflicts reported{RESET}")
+    sys.exit(1 if any(r['exit_code'] not in (0, 1) for r in results) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+gen-n8n-corpus.py — Write a seeded synthetic n8n workflow corpus
+
+Generates chatflow-shaped workflows (see n8n_corpus.py) into a project tree
+— workflow files over the WORKFLOW_DIRS, `.n8n-workflow-map.json`, and the
+sync state with every workflow's synced base — and the VM side as an API
+listing (`{"data": [...]}`) for FakeN8nApi or any other consumer.
+
+Same seed, same output. A --drift share of the workflows differs between
+local, git and VM, split round-robin over --kinds.
+
+Usage:
+    python commands/gen-n8n-corpus.py OUT_DIR [OPTIONS]
+
+Options:
+    --count N          Number of workflows (default: 100)
+    --seed N           Random seed (default: 0)
+    --drift FRACTION   Share of workflows changed since the last sync (default: 0)
+    --kinds K[,K...]   Drift kinds: vm, git, local (default: all three)
+    --git              Commit the tree to a git repo in OUT_DIR ('local' edits stay uncommitted)
+    --vm PATH          VM listing JSON (default: OUT_DIR/.n8n-cache/vm-corpus.json)
+    --sqlite PATH      Also write the VM side as an n8n SQLite database
+                       (workflow_entity, for sync-n8n-status.py --db)
+    --executions N     Also generate N executions per workflow over the last
+                       --days (default: 7) up to now, into
+                       OUT_DIR/.n8n-cache/vm-executions.json and the served API
+    --serve PORT       Then serve the VM side with FakeN8nApi until Ctrl-C
+
+Examples:
+    python commands/gen-n8n-corpus.py /tmp/corpus --count 500 --seed 7 --drift 0.2 --git
+    python commands/gen-n8n-corpus.py /tmp/corpus --drift 0.1 --kinds vm --serve 5678
+    python commands/gen-n8n-corpus.py /tmp/corpus --drift 0.1 --sqlite /tmp/corpus/.n8n-cache/n8n.db
+    python commands/gen-n8n-corpus.py /tmp/corpus --count 20 --executions 200 --serve 5678
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from n8n_corpus import DRIFT_KINDS, generate_corpus, generate_executions
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+GRAY = '\033[90m'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a seeded synthetic n8n workflow corpus')
+    parser.add_argument('out_dir', type=Path, metavar='OUT_DIR')
+    parser.add_argument('--count', type=int, default=100, metavar='N')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--drift', type=float, default=0.0, metavar='FRACTION')
+    parser.add_argument('--kinds', default=','.join(DRIFT_KINDS), metavar='K[,K...]')
+    parser.add_argument('--git', action='store_true', help='Commit the tree to a git repo')
+    parser.add_argument('--vm', type=Path, metavar='PATH', help='Where to write the VM listing')
+    parser.add_argument('--sqlite', type=Path, metavar='PATH', help='Also write an n8n SQLite database')
+    parser.add_argument('--executions', type=int, default=0, metavar='N', help='Executions per workflow')
+    parser.add_argument('--days', type=float, default=7.0, help='Execution history span')
+    parser.add_argument('--serve', type=int, metavar='PORT', help='Serve the VM side until Ctrl-C')
+    args = parser.parse_args()
+
+    if not 0 <= args.drift <= 1:
+        parser.error('--drift must be between 0 and 1')
+    try:
+        corpus = generate_corpus(args.count, seed=args.seed, drift=args.drift,
+                                 kinds=[k for k in args.kinds.split(',') if k])
+    except ValueError as e:
+        parser.error(str(e))
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    corpus.write_tree(args.out_dir, git=args.git)
+    vm_path = args.vm or args.out_dir / '.n8n-cache' / 'vm-corpus.json'
+    vm_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(vm_path, 'w', encoding='utf-8') as f:
+        json.dump({'data': corpus.vm_workflows(), 'nextCursor': None}, f, ensure_ascii=False)
+
+    print(f"{GREEN}✓ {args.count} workflows (seed {args.seed}) in {args.out_dir}{RESET}")
+    for kind in DRIFT_KINDS:
+        if corpus.edits.get(kind):
+            print(f"  {GRAY}{kind} drift: {len(corpus.edits[kind])}{RESET}")
+    print(f"  {GRAY}VM listing: {vm_path}{RESET}")
+    if args.sqlite:
+        from n8n_db import write_sqlite_fixture
+        write_sqlite_fixture(args.sqlite, corpus.vm_workflows())
+        print(f"  {GRAY}VM database: {args.sqlite}{RESET}")
+
+    executions = []
+    if args.executions:
+        # Ending now, so time windows (profile-n8n.py --since, retention policies) see them
+        executions = generate_executions(corpus.vm_workflows(), args.executions, seed=args.seed,
+                                         days=args.days, end=datetime.now(timezone.utc))
+        executions_path = args.out_dir / '.n8n-cache' / 'vm-executions.json'
+        with open(executions_path, 'w', encoding='utf-8') as f:
+            json.dump({'data': executions, 'nextCursor': None}, f, ensure_ascii=False)
+        print(f"  {GRAY}Executions: {len(executions)} in {executions_path}{RESET}")
+
+    if args.serve:
+        from n8n_fake_api import FakeN8nApi
+        api = FakeN8nApi(corpus.vm_workflows(), seed=args.seed, executions=executions)
+        url = api.start(args.serve)
+        print(f"{GREEN}✓ Fake n8n API at {url}{RESET} {GRAY}(Ctrl-C to stop){RESET}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            api.stop()
+
+
+if __name__ == '__main__':
+    main()
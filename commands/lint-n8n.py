@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+lint-n8n.py — Static performance checks on the local workflows
+
+Reads the workflow files (n8n_discovery.py rules, or the files given) and
+flags structures that make executions slow or expensive (rules in
+n8n_lint.py):
+
+    http-per-item-loop      HTTP Request inside a loop, without batching
+    split-batch-size-1      SplitInBatches / Loop Over Items with batch size 1
+    agent-unbounded-memory  AI Agent memory without a (small) message window
+    code-per-item           Code node running per item for work that could run once
+    duplicate-subchain      The same heavy chain of nodes repeated in a workflow
+
+Nothing is sent to n8n. Files are checked in a process pool, so the whole
+checkout takes well under a second; with --staged (or the file names a
+pre-commit hook passes) only what is about to be committed is read.
+--changed-nodes further keeps only findings on nodes added or edited since
+HEAD, so a commit is gated on what it changes, not on what was already there.
+
+Usage:
+    python commands/lint-n8n.py [FILES...] [OPTIONS]
+
+Options:
+    --staged            Lint only workflow files staged for commit, as staged
+                        (the index version, not the working tree)
+    --changed-nodes     Report only findings on nodes added or changed since
+                        HEAD (moving a node doesn't count)
+    --format FORMAT     text (default), json or sarif
+    --output PATH       Write the report to PATH instead of stdout
+    --jobs N            Worker processes (default: CPU count; 1 = no pool)
+    --disable RULE      Skip a rule (repeatable)
+    --fail-on LEVEL     Exit 1 on findings at or above LEVEL: note, warning
+                        (default), error, or never
+    --list-rules        Print the rules and exit
+
+Examples:
+    python commands/lint-n8n.py                              # whole checkout
+    python commands/lint-n8n.py --staged --changed-nodes     # pre-commit gate
+    python commands/lint-n8n.py "MVP's/Assistente de Voz/Vapi - Check Calendar Availability.json"
+    python commands/lint-n8n.py --format sarif --output lint.sarif --fail-on never
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from n8n_discovery import find_workflow_files, git_blobs, is_workflow_file, staged_contents, staged_workflow_files
+from n8n_lint import LEVELS, RULES, lint_file, lint_text, to_sarif
+from n8n_workflow_map import relative_path
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+LEVEL_COLORS = {'error': RED, 'warning': YELLOW, 'note': CYAN}
+
+# Below this many files a pool costs more to start than it saves
+MIN_FILES_PER_POOL = 8
+
+
+def lint_files(files: list[Path], disabled: tuple[str, ...], jobs: int,
+               sources: dict[str, bytes] | None = None) -> list[dict]:
+    """lint_file() results for ``files``, in file order.
+
+    ``sources`` (relative path → content, --staged: the index blobs) is
+    linted instead of the working-tree files.
+    """
+    tasks = [(str(path), relative_path(path, PROJECT_ROOT), disabled) for path in files]
+    if sources is not None:
+        return [lint_text(sources[rel].decode('utf-8', errors='replace'), rel, disabled) if rel in sources
+                else lint_file(path, rel, disabled) for path, rel, disabled in tasks]
+    if jobs <= 1 or len(tasks) < MIN_FILES_PER_POOL:
+        return [lint_file(*task) for task in tasks]
+    workers = min(jobs, max(1, len(tasks) // 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lint_file, *zip(*tasks), chunksize=max(1, len(tasks) // (workers * 4))))
+
+
+def nodes_by_name(raw: bytes) -> dict[str, dict]:
+    """{node name: node} of a workflow file's content ({} if it isn't one)."""
+    try:
+        nodes = json.loads(raw).get('nodes')
+    except (ValueError, AttributeError):
+        return {}
+    return {node.get('name'): node for node in nodes if isinstance(node, dict)} if isinstance(nodes, list) else {}
+
+
+def drop_unchanged_nodes(results: list[dict], sources: dict[str, bytes] | None = None) -> int:
+    """Remove findings on nodes identical (position aside) to HEAD; returns how many.
+
+    The linted version is ``sources[file]`` when given (--staged), else the file on disk.
+    """
+    def content(node: dict) -> dict:
+        return {key: value for key, value in node.items() if key != 'position'}
+
+    flagged = [result for result in results if result['findings']]
+    committed = git_blobs([f"HEAD:{result['file']}" for result in flagged], PROJECT_ROOT)
+    dropped = 0
+    for result in flagged:
+        before = nodes_by_name(committed.get(f"HEAD:{result['file']}", b''))
+        if not before:
+            continue
+        if sources is not None and result['file'] in sources:
+            now = nodes_by_name(sources[result['file']])
+        else:
+            now = nodes_by_name((PROJECT_ROOT / result['file']).read_bytes())
+        kept = [f for f in result['findings']
+                if f['node'] not in before or content(before[f['node']]) != content(now.get(f['node'], {}))]
+        dropped += len(result['findings']) - len(kept)
+        result['findings'] = kept
+    return dropped
+
+
+def print_text(results: list[dict]) -> None:
+    for result in results:
+        if result.get('error'):
+            print(f"{RED}✗{RESET} {result['file']}: {result['error']}")
+            continue
+        if not result['findings']:
+            continue
+        print(f"{BOLD}{result['name']}{RESET} {GRAY}{result['file']}{RESET}")
+        for f in result['findings']:
+            color = LEVEL_COLORS[f['level']]
+            print(f"  {color}{f['level']:<7}{RESET} {GRAY}:{f['line']:<5}{RESET} {f['message']} {GRAY}[{f['rule']}]{RESET}")
+
+
+def list_rules() -> None:
+    for rule, (level, description) in RULES.items():
+        print(f"  {rule:<24} {LEVEL_COLORS[level]}{level:<8}{RESET} {description}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Static performance checks on the local n8n workflows')
+    parser.add_argument('files', nargs='*', help='Workflow files to lint (default: all)')
+    parser.add_argument('--staged', action='store_true', help='Lint only workflow files staged for commit')
+    parser.add_argument('--changed-nodes', action='store_true',
+                        help='Report only findings on nodes added or changed since HEAD')
+    parser.add_argument('--format', choices=('text', 'json', 'sarif'), default='text', help='Report format')
+    parser.add_argument('--output', metavar='PATH', help='Write the report to PATH')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--disable', action='append', default=[], metavar='RULE', help='Skip a rule')
+    parser.add_argument('--fail-on', choices=LEVELS + ('never',), default='warning',
+                        help='Exit 1 on findings at or above this level')
+    parser.add_argument('--list-rules', action='store_true', help='Print the rules and exit')
+    args = parser.parse_args()
+
+    if args.list_rules:
+        list_rules()
+        return
+    unknown = [rule for rule in args.disable if rule not in RULES]
+    if unknown:
+        parser.error(f"unknown rule(s): {', '.join(unknown)} (see --list-rules)")
+    if args.staged and args.files:
+        parser.error('--staged and FILES are mutually exclusive')
+
+    started = time.perf_counter()
+    sources = None
+    if args.staged:
+        files = staged_workflow_files(PROJECT_ROOT)
+        # What is being committed, not the working tree (git add -p, edits after git add)
+        sources = {relative_path(path, PROJECT_ROOT): blob
+                   for path, blob in staged_contents(files, PROJECT_ROOT).items()}
+    elif args.files:
+        # A pre-commit hook passes every changed .json; keep the workflow ones
+        files = [Path(f).resolve() for f in args.files if f.endswith('.json') and is_workflow_file(Path(f))]
+    else:
+        files = find_workflow_files(PROJECT_ROOT)
+
+    results = lint_files(files, tuple(args.disable), args.jobs, sources)
+    unchanged = drop_unchanged_nodes(results, sources) if args.changed_nodes else 0
+    findings = [f for result in results for f in result['findings']]
+    elapsed = time.perf_counter() - started
+
+    if args.format == 'sarif':
+        report = json.dumps(to_sarif(results), indent=2, ensure_ascii=False)
+    elif args.format == 'json':
+        report = json.dumps([r for r in results if r['findings'] or r.get('error')], indent=2, ensure_ascii=False)
+    else:
+        report = None
+
+    if report is not None:
+        if args.output:
+            Path(args.output).write_text(report + '\n', encoding='utf-8')
+        else:
+            print(report)
+    else:
+        print_text(results)
+
+    if report is None or args.output:
+        linted = sum(1 for r in results if not r.get('skipped'))
+        counts = {level: sum(1 for f in findings if f['level'] == level) for level in LEVELS}
+        summary = ', '.join(f"{n} {level}(s)" for level, n in counts.items() if n) or 'no findings'
+        if unchanged:
+            summary += f" ({unchanged} more on unchanged nodes)"
+        color = GREEN if not findings else YELLOW
+        where = f" → {args.output}" if args.output else ""
+        print(f"{color}{linted} workflow(s): {summary}{RESET} {GRAY}in {elapsed * 1000:.0f} ms{where}{RESET}",
+              file=sys.stderr if report is not None else sys.stdout)
+
+    errors = [r for r in results if r.get('error')]
+    if args.fail_on != 'never':
+        threshold = LEVELS.index(args.fail_on)
+        if errors or any(LEVELS.index(f['level']) >= threshold for f in findings):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_analysis.py — Structure of a workflow's execution graph
+
+analyze_workflow() reads the main connections of a workflow (n8n_graph.py)
+and reports what bounds its run time:
+
+    depth            nodes on the longest trigger-to-end path
+    longest chain    the longest run of nodes linked one-to-one (no branching)
+    critical path    the heaviest trigger-to-end path: the most sequential
+                     external calls (HTTP, databases, mail, LLMs, sub-workflows,
+                     waits), or the most milliseconds when node timings are known
+    fan-out / in     nodes feeding, or fed by, several others
+    sequential       one output feeding several branches: with executionOrder
+    branches         v1 n8n runs them one after another (top to bottom on the
+                     canvas), so their calls add up
+    side steps       external calls in a sequence whose output nothing after
+                     them reads; they can be branched off and run beside the
+                     path instead of on it
+    independent      consecutive external calls that don't use each other's
+    runs             output (reads of different sheets, say): they could run
+                     concurrently instead of in series
+    webhooks         per webhook trigger, what the caller waits for: the
+                     heaviest path to a Respond to Webhook node, plus branches
+                     v1 runs before the response
+
+Loops (n8n_graph.loops()) are collapsed into one step, so every path is finite.
+
+Node timings (milliseconds per node name) come from load_timings(): saved
+execution JSON (GET /executions/{id}?includeData=true), or a map of
+workflow ID / name → node → milliseconds (or → {'p50': ...}).
+
+Usage:
+    from n8n_analysis import analyze_workflow
+    report = analyze_workflow(workflow, timings={'Get Calendar Events': 840})
+    report['critical_path'], report['webhooks']
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from n8n_graph import WorkflowGraph, build_graph
+
+# Node types that run inside n8n without waiting on anything (all others are
+# treated as external calls)
+LOCAL_TYPES = {
+    f"n8n-nodes-base.{name}" for name in (
+        'set', 'if', 'switch', 'filter', 'merge', 'noOp', 'code', 'function', 'functionItem',
+        'splitInBatches', 'splitOut', 'aggregate', 'itemLists', 'limit', 'sort', 'summarize',
+        'removeDuplicates', 'renameKeys', 'dateTime', 'crypto', 'xml', 'html', 'markdown',
+        'compareDatasets', 'respondToWebhook', 'stopAndError', 'executionData',
+        'convertToFile', 'extractFromFile', 'moveBinaryData', 'spreadsheetFile',
+    )
+}
+TRIGGER_SUFFIXES = ('Trigger', '.webhook', '.formTrigger', '.chatTrigger')
+STICKY_NOTE = 'n8n-nodes-base.stickyNote'
+WEBHOOK = 'n8n-nodes-base.webhook'
+RESPOND = 'n8n-nodes-base.respondToWebhook'
+
+# Parameters that read the incoming items ($json, $input, legacy `items`, Python `_json`)
+INPUT_REFERENCE = re.compile(r"\$json\b|\$input\b|\$binary\b|\$item\(|\bitems?\b|\b_json\b|\b_input\b")
+NAMED_REFERENCE = re.compile(r"""\$\(\s*['"](.+?)['"]\s*\)|\$node\[\s*['"](.+?)['"]\s*\]""")
+# Nodes that work on their input items whatever their parameters say
+PASS_THROUGH_TYPES = {
+    f"n8n-nodes-base.{name}" for name in (
+        'if', 'switch', 'filter', 'merge', 'noOp', 'splitInBatches', 'splitOut', 'aggregate',
+        'itemLists', 'limit', 'sort', 'summarize', 'removeDuplicates', 'renameKeys',
+        'convertToFile', 'extractFromFile', 'moveBinaryData', 'spreadsheetFile',
+    )
+}
+# Without expressions, these map the input fields into the request implicitly
+WRITE_OPERATIONS = {'append', 'appendOrUpdate', 'create', 'insert', 'update', 'upsert', 'delete', 'send'}
+MAPPING_PARAMETERS = ('columns', 'fieldsUi', 'dataMode', 'fieldsToSend', 'dataToSend')
+
+# Fan-out / fan-in at or above this are listed
+MIN_FAN = 3
+
+Weight = Tuple[float, int, int]  # (milliseconds, external calls, nodes)
+
+
+def is_external(node: dict) -> bool:
+    node_type = str(node.get('type', ''))
+    return not (node_type in LOCAL_TYPES or node_type.endswith(TRIGGER_SUFFIXES)
+                or node_type == STICKY_NOTE)
+
+
+def is_trigger(node: dict) -> bool:
+    return str(node.get('type', '')).endswith(TRIGGER_SUFFIXES)
+
+
+def _strings(value) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _parameter_text(node: dict) -> str:
+    """Every string parameter (expressions, code) of ``node``, one per line."""
+    return '\n'.join(_strings(node.get('parameters') or {}))
+
+
+def named_references(node: dict) -> Set[str]:
+    """Nodes referenced by name in ``node``'s parameters: $('Name'), $node["Name"]."""
+    return {a or b for a, b in NAMED_REFERENCE.findall(_parameter_text(node))}
+
+
+def reads_input(node: dict) -> bool:
+    """Whether ``node`` uses the data of its incoming items (best effort).
+
+    Expressions that mention $json / $input do; expressions that only name
+    other nodes ($('Name')) or nothing item-related don't. Without any
+    expression, nodes that transform items, write or map fields (Set, IF,
+    inserts, appends, ...) do, and plain reads (a sheet, a URL) don't.
+    """
+    params = node.get('parameters') or {}
+    text = _parameter_text(node)
+    if INPUT_REFERENCE.search(text) or node.get('type') in PASS_THROUGH_TYPES:
+        return True
+    if node.get('type') == RESPOND:
+        return params.get('respondWith', 'firstIncomingItem') in ('firstIncomingItem', 'allIncomingItems', 'binary')
+    if '{{' in text or text.startswith('=') or '\n=' in text or NAMED_REFERENCE.search(text):
+        return False
+    return (not is_external(node) or params.get('operation') in WRITE_OPERATIONS
+            or any(key in params for key in MAPPING_PARAMETERS))
+
+
+def flow_nodes(graph: WorkflowGraph) -> List[str]:
+    """Nodes that items pass through: no sticky notes, no LangChain sub-nodes."""
+    kinds: Dict[str, Set[str]] = {}
+    for edge in graph.edges:
+        kinds.setdefault(edge.source, set()).add(edge.kind)
+    names = []
+    for name, node in graph.nodes.items():
+        if node.get('type') == STICKY_NOTE:
+            continue
+        if kinds.get(name) and 'main' not in kinds[name] and not graph.in_edges(name):
+            continue  # model / memory / tool attached to an agent or chain
+        names.append(name)
+    return names
+
+
+def node_weight(node: dict, timings: Dict[str, float]) -> Weight:
+    return (float(timings.get(node['name'], 0.0)), 1 if is_external(node) else 0, 1)
+
+
+def _add(a: Weight, b: Weight) -> Weight:
+    return (a[0] + b[0], a[1] + b[1], a[2] + b[2])
+
+
+def heaviest_path(graph: WorkflowGraph, names: Iterable[str], timings: Dict[str, float],
+                  sources: Optional[Set[str]] = None,
+                  sinks: Optional[Set[str]] = None, unit: bool = False) -> Tuple[Weight, List[List[str]]]:
+    """Heaviest path over ``names`` (loops collapsed into one step).
+
+    Returns (total weight, steps), a step being the node names of one node or
+    one loop. ``sources`` / ``sinks`` restrict where the path starts and ends;
+    ``unit`` weighs every step as one node (for depth).
+    """
+    names = set(names)
+    component: Dict[str, int] = {}
+    members: List[List[str]] = []
+    for loop in graph.loops():
+        loop = loop & names
+        if loop:
+            for name in loop:
+                component[name] = len(members)
+            members.append(sorted(loop))
+    for name in names:
+        if name not in component:
+            component[name] = len(members)
+            members.append([name])
+
+    successors: Dict[int, Set[int]] = {c: set() for c in range(len(members))}
+    indegree = [0] * len(members)
+    for name in names:
+        for succ in graph.successors(name):
+            if succ in names and component[succ] != component[name] \
+                    and component[succ] not in successors[component[name]]:
+                successors[component[name]].add(component[succ])
+                indegree[component[succ]] += 1
+
+    weight = [(0.0, 0, 1 if unit else 0)] * len(members)
+    for c, group in enumerate(members):
+        for name in group if not unit else ():
+            weight[c] = _add(weight[c], node_weight(graph.nodes[name], timings))
+
+    start = {component[n] for n in sources} if sources is not None else None
+    end = {component[n] for n in sinks} if sinks is not None else None
+    best: Dict[int, Weight] = {}
+    parent: Dict[int, Optional[int]] = {}
+    ready = [c for c in range(len(members)) if indegree[c] == 0]
+    for c in (start or ()):
+        best[c], parent[c] = weight[c], None
+    while ready:
+        c = ready.pop()
+        if start is None and c not in best:
+            best[c], parent[c] = weight[c], None
+        for succ in successors[c]:
+            if c in best:
+                candidate = _add(best[c], weight[succ])
+                if succ not in best or candidate > best[succ]:
+                    best[succ], parent[succ] = candidate, c
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                ready.append(succ)
+
+    ends = [c for c in best if end is None or c in end]
+    if not ends:
+        return (0.0, 0, 0), []
+    last: Optional[int] = max(ends, key=lambda c: best[c])
+    total = best[last]
+    steps = []
+    while last is not None:
+        steps.append(members[last])
+        last = parent[last]
+    return total, steps[::-1]
+
+
+def longest_chain(graph: WorkflowGraph, names: List[str]) -> List[str]:
+    """Longest run of nodes linked one-to-one over main connections."""
+    names_set = set(names)
+
+    def linked(a: str, b: str) -> bool:
+        return graph.successors(a) == [b] and graph.predecessors(b) == [a]
+
+    best: List[str] = []
+    for name in names:
+        preds = [p for p in graph.predecessors(name) if p in names_set]
+        if len(preds) == 1 and linked(preds[0], name):
+            continue  # not the start of a chain
+        chain = [name]
+        while True:
+            succs = graph.successors(chain[-1])
+            if len(succs) != 1 or succs[0] not in names_set or succs[0] in chain \
+                    or not linked(chain[-1], succs[0]):
+                break
+            chain.append(succs[0])
+        if len(chain) > len(best):
+            best = chain
+    return best
+
+
+def _branch_order(graph: WorkflowGraph, targets: List[str]) -> List[str]:
+    """Branches in the order executionOrder v1 runs them: top to bottom, then left to right."""
+    def position(name: str) -> Tuple[float, float]:
+        pos = graph.nodes[name].get('position') or [0, 0]
+        return (pos[1], pos[0]) if len(pos) == 2 else (0, 0)
+    return sorted(targets, key=position)
+
+
+def sequential_branches(graph: WorkflowGraph, names: List[str], timings: Dict[str, float]) -> List[dict]:
+    """Outputs feeding several branches that each make external calls."""
+    found = []
+    names_set = set(names)
+    for name in names:
+        for output in sorted({e.output for e in graph.out_edges(name)}):
+            targets = [t for t in graph.successors(name, output) if t in names_set]
+            if len(targets) < 2:
+                continue
+            branches = []
+            for target in _branch_order(graph, targets):
+                reach = graph.reachable([target]) & names_set
+                total, _ = heaviest_path(graph, reach, timings, sources={target})
+                branches.append({'start': target, 'calls': total[1], 'ms': total[0]})
+            if sum(1 for b in branches if b['calls']) >= 2:
+                found.append({'node': name, 'output': output, 'branches': branches})
+    return found
+
+
+def side_steps(graph: WorkflowGraph, names: List[str]) -> List[dict]:
+    """External calls in a sequence whose output no later node reads."""
+    found = []
+    names_set = set(names)
+    for name in names:
+        node = graph.nodes[name]
+        succs = [s for s in graph.successors(name) if s in names_set]
+        if not is_external(node) or len(succs) != 1 or is_trigger(node):
+            continue
+        following = graph.nodes[succs[0]]
+        if reads_input(following):
+            continue
+        downstream = graph.reachable(succs) & names_set
+        if any(name in named_references(graph.nodes[d]) for d in downstream):
+            continue
+        found.append({'node': name, 'next': succs[0]})
+    return found
+
+
+def independent_runs(graph: WorkflowGraph, names: List[str]) -> List[List[str]]:
+    """Consecutive external calls in a sequence where none uses the previous one's output."""
+    names_set = set(names)
+
+    def independent(a: str, b: str) -> bool:
+        node = graph.nodes[b]
+        return (is_external(node) and graph.predecessors(b) == [a] and not reads_input(node)
+                and a not in named_references(node))
+
+    runs = []
+    for name in names:
+        if not is_external(graph.nodes[name]) or is_trigger(graph.nodes[name]):
+            continue
+        preds = graph.predecessors(name)
+        if len(preds) == 1 and preds[0] in names_set and independent(preds[0], name) \
+                and not is_trigger(graph.nodes[preds[0]]):
+            continue  # inside a run that starts earlier
+        run = [name]
+        while True:
+            succs = [s for s in graph.successors(run[-1]) if s in names_set]
+            if len(succs) != 1 or succs[0] in run or not independent(run[-1], succs[0]):
+                break
+            run.append(succs[0])
+        if len(run) >= 2:
+            runs.append(run)
+    return runs
+
+
+def webhook_bounds(graph: WorkflowGraph, names: List[str], timings: Dict[str, float],
+                   execution_order: str) -> List[dict]:
+    """For each webhook trigger: what its caller waits for."""
+    bounds = []
+    names_set = set(names)
+    for name in names:
+        node = graph.nodes[name]
+        if node.get('type') != WEBHOOK:
+            continue
+        mode = (node.get('parameters') or {}).get('responseMode', 'onReceived')
+        reach = graph.reachable([name]) & names_set
+        entry = {'webhook': name, 'mode': mode, 'respond': [], 'path': [], 'calls': 0, 'ms': 0.0,
+                 'before_response': []}
+        if mode == 'responseNode':
+            responders = {n for n in reach if graph.nodes[n].get('type') == RESPOND}
+            entry['respond'] = sorted(responders)
+            on_path = set()
+            for responder in responders:
+                on_path |= graph.reaching(responder)
+            total, steps = heaviest_path(graph, reach & on_path, timings, sources={name}, sinks=responders)
+        elif mode == 'lastNode':
+            total, steps = heaviest_path(graph, reach, timings, sources={name})
+            on_path = reach
+        else:
+            bounds.append(entry)  # answered on receipt
+            continue
+        entry.update(path=steps, calls=total[1], ms=total[0])
+
+        if mode == 'responseNode' and execution_order == 'v1':
+            # Branches that leave the response path but run before it continues
+            path_nodes = {n for step in steps for n in step}
+            for step in steps:
+                for n in step:
+                    targets = [t for t in graph.successors(n) if t in names_set]
+                    if len(targets) < 2:
+                        continue
+                    for target in _branch_order(graph, targets):
+                        if target in path_nodes:
+                            break
+                        if target in on_path:
+                            continue
+                        branch = graph.reachable([target]) & names_set - on_path
+                        branch_total, _ = heaviest_path(graph, branch, timings, sources={target})
+                        if branch_total[1] or branch_total[0]:
+                            entry['before_response'].append(
+                                {'from': n, 'start': target, 'calls': branch_total[1], 'ms': branch_total[0]})
+        bounds.append(entry)
+    return bounds
+
+
+def analyze_workflow(workflow: dict, timings: Optional[Dict[str, float]] = None) -> dict:
+    """Structural report of one workflow (see the module docstring)."""
+    timings = timings or {}
+    graph = build_graph(workflow)
+    names = flow_nodes(graph)
+    names_set = set(names)
+
+    fan_out = {n: len([s for s in graph.successors(n) if s in names_set]) for n in names}
+    fan_in = {n: len([p for p in graph.predecessors(n) if p in names_set]) for n in names}
+    depth, _ = heaviest_path(graph, names, {}, unit=True)
+    critical, critical_steps = heaviest_path(graph, names, timings)
+    runs = independent_runs(graph, names)
+
+    return {
+        'name': workflow.get('name'),
+        'id': workflow.get('id'),
+        'nodes': len(names),
+        'external_calls': sum(1 for n in names if is_external(graph.nodes[n])),
+        'loops': [sorted(loop & names_set) for loop in graph.loops() if loop & names_set],
+        'depth': depth[2],
+        'longest_chain': longest_chain(graph, names),
+        'critical_path': {'steps': critical_steps, 'calls': critical[1], 'ms': critical[0]},
+        'fan_out': sorted(((n, c) for n, c in fan_out.items() if c >= MIN_FAN), key=lambda x: -x[1]),
+        'fan_in': sorted(((n, c) for n, c in fan_in.items() if c >= MIN_FAN), key=lambda x: -x[1]),
+        'max_fan_out': max(fan_out.values(), default=0),
+        'max_fan_in': max(fan_in.values(), default=0),
+        'sequential_branches': sequential_branches(graph, names, timings),
+        'side_steps': [step for step in side_steps(graph, names)
+                       if not any(step['node'] in run and step['next'] in run for run in runs)],
+        'independent_runs': runs,
+        'webhooks': webhook_bounds(graph, names, timings,
+                                   (workflow.get('settings') or {}).get('executionOrder', 'v0')),
+        'timed': bool(timings),
+    }
+
+
+# Timings --------------------------------------------------------------------
+
+def execution_node_times(execution: dict) -> Dict[str, float]:
+    """Milliseconds per node in one execution (all runs of a node summed)."""
+    run_data = (((execution.get('data') or {}).get('resultData') or {}).get('runData')) or {}
+    times = {}
+    for node, runs in run_data.items():
+        times[node] = float(sum((run or {}).get('executionTime') or 0 for run in runs or []))
+    return times
+
+
+def load_timings(paths: Iterable[Path]) -> Dict[str, Dict[str, float]]:
+    """workflow ID / name → node → milliseconds, from execution or timing JSON files.
+
+    Accepts a saved execution (or a list of them, or {'data': [...]} as the
+    executions endpoint pages them; several executions of a workflow are
+    averaged), or {workflow: {node: ms | {'p50': ms, ...}}}.
+    """
+    totals: Dict[str, Dict[str, List[float]]] = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get('data'), list):
+            data = data['data']
+        executions = data if isinstance(data, list) else [data] if 'workflowId' in data else []
+        for execution in executions:
+            key = str(execution.get('workflowId') or (execution.get('workflowData') or {}).get('id') or '')
+            for node, ms in execution_node_times(execution).items():
+                totals.setdefault(key, {}).setdefault(node, []).append(ms)
+        if not executions and isinstance(data, dict):
+            for key, nodes in data.items():
+                for node, value in (nodes or {}).items():
+                    ms = value.get('p50') if isinstance(value, dict) else value
+                    if isinstance(ms, (int, float)):
+                        totals.setdefault(str(key), {}).setdefault(node, []).append(float(ms))
+    return {key: {node: sum(v) / len(v) for node, v in nodes.items()} for key, nodes in totals.items()}
@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_client.py — Rate-limited, retrying n8n API requests
+
+The n8n VM also serves production webhooks, and sits behind a reverse proxy
+that answers 429/502/503/504 when it is busy or restarting. Every API call of
+the sync scripts goes through api_request(), which adds, per API host:
+
+- a token bucket (N8N_API_RATE requests/second, bursts of N8N_API_BURST), so
+  concurrent instance checks and big fleets don't hammer the VM
+- retries of 429/502/503/504 and dropped connections, waiting for the
+  server's `Retry-After` or else a jittered exponential backoff
+- a circuit breaker: after N8N_API_BREAKER_FAILURES consecutive failures the
+  host is not contacted for N8N_API_BREAKER_COOLDOWN seconds (calls raise
+  CircuitOpenError at once), then one trial request decides
+
+Timeouts and refused connections are not retried: a dead VM should cost one
+timeout, not several (see sync-n8n-status.py offline mode).
+
+Requests, retries, throttling waits and circuit openings are recorded in the
+run metrics (n8n_metrics.py); client_summary() gives a one-line summary.
+
+Usage:
+    from n8n_client import api_request
+    status, reason, body = api_request('GET', url, headers)
+"""
+
+import email.utils
+import os
+import random
+import socket
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from n8n_http import http_exchange
+from n8n_metrics import get_metrics
+
+# Statuses worth retrying (the request was not processed, or is idempotent)
+RETRY_STATUSES = {429, 502, 503, 504}
+
+BACKOFF_BASE = 0.5   # seconds, doubled per attempt
+BACKOFF_MAX = 30.0   # cap for backoff and Retry-After
+
+# Defaults, overridable in the environment / .env (read on first use)
+DEFAULTS = {
+    'N8N_API_RATE': 20.0,
+    'N8N_API_BURST': 40,
+    'N8N_API_RETRIES': 4,
+    'N8N_API_BREAKER_FAILURES': 5,
+    'N8N_API_BREAKER_COOLDOWN': 30.0,
+}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of contacting a host whose circuit breaker is open."""
+
+
+def _setting(name: str):
+    default = DEFAULTS[name]
+    try:
+        return type(default)(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class TokenBucket:
+    """Allows ``rate`` requests per second on average, ``burst`` at once."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; returns seconds waited."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Closed → open after ``threshold`` consecutive failures → half-open after ``cooldown``.
+
+    Half-open lets a single trial request through; other callers keep
+    getting CircuitOpenError until it succeeds (closed) or fails (open again).
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def check(self, host: str) -> None:
+        """Raise CircuitOpenError while open; after the cooldown, let one trial through."""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                raise CircuitOpenError(f"{host}: circuit open after {self.failures} failures "
+                                       f"(retrying in {remaining:.0f}s)")
+            if self.probing:
+                raise CircuitOpenError(f"{host}: circuit half-open, waiting for the trial request")
+            self.probing = True
+
+    def success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self) -> bool:
+        """Count a failure; True if this one opened (or, as the trial, re-opened) the circuit."""
+        with self._lock:
+            self.failures += 1
+            if self.probing:
+                self.probing = False
+                self.opened_at = time.monotonic()
+                return True
+            if self.opened_at is None and self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+
+_hosts: Dict[str, Tuple[TokenBucket, CircuitBreaker]] = {}
+_hosts_lock = threading.Lock()
+
+
+def _host_state(host: str) -> Tuple[TokenBucket, CircuitBreaker]:
+    with _hosts_lock:
+        if host not in _hosts:
+            _hosts[host] = (
+                TokenBucket(_setting('N8N_API_RATE'), _setting('N8N_API_BURST')),
+                CircuitBreaker(_setting('N8N_API_BREAKER_FAILURES'), _setting('N8N_API_BREAKER_COOLDOWN'))
+            )
+        return _hosts[host]
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def backoff_seconds(attempt: int) -> float:
+    """Full-jitter exponential backoff for retry ``attempt`` (1-based)."""
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _is_dead_host(error: Exception) -> bool:
+    """Timeouts and refused connections: the host is down, retrying only adds waiting."""
+    return isinstance(error, (socket.timeout, TimeoutError, ConnectionRefusedError, socket.gaierror))
+
+
+def api_request(method: str, url: str, headers: Dict[str, str], body: Optional[bytes] = None,
+                timeout: float = 10) -> Tuple[int, str, bytes]:
+    """Send an n8n API request with rate limiting, retries and circuit breaking.
+
+    Returns (status, reason, body) of the final attempt; HTTP errors are
+    returned, not raised. Connection failures (after retries) raise, as
+    does an open circuit (CircuitOpenError, a ConnectionError).
+    """
+    host = urlsplit(url).netloc
+    bucket, breaker = _host_state(host)
+    metrics = get_metrics()
+    max_retries = _setting('N8N_API_RETRIES')
+    bytes_out = len(body) if body else 0
+    attempt = 0
+
+    while True:
+        breaker.check(host)
+        waited = bucket.acquire()
+        if waited:
+            metrics.record_throttle(waited)
+
+        try:
+            status, reason, response_headers, data = http_exchange(method, url, headers, body, timeout)
+        except Exception as e:
+            metrics.record_request(method, None, bytes_out=bytes_out)
+            if breaker.failure():
+                metrics.record_circuit_open()
+            if _is_dead_host(e) or attempt >= max_retries:
+                raise
+            attempt += 1
+            metrics.record_retry()
+            time.sleep(backoff_seconds(attempt))
+            continue
+
+        metrics.record_request(method, status, bytes_in=len(data), bytes_out=bytes_out)
+        if status not in RETRY_STATUSES:
+            breaker.success()
+            return status, reason, data
+
+        if breaker.failure():
+            metrics.record_circuit_open()
+        delay = retry_after_seconds(response_headers.get('Retry-After'))
+        if attempt >= max_retries or (delay is not None and delay > BACKOFF_MAX):
+            return status, reason, data
+        attempt += 1
+        metrics.record_retry()
+        time.sleep(delay if delay is not None else backoff_seconds(attempt))
+
+
+def client_summary() -> str:
+    """One line for the end of a run, e.g. 'API: 42 requests, 3 retries, 1.2s throttled'."""
+    report = get_metrics().to_dict()['requests']
+    parts = [f"{report['total']} requests"]
+    if report['errors']:
+        parts.append(f"{report['errors']} failed")
+    if report['retries']:
+        parts.append(f"{report['retries']} retries")
+    if report['throttle_seconds']:
+        parts.append(f"{report['throttle_seconds']:.1f}s throttled")
+    if report['circuit_opens']:
+        parts.append(f"circuit opened {report['circuit_opens']}x")
+    return "API: " + ", ".join(parts)
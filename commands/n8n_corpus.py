@@ -0,0 +1,504 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_corpus.py — Seeded synthetic workflow corpus for load tests and benchmarks
+
+Generates n8n workflows shaped like the `MVP's/Chatbots/*` chatflows:
+
+    Webhook → Validate Input (Code) → Flowise API (HTTP) | AI Agent (+ model, memory)
+            → Process Response (Code) → Route Response (Switch, 1-4 outputs)
+            → per branch: Email / Postgres / HTTP actions → Format (Code) → Respond to Webhook
+    plus, sometimes, a Log Incoming (Postgres) side branch off Validate Input
+
+Node count (≈6-40), Switch fan-out and the size of the embedded Code node
+sources and agent prompts (a few hundred characters to ~60 KB, with a long
+tail) vary per workflow. Everything comes from one random.Random(seed):
+same seed, same corpus, byte for byte (timestamps included).
+
+Drift: a ``drift`` share of the workflows is changed after the last sync,
+split over three kinds so a benchmark controls what differs between local,
+git and VM:
+
+    vm      edited in the n8n UI          (VM ≠ git = local; export)
+    git     edited locally and committed  (local = git ≠ VM; deploy)
+    local   edited locally, not committed (local ≠ git = VM; uncommitted)
+
+write_tree() writes the local side (files spread over the WORKFLOW_DIRS, the
+v2 workflow map, the sync state with each workflow's synced base) and, with
+git, commits it before applying the uncommitted edits; vm_workflows() is the
+VM side for FakeN8nApi (n8n_fake_api.py).
+
+generate_executions() adds execution history for those workflows, as
+`GET /executions?includeData=true` returns it: one path through each
+workflow per execution (one Switch output taken), per-node `runData` with
+start times, durations drawn around a per-node median (HTTP and LLM calls
+slow, Code fast), output items, and a share of executions failing at an
+external node.
+
+Usage:
+    from n8n_corpus import generate_corpus
+    corpus = generate_corpus(500, seed=7, drift=0.2)
+    corpus.write_tree(root, git=True)
+    api = FakeN8nApi(corpus.vm_workflows(), executions=generate_executions(corpus.vm_workflows(), 20))
+"""
+
+import copy
+import json
+import random
+import subprocess
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from n8n_graph import build_graph
+from n8n_hash import workflow_hash
+from n8n_sync_state import essential_fields
+from n8n_workflow_map import MAP_VERSION, save_workflow_map_file
+
+WORKFLOW_DIRS = ["MVP's", "Ferramentas", "Projetos de Clientes", "Módulos reutilizáveis"]
+DRIFT_KINDS = ('vm', 'git', 'local')
+
+# All timestamps derive from this, so output does not depend on the clock
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+BOTS = ['Hotel Concierge', 'Assistente de Vendas', 'Assistente de RH', 'Assistente de Conversão',
+        'Apoio ao Cliente', 'Marcações', 'Faturação', 'Recrutamento', 'Reservas', 'Suporte Técnico']
+CLIENTS = ['Clínica Sorriso', 'Hotel Atlântico', 'Imobiliária Lis', 'Ginásio Fit', 'Escola Nova',
+           'Restaurante Mar', 'Oficina Rápida', 'Loja Verde', 'Advogados & Associados', 'Farmácia Sol']
+TAGS = ['chatbot', 'vapi', 'cliente', 'interno', 'whatsapp', 'email']
+ACTIONS = ['email', 'postgres', 'http', 'gmail']
+BRANCHES = ['Booking', 'Feedback', 'Normal', 'Lead', 'Handoff']
+
+WORDS = ('o cliente pedido reserva hotel quarto data disponível confirmar email resposta mensagem '
+         'assistente deve sempre nunca informação contacto telefone preço serviço horário equipa '
+         'quando se não para com uma pela utilizador idioma português formal breve claro').split()
+
+CODE_LINES = [
+    "const items = $input.all();",
+    "const body = $json.body || {};",
+    "if (!body.message) { throw new Error('message is required'); }",
+    "const sessionId = body.sessionId || $execution.id;",
+    "const text = String(body.message).trim().slice(0, 2000);",
+    "const intent = /reserv|book/i.test(text) ? 'booking' : /feedback|opini/i.test(text) ? 'feedback' : 'normal';",
+    "const out = items.map(item => ({ json: { ...item.json, sessionId, intent } }));",
+    "const html = `<p>${$json.name || 'Cliente'}</p><p>${$json.summary || ''}</p>`;",
+    "const parsed = JSON.parse($json.data || '{}');",
+    "for (const [key, value] of Object.entries(parsed)) { if (value === null) delete parsed[key]; }",
+    "const now = new Date().toISOString();",
+    "return out;",
+]
+
+
+def _text(rng: random.Random, length: int) -> str:
+    """Prompt-like prose of about ``length`` characters."""
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    sentences = [' '.join(words[i:i + 14]).capitalize() + '.' for i in range(0, len(words), 14)]
+    return ' '.join(sentences)
+
+
+def _code(rng: random.Random, length: int) -> str:
+    """JavaScript-like Code node source of about ``length`` characters."""
+    lines = ['// Generated benchmark code']
+    size = 0
+    while size < length:
+        line = rng.choice(CODE_LINES)
+        if rng.random() < 0.2:
+            line = f"// {_text(rng, rng.randint(30, 120))}"
+        lines.append(line)
+        size += len(line) + 1
+    lines.append('return $input.all();')
+    return '\n'.join(lines)
+
+
+def _payload_size(rng: random.Random) -> int:
+    """Length of an embedded Code source / prompt: mostly small, some huge."""
+    roll = rng.random()
+    if roll < 0.6:
+        return rng.randint(200, 1500)
+    if roll < 0.9:
+        return rng.randint(1500, 6000)
+    if roll < 0.98:
+        return rng.randint(6000, 20000)
+    return rng.randint(20000, 60000)
+
+
+def _uuid(rng: random.Random) -> str:
+    h = '%032x' % rng.getrandbits(128)
+    return f"{h[:8]}-{h[8:12]}-4{h[13:16]}-a{h[17:20]}-{h[20:32]}"
+
+
+def _workflow_id(rng: random.Random) -> str:
+    alphabet = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    return ''.join(rng.choice(alphabet) for _ in range(16))
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f"{moment.microsecond // 1000:03d}Z"
+
+
+class _Builder:
+    """Accumulates nodes and connections for one workflow."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.nodes: List[dict] = []
+        self.connections: Dict[str, dict] = {}
+
+    def add(self, name: str, node_type: str, version: float, parameters: dict, column: int, row: int,
+            **extra) -> str:
+        node = {
+            'parameters': parameters,
+            'id': _uuid(self.rng),
+            'name': name,
+            'type': node_type,
+            'typeVersion': version,
+            'position': [column * 220, row * 180],
+        }
+        node.update(extra)
+        self.nodes.append(node)
+        return name
+
+    def connect(self, source: str, target: str, output: int = 0, kind: str = 'main') -> None:
+        outputs = self.connections.setdefault(source, {}).setdefault(kind, [])
+        while len(outputs) <= output:
+            outputs.append([])
+        outputs[output].append({'node': target, 'type': kind, 'index': 0})
+
+    def code(self, name: str, column: int, row: int) -> str:
+        return self.add(name, 'n8n-nodes-base.code', 2, {'jsCode': _code(self.rng, _payload_size(self.rng))},
+                        column, row)
+
+    def action(self, kind: str, name: str, column: int, row: int) -> str:
+        rng = self.rng
+        if kind == 'email':
+            return self.add(name, 'n8n-nodes-base.emailSend', 2.1, {
+                'toEmail': '={{ $json.email }}', 'subject': _text(rng, 50), 'emailType': 'html',
+                'html': f"<html><body>{_text(rng, _payload_size(rng))}</body></html>",
+                'fromEmail': 'noreply@descomplicador.pt', 'options': {}
+            }, column, row, credentials={'smtp': {'id': _workflow_id(rng), 'name': 'SMTP Descomplicador'}},
+                webhookId=_uuid(rng))
+        if kind == 'postgres':
+            return self.add(name, 'n8n-nodes-base.postgres', 2.5, {
+                'schema': {'__rl': True, 'mode': 'list', 'value': 'public'},
+                'table': {'__rl': True, 'mode': 'list', 'value': rng.choice(['messages', 'leads', 'bookings'])},
+                'columns': {'mappingMode': 'autoMapInputData', 'value': {}}, 'options': {}
+            }, column, row, credentials={'postgres': {'id': _workflow_id(rng), 'name': 'Postgres n8n'}},
+                continueOnFail=True)
+        if kind == 'gmail':
+            return self.add(name, 'n8n-nodes-base.gmail', 2.1, {
+                'sendTo': '={{ $json.email }}', 'subject': _text(rng, 40), 'message': _text(rng, 400),
+                'options': {}
+            }, column, row, credentials={'gmailOAuth2': {'id': _workflow_id(rng), 'name': 'Gmail'}},
+                webhookId=_uuid(rng))
+        return self.add(name, 'n8n-nodes-base.httpRequest', 4.2, {
+            'method': 'POST', 'url': f"https://api.example.pt/v1/{rng.choice(['crm', 'calendar', 'tickets'])}",
+            'sendBody': True, 'specifyBody': 'json', 'jsonBody': '={{ JSON.stringify($json) }}', 'options': {}
+        }, column, row, retryOnFail=True, maxTries=3, waitBetweenTries=1000)
+
+
+def generate_workflow(rng: random.Random, index: int) -> dict:
+    """One chatflow-shaped workflow (deterministic for a given rng state)."""
+    bot = BOTS[index % len(BOTS)]
+    client = CLIENTS[(index // len(BOTS)) % len(CLIENTS)]
+    name = f"{bot} - {client} {index:04d}"
+    b = _Builder(rng)
+
+    webhook = b.add('Webhook', 'n8n-nodes-base.webhook', 2, {
+        'httpMethod': 'POST', 'path': f"{bot.lower().replace(' ', '-')}-{index:04d}",
+        'responseMode': 'responseNode', 'options': {}
+    }, 0, 1, webhookId=_uuid(rng))
+    validate = b.code('Validate Input', 1, 1)
+    b.connect(webhook, validate)
+
+    if rng.random() < 0.5:
+        core = b.add('Flowise API', 'n8n-nodes-base.httpRequest', 4.2, {
+            'method': 'POST', 'url': f"https://flowise.descomplicador.pt/api/v1/prediction/{_uuid(rng)}",
+            'sendBody': True, 'specifyBody': 'json',
+            'jsonBody': '={{ JSON.stringify({ question: $json.text, sessionId: $json.sessionId }) }}',
+            'options': {'timeout': 60000}
+        }, 2, 1, retryOnFail=True, maxTries=2, continueOnFail=True)
+    else:
+        core = b.add('AI Agent', '@n8n/n8n-nodes-langchain.agent', 1.7, {
+            'promptType': 'define', 'text': '={{ $json.text }}',
+            'options': {'systemMessage': _text(rng, _payload_size(rng))}
+        }, 2, 1)
+        model = b.add('OpenAI Chat Model', '@n8n/n8n-nodes-langchain.lmChatOpenAi', 1, {
+            'model': rng.choice(['gpt-4o-mini', 'gpt-4o']), 'options': {'temperature': 0.3}
+        }, 2, 2, credentials={'openAiApi': {'id': _workflow_id(rng), 'name': 'OpenAI'}})
+        memory = b.add('Window Buffer Memory', '@n8n/n8n-nodes-langchain.memoryBufferWindow', 1.3, {
+            'sessionKey': '={{ $json.sessionId }}', 'contextWindowLength': rng.choice([5, 10, 20])
+        }, 3, 2)
+        b.connect(model, core, kind='ai_languageModel')
+        b.connect(memory, core, kind='ai_memory')
+    b.connect(validate, core)
+
+    process = b.code('Process Response', 3, 1)
+    b.connect(core, process)
+
+    # Optional pre-processing chain: the long tail of node counts
+    previous = process
+    column = 4
+    for step in range(rng.choice([0, 0, 0, 1, 2, 4, 8])):
+        previous_step = previous
+        previous = b.code(f"Transform {step + 1}", column, 1)
+        b.connect(previous_step, previous)
+        column += 1
+
+    fan_out = rng.randint(1, 4)
+    if fan_out > 1:
+        route = b.add('Route Response', 'n8n-nodes-base.switch', 3.2, {
+            'rules': {'values': [{'outputKey': BRANCHES[i].lower(), 'conditions': {
+                'conditions': [{'leftValue': '={{ $json.intent }}', 'rightValue': BRANCHES[i].lower(),
+                                'operator': {'type': 'string', 'operation': 'equals'}}]}}
+                for i in range(fan_out)]},
+            'options': {}
+        }, column, 1)
+        b.connect(previous, route)
+        column += 1
+    else:
+        route = previous
+
+    for branch in range(fan_out):
+        label = BRANCHES[branch]
+        tail = route
+        for a in range(rng.randint(0, 2)):
+            action = b.action(rng.choice(ACTIONS), f"{label} Action {a + 1}", column + a, branch)
+            b.connect(tail, action, output=branch if tail == route and fan_out > 1 else 0)
+            tail = action
+        fmt = b.code(f"Format {label} Response", column + 2, branch)
+        b.connect(tail, fmt, output=branch if tail == route and fan_out > 1 else 0)
+        respond = b.add(f"Respond {label}", 'n8n-nodes-base.respondToWebhook', 1.1, {'options': {}},
+                        column + 3, branch)
+        b.connect(fmt, respond)
+
+    if rng.random() < 0.6:
+        log = b.action('postgres', 'Log Incoming', 2, 3)
+        b.connect(validate, log)
+
+    created = EPOCH + timedelta(minutes=rng.randint(0, 60 * 24 * 180))
+    return {
+        'id': _workflow_id(rng),
+        'name': name,
+        'nodes': b.nodes,
+        'connections': b.connections,
+        'settings': {'executionOrder': 'v1', 'callerPolicy': 'workflowsFromSameOwner'},
+        'active': rng.random() < 0.6,
+        'tags': [{'name': tag} for tag in sorted(rng.sample(TAGS, rng.randint(0, 2)))],
+        'createdAt': _timestamp(created),
+        'updatedAt': _timestamp(created + timedelta(minutes=rng.randint(0, 60 * 24 * 30))),
+    }
+
+
+def edit_workflow(workflow: dict, rng: random.Random, who: str) -> dict:
+    """A copy with a small, realistic edit (Code source, prompt or node position)."""
+    edited = copy.deepcopy(workflow)
+    node = rng.choice(edited['nodes'])
+    parameters = node['parameters']
+    if 'jsCode' in parameters:
+        parameters['jsCode'] += f"\n// {who} edit {rng.randint(1, 10 ** 6)}"
+    elif 'systemMessage' in parameters.get('options', {}):
+        parameters['options']['systemMessage'] += f" ({who} edit {rng.randint(1, 10 ** 6)})"
+    else:
+        x, y = node['position']
+        node['position'] = [x + 20 * rng.randint(1, 5), y]
+    return edited
+
+
+class SyntheticCorpus:
+    """Synced base, per-side edits, and writers for the local tree and the VM corpus."""
+
+    def __init__(self, workflows: List[dict], edits: Dict[str, Dict[str, dict]], seed: int):
+        self.workflows = workflows  # as last synced (base)
+        self.edits = edits          # kind → {workflow id: edited workflow}
+        self.seed = seed
+        self.paths = {w['id']: self.file_path(i, w) for i, w in enumerate(workflows)}
+
+    def drifted(self, kind: Optional[str] = None) -> List[str]:
+        """IDs of the drifted workflows (of one kind, or all)."""
+        kinds = [kind] if kind else DRIFT_KINDS
+        return sorted(wf_id for k in kinds for wf_id in self.edits.get(k, {}))
+
+    @staticmethod
+    def file_path(index: int, workflow: dict) -> str:
+        """Project-relative file of a workflow, spread over the WORKFLOW_DIRS."""
+        bot = workflow['name'].split(' - ', 1)[0]
+        safe = ''.join(c if c.isalnum() or c in " -_'&" else '_' for c in workflow['name'])
+        return f"{WORKFLOW_DIRS[index % len(WORKFLOW_DIRS)]}/Chatbots/{bot}/{safe}.json"
+
+    def vm_workflows(self) -> List[dict]:
+        """The VM side (full objects, as the API returns them)."""
+        vm_edits = self.edits.get('vm', {})
+        return [vm_edits.get(w['id'], w) for w in self.workflows]
+
+    def write_tree(self, root: Path, git: bool = False, sync_state: bool = True) -> None:
+        """Write the local side under ``root``.
+
+        Files hold the git version (base, or the committed edit), plus the
+        workflow map and, with ``sync_state``, the synced base of every
+        workflow. With ``git`` they are committed (a repo is initialised if
+        needed) before the uncommitted 'local' edits are written.
+        """
+        root = Path(root)
+        workflow_map = {'version': MAP_VERSION, 'workflows': {}}
+        committed = self.edits.get('git', {})
+        for workflow in self.workflows:
+            rel = self.paths[workflow['id']]
+            self._write_workflow(root / rel, committed.get(workflow['id'], workflow))
+            workflow_map['workflows'][workflow['id']] = {'name': workflow['name'], 'file': rel,
+                                                         'updatedAt': workflow['updatedAt']}
+        save_workflow_map_file(root / '.n8n-workflow-map.json', workflow_map)
+        if sync_state:
+            self._write_sync_state(root)
+
+        if git:
+            if not (root / '.git').exists():
+                _git(root, 'init', '-q')
+                _git(root, 'config', 'user.email', 'corpus@localhost')
+                _git(root, 'config', 'user.name', 'corpus')
+                _git(root, 'config', 'commit.gpgsign', 'false')
+            _git(root, 'add', '-A')
+            _git(root, 'commit', '-q', '-m', f"Synthetic corpus (seed {self.seed})")
+
+        self.write_local_edits(root)
+
+    def write_local_edits(self, root: Path) -> None:
+        """(Re)apply the uncommitted 'local' edits, e.g. after a `git reset --hard`."""
+        for wf_id, workflow in self.edits.get('local', {}).items():
+            self._write_workflow(Path(root) / self.paths[wf_id], workflow)
+
+    def _write_workflow(self, path: Path, workflow: dict) -> None:
+        # Local files look like exports: essential fields plus id/updatedAt
+        data = dict(essential_fields(workflow), id=workflow['id'], updatedAt=workflow['updatedAt'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+    def _write_sync_state(self, root: Path) -> None:
+        state = {'workflows': {}}
+        base_dir = root / '.n8n-sync-base'
+        base_dir.mkdir(exist_ok=True)
+        for workflow in self.workflows:
+            digest = workflow_hash(workflow)
+            state['workflows'][workflow['id']] = {'name': workflow['name'], 'hash': digest,
+                                                  'synced_at': workflow['updatedAt'][:19] + 'Z'}
+            with open(base_dir / f"{workflow['id']}.json", 'w', encoding='utf-8') as f:
+                json.dump({'hash': digest, 'workflow': essential_fields(workflow)}, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+        with open(root / '.n8n-sync-state.json', 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write('\n')
+
+
+# Median milliseconds per node type (per workflow node: × 0.5-2), and the spread around it
+NODE_MEDIAN_MS = {
+    'n8n-nodes-base.webhook': 1, 'n8n-nodes-base.code': 15, 'n8n-nodes-base.switch': 2,
+    'n8n-nodes-base.respondToWebhook': 3, 'n8n-nodes-base.httpRequest': 600,
+    'n8n-nodes-base.postgres': 40, 'n8n-nodes-base.emailSend': 700, 'n8n-nodes-base.gmail': 900,
+    '@n8n/n8n-nodes-langchain.agent': 2500,
+}
+DEFAULT_MEDIAN_MS = 100
+DURATION_SIGMA = 0.5
+
+
+def _execution_path(graph, rng: random.Random) -> List[str]:
+    """Nodes one execution runs, in order: every main branch, one Switch output."""
+    starts = [name for name in graph.nodes
+              if not graph.in_edges(name) and any(e.kind == 'main' for e in graph.out_edges(name))]
+    order: List[str] = []
+    stack = list(reversed(starts))
+    while stack:
+        name = stack.pop()
+        if name in order:
+            continue
+        order.append(name)
+        outputs = sorted({e.output for e in graph.out_edges(name)})
+        if graph.nodes[name]['type'] == 'n8n-nodes-base.switch' and outputs:
+            outputs = [rng.choice(outputs)]
+        for output in reversed(outputs):
+            stack.extend(reversed(graph.successors(name, output)))
+    return order
+
+
+def generate_executions(workflows: Sequence[dict], per_workflow: int, seed: int = 0, days: float = 7.0,
+                        end: datetime = EPOCH, error_rate: float = 0.03) -> List[dict]:
+    """``per_workflow`` executions of each workflow over the ``days`` before ``end``, oldest first.
+
+    Full objects (with `data`), IDs '1', '2', ... in start order, as n8n numbers them.
+    """
+    rng = random.Random(seed)
+    drafts = []
+    for workflow in workflows:
+        graph = build_graph(workflow)
+        medians = {name: NODE_MEDIAN_MS.get(node['type'], DEFAULT_MEDIAN_MS) * rng.uniform(0.5, 2.0)
+                   for name, node in graph.nodes.items()}
+        for _ in range(per_workflow):
+            started = end - timedelta(seconds=rng.uniform(0, days * 86400))
+            path = _execution_path(graph, rng)
+            external = [n for n in path if graph.nodes[n]['type'] in
+                        ('n8n-nodes-base.httpRequest', 'n8n-nodes-base.postgres', 'n8n-nodes-base.emailSend',
+                         'n8n-nodes-base.gmail', '@n8n/n8n-nodes-langchain.agent')]
+            failing = rng.choice(external) if external and rng.random() < error_rate else None
+
+            run_data = {}
+            clock = started
+            items = 1
+            for name in path:
+                ms = max(1, round(medians[name] * rng.lognormvariate(0, DURATION_SIGMA)))
+                run = {'startTime': int(clock.timestamp() * 1000), 'executionTime': ms, 'source': []}
+                clock += timedelta(milliseconds=ms)
+                if name == failing:
+                    run.update(executionStatus='error', error={
+                        'message': rng.choice(['The service was not able to process your request',
+                                               'timeout of 60000ms exceeded', 'Connection refused']),
+                        'name': 'NodeApiError'})
+                    run_data[name] = [run]
+                    break
+                items = max(1, items + rng.choice([0, 0, 0, 1, -1]))
+                run.update(executionStatus='success', data={'main': [[
+                    {'json': {'message': _text(rng, rng.randint(40, 400)), 'index': i}} for i in range(items)]]})
+                run_data[name] = [run]
+            drafts.append({
+                'workflowId': workflow['id'],
+                'mode': 'webhook',
+                'startedAt': started,
+                'stoppedAt': clock,
+                'status': 'error' if failing and failing in run_data else 'success',
+                'data': {'resultData': {'runData': run_data, 'lastNodeExecuted': list(run_data)[-1]}},
+            })
+
+    drafts.sort(key=lambda e: e['startedAt'])
+    executions = []
+    for number, draft in enumerate(drafts, 1):
+        executions.append(dict(draft, id=str(number), finished=draft['status'] == 'success', retryOf=None,
+                               retrySuccessId=None, waitTill=None, startedAt=_timestamp(draft['startedAt']),
+                               stoppedAt=_timestamp(draft['stoppedAt'])))
+    return executions
+
+
+def _git(root: Path, *args: str) -> None:
+    subprocess.run(['git', *args], cwd=root, check=True, capture_output=True)
+
+
+def generate_corpus(count: int, seed: int = 0, drift: float = 0.0,
+                    kinds: Sequence[str] = DRIFT_KINDS) -> SyntheticCorpus:
+    """``count`` workflows; ``drift`` of them changed after the sync, round-robin over ``kinds``."""
+    unknown = set(kinds) - set(DRIFT_KINDS)
+    if unknown:
+        raise ValueError(f"unknown drift kind(s): {', '.join(sorted(unknown))}")
+    rng = random.Random(seed)
+    workflows = [generate_workflow(rng, index) for index in range(count)]
+
+    edits: Dict[str, Dict[str, dict]] = {kind: {} for kind in kinds}
+    drifted = rng.sample(range(count), round(count * drift)) if kinds else []
+    for n, index in enumerate(sorted(drifted)):
+        kind = kinds[n % len(kinds)]
+        workflow = workflows[index]
+        edited = edit_workflow(workflow, rng, kind)
+        # Edits are newer than the sync
+        edited['updatedAt'] = _timestamp(EPOCH + timedelta(days=365, minutes=n))
+        edits[kind][workflow['id']] = edited
+    return SyntheticCorpus(workflows, edits, seed)
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_discovery.py — Which local files are workflows
+
+The rules every tool uses to find workflow JSON files in the checkout: the
+`.json` files under the WORKFLOW_DIRS, minus node_modules, .claude and
+evaluator/test files. sync-n8n-status.py (and through it the other sync
+scripts), the search index (n8n_index.py) and the linter share them from
+here, so a file is a workflow for all of them or for none.
+
+Pre-commit checks must look at what is being committed, not at the working
+tree (`git add -p`, or edits after `git add`): staged_contents() reads the
+index version of the staged files, git_blobs() any `HEAD:path` / `:path`
+object, all in one `git cat-file --batch` call.
+
+Usage:
+    from n8n_discovery import WORKFLOW_DIRS, is_workflow_file, find_workflow_files, staged_workflow_files
+    contents = staged_contents(staged_workflow_files())
+"""
+
+import re
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# `git cat-file --batch` header of an object it found: "<sha> <type> <size>"
+_BATCH_HEADER = re.compile(rb'^[0-9a-f]{40,64} (\w+) (\d+)$')
+
+WORKFLOW_DIRS = ["MVP's", "Ferramentas", "Projetos de Clientes", "Módulos reutilizáveis"]
+
+
+def is_workflow_file(json_file: Path) -> bool:
+    """True for .json files the sync scripts treat as workflows (not evaluators/tests)."""
+    # Skip node_modules, .claude, and test/evaluator files
+    return not any(skip in str(json_file) for skip in ['node_modules', '.claude', 'evaluator', 'Evaluator', 'test'])
+
+
+def find_workflow_files(root: Optional[Path] = None) -> List[Path]:
+    """Find all workflow JSON files in configured directories (under ``root``, default: cwd)."""
+    workflows = []
+    base_path = root if root is not None else Path.cwd()
+
+    for dir_name in WORKFLOW_DIRS:
+        dir_path = base_path / dir_name
+        if dir_path.exists():
+            # Find all .json files, excluding evaluators and test files
+            for json_file in dir_path.rglob("*.json"):
+                if is_workflow_file(json_file):
+                    workflows.append(json_file)
+
+    return sorted(workflows)
+
+
+def staged_workflow_files(root: Optional[Path] = None) -> List[Path]:
+    """Workflow files staged for commit (added, copied, modified or renamed).
+
+    Uses `git diff --cached --name-only -z`, so it costs one git call and no
+    directory walk; paths are filtered with the find_workflow_files() rules.
+    """
+    base_path = root if root is not None else Path.cwd()
+    result = subprocess.run(
+        ['git', 'diff', '--cached', '--name-only', '-z', '--diff-filter=ACMR'],
+        capture_output=True, cwd=base_path
+    )
+    if result.returncode != 0:
+        return []
+
+    staged = []
+    for name in result.stdout.decode('utf-8', errors='surrogateescape').split('\0'):
+        if not name.endswith('.json') or name.split('/', 1)[0] not in WORKFLOW_DIRS:
+            continue
+        json_file = base_path / name
+        if is_workflow_file(json_file):
+            staged.append(json_file)
+    return sorted(staged)
+
+
+def git_blobs(specs: List[str], root: Optional[Path] = None) -> Dict[str, bytes]:
+    """{spec: content} of git objects such as 'HEAD:path' or ':path' (the index).
+
+    One `git cat-file --batch` call for all of them; specs git can't
+    resolve (a file new since HEAD, say) are left out.
+    """
+    if not specs:
+        return {}
+    base_path = root if root is not None else Path.cwd()
+    result = subprocess.run(
+        ['git', 'cat-file', '--batch'],
+        input=''.join(f"{spec}\n" for spec in specs).encode('utf-8', errors='surrogateescape'),
+        capture_output=True, cwd=base_path
+    )
+    if result.returncode != 0:
+        return {}
+
+    blobs = {}
+    out, pos = result.stdout, 0
+    for spec in specs:
+        end = out.index(b'\n', pos)
+        header = _BATCH_HEADER.match(out[pos:end])
+        pos = end + 1
+        if header is None:
+            continue  # "<spec> missing" / "ambiguous"
+        size = int(header.group(2))
+        if header.group(1) == b'blob':
+            blobs[spec] = out[pos:pos + size]
+        pos += size + 1
+    return blobs
+
+
+def staged_contents(files: List[Path], root: Optional[Path] = None) -> Dict[Path, bytes]:
+    """{file: content as staged in the index} for ``files`` under ``root`` (the repository top level)."""
+    base_path = (root if root is not None else Path.cwd()).resolve()
+    specs = {file_path: ':' + Path(file_path).resolve().relative_to(base_path).as_posix() for file_path in files}
+    blobs = git_blobs(list(specs.values()), base_path)
+    return {file_path: blobs[spec] for file_path, spec in specs.items() if spec in blobs}
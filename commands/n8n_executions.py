@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_executions.py — Page through n8n's execution history
+
+`GET /executions` lists executions newest first, `limit` (max 250) at a
+time, with an opaque `nextCursor` for the next page; `includeData=true`
+adds each execution's full `data` (per-node runData with timings and
+output items), which is what makes pages heavy. iter_executions() follows
+the cursor and stops early at the end of a time window, so a profile of the
+last 24 hours reads only the last 24 hours, whatever the history holds.
+
+Each execution comes with the cursor of the page it was on: a consumer that
+saves it can resume a long walk there (executions before it on that page
+are seen again; see prune-n8n.py).
+
+Timestamps are n8n's ISO strings ('2025-01-01T12:00:00.000Z');
+parse_timestamp() makes them timezone-aware datetimes, parse_duration()
+reads windows like '90m', '24h', '7d', '2w'.
+
+Usage:
+    from n8n_executions import iter_executions, parse_duration
+    since = datetime.now(timezone.utc) - parse_duration('24h')
+    for execution, cursor in iter_executions(api_url, api_key, workflow_id=wf_id,
+                                             include_data=True, newer_than=since):
+        ...
+"""
+
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from n8n_client import api_request
+
+# Executions per page (the API allows 250; with data a page of 250 can be tens of MB)
+PAGE_SIZE = 100
+DATA_PAGE_SIZE = 25
+
+# Executions that are over; 'running' / 'waiting' / 'new' ones are skipped by consumers
+FINISHED_STATUSES = ('success', 'error', 'canceled', 'crashed')
+
+DURATION_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+
+
+class ExecutionApiError(Exception):
+    """The executions endpoint answered with an error (or not at all)."""
+
+
+def parse_duration(text: str) -> timedelta:
+    """'90m', '24h', '7d', '2w' (or a combination: '1d12h') as a timedelta."""
+    parts = re.findall(r'(\d+(?:\.\d+)?)\s*([smhdw])', text.strip().lower())
+    if not parts or re.sub(r'[\d.\ssmhdw]', '', text.strip().lower()):
+        raise ValueError(f"invalid duration {text!r} (e.g. 90m, 24h, 7d, 2w)")
+    return sum((timedelta(**{DURATION_UNITS[unit]: float(value)}) for value, unit in parts), timedelta())
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """An n8n timestamp as an aware datetime (None if missing or unreadable)."""
+    if not value:
+        return None
+    try:
+        moment = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def execution_ms(execution: dict) -> Optional[float]:
+    """Wall time of an execution (stoppedAt - startedAt) in milliseconds."""
+    started = parse_timestamp(execution.get('startedAt'))
+    stopped = parse_timestamp(execution.get('stoppedAt'))
+    if not started or not stopped:
+        return None
+    return (stopped - started).total_seconds() * 1000
+
+
+def iter_executions(api_url: str, api_key: Optional[str], workflow_id: Optional[str] = None,
+                    status: Optional[str] = None, include_data: bool = False,
+                    page_size: Optional[int] = None, cursor: Optional[str] = None,
+                    newer_than: Optional[datetime] = None) -> Iterator[Tuple[dict, Optional[str]]]:
+    """(execution, cursor of its page) newest first, until the history or the window ends.
+
+    ``newer_than`` stops at the first execution started before it; ``cursor``
+    starts from a saved page. Raises ExecutionApiError if a page can't be read.
+    """
+    headers = {"X-N8N-API-KEY": api_key or '', "Accept": "application/json"}
+    limit = page_size or (DATA_PAGE_SIZE if include_data else PAGE_SIZE)
+    params = [f"limit={limit}"]
+    if workflow_id:
+        params.append(f"workflowId={quote(workflow_id)}")
+    if status:
+        params.append(f"status={quote(status)}")
+    if include_data:
+        params.append("includeData=true")
+    base = f"{api_url}/executions?{'&'.join(params)}"
+
+    while True:
+        url = base + (f"&cursor={quote(cursor)}" if cursor else "")
+        try:
+            status_code, reason, body = api_request('GET', url, headers, timeout=60 if include_data else 30)
+        except Exception as e:
+            raise ExecutionApiError(f"Connection error: {e}") from e
+        if status_code >= 400:
+            raise ExecutionApiError(f"API Error {status_code}: {reason}")
+        try:
+            page = json.loads(body)
+        except ValueError as e:
+            raise ExecutionApiError(f"Invalid API response: {e}") from e
+
+        for execution in page.get('data') or []:
+            if newer_than is not None:
+                started = parse_timestamp(execution.get('startedAt'))
+                if started is not None and started < newer_than:
+                    return
+            yield execution, cursor
+        cursor = page.get('nextCursor')
+        if not cursor:
+            return
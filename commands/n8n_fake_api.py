@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_fake_api.py — Local stand-in for the n8n public API
+
+The sync scripts can't be load-tested against hub.descomplicador.pt (it
+also serves production webhooks). FakeN8nApi serves the part of the n8n
+public API they use, from an in-memory workflow corpus, with the stdlib
+http.server:
+
+    GET    /api/v1/workflows              ?limit (max 250), cursor, active, tags, name
+    GET    /api/v1/workflows/{id}
+    POST   /api/v1/workflows              create
+    PUT    /api/v1/workflows/{id}         name/nodes/connections/settings(/staticData) only,
+                                          like n8n ("must NOT have additional properties")
+    DELETE /api/v1/workflows/{id}
+    POST   /api/v1/workflows/{id}/activate, /deactivate
+    GET    /api/v1/executions             ?limit, cursor, workflowId, status, includeData
+    GET    /api/v1/executions/{id}        ?includeData
+    DELETE /api/v1/executions/{id}        returns the deleted execution, without data
+
+Listings are sorted by ID and paged with an opaque `nextCursor`, as n8n
+does (executions newest first, the cursor holding the last ID seen, so
+deletions between pages don't shift them). Executions (n8n_corpus.py
+generate_executions()) are served without `data` unless includeData=true.
+
+Knobs for benchmarks: ``latency`` (+ random ``jitter``) seconds per
+request, ``error_rate`` (fraction of requests answered with ``error_status``
+and `Retry-After: 0`, seeded), and ``api_key`` (401 without it). Requests
+are counted per route in ``stats``.
+
+`python commands/bench-n8n-sync.py` runs the sync scripts against it;
+`--serve` keeps one running for manual tests.
+
+Usage:
+    from n8n_fake_api import FakeN8nApi
+    with FakeN8nApi(workflows, latency=0.02) as api:
+        os.environ['N8N_API_URL'] = api.url
+"""
+
+import base64
+import copy
+import json
+import random
+import re
+import string
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = '/api/v1'
+MAX_PAGE_SIZE = 250
+DEFAULT_PAGE_SIZE = 100
+
+# Fields the public API accepts on PUT /workflows/{id}
+WRITABLE_FIELDS = {'name', 'nodes', 'connections', 'settings', 'staticData'}
+REQUIRED_FIELDS = ('name', 'nodes', 'connections', 'settings')
+
+
+def now_iso() -> str:
+    """n8n-style timestamp: '2025-01-01T12:00:00.000Z'."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+
+def encode_execution_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({'lastId': last_id}).encode()).decode()
+
+
+def decode_execution_cursor(cursor: str) -> Optional[int]:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))['lastId'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))['offset'])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class FakeN8nApi:
+    """In-memory n8n public API served on 127.0.0.1 (start()/stop() or a with-block)."""
+
+    def __init__(self, workflows: Iterable[dict] = (), latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 503, api_key: Optional[str] = None,
+                 seed: Optional[int] = None, executions: Iterable[dict] = ()):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.api_key = api_key
+        self.workflows: Dict[str, dict] = {}
+        self.executions: Dict[int, dict] = {}
+        self.stats: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self.load(workflows)
+        self.load_executions(executions)
+
+    # Corpus -----------------------------------------------------------------
+
+    def load(self, workflows: Iterable[dict]) -> None:
+        """Replace the corpus (workflows without an 'id' get one)."""
+        with self._lock:
+            self.workflows = {}
+            for workflow in workflows:
+                workflow = copy.deepcopy(workflow)
+                workflow.setdefault('id', self._new_id())
+                workflow.setdefault('active', False)
+                workflow.setdefault('tags', [])
+                workflow.setdefault('updatedAt', now_iso())
+                workflow.setdefault('createdAt', workflow['updatedAt'])
+                self.workflows[workflow['id']] = workflow
+
+    def load_executions(self, executions: Iterable[dict]) -> None:
+        """Replace the execution history (IDs must be numeric, as in n8n)."""
+        with self._lock:
+            self.executions = {int(e['id']): copy.deepcopy(e) for e in executions}
+
+    def _new_id(self) -> str:
+        alphabet = string.ascii_letters + string.digits
+        while True:
+            workflow_id = ''.join(self._random.choice(alphabet) for _ in range(16))
+            if workflow_id not in self.workflows:
+                return workflow_id
+
+    # Server -----------------------------------------------------------------
+
+    @property
+    def url(self) -> str:
+        """API base URL, as N8N_API_URL expects it."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self, port: int = 0) -> str:
+        """Serve in a background thread (port 0: any free port); returns the API URL."""
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _Handler)
+        self._server.daemon_threads = True
+        self._server.api = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-n8n', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeN8nApi':
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # Stats ------------------------------------------------------------------
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {}
+
+    @property
+    def requests(self) -> int:
+        """Requests served (including injected errors)."""
+        return sum(n for key, n in self.stats.items() if key != 'injected_errors')
+
+    # Request handling -------------------------------------------------------
+
+    def delay_and_fault(self) -> bool:
+        """Apply the latency knobs; True if this request should fail (error_rate)."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        return fail
+
+    def handle(self, method: str, path: str, query: Dict[str, str],
+               body: Optional[dict]) -> Tuple[int, dict]:
+        """(status, JSON body) for one API request."""
+        if not path.startswith(API_PREFIX + '/'):
+            return 404, {'message': 'not found'}
+        path = path[len(API_PREFIX):].rstrip('/')
+
+        if path == '/executions' or path.startswith('/executions/'):
+            return self.handle_executions(method, path, query)
+
+        if path == '/workflows':
+            if method == 'GET':
+                return self.list_workflows(query)
+            if method == 'POST':
+                return self.create_workflow(body)
+            return 405, {'message': 'method not allowed'}
+
+        match = re.fullmatch(r'/workflows/([^/]+)(?:/(activate|deactivate))?', path)
+        if not match:
+            return 404, {'message': 'not found'}
+        workflow_id, action = match.groups()
+        with self._lock:
+            workflow = self.workflows.get(workflow_id)
+        if workflow is None:
+            return 404, {'message': 'Not Found'}
+
+        if action:
+            if method != 'POST':
+                return 405, {'message': 'method not allowed'}
+            with self._lock:
+                workflow['active'] = action == 'activate'
+                workflow['updatedAt'] = now_iso()
+            return 200, workflow
+        if method == 'GET':
+            return 200, workflow
+        if method == 'PUT':
+            return self.update_workflow(workflow, body)
+        if method == 'DELETE':
+            with self._lock:
+                del self.workflows[workflow_id]
+            return 200, workflow
+        return 405, {'message': 'method not allowed'}
+
+    def list_workflows(self, query: Dict[str, str]) -> Tuple[int, dict]:
+        try:
+            limit = min(MAX_PAGE_SIZE, max(1, int(query.get('limit', DEFAULT_PAGE_SIZE))))
+        except ValueError:
+            return 400, {'message': 'request/query/limit must be integer'}
+        offset = 0
+        if query.get('cursor'):
+            offset = decode_cursor(query['cursor'])
+            if offset is None:
+                return 400, {'message': 'An invalid cursor was provided'}
+
+        with self._lock:
+            rows = [self.workflows[k] for k in sorted(self.workflows)]
+        if 'active' in query:
+            active = query['active'] == 'true'
+            rows = [w for w in rows if bool(w.get('active')) == active]
+        if query.get('tags'):
+            wanted = set(query['tags'].split(','))
+            rows = [w for w in rows if wanted & {t.get('name') for t in w.get('tags') or []}]
+        if query.get('name'):
+            rows = [w for w in rows if w.get('name') == query['name']]
+
+        page = rows[offset:offset + limit]
+        next_offset = offset + limit
+        return 200, {'data': page, 'nextCursor': encode_cursor(next_offset) if next_offset < len(rows) else None}
+
+    def handle_executions(self, method: str, path: str, query: Dict[str, str]) -> Tuple[int, dict]:
+        include_data = query.get('includeData') == 'true'
+        if path == '/executions':
+            if method != 'GET':
+                return 405, {'message': 'method not allowed'}
+            return self.list_executions(query, include_data)
+        match = re.fullmatch(r'/executions/(\d+)', path)
+        if not match:
+            return 404, {'message': 'not found'}
+        with self._lock:
+            execution = self.executions.get(int(match.group(1)))
+        if execution is None:
+            return 404, {'message': 'Not Found'}
+        if method == 'GET':
+            return 200, execution if include_data else _without_data(execution)
+        if method == 'DELETE':
+            with self._lock:
+                self.executions.pop(int(match.group(1)), None)
+            return 200, _without_data(execution)
+        return 405, {'message': 'method not allowed'}
+
+    def list_executions(self, query: Dict[str, str], include_data: bool) -> Tuple[int, dict]:
+        try:
+            limit = min(MAX_PAGE_SIZE, max(1, int(query.get('limit', DEFAULT_PAGE_SIZE))))
+        except ValueError:
+            return 400, {'message': 'request/query/limit must be integer'}
+        last_id = None
+        if query.get('cursor'):
+            last_id = decode_execution_cursor(query['cursor'])
+            if last_id is None:
+                return 400, {'message': 'An invalid cursor was provided'}
+
+        with self._lock:
+            ids = sorted(self.executions, reverse=True)
+            rows = []
+            for execution_id in ids:
+                if last_id is not None and execution_id >= last_id:
+                    continue
+                execution = self.executions[execution_id]
+                if query.get('workflowId') and execution.get('workflowId') != query['workflowId']:
+                    continue
+                if query.get('status') and execution.get('status') != query['status']:
+                    continue
+                rows.append(execution if include_data else _without_data(execution))
+                if len(rows) > limit:
+                    break
+        page = rows[:limit]
+        more = len(rows) > limit
+        return 200, {'data': page, 'nextCursor': encode_execution_cursor(int(page[-1]['id'])) if more else None}
+
+    def _validate(self, body: Optional[dict]) -> Optional[str]:
+        if not isinstance(body, dict):
+            return 'request/body must be object'
+        extra = set(body) - WRITABLE_FIELDS
+        if extra:
+            return 'request/body must NOT have additional properties'
+        for field in REQUIRED_FIELDS:
+            if field not in body:
+                return f"request/body must have required property '{field}'"
+        return None
+
+    def create_workflow(self, body: Optional[dict]) -> Tuple[int, dict]:
+        error = self._validate(body)
+        if error:
+            return 400, {'message': error}
+        with self._lock:
+            workflow = dict(copy.deepcopy(body), id=self._new_id(), active=False, tags=[],
+                            createdAt=now_iso())
+            workflow['updatedAt'] = workflow['createdAt']
+            self.workflows[workflow['id']] = workflow
+        return 200, workflow
+
+    def update_workflow(self, workflow: dict, body: Optional[dict]) -> Tuple[int, dict]:
+        error = self._validate(body)
+        if error:
+            return 400, {'message': error}
+        with self._lock:
+            workflow.update(copy.deepcopy(body))
+            workflow['updatedAt'] = now_iso()
+        return 200, workflow
+
+
+def _without_data(execution: dict) -> dict:
+    return {k: v for k, v in execution.items() if k != 'data'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the reverse proxy in front of n8n
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str) -> None:
+        api: FakeN8nApi = self.server.api
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        route = re.sub(r'/(workflows|executions)/[^/]+', r'/\1/{id}', url.path)
+        api.count(f"{method} {route}")
+
+        if api.delay_and_fault():
+            api.count('injected_errors')
+            return self._send(api.error_status, {'message': 'Service Unavailable'}, {'Retry-After': '0'})
+        if api.api_key and self.headers.get('X-N8N-API-KEY') != api.api_key:
+            return self._send(401, {'message': 'unauthorized'})
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            return self._send(400, {'message': 'request/body must be valid JSON'})
+        status, payload = api.handle(method, url.path, query, body)
+        self._send(status, payload)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
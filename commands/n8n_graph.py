@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_graph.py — The node graph of a workflow
+
+A workflow's `connections` map each source node to its outputs, per
+connection type:
+
+    "Switch": {"main": [[{"node": "Reply A", "type": "main", "index": 0}],
+                        [{"node": "Reply B", "type": "main", "index": 0}]]}
+    "Window Buffer Memory": {"ai_memory": [[{"node": "AI Agent", "type": "ai_memory", "index": 0}]]}
+
+`main` connections carry items from node to node. The `ai_*` ones attach a
+LangChain sub-node (model, memory, tool) to the agent or chain that uses it,
+so for them the edge points from the sub-node to its consumer.
+build_graph() turns both into a WorkflowGraph with successor / predecessor
+lookups; the linter (n8n_lint.py) uses it to find loops and attached
+sub-nodes.
+
+Usage:
+    from n8n_graph import build_graph
+    graph = build_graph(workflow)
+    graph.successors('Webhook')
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+
+class Edge(NamedTuple):
+    source: str
+    kind: str          # 'main', 'ai_memory', 'ai_languageModel', ...
+    output: int        # source output index (Switch/IF branch, SplitInBatches loop/done)
+    target: str
+    input: int
+
+
+class WorkflowGraph:
+    """Nodes by name and their connections."""
+
+    def __init__(self, nodes: Dict[str, dict], edges: List[Edge]):
+        self.nodes = nodes
+        self.edges = edges
+        self._out: Dict[str, List[Edge]] = {name: [] for name in nodes}
+        self._in: Dict[str, List[Edge]] = {name: [] for name in nodes}
+        for edge in edges:
+            self._out.setdefault(edge.source, []).append(edge)
+            self._in.setdefault(edge.target, []).append(edge)
+
+    def out_edges(self, name: str, kind: str = 'main') -> List[Edge]:
+        return [e for e in self._out.get(name, []) if e.kind == kind]
+
+    def in_edges(self, name: str, kind: str = 'main') -> List[Edge]:
+        return [e for e in self._in.get(name, []) if e.kind == kind]
+
+    def successors(self, name: str, output: Optional[int] = None) -> List[str]:
+        """Nodes fed by ``name``'s main outputs (only ``output`` if given), in order, once each."""
+        return list(dict.fromkeys(e.target for e in self.out_edges(name)
+                                  if output is None or e.output == output))
+
+    def predecessors(self, name: str) -> List[str]:
+        return list(dict.fromkeys(e.source for e in self.in_edges(name)))
+
+    def attached(self, name: str, kind: str) -> List[str]:
+        """Sub-nodes attached to ``name`` over an ``ai_*`` connection (e.g. 'ai_memory')."""
+        return list(dict.fromkeys(e.source for e in self.in_edges(name, kind)))
+
+    def reachable(self, starts: Iterable[str]) -> Set[str]:
+        """Every node reachable from ``starts`` over main connections (``starts`` included)."""
+        seen: Set[str] = set()
+        stack = list(starts)
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.successors(name))
+        return seen
+
+    def reaching(self, target: str) -> Set[str]:
+        """Every node from which ``target`` is reachable over main connections."""
+        seen: Set[str] = set()
+        stack = [target]
+        while stack:
+            name = stack.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            stack.extend(self.predecessors(name))
+        return seen
+
+    def loops(self) -> List[Set[str]]:
+        """Node sets that feed back into themselves over main connections.
+
+        n8n loops are cycles in the graph (SplitInBatches' loop output wired
+        back to its input, or an IF routing items back): the strongly
+        connected components with more than one node, or a node wired to itself.
+        """
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[Set[str]] = []
+        counter = 0
+
+        for root in self.nodes:
+            if root in index:
+                continue
+            # Iterative Tarjan: (node, iterator over its successors)
+            work = [(root, iter(self.successors(root)))]
+            index[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                name, successors = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = low[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(self.successors(succ))))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        low[name] = min(low[name], index[succ])
+                if advanced:
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[name])
+                if low[name] == index[name]:
+                    component = set()
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.add(member)
+                        if member == name:
+                            break
+                    if len(component) > 1 or name in self.successors(name):
+                        components.append(component)
+        return components
+
+
+def build_graph(workflow: dict) -> WorkflowGraph:
+    """WorkflowGraph of a workflow (connections to unknown nodes are dropped)."""
+    nodes = {}
+    for node in workflow.get('nodes') or []:
+        if isinstance(node, dict) and node.get('name'):
+            nodes[node['name']] = node
+
+    edges = []
+    connections = workflow.get('connections') or {}
+    for source, kinds in connections.items():
+        if source not in nodes or not isinstance(kinds, dict):
+            continue
+        for kind, outputs in kinds.items():
+            for output, targets in enumerate(outputs or []):
+                for target in targets or []:
+                    if isinstance(target, dict) and target.get('node') in nodes:
+                        edges.append(Edge(source, kind, output, target['node'], int(target.get('index') or 0)))
+    return WorkflowGraph(nodes, edges)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_hash.py — Streaming canonical workflow hash
+
+Drift detection compares md5 digests of a workflow's essential fields
+(name, nodes, connections, settings) in canonical JSON form:
+
+    json.dumps(essential, sort_keys=True, separators=(',', ':'))
+
+Building that string for a multi-megabyte workflow (e.g. the 2.8 MB
+`workflows-list.json` export) holds the parsed document, the escaped string
+and its UTF-8 copy at once. workflow_hash() produces the same bytes, and so
+the same digest, but feeds them to md5 piece by piece: it walks the outer
+containers (the essential dict, the nodes list, the connections dict) itself
+and encodes each node / connection entry with the C encoder, so the largest
+string ever built is one node (typically a Code node or an AI prompt), not
+the whole workflow, at the same speed as json.dumps().
+
+`python commands/bench-n8n-hash.py` checks the digests against json.dumps
+and measures the peak-memory difference.
+
+Usage:
+    from n8n_hash import workflow_hash
+    digest = workflow_hash(workflow_json)
+"""
+
+import hashlib
+import json
+from typing import Iterator
+
+# Containers nested deeper than this are encoded in one piece (fast C path);
+# 2 = the essential dict and its nodes/connections; each node is one piece
+STREAM_DEPTH = 2
+
+# Pieces are joined and fed to md5 once this many characters are pending
+FEED_CHARS = 64 * 1024
+
+_encode = json.JSONEncoder(sort_keys=True, separators=(',', ':')).encode
+
+
+def essential_fields(data: dict) -> dict:
+    """The fields the drift hash covers, with the same defaults everywhere."""
+    return {
+        'name': data.get('name', ''),
+        'nodes': data.get('nodes', []),
+        'connections': data.get('connections', {}),
+        'settings': data.get('settings', {})
+    }
+
+
+def canonical_chunks(value, depth: int = STREAM_DEPTH) -> Iterator[str]:
+    """Pieces of ``json.dumps(value, sort_keys=True, separators=(',', ':'))``, in order."""
+    if depth <= 0:
+        yield _encode(value)
+    elif isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            # Non-string keys sort before conversion; leave that to the encoder
+            yield _encode(value)
+            return
+        yield '{'
+        for i, key in enumerate(sorted(value)):
+            yield (',' if i else '') + _encode(key) + ':'
+            yield from canonical_chunks(value[key], depth - 1)
+        yield '}'
+    elif isinstance(value, (list, tuple)):
+        yield '['
+        for i, item in enumerate(value):
+            if i:
+                yield ','
+            yield from canonical_chunks(item, depth - 1)
+        yield ']'
+    else:
+        yield _encode(value)
+
+
+def streaming_md5(value, depth: int = STREAM_DEPTH) -> str:
+    """md5 hex digest of the canonical JSON of ``value``, without building it whole."""
+    digest = hashlib.md5()
+    pending, size = [], 0
+    for chunk in canonical_chunks(value, depth):
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= FEED_CHARS:
+            digest.update(''.join(pending).encode())
+            pending, size = [], 0
+    digest.update(''.join(pending).encode())
+    return digest.hexdigest()
+
+
+def workflow_hash(data: dict) -> str:
+    """Drift hash of a workflow (VM payload or local file): md5 of its canonical essential fields."""
+    return streaming_md5(essential_fields(data))
+
+
+def dumps_hash(data: dict) -> str:
+    """The original one-string implementation, kept as the reference for workflow_hash()."""
+    json_str = json.dumps(essential_fields(data), sort_keys=True, separators=(',', ':'))
+    return hashlib.md5(json_str.encode()).hexdigest()
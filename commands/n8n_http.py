@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_http.py — Keep-alive HTTP connections for the n8n API
+
+urllib opens a new TCP (and TLS) connection for every request. The sync
+scripts make one request per workflow, so the handshakes dominate on a
+remote n8n. This module keeps one connection per host (and per thread, so
+concurrent callers never share a socket) and reuses it across requests —
+and, in `sync-n8n-full.py --daemon`, across sync cycles.
+
+Usage:
+    from n8n_http import http_exchange
+    status, reason, headers, body = http_exchange('GET', url, headers)
+
+Retries, rate limiting and the circuit breaker live one level up, in
+n8n_client.py; the scripts call that.
+"""
+
+import http.client
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+_local = threading.local()
+
+# Errors that mean a reused keep-alive connection was closed by the server
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.CannotSendRequest,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+def _get_connection(scheme: str, netloc: str, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+    """Return (connection, reused) for this thread and host."""
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    key = (scheme, netloc)
+    conn = connections.get(key)
+    if conn is not None:
+        conn.timeout = timeout
+        if conn.sock is not None:
+            # The open socket keeps the timeout it was created with otherwise
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    if scheme == 'https':
+        conn = http.client.HTTPSConnection(netloc, timeout=timeout)
+    else:
+        conn = http.client.HTTPConnection(netloc, timeout=timeout)
+    connections[key] = conn
+    return conn, False
+
+
+def _drop_connection(scheme: str, netloc: str) -> None:
+    conn = getattr(_local, 'connections', {}).pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def http_exchange(method: str, url: str, headers: Dict[str, str], body: Optional[bytes] = None,
+                  timeout: float = 10) -> Tuple[int, str, http.client.HTTPMessage, bytes]:
+    """Send a request over a pooled connection; (status, reason, response headers, body).
+
+    A reused connection the server has since closed is reopened once;
+    any other failure is raised to the caller (and the connection dropped).
+    """
+    parts = urlsplit(url)
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+
+    while True:
+        conn, reused = _get_connection(parts.scheme, parts.netloc, timeout)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            data = response.read()
+        except _STALE_CONNECTION_ERRORS:
+            _drop_connection(parts.scheme, parts.netloc)
+            if reused:
+                continue
+            raise
+        except Exception:
+            _drop_connection(parts.scheme, parts.netloc)
+            raise
+
+        if response.will_close:
+            _drop_connection(parts.scheme, parts.netloc)
+        return response.status, response.reason, response.headers, data
+
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_index.py — Inverted search index over the local workflow files
+
+"Which workflows call Pinecone?", "where is this webhook path used?",
+"which nodes use credential X?" — answered from an index instead of grepping
+escaped JSON. For every workflow file (n8n_discovery.py rules) the indexer
+extracts, per node:
+
+    type         node type            n8n-nodes-base.httpRequest
+    node         node name            Call Flowise
+    webhook      webhook path / id    book-appointment-v3
+    url          URLs in parameters   https://api.pinecone.io/...
+    credential   credential name and credential type
+    subworkflow  Execute Workflow / workflow tool target (ID and cached name)
+
+and keeps an inverted index field → term → {file: [node names]} in
+`.n8n-cache/search-index.json`. Updates are incremental: a file whose mtime
+and size are unchanged is not opened, one whose content hash is unchanged is
+not parsed, and only changed files have their postings replaced.
+
+Queries are whitespace-separated clauses, all of which must match the same
+workflow; a clause is `field:text` or just `text` (any field), matched
+case-insensitively as a substring of the indexed terms. search() takes the
+clauses as a list (search-n8n.py passes one per argument) or as one string,
+split shell-style: quote clauses with spaces, `node:"Call Flowise"`.
+
+Usage:
+    from n8n_index import SearchIndex
+    index = SearchIndex.load()
+    index.update(find_workflow_files(root), root)
+    index.save()
+    hits = index.search('type:pinecone credential:openai')
+"""
+
+import hashlib
+import json
+import os
+import re
+import shlex
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from n8n_workflow_map import relative_path
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+INDEX_FILE = PROJECT_ROOT / ".n8n-cache" / "search-index.json"
+INDEX_VERSION = 1
+
+FIELDS = ('type', 'node', 'webhook', 'url', 'credential', 'subworkflow')
+
+URL_PATTERN = re.compile(r"https?://[^\s\"'`<>{}\\|^]+")
+URL_TRAILING = '.,;:)]'
+
+# Nodes whose `workflowId` parameter names another workflow
+SUBWORKFLOW_TYPES = ('n8n-nodes-base.executeWorkflow', '@n8n/n8n-nodes-langchain.toolWorkflow')
+
+
+def _strings(value) -> Iterator[str]:
+    """Every string inside a parameters structure."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+
+
+def _plain(value) -> Optional[str]:
+    """A parameter value without n8n's '=' expression prefix (None if empty / not text)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if not isinstance(value, str):
+        return None
+    value = value[1:] if value.startswith('=') else value
+    return value.strip() or None
+
+
+def extract_terms(workflow: dict) -> Dict[str, Dict[str, List[str]]]:
+    """field → term → names of the nodes it occurs in."""
+    terms: Dict[str, Dict[str, List[str]]] = {}
+
+    def add(field: str, term, node_name: str) -> None:
+        term = _plain(term)
+        if term is None:
+            return
+        nodes = terms.setdefault(field, {}).setdefault(term, [])
+        if node_name not in nodes:
+            nodes.append(node_name)
+
+    for node in workflow.get('nodes') or []:
+        if not isinstance(node, dict):
+            continue
+        name = str(node.get('name', ''))
+        node_type = str(node.get('type', ''))
+        params = node.get('parameters') if isinstance(node.get('parameters'), dict) else {}
+
+        add('type', node_type, name)
+        add('node', name, name)
+
+        if 'webhook' in node_type.lower() or (node_type.endswith('Trigger') and 'path' in params):
+            add('webhook', params.get('path'), name)
+            add('webhook', node.get('webhookId'), name)
+
+        for text in _strings(params):
+            for url in URL_PATTERN.findall(text):
+                add('url', url.rstrip(URL_TRAILING), name)
+
+        credentials = node.get('credentials') if isinstance(node.get('credentials'), dict) else {}
+        for credential_type, credential in credentials.items():
+            add('credential', credential_type, name)
+            if isinstance(credential, dict):
+                add('credential', credential.get('name') or credential.get('id'), name)
+            else:
+                add('credential', credential, name)
+
+        if node_type in SUBWORKFLOW_TYPES:
+            target = params.get('workflowId')
+            if isinstance(target, dict):
+                # Resource locator: {"__rl": true, "value": "<id>", "cachedResultName": "<name>"}
+                add('subworkflow', target.get('value'), name)
+                add('subworkflow', target.get('cachedResultName'), name)
+            else:
+                add('subworkflow', target, name)
+    return terms
+
+
+def parse_clause(clause: str) -> Tuple[Optional[str], str]:
+    """(field or None, lowercased text) of one 'field:text' or 'text' clause."""
+    field, sep, text = clause.partition(':')
+    if sep and field in FIELDS:
+        return field, text.strip().lower()
+    # 'https://...' and other colons that are not a field prefix
+    return None, clause.strip().lower()
+
+
+def parse_query(query: Union[str, Sequence[str]]) -> List[Tuple[Optional[str], str]]:
+    """[(field or None, lowercased text)] of a query (ValueError if malformed).
+
+    A list is taken as one clause per item, as the shell already split
+    them (`node:"Send Email"` arrives as `node:Send Email`); a string is
+    split into clauses shell-style, with quotes around clauses with spaces.
+    """
+    if isinstance(query, str):
+        try:
+            parts = shlex.split(query)
+        except ValueError as e:
+            raise ValueError(f"cannot split {query!r} into clauses ({e}): "
+                             f"quote clauses with spaces or apostrophes") from None
+    else:
+        parts = list(query)
+    clauses = [parse_clause(part) for part in parts]
+    if not clauses or any(not text for _, text in clauses):
+        raise ValueError(f"empty search clause in {query!r}")
+    return clauses
+
+
+class SearchIndex:
+    """Inverted index of the workflow files, persisted as JSON."""
+
+    def __init__(self, path: Path = INDEX_FILE):
+        self.path = Path(path)
+        # relative path → {'key': [mtime_ns, size], 'hash', 'name', 'id', 'terms'}
+        self.files: Dict[str, dict] = {}
+        # field → term → {relative path: [node names]}
+        self.postings: Dict[str, Dict[str, Dict[str, List[str]]]] = {field: {} for field in FIELDS}
+        self._lowered: Dict[str, List[Tuple[str, str]]] = {}
+
+    @classmethod
+    def load(cls, path: Path = INDEX_FILE) -> 'SearchIndex':
+        """The saved index (empty if missing, unreadable or of another version)."""
+        index = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') == INDEX_VERSION:
+            index.files = data['files']
+            index.postings.update(data['postings'])
+        return index
+
+    def save(self) -> None:
+        """Write the index atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files, 'postings': self.postings},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+
+    # Updating ---------------------------------------------------------------
+
+    def _remove(self, rel: str) -> None:
+        entry = self.files.pop(rel, None)
+        if not entry:
+            return
+        for field, terms in entry['terms'].items():
+            postings = self.postings.get(field, {})
+            for term in terms:
+                files = postings.get(term)
+                if files is not None:
+                    files.pop(rel, None)
+                    if not files:
+                        del postings[term]
+
+    def _add(self, rel: str, entry: dict) -> None:
+        self.files[rel] = entry
+        for field, terms in entry['terms'].items():
+            postings = self.postings.setdefault(field, {})
+            for term, nodes in terms.items():
+                postings.setdefault(term, {})[rel] = nodes
+
+    def update(self, files: List[Path], root: Path) -> Dict[str, int]:
+        """Bring the index in line with ``files``; counts of what was done."""
+        counts = {'indexed': 0, 'unchanged': 0, 'removed': 0, 'skipped': 0}
+        seen: Set[str] = set()
+        for file_path in files:
+            rel = relative_path(file_path, root)
+            seen.add(rel)
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            key = [stat.st_mtime_ns, stat.st_size]
+            entry = self.files.get(rel)
+            if entry and entry['key'] == key:
+                counts['unchanged'] += 1
+                continue
+            try:
+                raw = file_path.read_bytes()
+            except OSError:
+                continue
+            digest = hashlib.md5(raw).hexdigest()
+            if entry and entry['hash'] == digest:
+                entry['key'] = key  # touched, not changed
+                counts['unchanged'] += 1
+                continue
+
+            try:
+                workflow = json.loads(raw)
+            except ValueError:
+                workflow = None
+            if not isinstance(workflow, dict) or not isinstance(workflow.get('nodes'), list):
+                # package.json and friends: remembered, so they are not re-read, but not searchable
+                new_entry = {'key': key, 'hash': digest, 'name': None, 'id': None, 'terms': {}}
+                counts['skipped'] += 1
+            else:
+                new_entry = {'key': key, 'hash': digest, 'name': workflow.get('name', file_path.stem),
+                             'id': workflow.get('id'), 'terms': extract_terms(workflow)}
+                counts['indexed'] += 1
+            self._remove(rel)
+            self._add(rel, new_entry)
+
+        for rel in [rel for rel in self.files if rel not in seen]:
+            self._remove(rel)
+            counts['removed'] += 1
+        if counts['indexed'] or counts['removed'] or counts['skipped']:
+            self._lowered = {}
+        return counts
+
+    # Searching --------------------------------------------------------------
+
+    def _vocabulary(self, field: str) -> List[Tuple[str, str]]:
+        """[(lowercased term, term)] of a field, built once per loaded index."""
+        if field not in self._lowered:
+            self._lowered[field] = [(term.lower(), term) for term in self.postings.get(field, {})]
+        return self._lowered[field]
+
+    def search(self, query: Union[str, Sequence[str]]) -> List[dict]:
+        """Workflows matching every clause of ``query`` (see parse_query), with what matched where.
+
+        Each hit: {'file', 'name', 'id', 'matches': [(field, term, [node names])]}.
+        """
+        hits: Optional[Dict[str, List[tuple]]] = None
+        for field, text in parse_query(query):
+            matched: Dict[str, List[tuple]] = {}
+            for f in (field,) if field else FIELDS:
+                postings = self.postings.get(f, {})
+                for lowered, term in self._vocabulary(f):
+                    if text in lowered:
+                        for rel, nodes in postings[term].items():
+                            matched.setdefault(rel, []).append((f, term, nodes))
+            if hits is None:
+                hits = matched
+            else:
+                hits = {rel: hits[rel] + found for rel, found in matched.items() if rel in hits}
+            if not hits:
+                return []
+
+        results = []
+        for rel, matches in (hits or {}).items():
+            entry = self.files[rel]
+            results.append({'file': rel, 'name': entry['name'], 'id': entry['id'], 'matches': matches})
+        results.sort(key=lambda r: (str(r['name']).lower(), r['file']))
+        return results
+
+    def stats(self) -> dict:
+        return {
+            'files': len(self.files),
+            'workflows': sum(1 for entry in self.files.values() if entry['name'] is not None),
+            'terms': {field: len(self.postings.get(field, {})) for field in FIELDS},
+        }
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_instances.py — Instance profiles for syncing several n8n servers
+
+By default the sync scripts talk to one n8n (N8N_API_URL / N8N_API_KEY) and
+keep one `.n8n-workflow-map.json`. To work with staging, production and
+client instances from the same checkout, define profiles in
+`.n8n-instances.json` at the project root:
+
+    {
+      "production": {
+        "url": "https://hub.descomplicador.pt/api/v1",
+        "key_env": "N8N_API_KEY",
+        "map_file": ".n8n-workflow-map.json"
+      },
+      "staging": {
+        "url": "https://staging.descomplicador.pt/api/v1",
+        "key_env": "N8N_STAGING_API_KEY",
+        "map_file": ".n8n-workflow-map.staging.json"
+      }
+    }
+
+Each profile has its own URL, the name of the environment variable (or .env
+entry) holding its API key, and its own workflow map, since workflow IDs
+differ per instance. Keys never go in this file.
+
+The scripts select profiles with `--instance NAME[,NAME...]` (or
+`--instance all`). Work for one instance runs inside use_instance(), which
+the scripts' API and map helpers consult (per thread, so instances can be
+checked concurrently with run_per_instance()).
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+INSTANCES_FILE = PROJECT_ROOT / ".n8n-instances.json"
+DEFAULT_MAP_FILE = ".n8n-workflow-map.json"
+
+_local = threading.local()
+
+
+class InstanceError(Exception):
+    """Raised for unknown or misconfigured instance profiles."""
+
+
+def has_instance_profiles() -> bool:
+    return INSTANCES_FILE.exists()
+
+
+def load_instances() -> Dict[str, dict]:
+    """Load and resolve all profiles from .n8n-instances.json.
+
+    Each profile dict has 'name', 'url', 'key_env', 'api_key' and
+    'map_file' (absolute Path). Missing API keys are reported when a
+    profile is selected, not here.
+    """
+    try:
+        with open(INSTANCES_FILE, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        raise InstanceError(f"Cannot read {INSTANCES_FILE.name}: {e}")
+
+    instances = {}
+    for name, profile in raw.items():
+        if 'url' not in profile:
+            raise InstanceError(f"Instance '{name}' has no 'url' in {INSTANCES_FILE.name}")
+        key_env = profile.get('key_env', 'N8N_API_KEY')
+        instances[name] = {
+            'name': name,
+            'url': profile['url'].rstrip('/'),
+            'key_env': key_env,
+            'api_key': os.getenv(key_env),
+            'map_file': PROJECT_ROOT / profile.get('map_file', f".n8n-workflow-map.{name}.json")
+        }
+    return instances
+
+
+def select_instances(spec: str) -> List[dict]:
+    """Resolve an `--instance` value ('all' or comma-separated names) to profiles."""
+    instances = load_instances()
+    if not instances:
+        raise InstanceError(f"--instance needs profiles in {INSTANCES_FILE.name}")
+
+    names = list(instances) if spec == 'all' else [n.strip() for n in spec.split(',') if n.strip()]
+    selected = []
+    for name in names:
+        if name not in instances:
+            raise InstanceError(f"Unknown instance '{name}' (known: {', '.join(instances)})")
+        if not instances[name]['api_key']:
+            raise InstanceError(f"Instance '{name}': {instances[name]['key_env']} not set in environment or .env")
+        selected.append(instances[name])
+    return selected
+
+
+def pop_instance_args(args: List[str]) -> Tuple[List[str], Optional[str]]:
+    """Strip --instance (and its value) from a raw argv list.
+
+    For scripts that parse sys.argv by hand. Returns (remaining_args, spec).
+    """
+    remaining = []
+    spec = None
+    i = 0
+    while i < len(args):
+        flag, _, value = args[i].partition('=')
+        if flag == '--instance':
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            spec = value or None
+        else:
+            remaining.append(args[i])
+        i += 1
+    return remaining, spec
+
+
+@contextmanager
+def use_instance(instance: Optional[dict]):
+    """Make ``instance`` the active profile for API calls in this thread."""
+    previous = getattr(_local, 'instance', None)
+    _local.instance = instance
+    try:
+        yield instance
+    finally:
+        _local.instance = previous
+
+
+def active_instance() -> Optional[dict]:
+    """The profile selected by use_instance() in this thread (None: defaults)."""
+    return getattr(_local, 'instance', None)
+
+
+def api_settings(default_url: str, default_key: Optional[str]) -> Tuple[str, Optional[str]]:
+    """(API URL, API key) for the active profile, or the script's defaults."""
+    instance = active_instance()
+    if instance is None:
+        return default_url, default_key
+    return instance['url'], instance['api_key']
+
+
+def map_file_path(default: Path) -> Path:
+    """Workflow map file for the active profile, or the script's default."""
+    instance = active_instance()
+    return instance['map_file'] if instance else default
+
+
+def instance_label() -> str:
+    """' [name]' for the active profile (for messages), '' without one."""
+    instance = active_instance()
+    return f" [{instance['name']}]" if instance else ""
+
+
+def run_per_instance(instances: List[dict], func: Callable[[dict], object]) -> Dict[str, object]:
+    """Run ``func(instance)`` for every instance concurrently, each inside use_instance().
+
+    Returns {instance name: result}, in the order given. Exceptions propagate.
+    """
+    def run(instance):
+        with use_instance(instance):
+            return func(instance)
+
+    if len(instances) == 1:
+        return {instances[0]['name']: run(instances[0])}
+
+    with ThreadPoolExecutor(max_workers=len(instances)) as pool:
+        futures = [(instance['name'], pool.submit(run, instance)) for instance in instances]
+        return {name: future.result() for name, future in futures}
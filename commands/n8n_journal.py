@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_journal.py — Checkpoint journal for resumable export and deploy runs
+
+An interrupted `sync-n8n-export.py` or `sync-n8n-deploy.py` run (Ctrl-C, VPN
+drop, laptop sleep) used to start over from discovery. Each run now writes a
+journal to `.n8n-cache/journal-<command>[.<instance>].jsonl`:
+
+    {"journal": 1, "command": "sync-n8n-deploy", "started_at": "...", "options": {...}, "plan": [...]}
+    {"key": "MVP's/Hotel Concierge/Hotel Concierge.json", "stage": "pushed"}
+    {"key": "MVP's/Hotel Concierge/Hotel Concierge.json", "stage": "done"}
+
+The first line holds the plan (the workflows discovery selected, each with a
+unique 'key': the workflow ID for export, the local file for deploy); each
+later line records a stage a workflow completed, appended and fsynced as it
+happens, so a crash loses at most the workflow in flight. `--resume` reads
+the plan back instead of re-discovering and skips workflows already `done`
+(a deploy `pushed` but not yet activated is only activated). A run that
+completes every workflow deletes its journal.
+
+Usage:
+    from n8n_journal import Journal
+    journal = Journal('sync-n8n-export')
+    journal.begin(plan, options)          # or: journal.load() for --resume
+    journal.record(key, 'done')
+    journal.finish()
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from n8n_instances import active_instance
+from n8n_snapshots import CACHE_DIR
+
+JOURNAL_VERSION = 1
+DONE = 'done'
+
+
+class Journal:
+    """Plan plus per-workflow completed stages of one export/deploy run."""
+
+    def __init__(self, command: str):
+        instance = active_instance()
+        suffix = f".{instance['name']}" if instance else ""
+        self.path = CACHE_DIR / f"journal-{command}{suffix}.jsonl"
+        self.command = command
+        self.header: dict = {}
+        self.stages: Dict[str, str] = {}
+
+    @property
+    def plan(self) -> List:
+        return self.header.get('plan', [])
+
+    @property
+    def started_at(self) -> Optional[str]:
+        return self.header.get('started_at')
+
+    def begin(self, plan: List, options: Optional[dict] = None) -> None:
+        """Start a new journal (replacing any previous one) with the run's plan."""
+        self.header = {
+            'journal': JOURNAL_VERSION,
+            'command': self.command,
+            'started_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'options': options or {},
+            'plan': plan
+        }
+        self.stages = {}
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(self.header, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> bool:
+        """Read an interrupted run's journal; False if there is none.
+
+        A torn last line (crash mid-write) is ignored.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return False
+
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+        if not header or header.get('journal') != JOURNAL_VERSION:
+            return False
+
+        self.header = header
+        self.stages = {}
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.stages[entry['key']] = entry['stage']
+        return True
+
+    def stage(self, key: str) -> Optional[str]:
+        """Last completed stage of a plan item (None: not started)."""
+        return self.stages.get(key)
+
+    def is_done(self, key: str) -> bool:
+        return self.stages.get(key) == DONE
+
+    def record(self, key: str, stage: str = DONE) -> None:
+        """Append a completed stage (durable before returning)."""
+        self.stages[key] = stage
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({'key': key, 'stage': stage}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remaining(self) -> int:
+        """Plan items not yet done."""
+        return sum(1 for item in self.plan if not self.is_done(item['key']))
+
+    def finish(self) -> None:
+        """Delete the journal (run complete)."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_lint.py — Static performance checks on a workflow's node graph
+
+Rules (id, default level):
+
+    http-per-item-loop      warning  HTTP Request inside a loop, without the
+                                     node's Batching option: one request per
+                                     item per iteration, no throttling
+    split-batch-size-1      warning  SplitInBatches / Loop Over Items with batch
+                                     size 1 (the v3 default): the loop body runs
+                                     once per item
+    agent-unbounded-memory  warning  AI Agent memory that replays the whole chat
+                                     (no window, or a window above
+                                     MAX_MEMORY_WINDOW messages) into every prompt
+    code-per-item           warning  Code node in "Run Once for Each Item" mode
+                                     that ignores the item, or loads other nodes'
+                                     items / calls out per item
+    duplicate-subchain      note     The same chain of nodes (type and
+                                     parameters) repeated in one workflow,
+                                     with at least one heavy node in it
+
+lint_workflow() returns findings as dicts: {'rule', 'level', 'message',
+'node'}. lint_file() wraps it for one file (with the line of each finding's
+node, for SARIF), and is what lint-n8n.py runs in a process pool;
+lint_text() does the same for content not read from disk (a staged blob).
+to_sarif() turns file results into a SARIF 2.1.0 log.
+
+Usage:
+    from n8n_lint import lint_workflow
+    for finding in lint_workflow(workflow):
+        print(finding['level'], finding['node'], finding['message'])
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from n8n_graph import WorkflowGraph, build_graph
+
+LEVELS = ('note', 'warning', 'error')
+
+RULES = {
+    'http-per-item-loop': ('warning', 'HTTP Request inside a per-item loop without batching'),
+    'split-batch-size-1': ('warning', 'SplitInBatches with batch size 1'),
+    'agent-unbounded-memory': ('warning', 'AI Agent with an unbounded memory window'),
+    'code-per-item': ('warning', 'Code node running once per item for work that could run once'),
+    'duplicate-subchain': ('note', 'Duplicate heavy sub-chain'),
+}
+
+HTTP_REQUEST = 'n8n-nodes-base.httpRequest'
+SPLIT_IN_BATCHES = 'n8n-nodes-base.splitInBatches'
+CODE = 'n8n-nodes-base.code'
+AGENT_TYPES = ('@n8n/n8n-nodes-langchain.agent', '@n8n/n8n-nodes-langchain.agentTool')
+
+# Memories with a contextWindowLength parameter (default 5 messages)...
+WINDOWED_MEMORIES = ('memoryBufferWindow', 'memoryPostgresChat', 'memoryRedisChat', 'memoryMongoDbChat')
+# ...which the Postgres / Redis ones only got in typeVersion 1.1 (before: whole session)
+WINDOW_SINCE_VERSION = {'memoryPostgresChat': 1.1, 'memoryRedisChat': 1.1}
+# Above this many messages a window is as good as unbounded for prompt size and latency
+MAX_MEMORY_WINDOW = 30
+
+# Code-node patterns: referencing the current item, and work worth doing only once
+ITEM_REFERENCE = {
+    'javaScript': re.compile(r"\$json\b|\$input\.item\b|\$itemIndex\b|\$binary\b"),
+    'python': re.compile(r"\b_json\b|_input\.item\b|\b_item_index\b|\b_binary\b"),
+}
+ONCE_ONLY_WORK = [
+    (re.compile(r"\.all\(\s*\)"), "reads all items of a node"),
+    (re.compile(r"helpers\.(httpRequest|request)\w*\("), "makes an HTTP request"),
+    (re.compile(r"\bfetch\(|\baxios\b"), "makes an HTTP request"),
+    (re.compile(r"\brequire\(|^\s*import\s", re.MULTILINE), "loads a module"),
+]
+
+# Node types that make a repeated chain worth extracting (calls out, computes or prompts)
+HEAVY_TYPES = {HTTP_REQUEST, CODE, 'n8n-nodes-base.function', 'n8n-nodes-base.postgres',
+               'n8n-nodes-base.executeWorkflow', 'n8n-nodes-base.googleSheets'}
+HEAVY_PREFIXES = ('@n8n/n8n-nodes-langchain.',)
+CHAIN_LENGTH = 3
+
+# Node fields that don't change what a node does
+_IDENTITY_FIELDS = ('name', 'id', 'position', 'webhookId', 'notes', 'notesInFlow', 'disabled')
+
+
+def finding(rule: str, node: str, message: str) -> dict:
+    return {'rule': rule, 'level': RULES[rule][0], 'message': message, 'node': node}
+
+
+def _short_type(node: dict) -> str:
+    return str(node.get('type', '')).rsplit('.', 1)[-1]
+
+
+def _version(node: dict) -> float:
+    try:
+        return float(node.get('typeVersion') or 1)
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _params(node: dict) -> dict:
+    params = node.get('parameters')
+    return params if isinstance(params, dict) else {}
+
+
+def batch_size(node: dict) -> Optional[int]:
+    """SplitInBatches batch size (defaults per version); None for expressions."""
+    value = _params(node).get('batchSize', 1 if _version(node) >= 3 else 10)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def has_http_batching(node: dict) -> bool:
+    options = _params(node).get('options')
+    return isinstance(options, dict) and bool(options.get('batching'))
+
+
+# Rules ----------------------------------------------------------------------
+
+def check_http_in_loops(graph: WorkflowGraph) -> List[dict]:
+    findings = []
+    for loop in graph.loops():
+        splitters = [graph.nodes[n] for n in loop if graph.nodes[n].get('type') == SPLIT_IN_BATCHES]
+        sizes = sorted({batch_size(n) for n in splitters} - {None})
+        via = f" (loop via '{splitters[0]['name']}', batch size {sizes[0]})" if splitters and sizes else ""
+        for name in sorted(loop):
+            node = graph.nodes[name]
+            if node.get('type') == HTTP_REQUEST and not has_http_batching(node):
+                findings.append(finding(
+                    'http-per-item-loop', name,
+                    f"'{name}' sends a request per item on every loop iteration{via}. Send the items in one "
+                    f"call where the API allows it, or set Options → Batching to cap and pace the requests."))
+    return findings
+
+
+def check_split_batch_size(graph: WorkflowGraph) -> List[dict]:
+    findings = []
+    for name, node in graph.nodes.items():
+        if node.get('type') == SPLIT_IN_BATCHES and batch_size(node) == 1:
+            default = " (the default in this version)" if 'batchSize' not in _params(node) else ""
+            findings.append(finding(
+                'split-batch-size-1', name,
+                f"'{name}' has batch size 1{default}: every node in the loop runs once per item. "
+                f"Raise the batch size unless each item really needs its own pass."))
+    return findings
+
+
+def check_agent_memory(graph: WorkflowGraph) -> List[dict]:
+    findings = []
+    for agent_name, agent in graph.nodes.items():
+        if agent.get('type') not in AGENT_TYPES:
+            continue
+        for memory_name in graph.attached(agent_name, 'ai_memory'):
+            memory = graph.nodes[memory_name]
+            kind = _short_type(memory)
+            window = _params(memory).get('contextWindowLength')
+            if kind in WINDOWED_MEMORIES:
+                if window is None:
+                    if _version(memory) >= WINDOW_SINCE_VERSION.get(kind, 0):
+                        continue  # default window of 5
+                    problem = "has no context window in this node version (the whole session is replayed)"
+                else:
+                    try:
+                        if int(window) <= MAX_MEMORY_WINDOW:
+                            continue
+                    except (TypeError, ValueError):
+                        continue  # expression
+                    problem = f"keeps a {window}-message window"
+            elif kind.startswith('memory') and kind != 'memoryManager':
+                problem = f"({kind}) has no message window"
+            else:
+                continue
+            findings.append(finding(
+                'agent-unbounded-memory', memory_name,
+                f"Memory '{memory_name}' of agent '{agent_name}' {problem}: every turn sends the history "
+                f"to the model, so prompt size and latency grow with the conversation. "
+                f"Use a window of at most {MAX_MEMORY_WINDOW} messages."))
+    return findings
+
+
+def check_code_per_item(graph: WorkflowGraph) -> List[dict]:
+    findings = []
+    for name, node in graph.nodes.items():
+        params = _params(node)
+        if node.get('type') != CODE or params.get('mode') != 'runOnceForEachItem':
+            continue
+        language = 'python' if str(params.get('language', '')).startswith('python') else 'javaScript'
+        code = params.get('pythonCode' if language == 'python' else 'jsCode') or ''
+        if not ITEM_REFERENCE[language].search(code):
+            findings.append(finding(
+                'code-per-item', name,
+                f"'{name}' runs once for each item but never reads the item: the same work is repeated "
+                f"per item. Switch it to 'Run Once for All Items'."))
+            continue
+        work = sorted({label for pattern, label in ONCE_ONLY_WORK if pattern.search(code)})
+        if work:
+            findings.append(finding(
+                'code-per-item', name,
+                f"'{name}' runs once for each item and {' and '.join(work)} each time. Do that once in "
+                f"'Run Once for All Items' mode and loop over $input.all() instead."))
+    return findings
+
+
+def _signature(node: dict) -> str:
+    """What a node does: its type, version and parameters (not its name or position)."""
+    essential = {k: v for k, v in node.items() if k not in _IDENTITY_FIELDS and k != 'credentials'}
+    return hashlib.md5(json.dumps(essential, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _is_heavy(node: dict) -> bool:
+    node_type = str(node.get('type', ''))
+    return node_type in HEAVY_TYPES or node_type.startswith(HEAVY_PREFIXES)
+
+
+def check_duplicate_chains(graph: WorkflowGraph) -> List[dict]:
+    signatures = {name: _signature(node) for name, node in graph.nodes.items()}
+
+    # Every path of CHAIN_LENGTH nodes over main connections, grouped by what the nodes do
+    groups: Dict[Tuple[str, ...], List[List[str]]] = {}
+    order = list(graph.nodes)
+
+    def extend(path: List[str]) -> Iterable[List[str]]:
+        if len(path) == CHAIN_LENGTH:
+            yield path
+            return
+        for succ in graph.successors(path[-1]):
+            if succ not in path:
+                yield from extend(path + [succ])
+
+    for start in order:
+        for path in extend([start]):
+            groups.setdefault(tuple(signatures[n] for n in path), []).append(path)
+
+    findings = []
+    covered: Set[str] = set()
+    for key, paths in groups.items():
+        if len(paths) < 2 or not any(_is_heavy(graph.nodes[n]) for n in paths[0]):
+            continue
+        # Non-overlapping copies, not starting inside a chain already reported
+        chosen: List[List[str]] = []
+        used: Set[str] = set()
+        for path in paths:
+            if used.isdisjoint(path) and path[0] not in covered:
+                chosen.append(list(path))
+                used.update(path)
+        if len(chosen) < 2:
+            continue
+
+        # Grow the copies while they keep going the same way
+        while True:
+            nexts = [graph.successors(path[-1]) for path in chosen]
+            if not all(len(n) == 1 for n in nexts):
+                break
+            nexts = [n[0] for n in nexts]
+            if (len({signatures[n] for n in nexts}) != 1 or len(set(nexts)) != len(nexts)
+                    or any(n in used for n in nexts)):
+                break
+            for path, n in zip(chosen, nexts):
+                path.append(n)
+                used.add(n)
+
+        covered.update(used)
+        first = chosen[0]
+        for copy in chosen[1:]:
+            findings.append(finding(
+                'duplicate-subchain', copy[0],
+                f"{len(copy)} nodes from '{copy[0]}' to '{copy[-1]}' repeat '{first[0]}' → … → '{first[-1]}'. "
+                f"Merge the branches before this chain, or move it into a sub-workflow (Execute Workflow)."))
+    return findings
+
+
+CHECKS = {
+    'http-per-item-loop': check_http_in_loops,
+    'split-batch-size-1': check_split_batch_size,
+    'agent-unbounded-memory': check_agent_memory,
+    'code-per-item': check_code_per_item,
+    'duplicate-subchain': check_duplicate_chains,
+}
+
+
+def lint_workflow(workflow: dict, disabled: Iterable[str] = ()) -> List[dict]:
+    """Findings for one workflow, in rule order."""
+    graph = build_graph(workflow)
+    findings = []
+    for rule, check in CHECKS.items():
+        if rule not in disabled:
+            findings.extend(check(graph))
+    return findings
+
+
+def _node_line(text: str, node_name: str) -> int:
+    """1-based line of a node's "name" in the file (1 if not found)."""
+    for encoded in dict.fromkeys((json.dumps(node_name, ensure_ascii=False), json.dumps(node_name))):
+        match = re.search(r'"name"\s*:\s*' + re.escape(encoded), text)
+        if match:
+            return text.count('\n', 0, match.start()) + 1
+    return 1
+
+
+def lint_file(path: str, rel: str, disabled: Tuple[str, ...] = ()) -> dict:
+    """{'file', 'name', 'findings'} (findings with 'line'), or with 'error' if unreadable.
+
+    Top-level so a process pool can run it; returns only plain data.
+    """
+    try:
+        text = Path(path).read_text(encoding='utf-8')
+    except (OSError, ValueError) as e:
+        return {'file': rel, 'name': Path(path).stem, 'findings': [], 'error': str(e)}
+    return lint_text(text, rel, disabled)
+
+
+def lint_text(text: str, rel: str, disabled: Tuple[str, ...] = ()) -> dict:
+    """lint_file() for the content ``text`` of the workflow file ``rel``."""
+    stem = Path(rel).stem
+    try:
+        workflow = json.loads(text)
+    except ValueError as e:
+        return {'file': rel, 'name': stem, 'findings': [], 'error': str(e)}
+    if not isinstance(workflow, dict) or not isinstance(workflow.get('nodes'), list):
+        return {'file': rel, 'name': stem, 'findings': [], 'skipped': True}
+    findings = lint_workflow(workflow, disabled)
+    for f in findings:
+        f['line'] = _node_line(text, f['node'])
+    return {'file': rel, 'name': workflow.get('name', stem), 'findings': findings}
+
+
+def to_sarif(results: List[dict], tool_name: str = 'lint-n8n') -> dict:
+    """SARIF 2.1.0 log of lint_file() results (for GitHub code scanning and friends)."""
+    rule_ids = list(RULES)
+    sarif_results = []
+    for result in results:
+        for f in result['findings']:
+            sarif_results.append({
+                'ruleId': f['rule'],
+                'ruleIndex': rule_ids.index(f['rule']),
+                'level': f['level'],
+                'message': {'text': f['message']},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': result['file'], 'uriBaseId': 'SRCROOT'},
+                        'region': {'startLine': f.get('line', 1)},
+                    },
+                    'logicalLocations': [{'name': f['node'], 'kind': 'object',
+                                          'fullyQualifiedName': f"{result['name']}/{f['node']}"}],
+                }],
+            })
+    return {
+        '$schema': 'https://json.schemastore.org/sarif-2.1.0.json',
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {'driver': {
+                'name': tool_name,
+                'rules': [{'id': rule, 'shortDescription': {'text': description},
+                           'defaultConfiguration': {'level': level}}
+                          for rule, (level, description) in RULES.items()],
+            }},
+            'originalUriBaseIds': {'SRCROOT': {'uri': './'}},
+            'results': sarif_results,
+        }],
+    }
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_merge.py — Node-level three-way merge for n8n workflows
+
+Merges a workflow that changed both locally and on the VM, using the
+last-synced base snapshot (see n8n_sync_state.py):
+
+- Nodes are matched by `id`. A node changed on one side only takes that
+  side's version; a node changed on both sides is merged key by key
+  (`parameters`, `position`, `name`, ...), and only a key changed differently
+  on both sides is a conflict.
+- Nodes added on one side are kept; nodes deleted on one side are dropped,
+  unless the other side modified them (delete/modify conflict).
+- Connections are keyed by node *name* in n8n, so they are translated to
+  edges between node IDs, merged as sets, and rebuilt with the merged names.
+- `name` and each `settings` key are merged the same way.
+
+Only real per-node (or per-setting) conflicts are left for a human.
+
+Usage:
+    from n8n_merge import merge_workflows
+    result = merge_workflows(base, local, remote)
+    if not result['conflicts']:
+        merged = result['merged']
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+# Marks a value as absent on one side (distinct from a JSON null)
+_MISSING = object()
+
+
+def _canonical(value) -> str:
+    """Canonical JSON for equality checks (ignores key order)."""
+    return json.dumps(value, sort_keys=True, separators=(',', ':'))
+
+
+def _same(a, b) -> bool:
+    if a is _MISSING or b is _MISSING:
+        return a is b
+    return _canonical(a) == _canonical(b)
+
+
+def _merge_value(base, local, remote) -> Tuple[bool, object]:
+    """Three-way merge of a single value.
+
+    Returns (ok, value); ok is False on a conflict. ``_MISSING`` may be passed
+    or returned for an absent value.
+    """
+    if _same(local, remote):
+        return True, local
+    if _same(local, base):
+        return True, remote
+    if _same(remote, base):
+        return True, local
+    return False, local
+
+
+def _merge_dict(base: dict, local: dict, remote: dict, label: str,
+                conflicts: List[dict], node: Optional[dict] = None) -> dict:
+    """Key-by-key three-way merge of two dicts, recording conflicts."""
+    merged = {}
+    keys = list(local.keys()) + [k for k in remote.keys() if k not in local]
+    keys += [k for k in base.keys() if k not in local and k not in remote]
+
+    for key in keys:
+        ok, value = _merge_value(base.get(key, _MISSING), local.get(key, _MISSING),
+                                 remote.get(key, _MISSING))
+        if not ok:
+            conflict = {'field': f"{label}.{key}", 'reason': 'changed on both sides'}
+            if node is not None:
+                conflict['node_id'] = node.get('id')
+                conflict['node_name'] = node.get('name')
+            conflicts.append(conflict)
+        if value is not _MISSING:
+            merged[key] = value
+
+    return merged
+
+
+def _merge_nodes(base_nodes: List[dict], local_nodes: List[dict], remote_nodes: List[dict],
+                 conflicts: List[dict], summary: Dict[str, int]) -> List[dict]:
+    """Merge node lists keyed by node id, keeping local order then remote additions."""
+    base_by_id = {n['id']: n for n in base_nodes if 'id' in n}
+    local_by_id = {n['id']: n for n in local_nodes if 'id' in n}
+    remote_by_id = {n['id']: n for n in remote_nodes if 'id' in n}
+
+    order = [n['id'] for n in local_nodes if 'id' in n]
+    order += [n['id'] for n in remote_nodes if 'id' in n and n['id'] not in local_by_id]
+    order += [node_id for node_id in base_by_id if node_id not in local_by_id and node_id not in remote_by_id]
+
+    merged = []
+    for node_id in order:
+        base = base_by_id.get(node_id, _MISSING)
+        local = local_by_id.get(node_id, _MISSING)
+        remote = remote_by_id.get(node_id, _MISSING)
+
+        ok, value = _merge_value(base, local, remote)
+        if ok:
+            if value is not _MISSING:
+                merged.append(value)
+            if not _same(value, local):
+                summary['from_remote'] += 1
+            elif not _same(value, remote):
+                summary['from_local'] += 1
+            continue
+
+        # Both sides touched this node
+        if local is _MISSING or remote is _MISSING:
+            present = remote if local is _MISSING else local
+            conflicts.append({
+                'node_id': node_id,
+                'node_name': present.get('name'),
+                'field': 'node',
+                'reason': 'deleted on one side, modified on the other'
+            })
+            merged.append(present)
+            continue
+
+        before = len(conflicts)
+        merged.append(_merge_dict(base if base is not _MISSING else {}, local, remote,
+                                  'node', conflicts, node=local))
+        if len(conflicts) == before:
+            summary['merged'] += 1
+
+    # Nodes without ids cannot be matched across versions: keep local's as-is
+    merged += [n for n in local_nodes if 'id' not in n]
+    return merged
+
+
+def _connection_edges(workflow: dict) -> List[tuple]:
+    """Flatten n8n connections into (src, type, output, dst, dst_type, dst_index) edges.
+
+    Node names are translated to node ids so renames do not break matching;
+    names without a node fall back to a 'name:' key.
+    """
+    ids = {n.get('name'): n['id'] for n in workflow.get('nodes', []) if 'id' in n}
+
+    def key(name):
+        return ids.get(name, f"name:{name}")
+
+    edges = []
+    for source, by_type in (workflow.get('connections') or {}).items():
+        for conn_type, outputs in (by_type or {}).items():
+            for output_index, targets in enumerate(outputs or []):
+                for target in targets or []:
+                    edges.append((
+                        key(source), conn_type, output_index,
+                        key(target.get('node')), target.get('type', conn_type), target.get('index', 0)
+                    ))
+    return edges
+
+
+def _merge_connections(base: dict, local: dict, remote: dict, merged_nodes: List[dict]) -> dict:
+    """Three-way merge of connections as edge sets, rebuilt with merged node names."""
+    base_edges = set(_connection_edges(base))
+    local_edges = _connection_edges(local)
+    remote_edges = _connection_edges(remote)
+    local_set, remote_set = set(local_edges), set(remote_edges)
+
+    # Keep edges both sides have, plus edges either side added since the base
+    keep = (local_set & remote_set) | (local_set - base_edges) | (remote_set - base_edges)
+
+    names = {n['id']: n.get('name') for n in merged_nodes if 'id' in n}
+    merged_names = {n.get('name') for n in merged_nodes}
+
+    def name(key):
+        if key.startswith('name:'):
+            return key[len('name:'):]
+        return names.get(key)
+
+    # If the result is exactly one side's connections (and its node names
+    # survived the merge), return them verbatim so formatting is untouched
+    for side, side_set in ((local, local_set), (remote, remote_set)):
+        side_names = {n['id']: n.get('name') for n in side.get('nodes', []) if 'id' in n}
+        if (keep == side_set
+                and all(names.get(node_id) == side_name for node_id, side_name in side_names.items()
+                        if node_id in names)
+                and all(name(e[0]) in merged_names and name(e[3]) in merged_names for e in keep)):
+            return side.get('connections') or {}
+
+    connections: Dict[str, Dict[str, List[List[dict]]]] = {}
+    seen = set()
+    for edge in local_edges + remote_edges:
+        if edge not in keep or edge in seen:
+            continue
+        seen.add(edge)
+
+        source, conn_type, output_index, target, target_type, target_index = edge
+        source_name, target_name = name(source), name(target)
+        # Drop edges to or from deleted nodes
+        if source_name not in merged_names or target_name not in merged_names:
+            continue
+
+        outputs = connections.setdefault(source_name, {}).setdefault(conn_type, [])
+        while len(outputs) <= output_index:
+            outputs.append([])
+        outputs[output_index].append({'node': target_name, 'type': target_type, 'index': target_index})
+
+    return connections
+
+
+def merge_workflows(base: dict, local: dict, remote: dict) -> dict:
+    """Three-way merge of workflow essentials (name, nodes, connections, settings).
+
+    Args:
+        base:   Last-synced version (common ancestor)
+        local:  Local file version
+        remote: VM version
+
+    Returns:
+        Dict with:
+            'merged'    — merged workflow (name, nodes, connections, settings)
+            'conflicts' — list of {'field', 'reason'[, 'node_id', 'node_name']}
+            'summary'   — counts of nodes taken from local / remote / merged
+    """
+    conflicts = []
+    summary = {'from_local': 0, 'from_remote': 0, 'merged': 0}
+
+    ok, name = _merge_value(base.get('name', ''), local.get('name', ''), remote.get('name', ''))
+    if not ok:
+        conflicts.append({'field': 'name', 'reason': 'renamed differently on both sides'})
+
+    settings = _merge_dict(base.get('settings') or {}, local.get('settings') or {},
+                           remote.get('settings') or {}, 'settings', conflicts)
+
+    nodes = _merge_nodes(base.get('nodes', []), local.get('nodes', []),
+                         remote.get('nodes', []), conflicts, summary)
+
+    connections = _merge_connections(base, local, remote, nodes)
+
+    return {
+        'merged': {
+            'name': name,
+            'nodes': nodes,
+            'connections': connections,
+            'settings': settings
+        },
+        'conflicts': conflicts,
+        'summary': summary
+    }
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_metrics.py — Run metrics for the sync scripts
+
+Records, for one run of a sync script:
+- phase durations (discover, git, fetch, hash, diff, write, push)
+- n8n API requests (count by method and status), bytes in/out, retries,
+  time spent waiting for the rate limiter and circuit breaker openings
+- per-workflow latency
+
+and writes them as a JSON run report and/or a Prometheus textfile (for the
+node_exporter textfile collector), so sync cost can be graphed over time.
+
+Phases are exclusive within a thread: a phase opened inside another (hash
+inside git, fetch inside discover) pauses the outer one, so one thread's
+phase totals add up to its time spent in phases. Across threads they
+overlap when instances are checked concurrently, so phase totals are summed
+thread time and may exceed the run's wall time. Per-workflow latency is
+keyed by instance and workflow ID ('<instance>/<id>' under an instance
+profile).
+
+One RunMetrics object is shared per process: the script's main() calls
+start_run(), library code calls get_metrics(). When sync-n8n-full.py runs
+status/export/deploy in-process, everything lands in the same report.
+
+Usage (all sync scripts):
+    --metrics PATH         Write JSON run report (PATH may be a directory:
+                           one sync-n8n-<cmd>-<timestamp>.json per run)
+    --metrics-prom PATH    Write Prometheus textfile (overwritten each run)
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from n8n_instances import active_instance
+
+
+class RunMetrics:
+    """Counters and timers for a single sync run."""
+
+    def __init__(self, command: str):
+        self.command = command
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.requests: Dict[str, int] = {}
+        self.statuses: Dict[str, int] = {}
+        self.request_errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.retries = 0
+        self.throttle_seconds = 0.0
+        self.circuit_opens = 0
+        self.workflows: Dict[Tuple[Optional[str], str], float] = {}
+        # Instances can be checked concurrently (see n8n_instances.py)
+        self._lock = threading.Lock()
+        # Per thread: [phase name, time it last started or resumed] of the open phases
+        self._open = threading.local()
+
+    def _add_phase(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block and add it to phase ``name`` (pausing the enclosing phase, if any)."""
+        stack = self._open.__dict__.setdefault('stack', [])
+        start = time.perf_counter()
+        if stack:
+            outer = stack[-1]
+            self._add_phase(outer[0], start - outer[1])
+        stack.append([name, start])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            current = stack.pop()
+            self._add_phase(current[0], now - current[1])
+            if stack:
+                stack[-1][1] = now
+
+    @contextmanager
+    def workflow(self, workflow_id: str):
+        """Time the handling of one workflow (of the active instance)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_workflow(workflow_id, time.perf_counter() - start)
+
+    def record_workflow(self, workflow_id: str, seconds: float, instance: Optional[str] = None) -> None:
+        """Add per-workflow latency (accumulates if a workflow is handled twice).
+
+        ``instance`` defaults to the active instance profile's name.
+        """
+        if instance is None:
+            profile = active_instance()
+            instance = profile['name'] if profile else None
+        key = (instance, workflow_id)
+        with self._lock:
+            self.workflows[key] = self.workflows.get(key, 0.0) + seconds
+
+    def record_request(self, method: str, status: Optional[int], bytes_in: int = 0, bytes_out: int = 0) -> None:
+        """Record one n8n API request. ``status`` is None for connection errors."""
+        key = str(status) if status is not None else 'error'
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if status is None or status >= 400:
+                self.request_errors += 1
+            self.bytes_in += bytes_in
+            self.bytes_out += bytes_out
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_throttle(self, seconds: float) -> None:
+        """Time a request waited for the rate limiter (n8n_client.py)."""
+        with self._lock:
+            self.throttle_seconds += seconds
+
+    def record_circuit_open(self) -> None:
+        with self._lock:
+            self.circuit_opens += 1
+
+    def latency_quantiles(self) -> Dict[str, float]:
+        """p50/p95/max of per-workflow latency (seconds)."""
+        values = sorted(self.workflows.values())
+        if not values:
+            return {}
+
+        def quantile(q: float) -> float:
+            return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+        return {'p50': quantile(0.5), 'p95': quantile(0.95), 'max': values[-1]}
+
+    def to_dict(self) -> dict:
+        """JSON run report."""
+        return {
+            'command': self.command,
+            'started_at': self.started_at.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'duration_seconds': round(time.perf_counter() - self._start, 4),
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'requests': {
+                'total': sum(self.requests.values()),
+                'by_method': dict(self.requests),
+                'by_status': dict(self.statuses),
+                'errors': self.request_errors,
+                'retries': self.retries,
+                'throttle_seconds': round(self.throttle_seconds, 4),
+                'circuit_opens': self.circuit_opens
+            },
+            'bytes': {'in': self.bytes_in, 'out': self.bytes_out},
+            'workflows': {
+                'count': len(self.workflows),
+                'latency_seconds': {k: round(v, 4) for k, v in self.latency_quantiles().items()},
+                'by_id': {(f"{instance}/{wf_id}" if instance else wf_id): round(v, 4)
+                          for (instance, wf_id), v in sorted(self.workflows.items(),
+                                                             key=lambda item: (item[0][0] or '', item[0][1]))}
+            }
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format."""
+        report = self.to_dict()
+        label = f'command="{self.command}"'
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, float]]):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{{{label}{labels}}} {value}")
+
+        metric('n8n_sync_run_duration_seconds', 'gauge', 'Wall time of the last sync run.',
+               [('', report['duration_seconds'])])
+        metric('n8n_sync_last_run_timestamp_seconds', 'gauge', 'Start time of the last sync run.',
+               [('', int(self.started_at.timestamp()))])
+        metric('n8n_sync_phase_seconds', 'gauge', 'Time spent per sync phase in the last run.',
+               [(f',phase="{name}"', seconds) for name, seconds in report['phases'].items()])
+        metric('n8n_sync_requests', 'gauge', 'n8n API requests in the last run.',
+               [(f',method="{m}"', n) for m, n in self.requests.items()])
+        metric('n8n_sync_request_errors', 'gauge', 'Failed n8n API requests in the last run.',
+               [('', self.request_errors)])
+        metric('n8n_sync_retries', 'gauge', 'n8n API retries in the last run.',
+               [('', self.retries)])
+        metric('n8n_sync_throttle_seconds', 'gauge', 'Time spent waiting for the API rate limiter in the last run.',
+               [('', round(self.throttle_seconds, 4))])
+        metric('n8n_sync_circuit_opens', 'gauge', 'n8n API circuit breaker openings in the last run.',
+               [('', self.circuit_opens)])
+        metric('n8n_sync_bytes', 'gauge', 'Bytes transferred to/from the n8n API in the last run.',
+               [(',direction="in"', self.bytes_in), (',direction="out"', self.bytes_out)])
+        metric('n8n_sync_workflow_latency_seconds', 'gauge', 'Per-workflow latency in the last run.',
+               [(f',quantile="{q}"', v) for q, v in report['workflows']['latency_seconds'].items()])
+        metric('n8n_sync_workflows', 'gauge', 'Workflows handled in the last run.',
+               [('', len(self.workflows))])
+
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: Path) -> Path:
+        """Write the JSON report; a directory gets one timestamped file per run."""
+        path = Path(path)
+        if path.is_dir():
+            stamp = self.started_at.strftime('%Y%m%dT%H%M%SZ')
+            path = path / f"{self.command}-{stamp}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+        return path
+
+    def write_prometheus(self, path: Path) -> Path:
+        """Write the Prometheus textfile atomically (collector never sees half a file)."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+        return path
+
+
+_current: Optional[RunMetrics] = None
+
+
+def start_run(command: str, fresh: bool = False) -> RunMetrics:
+    """Start the process-wide run (a run already started by an outer script is kept).
+
+    ``fresh`` replaces it with a new run (one per daemon cycle).
+    """
+    global _current
+    if _current is None or fresh:
+        _current = RunMetrics(command)
+    return _current
+
+
+def get_metrics() -> RunMetrics:
+    """The process-wide run (started on first use when imported as a library)."""
+    return _current or start_run('sync-n8n')
+
+
+def pop_metrics_args(args: List[str]) -> Tuple[List[str], Optional[str], Optional[str]]:
+    """Strip --metrics / --metrics-prom (and their values) from a raw argv list.
+
+    For scripts that parse sys.argv by hand, so the values are not mistaken
+    for workflow IDs. Returns (remaining_args, json_path, prom_path).
+    """
+    remaining = []
+    paths = {'--metrics': None, '--metrics-prom': None}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        flag, _, value = arg.partition('=')
+        if flag in paths:
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            paths[flag] = value or None
+        else:
+            remaining.append(arg)
+        i += 1
+    return remaining, paths['--metrics'], paths['--metrics-prom']
+
+
+def resolve_report_path(path: Optional[str]) -> Optional[Path]:
+    """Absolute report path; a trailing separator means a directory (created if missing)."""
+    if not path:
+        return None
+    resolved = Path(path).resolve()
+    if path.endswith(('/', os.sep)):
+        resolved.mkdir(parents=True, exist_ok=True)
+    return resolved
+
+
+def report_at_exit(metrics: RunMetrics, json_path: Optional[str], prom_path: Optional[str]) -> None:
+    """Write the requested reports when the script exits (any sys.exit path)."""
+    if not json_path and not prom_path:
+        return
+
+    # Resolve now: the scripts chdir to the project root before exiting
+    json_path = resolve_report_path(json_path)
+    prom_path = resolve_report_path(prom_path)
+
+    def write_reports():
+        if json_path:
+            metrics.write_json(json_path)
+        if prom_path:
+            metrics.write_prometheus(prom_path)
+
+    atexit.register(write_reports)
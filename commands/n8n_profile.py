@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_profile.py — Per-node latency profile from execution data
+
+With EXECUTIONS_DATA_SAVE_ON_SUCCESS=all (docker-compose.yml) every saved
+execution holds, per node, a list of runs (one per loop iteration):
+
+    "runData": {"Get Calendar Events": [{"startTime": 1735732800123, "executionTime": 840,
+                                         "executionStatus": "success",
+                                         "data": {"main": [[{"json": {...}}, ...]]}}]}
+
+WorkflowProfile.add() folds executions into per-node samples: time per
+execution (runs summed), offset of the node's first run from the start of
+the execution, runs, output items, and whether it failed. rows() turns them
+into p50/p95/p99, error rate and items per execution, in the order the
+nodes typically start, with each node's share of the summed node time;
+timings() is the node → percentile map analyze-n8n.py --timings reads.
+
+Usage:
+    from n8n_profile import WorkflowProfile
+    profile = WorkflowProfile(workflow_id, name)
+    for execution in executions:
+        profile.add(execution)
+    for row in profile.rows():
+        print(row['node'], row['p50'], row['p95'])
+"""
+
+import math
+from typing import Dict, List, Optional
+
+from n8n_executions import execution_ms, parse_timestamp
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """q-th percentile with linear interpolation (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class NodeSamples:
+    """One node's samples across executions."""
+
+    def __init__(self):
+        self.durations: List[float] = []  # ms per execution (all runs)
+        self.offsets: List[float] = []    # ms from execution start to the first run
+        self.runs = 0
+        self.items = 0
+        self.errors = 0
+
+
+class WorkflowProfile:
+    """Per-node samples of one workflow's executions."""
+
+    def __init__(self, workflow_id: str, name: Optional[str] = None):
+        self.workflow_id = workflow_id
+        self.name = name or workflow_id
+        self.executions = 0
+        self.failed = 0
+        self.durations: List[float] = []  # wall time per execution
+        self.nodes: Dict[str, NodeSamples] = {}
+
+    def add(self, execution: dict) -> None:
+        """Fold one execution (fetched with includeData=true) into the samples."""
+        run_data = ((execution.get('data') or {}).get('resultData') or {}).get('runData') or {}
+        self.executions += 1
+        if execution.get('status') not in (None, 'success'):
+            self.failed += 1
+        wall = execution_ms(execution)
+        if wall is not None:
+            self.durations.append(wall)
+        started = parse_timestamp(execution.get('startedAt'))
+        started_ms = started.timestamp() * 1000 if started else None
+
+        for node, runs in run_data.items():
+            runs = [run for run in runs or [] if isinstance(run, dict)]
+            if not runs:
+                continue
+            samples = self.nodes.setdefault(node, NodeSamples())
+            samples.durations.append(float(sum(run.get('executionTime') or 0 for run in runs)))
+            first = min((run.get('startTime') for run in runs if run.get('startTime')), default=None)
+            if first is not None and started_ms is not None:
+                samples.offsets.append(max(0.0, first - started_ms))
+            samples.runs += len(runs)
+            samples.items += sum(len(output or []) for run in runs
+                                 for output in ((run.get('data') or {}).get('main') or []))
+            if any(run.get('error') or run.get('executionStatus') == 'error' for run in runs):
+                samples.errors += 1
+
+    def summary(self) -> dict:
+        """Executions, error rate and wall-time percentiles of the whole workflow."""
+        result = {'executions': self.executions, 'failed': self.failed,
+                  'error_rate': self.failed / self.executions if self.executions else 0.0}
+        for q in PERCENTILES:
+            result[f"p{q}"] = percentile(self.durations, q)
+        return result
+
+    def rows(self) -> List[dict]:
+        """Per-node statistics, in typical start order."""
+        total = sum(sum(s.durations) for s in self.nodes.values()) or 1.0
+        rows = []
+        for node, samples in self.nodes.items():
+            executions = len(samples.durations)
+            row = {
+                'node': node,
+                'executions': executions,
+                'runs_per_execution': samples.runs / executions,
+                'items_per_execution': samples.items / executions,
+                'error_rate': samples.errors / executions,
+                'offset': percentile(samples.offsets, 50) or 0.0,
+                'share': sum(samples.durations) / total,
+            }
+            for q in PERCENTILES:
+                row[f"p{q}"] = percentile(samples.durations, q)
+            rows.append(row)
+        rows.sort(key=lambda r: (r['offset'], -r['executions']))
+        return rows
+
+    def timings(self) -> Dict[str, dict]:
+        """node → {'p50', 'p95', 'p99'} milliseconds (for analyze-n8n.py --timings)."""
+        return {row['node']: {f"p{q}": round(row[f"p{q}"], 1) for q in PERCENTILES} for row in self.rows()}
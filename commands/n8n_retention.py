@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_retention.py — Execution retention policy and pruning estimates
+
+docker-compose.yml saves every execution with its data
+(EXECUTIONS_DATA_SAVE_ON_SUCCESS/ON_ERROR=all), so the execution tables
+only grow. A retention policy says how long executions are kept, by
+workflow and by status, most specific rule first:
+
+    {
+        "default": "30d",
+        "status": {"error": "90d", "crashed": "90d"},
+        "workflows": {
+            "Vapi - Book Appointment": "60d",
+            "Chatbot Mundo Lar": {"success": "7d", "error": "30d"},
+            "aB3dE5fG7hJ9kL1m": null
+        }
+    }
+
+Workflows are named by ID or exact name; ages are durations ('12h', '30d',
+'2w'); null keeps executions forever. Executions that aren't finished
+('running', 'waiting', 'new') are never due.
+
+SizeEstimate extrapolates space per (workflow, status) group from a few
+executions fetched with their data: the JSON size is close to what n8n
+stores in execution_data.
+
+Usage:
+    from n8n_retention import RetentionPolicy, SizeEstimate
+    policy = RetentionPolicy.from_dict(json.load(f), names)
+    if policy.is_due(execution, now):
+        ...
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from n8n_executions import FINISHED_STATUSES, parse_duration, parse_timestamp
+
+# Policy file at the project root (optional; --older-than alone also works)
+POLICY_FILE = '.n8n-retention.json'
+
+
+def _age(value, where: str) -> Optional[timedelta]:
+    if value is None:
+        return None
+    try:
+        return parse_duration(str(value))
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from e
+
+
+class RetentionPolicy:
+    """Maximum age per (workflow, status); None means keep."""
+
+    def __init__(self, default: Optional[timedelta] = None,
+                 statuses: Optional[Dict[str, Optional[timedelta]]] = None,
+                 workflows: Optional[Dict[str, Dict[str, Optional[timedelta]]]] = None):
+        self.default = default
+        self.statuses = statuses or {}
+        self.workflows = workflows or {}  # workflow ID → {status or '*': age}
+
+    @classmethod
+    def from_dict(cls, data: dict, names: Optional[Dict[str, str]] = None,
+                  default: Optional[timedelta] = None) -> 'RetentionPolicy':
+        """Read a policy file's content; ``names`` (ID → name) resolves workflow names.
+
+        ``default`` overrides the file's default. Raises ValueError on bad
+        ages, unknown statuses, or names matching several workflows.
+        """
+        if not isinstance(data, dict):
+            raise ValueError('policy must be a JSON object')
+        names = names or {}
+        if default is None:
+            default = _age(data.get('default'), 'default')
+
+        statuses = {}
+        for status, value in (data.get('status') or {}).items():
+            if status not in FINISHED_STATUSES:
+                raise ValueError(f"status.{status}: not one of {', '.join(FINISHED_STATUSES)}")
+            statuses[status] = _age(value, f"status.{status}")
+
+        workflows = {}
+        for key, value in (data.get('workflows') or {}).items():
+            matches = [wf_id for wf_id, name in names.items() if name == key]
+            if len(matches) > 1:
+                raise ValueError(f"workflows.{key}: name shared by {len(matches)} workflows, use an ID")
+            wf_id = matches[0] if matches else key
+            if isinstance(value, dict):
+                rules = {}
+                for status, age in value.items():
+                    if status != '*' and status not in FINISHED_STATUSES:
+                        raise ValueError(f"workflows.{key}.{status}: not one of {', '.join(FINISHED_STATUSES)}")
+                    rules[status] = _age(age, f"workflows.{key}.{status}")
+            else:
+                rules = {'*': _age(value, f"workflows.{key}")}
+            workflows[wf_id] = rules
+        return cls(default, statuses, workflows)
+
+    def unknown_workflows(self, names: Dict[str, str]) -> List[str]:
+        """Workflow keys that are neither a known ID nor a known name (likely typos)."""
+        return sorted(wf_id for wf_id in self.workflows if wf_id not in names)
+
+    def max_age(self, workflow_id: str, status: str) -> Optional[timedelta]:
+        """How long an execution is kept (None: forever)."""
+        rules = self.workflows.get(workflow_id)
+        if rules is not None:
+            if status in rules:
+                return rules[status]
+            if '*' in rules:
+                return rules['*']
+        if status in self.statuses:
+            return self.statuses[status]
+        return self.default
+
+    def is_due(self, execution: dict, now: datetime) -> bool:
+        """Whether a finished execution is past its retention at ``now``."""
+        status = execution.get('status')
+        if status not in FINISHED_STATUSES:
+            return False
+        age = self.max_age(str(execution.get('workflowId')), status)
+        started = parse_timestamp(execution.get('startedAt'))
+        return age is not None and started is not None and now - started > age
+
+    def is_empty(self) -> bool:
+        """True when nothing can ever be due."""
+        ages = [self.default, *self.statuses.values()]
+        ages += [age for rules in self.workflows.values() for age in rules.values()]
+        return all(age is None for age in ages)
+
+
+class SizeEstimate:
+    """Executions and sampled data sizes per (workflow ID, status)."""
+
+    def __init__(self, samples_per_group: int = 3):
+        self.samples_per_group = samples_per_group
+        self.counts: Dict[Tuple[str, str], int] = {}
+        self.samples: Dict[Tuple[str, str], List[int]] = {}
+
+    def add(self, group: Tuple[str, str], count: int = 1) -> None:
+        self.counts[group] = self.counts.get(group, 0) + count
+
+    def wants_sample(self, group: Tuple[str, str]) -> bool:
+        return len(self.samples.get(group, ())) < self.samples_per_group
+
+    def add_sample(self, group: Tuple[str, str], size: int) -> None:
+        self.samples.setdefault(group, []).append(size)
+
+    def mean_size(self, group: Tuple[str, str]) -> float:
+        """Mean sampled size of the group (else of all samples; 0 without any)."""
+        sizes = self.samples.get(group) or [s for sizes in self.samples.values() for s in sizes]
+        return sum(sizes) / len(sizes) if sizes else 0.0
+
+    def bytes(self, group: Tuple[str, str]) -> int:
+        return round(self.mean_size(group) * self.counts.get(group, 0))
+
+    def total_bytes(self) -> int:
+        return sum(self.bytes(group) for group in self.counts)
+
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def to_dict(self) -> dict:
+        """JSON-safe form (for the resume state)."""
+        return {'samples_per_group': self.samples_per_group,
+                'groups': [{'workflowId': wf_id, 'status': status, 'count': count,
+                            'samples': self.samples.get((wf_id, status), [])}
+                           for (wf_id, status), count in sorted(self.counts.items())]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SizeEstimate':
+        estimate = cls(data.get('samples_per_group', 3))
+        for group in data.get('groups') or []:
+            key = (group['workflowId'], group['status'])
+            estimate.counts[key] = group.get('count', 0)
+            if group.get('samples'):
+                estimate.samples[key] = list(group['samples'])
+        return estimate
+
+
+def format_bytes(size: float) -> str:
+    """1536 → '1.5 KB'."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_scripts.py — Import the hyphenated sync-n8n-*.py scripts as modules
+
+The sync scripts are named for the command line (sync-n8n-export.py), so
+they can't be imported with `import`. sync-n8n-full.py and
+sync-n8n-listen.py call their run_* functions in-process through this loader;
+each script is executed once and cached in sys.modules under its
+underscored name (sync_n8n_export).
+
+Usage:
+    from n8n_scripts import load_sync_module
+    export = load_sync_module('sync-n8n-export.py')
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent
+
+
+def load_sync_module(script_name: str):
+    """Import a sibling sync-n8n-*.py script as a module (cached in sys.modules)."""
+    module_name = script_name[:-len('.py')].replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / script_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_selection.py — --tag / --active-only / --dir workflow selectors
+
+By default status, export and deploy consider every mapped workflow. The
+selectors narrow a run to what it is about, so client-specific operations
+(e.g. the `Projetos de Clientes` tree, or the Vapi tool workflows tagged
+`vapi`) only cost what they touch:
+
+    --tag NAME        workflows with this n8n tag (repeat or comma-separate
+                      for any of several tags)
+    --active-only     only workflows active on the VM
+    --dir PATH        only local files under this directory (repeatable),
+                      relative to the project root
+
+Tags and active state are pushed into the `GET /workflows` listing query
+(`?tags=a,b&active=true`) and re-checked on the returned rows (older n8n
+versions ignore unknown filters). Directories are matched locally. Both are
+applied before any per-workflow fetch.
+
+list_workflows() is the one paginated `GET /workflows` lister: status
+passes its own page fetcher (offline mode), list_selected_ids() a plain one.
+
+Usage:
+    from n8n_selection import WorkflowSelection, pop_selection_args
+"""
+
+import json
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+from n8n_client import api_request
+
+WORKFLOW_PAGE_SIZE = 250  # n8n's maximum `limit` for GET /workflows
+
+
+class WorkflowSelection:
+    """The selectors given on the command line (empty: select everything)."""
+
+    def __init__(self, tags: Optional[List[str]] = None, active_only: bool = False,
+                 dirs: Optional[List[str]] = None):
+        self.tags = [t.strip() for tag in tags or [] for t in tag.split(',') if t.strip()]
+        self.active_only = active_only
+        self.dirs = [d.replace('\\', '/').strip('/') for d in dirs or [] if d.strip('/\\')]
+
+    def __bool__(self) -> bool:
+        return bool(self.tags or self.active_only or self.dirs)
+
+    @property
+    def needs_listing(self) -> bool:
+        """True if the selectors depend on VM-side state (tags, active)."""
+        return bool(self.tags or self.active_only)
+
+    def query(self) -> str:
+        """Listing query parameters for the VM-side selectors ('' if none)."""
+        params = []
+        if self.active_only:
+            params.append('active=true')
+        if self.tags:
+            params.append('tags=' + quote(','.join(self.tags)))
+        return '&'.join(params)
+
+    def matches_listing(self, workflow: dict) -> bool:
+        """Re-check a `GET /workflows` row against the tag/active selectors."""
+        if self.active_only and not workflow.get('active'):
+            return False
+        if self.tags:
+            names = {t.get('name') if isinstance(t, dict) else t for t in workflow.get('tags') or []}
+            if not names & set(self.tags):
+                return False
+        return True
+
+    def matches_file(self, file_rel: Optional[str]) -> bool:
+        """True if a local file (relative, forward slashes) is under one of the --dir paths."""
+        if not self.dirs:
+            return True
+        if not file_rel:
+            return False
+        return any(file_rel == d or file_rel.startswith(d + '/') for d in self.dirs)
+
+    def describe(self) -> str:
+        """'tag vapi, active only, dir Projetos de Clientes' for messages."""
+        parts = [f"tag {', '.join(self.tags)}"] if self.tags else []
+        if self.active_only:
+            parts.append('active only')
+        parts += [f"dir {d}" for d in self.dirs]
+        return '; '.join(parts)
+
+
+def pop_selection_args(args: List[str]) -> Tuple[List[str], WorkflowSelection]:
+    """Strip --tag/--dir (with values) and --active-only from a raw argv list."""
+    remaining = []
+    tags, dirs = [], []
+    active_only = False
+    i = 0
+    while i < len(args):
+        flag, _, value = args[i].partition('=')
+        if flag in ('--tag', '--dir'):
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            (tags if flag == '--tag' else dirs).append(value)
+        elif flag == '--active-only':
+            active_only = True
+        else:
+            remaining.append(args[i])
+        i += 1
+    return remaining, WorkflowSelection(tags, active_only, dirs)
+
+
+def selected_ids(rows: Iterable[dict], selection: WorkflowSelection) -> Set[str]:
+    """IDs of the listing rows that pass the tag/active selectors."""
+    return {row['id'] for row in rows if selection.matches_listing(row)}
+
+
+def list_workflows(fetch_page: Callable[[str], Optional[dict]], query: str = "",
+                   page_size: int = WORKFLOW_PAGE_SIZE) -> Optional[List[dict]]:
+    """Every workflow of a listing, following `nextCursor` across pages.
+
+    ``fetch_page`` takes an endpoint ('workflows?limit=...') and returns the
+    decoded page, or None on any failure; ``query`` adds listing filters
+    (e.g. 'active=true&tags=vapi'). Returns None if any page cannot be
+    fetched (never a silently truncated list).
+    """
+    workflows = []
+    cursor = None
+    while True:
+        endpoint = f"workflows?limit={page_size}" + (f"&{query}" if query else "")
+        endpoint += f"&cursor={quote(cursor)}" if cursor else ""
+        page = fetch_page(endpoint)
+        if not isinstance(page, dict) or not isinstance(page.get('data'), list):
+            return None
+        workflows.extend(page['data'])
+        cursor = page.get('nextCursor')
+        if not cursor:
+            return workflows
+
+
+def list_selected_ids(api_url: str, api_key: Optional[str], selection: WorkflowSelection,
+                      page_size: int = WORKFLOW_PAGE_SIZE) -> Optional[Set[str]]:
+    """IDs of the VM workflows matching the tag/active selectors (None if the listing failed).
+
+    The filters ride on the listing query. Connection errors, error statuses
+    and unreadable bodies (e.g. a proxy's HTML error page) all count as a
+    failed listing.
+    """
+    headers = {"X-N8N-API-KEY": api_key or '', "Accept": "application/json"}
+
+    def fetch_page(endpoint: str) -> Optional[dict]:
+        try:
+            status, _, body = api_request('GET', f"{api_url}/{endpoint}", headers, timeout=30)
+        except Exception:
+            return None
+        if status >= 400:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    rows = list_workflows(fetch_page, selection.query(), page_size)
+    return selected_ids(rows, selection) if rows is not None else None
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_shard.py — Split a sync run across several CI runners
+
+`--shard i/n` (1 ≤ i ≤ n) makes status, export and deploy handle only the
+workflows whose hashed key falls in shard i of n. The key is the workflow ID
+(the local file path for workflows not on the VM), hashed with md5, so every
+runner with the same checkout and workflow map computes the same partition
+and each workflow lands in exactly one shard:
+
+    python commands/sync-n8n-status.py --shard 1/3 --json > status-1.json
+    python commands/sync-n8n-status.py --shard 2/3 --json > status-2.json
+    python commands/sync-n8n-status.py --shard 3/3 --json > status-3.json
+    python commands/sync-n8n-status.py --merge-reports status-*.json
+
+Usage:
+    from n8n_shard import parse_shard, in_shard, shard_key
+"""
+
+import hashlib
+from typing import List, Optional, Tuple
+
+Shard = Tuple[int, int]  # (index, count), index 1-based
+
+
+def parse_shard(spec: str) -> Shard:
+    """Parse 'i/n' (raises ValueError for anything else)."""
+    index, sep, count = spec.partition('/')
+    if not sep:
+        raise ValueError(f"--shard expects i/n, got '{spec}'")
+    index, count = int(index), int(count)
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"--shard {spec}: need 1 <= i <= n")
+    return index, count
+
+
+def shard_key(workflow_id: Optional[str], file_rel: Optional[str] = None) -> str:
+    """What a workflow is partitioned by: its ID, else its local file."""
+    return workflow_id or file_rel or ''
+
+
+def in_shard(key: str, shard: Optional[Shard]) -> bool:
+    """True if ``key`` belongs to ``shard`` (always True without sharding)."""
+    if shard is None:
+        return True
+    index, count = shard
+    bucket = int(hashlib.md5(key.encode('utf-8')).hexdigest()[:8], 16) % count
+    return bucket == index - 1
+
+
+def pop_shard_args(args: List[str]) -> Tuple[List[str], Optional[Shard]]:
+    """Strip --shard (and its value) from a raw argv list; returns (args, shard)."""
+    remaining = []
+    shard = None
+    i = 0
+    while i < len(args):
+        flag, _, value = args[i].partition('=')
+        if flag == '--shard':
+            if not value and i + 1 < len(args):
+                i += 1
+                value = args[i]
+            shard = parse_shard(value)
+        else:
+            remaining.append(args[i])
+        i += 1
+    return remaining, shard
+
+
+def shard_label(shard: Optional[Shard]) -> str:
+    """' (shard 2/3)' for messages, '' without sharding."""
+    return f" (shard {shard[0]}/{shard[1]})" if shard else ""
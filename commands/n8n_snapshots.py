@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_snapshots.py — Last-known VM state of each workflow, cached on disk
+
+Every status check records, per workflow ID, the hash (and updatedAt/name)
+of the version it fetched from the VM, with the time it was fetched. Kept in
+`.n8n-cache/vm-snapshots.json` (one file per instance profile:
+`vm-snapshots.<name>.json`). The cache is local, not committed.
+
+Readers:
+- `sync-n8n-status.py --staged` (pre-commit) trusts snapshots younger than
+  the TTL instead of going to the network
+- offline mode answers from snapshots of any age, reporting how old they are
+
+Usage:
+    from n8n_snapshots import load_snapshots, save_snapshots, record_snapshot, fresh_snapshot
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from n8n_instances import active_instance
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+CACHE_DIR = PROJECT_ROOT / ".n8n-cache"
+
+# Default max age for --staged (seconds)
+DEFAULT_TTL = 600
+
+
+def snapshot_file() -> Path:
+    """Snapshot file of the active instance profile (default file without one)."""
+    instance = active_instance()
+    if instance:
+        return CACHE_DIR / f"vm-snapshots.{instance['name']}.json"
+    return CACHE_DIR / "vm-snapshots.json"
+
+
+def load_snapshots() -> Dict[str, dict]:
+    """{workflow id: {'hash', 'name', 'updatedAt', 'fetched_at'}} (empty if none yet)."""
+    try:
+        with open(snapshot_file(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_snapshots(snapshots: Dict[str, dict]) -> None:
+    """Write the snapshot file atomically (concurrent runs never see half a file)."""
+    path = snapshot_file()
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshots, f, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def record_snapshot(snapshots: Dict[str, dict], workflow_id: str, workflow: dict, workflow_hash: str) -> None:
+    snapshots[workflow_id] = {
+        'hash': workflow_hash,
+        'name': workflow.get('name', ''),
+        'updatedAt': workflow.get('updatedAt'),
+        'fetched_at': time.time()
+    }
+
+
+def snapshot_age(entry: dict) -> float:
+    """Seconds since the snapshot was fetched."""
+    return max(0.0, time.time() - entry.get('fetched_at', 0))
+
+
+def fresh_snapshot(snapshots: Dict[str, dict], workflow_id: str, ttl: float) -> Optional[dict]:
+    """The snapshot of ``workflow_id`` if it is younger than ``ttl`` seconds."""
+    entry = snapshots.get(workflow_id)
+    if entry and snapshot_age(entry) < ttl:
+        return entry
+    return None
+
+
+def format_age(seconds: float) -> str:
+    """Human-readable age: 45s, 12m, 3h, 2d."""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds >= size:
+            return f"{int(seconds // size)}{unit}"
+    return f"{int(seconds)}s"
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_sync_state.py — Last-synced base snapshots for 3-way direction resolution
+
+Keeps `.n8n-sync-state.json` in the project root with, per workflow ID, the
+hash of the version that was last in sync between local and VM (the "base").
+With a base, each drifted workflow can be classified on its own:
+
+    local == base, VM != base  →  vm_changed     (export)
+    VM == base, local != base  →  local_changed  (deploy)
+    both != base               →  both_changed   (conflict / merge)
+
+Updated by sync-n8n-export.py, sync-n8n-deploy.py and sync-n8n-full.py after
+every successful sync. Commit the file so the base is shared with the team.
+
+The base content itself (name, nodes, connections, settings) is kept in
+`.n8n-sync-base/<workflow-id>.json` so workflows changed on both sides can be
+merged node by node (see n8n_merge.py).
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+# One definition of the hashed fields: base snapshots and merges must match the drift hash
+from n8n_hash import essential_fields
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+SYNC_STATE_FILE = PROJECT_ROOT / ".n8n-sync-state.json"
+BASE_SNAPSHOT_DIR = PROJECT_ROOT / ".n8n-sync-base"
+
+# Key for base snapshots recorded in memory and written by save_sync_state()
+PENDING_SNAPSHOTS = '_pending_snapshots'
+
+# Change classifications
+SYNCED = 'synced'
+LOCAL_CHANGED = 'local_changed'
+VM_CHANGED = 'vm_changed'
+BOTH_CHANGED = 'both_changed'
+NO_BASE = 'no_base'
+
+
+def load_sync_state(path: Optional[Path] = None) -> dict:
+    """Load the sync state file (empty state if missing or unreadable)."""
+    path = path or SYNC_STATE_FILE
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {'workflows': {}}
+
+    state.setdefault('workflows', {})
+    return state
+
+
+def save_sync_state(state: dict, path: Optional[Path] = None) -> None:
+    """Write the sync state file (sorted, so diffs stay small) and any new base snapshots."""
+    path = path or SYNC_STATE_FILE
+    pending = state.pop(PENDING_SNAPSHOTS, {})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+    if pending:
+        BASE_SNAPSHOT_DIR.mkdir(exist_ok=True)
+    for workflow_id, snapshot in pending.items():
+        with open(BASE_SNAPSHOT_DIR / f"{workflow_id}.json", 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+
+def get_base_hash(state: dict, workflow_id: str) -> Optional[str]:
+    """Return the hash recorded at the last sync, if any."""
+    entry = state['workflows'].get(workflow_id)
+    return entry.get('hash') if entry else None
+
+
+def load_base_snapshot(state: dict, workflow_id: str) -> Optional[dict]:
+    """Return the base workflow content, if a snapshot matching the base hash exists."""
+    base_hash = get_base_hash(state, workflow_id)
+    if not base_hash:
+        return None
+
+    try:
+        with open(BASE_SNAPSHOT_DIR / f"{workflow_id}.json", 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    # A snapshot from an older sync is not a valid merge base
+    if snapshot.get('hash') != base_hash:
+        return None
+    return snapshot.get('workflow')
+
+
+def record_synced(state: dict, workflow_id: str, name: str, workflow_hash: str,
+                  workflow: Optional[dict] = None) -> bool:
+    """Record that local and VM agreed on ``workflow_hash``.
+
+    If ``workflow`` is given, its content is kept as the base snapshot (written
+    on the next save_sync_state()). Returns True if the state changed, so
+    callers know whether to save.
+    """
+    entry = state['workflows'].get(workflow_id)
+    if (entry and entry.get('hash') == workflow_hash and entry.get('name') == name
+            and (workflow is None or (BASE_SNAPSHOT_DIR / f"{workflow_id}.json").exists())):
+        return False
+
+    state['workflows'][workflow_id] = {
+        'name': name,
+        'hash': workflow_hash,
+        'synced_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+    if workflow is not None:
+        state.setdefault(PENDING_SNAPSHOTS, {})[workflow_id] = {
+            'hash': workflow_hash,
+            'workflow': essential_fields(workflow)
+        }
+    return True
+
+
+def classify_change(local_hash: str, vm_hash: str, base_hash: Optional[str]) -> str:
+    """Classify which side(s) changed since the last sync."""
+    if local_hash == vm_hash:
+        return SYNCED
+    if not base_hash:
+        return NO_BASE
+    if local_hash == base_hash:
+        return VM_CHANGED
+    if vm_hash == base_hash:
+        return LOCAL_CHANGED
+    return BOTH_CHANGED
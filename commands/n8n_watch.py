@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_watch.py — Watch the workflow directories for saved JSON files
+
+`sync-n8n-status.py --watch` stays resident and re-checks a workflow as soon
+as its file is saved. FileWatcher reports which `.json` files under the
+watched directories were written, created, renamed or deleted:
+
+- on Linux through inotify (via ctypes, no dependency): one watch per
+  directory, new directories watched as they appear, an event queue
+  overflow answered with a full rescan
+- elsewhere, or when inotify is unavailable (e.g. watch limit reached), by
+  polling mtime and size every ``interval`` seconds
+
+Editors save in bursts (temp file, rename, sometimes a second write), so
+changes() waits until the tree has been quiet for ``settle`` seconds and
+returns each changed path once.
+
+Usage:
+    from n8n_watch import FileWatcher
+    watcher = FileWatcher([Path("MVP's"), Path('Ferramentas')])
+    while True:
+        for path in watcher.changes(timeout=60):
+            ...  # path may no longer exist (deleted / renamed away)
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Directories never worth watching (the workflow rules skip them anyway)
+SKIP_DIRS = {'node_modules', '.git', '.claude', '__pycache__'}
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _walk_dirs(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        yield Path(dirpath)
+
+
+def _json_files(root: Path) -> Iterable[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            if name.endswith('.json'):
+                yield Path(dirpath) / name
+
+
+class _Inotify:
+    """Recursive inotify watches over some directory trees."""
+
+    def __init__(self, roots: List[Path]):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs: Dict[int, Path] = {}
+        self.roots = roots
+        try:
+            for root in roots:
+                if root.is_dir():
+                    self.watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def watch_tree(self, root: Path) -> None:
+        for directory in _walk_dirs(root):
+            wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, f"inotify_add_watch {directory}: {os.strerror(errno)}")
+            self.dirs[wd] = directory
+
+    def read(self, timeout: Optional[float]) -> Tuple[Set[Path], bool]:
+        """(changed .json paths, overflowed) from the events ready within ``timeout``."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set(), False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+
+        changed: Set[Path] = set()
+        overflow = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None:
+                continue
+            if mask & (IN_IGNORED | IN_DELETE_SELF):
+                self.dirs.pop(wd, None)
+                continue
+            path = directory / name
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in SKIP_DIRS:
+                    # A new (or moved-in) folder: watch it and report what it already holds
+                    try:
+                        self.watch_tree(path)
+                    except OSError:
+                        overflow = True
+                    changed.update(_json_files(path))
+                continue
+            if name.endswith('.json'):
+                changed.add(path)
+        return changed, overflow
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    """Changed `.json` files under ``roots``, by inotify or mtime polling."""
+
+    def __init__(self, roots: Iterable[Path], interval: float = 1.0, settle: float = 0.3,
+                 polling: bool = False):
+        self.roots = [Path(root) for root in roots]
+        self.interval = interval
+        self.settle = settle
+        self._inotify: Optional[_Inotify] = None
+        if not polling and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify(self.roots)
+            except (OSError, AttributeError):
+                self._inotify = None  # e.g. fs.inotify.max_user_watches reached
+        self._stamps = {} if self._inotify else self._scan()
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self._inotify else 'polling'
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        stamps = {}
+        for root in self.roots:
+            for path in _json_files(root):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                stamps[path] = (st.st_mtime_ns, st.st_size)
+        return stamps
+
+    def _poll(self) -> Set[Path]:
+        stamps = self._scan()
+        changed = {p for p, stamp in stamps.items() if self._stamps.get(p) != stamp}
+        changed |= set(self._stamps) - set(stamps)
+        self._stamps = stamps
+        return changed
+
+    def _collect(self, timeout: Optional[float]) -> Set[Path]:
+        if self._inotify:
+            changed, overflow = self._inotify.read(timeout)
+            if overflow:
+                # Events were lost: report everything, the caller's hash cache keeps it cheap
+                changed |= {p for root in self.roots for p in _json_files(root)}
+            return changed
+        time.sleep(self.interval if timeout is None else min(self.interval, timeout))
+        return self._poll()
+
+    def changes(self, timeout: Optional[float] = None) -> Set[Path]:
+        """Block until files change (or ``timeout``); returns them once things settle."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            changed = self._collect(remaining)
+        # Let a burst of saves finish
+        while True:
+            more = self._collect(self.settle) if self._inotify else set()
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self) -> None:
+        if self._inotify:
+            self._inotify.close()
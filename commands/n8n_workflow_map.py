@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+n8n_workflow_map.py — ID-keyed workflow map with local file links
+
+`.n8n-workflow-map.json` used to be a flat {name: id} dict built once from a
+single unpaginated `GET /workflows`. Workflows past the first page were
+dropped, and a rename on either side broke the link. The map is now keyed
+by workflow ID and records the local file of each workflow:
+
+    {
+      "version": 2,
+      "workflows": {
+        "2Zd3Uz3JmCqDEomKMzIvl": {
+          "name": "Hotel Self-Service Support",
+          "file": "MVP's/Hotel Concierge/Hotel Self-Service Support.json",
+          "updatedAt": "2025-01-01T00:00:00.000Z"
+        }
+      }
+    }
+
+refresh_workflow_map() merges a full (paginated) workflow listing into it:
+new IDs are added, deleted ones dropped, renames and duplicate names
+reported. Local files are only searched for workflows whose recorded file is
+missing. Lookups go file → ID first, then the file's own `id` field, then
+name, so a renamed workflow still resolves to its file.
+
+Old {name: id} maps are read transparently and rewritten in this format on
+the next refresh (sync-n8n-status.py --refresh-map).
+"""
+
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+MAP_VERSION = 2
+
+
+def empty_map() -> dict:
+    return {'version': MAP_VERSION, 'workflows': {}}
+
+
+def load_workflow_map_file(path: Path) -> dict:
+    """Load a map file in either format (raises OSError / JSONDecodeError)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data.get('workflows'), dict) and data.get('version') == MAP_VERSION:
+        return data
+
+    # Legacy {name: id}
+    workflow_map = empty_map()
+    for name, workflow_id in data.items():
+        workflow_map['workflows'][workflow_id] = {'name': name, 'file': None}
+    return workflow_map
+
+
+def save_workflow_map_file(path: Path, workflow_map: dict) -> None:
+    """Write the map (sorted, so diffs stay small)."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(workflow_map, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+
+
+def name_index(workflow_map: dict) -> Dict[str, str]:
+    """{name: id}, leaving out names shared by several workflows."""
+    by_name: Dict[str, List[str]] = {}
+    for workflow_id, entry in workflow_map['workflows'].items():
+        by_name.setdefault(entry['name'], []).append(workflow_id)
+    return {name: ids[0] for name, ids in by_name.items() if len(ids) == 1}
+
+
+def file_index(workflow_map: dict) -> Dict[str, str]:
+    """{relative file path: id} for workflows with a recorded local file."""
+    return {entry['file']: workflow_id for workflow_id, entry in workflow_map['workflows'].items()
+            if entry.get('file')}
+
+
+def relative_path(file_path: Path, root: Path) -> str:
+    """Map-style path: relative to the project root, forward slashes."""
+    try:
+        return Path(file_path).resolve().relative_to(root).as_posix()
+    except ValueError:
+        return Path(file_path).as_posix()
+
+
+def resolve_workflow_id(workflow_map: dict, lookups: Tuple[Dict[str, str], Dict[str, str]],
+                        file_rel: str, name: str, file_id: Optional[str] = None) -> Optional[str]:
+    """Workflow ID for a local file: by recorded file, then its `id` field, then name.
+
+    ``lookups`` is (file_index(map), name_index(map)), built once per run.
+    """
+    by_file, by_name = lookups
+    if file_rel in by_file:
+        return by_file[file_rel]
+    if file_id and file_id in workflow_map['workflows']:
+        return file_id
+    return by_name.get(name)
+
+
+def resolve_workflow_specs(specs: Iterable[str], names: Dict[str, str]) -> List[str]:
+    """Workflow IDs for --workflow values: an ID, an exact name, or a unique name substring.
+
+    ``names`` is {id: name}. Values unknown to it are taken as IDs; raises
+    ValueError for a substring matching several workflows.
+    """
+    ids = []
+    for spec in specs:
+        if spec in names:
+            ids.append(spec)
+            continue
+        exact = [wf_id for wf_id, name in names.items() if name.lower() == spec.lower()]
+        partial = [wf_id for wf_id, name in names.items() if spec.lower() in name.lower()]
+        matches = exact or partial
+        if len(matches) > 1:
+            options = ', '.join(sorted(names[m] for m in matches)[:5])
+            raise ValueError(f"'{spec}' matches {len(matches)} workflows: {options}")
+        ids.append(matches[0] if matches else spec)
+    return ids
+
+
+def workflow_file(workflow_map: dict, workflow_id: str, root: Path) -> Optional[Path]:
+    """The recorded local file of a workflow, if it still exists."""
+    entry = workflow_map['workflows'].get(workflow_id)
+    if entry and entry.get('file'):
+        path = root / entry['file']
+        if path.exists():
+            return path
+    return None
+
+
+def refresh_workflow_map(workflow_map: dict, remote_workflows: Iterable[dict], root: Path,
+                         scan_local: Callable[[], List[Tuple[str, dict]]]) -> dict:
+    """Merge a complete workflow listing into ``workflow_map`` (in place).
+
+    Args:
+        remote_workflows: every workflow on the instance ({'id', 'name', 'updatedAt'})
+        root:             project root (recorded files are relative to it)
+        scan_local:       returns [(relative path, {'name', 'id'})] for local
+                          workflow files; only called if some workflow has no
+                          valid recorded file
+
+    Returns:
+        Report dict: 'added', 'removed' (names), 'renamed' ((old, new) pairs),
+        'duplicates' ({name: [ids]}), 'unmatched' (names without a local file)
+    """
+    workflows = workflow_map['workflows']
+    report = {'added': [], 'removed': [], 'renamed': [], 'duplicates': {}, 'unmatched': []}
+    seen = set()
+
+    for wf in remote_workflows:
+        workflow_id, name = wf['id'], wf.get('name', '')
+        seen.add(workflow_id)
+        entry = workflows.get(workflow_id)
+        if entry is None:
+            workflows[workflow_id] = {'name': name, 'file': None, 'updatedAt': wf.get('updatedAt')}
+            report['added'].append(name)
+            continue
+        if entry['name'] != name:
+            report['renamed'].append((entry['name'], name))
+            entry['name'] = name
+        entry['updatedAt'] = wf.get('updatedAt')
+
+    for workflow_id in [i for i in workflows if i not in seen]:
+        report['removed'].append(workflows.pop(workflow_id)['name'])
+
+    by_name: Dict[str, List[str]] = {}
+    for workflow_id, entry in workflows.items():
+        by_name.setdefault(entry['name'], []).append(workflow_id)
+    report['duplicates'] = {name: sorted(ids) for name, ids in by_name.items() if len(ids) > 1}
+
+    # Link local files, only for workflows whose recorded file is gone
+    missing = [i for i, e in workflows.items() if not e.get('file') or not (root / e['file']).exists()]
+    if missing:
+        local = scan_local()
+        claimed = {e['file'] for e in workflows.values() if e.get('file') and (root / e['file']).exists()}
+        by_local_id = {info['id']: path for path, info in local if info.get('id')}
+        by_local_name: Dict[str, List[str]] = {}
+        for path, info in local:
+            by_local_name.setdefault(info.get('name'), []).append(path)
+
+        for workflow_id in missing:
+            entry = workflows[workflow_id]
+            path = by_local_id.get(workflow_id)
+            if path is None and entry['name'] not in report['duplicates']:
+                candidates = [p for p in by_local_name.get(entry['name'], []) if p not in claimed]
+                path = candidates[0] if len(candidates) == 1 else None
+            entry['file'] = path
+            if path:
+                claimed.add(path)
+            else:
+                report['unmatched'].append(entry['name'])
+
+    return report
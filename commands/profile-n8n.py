@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+profile-n8n.py — Per-node latency profile from the VM's execution history
+
+Streams executions of the selected workflows through the API
+(`GET /executions?includeData=true`, newest first, stopping at the end of
+the --since window) and aggregates per node: p50/p95/p99 time, error rate,
+runs and output items per execution (n8n_profile.py). Each workflow gets a
+flame-style table: nodes in start order, each bar placed at the node's
+typical start and as long as its p50, on the scale of the workflow's p50
+wall time, so the node that dominates latency stands out.
+
+Needs saved execution data (EXECUTIONS_DATA_SAVE_ON_SUCCESS=all, as in
+docker-compose.yml); executions are only read.
+
+Usage:
+    python commands/profile-n8n.py [OPTIONS]
+
+Options:
+    --workflow NAME|ID  Workflow to profile (repeatable; name substring or ID;
+                        default: every workflow with executions in the window)
+    --tag NAME          Only workflows with this n8n tag
+    --active-only       Only active workflows
+    --since WINDOW      Time window: 90m, 24h (default), 7d, 2w
+    --status STATUS     Only success or error executions
+    --limit N           Executions per workflow at most (default: 500)
+    --page-size N       Executions per API page (default: 25, max 250)
+    --json              Print the profiles as JSON
+    --save-timings PATH Write node p50/p95/p99 per workflow ID, for
+                        analyze-n8n.py --timings
+
+Examples:
+    python commands/profile-n8n.py --workflow "Vapi - Check Calendar Availability"
+    python commands/profile-n8n.py --tag vapi --since 7d --save-timings .n8n-cache/timings.json
+    python commands/analyze-n8n.py --webhooks --timings .n8n-cache/timings.json
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from n8n_executions import FINISHED_STATUSES, ExecutionApiError, iter_executions, parse_duration
+from n8n_instances import api_settings
+from n8n_profile import WorkflowProfile
+from n8n_selection import WorkflowSelection, list_selected_ids
+from n8n_workflow_map import load_workflow_map_file, resolve_workflow_specs
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+WORKFLOW_MAP_FILE = PROJECT_ROOT / '.n8n-workflow-map.json'
+
+# Width of the flame bars, and of the node column
+BAR_WIDTH = 40
+NAME_WIDTH = 34
+
+
+def load_env():
+    """Load environment variables from .env file in project root."""
+    env_file = PROJECT_ROOT / '.env'
+    if env_file.exists():
+        with open(env_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    os.environ.setdefault(key.strip(), value.strip())
+
+
+def format_ms(ms) -> str:
+    if ms is None:
+        return '-'
+    if ms < 1000:
+        return f"{ms:.0f} ms"
+    return f"{ms / 1000:.2f} s" if ms < 60000 else f"{ms / 60000:.1f} min"
+
+
+def print_profile(profile: WorkflowProfile, window: str) -> None:
+    summary = profile.summary()
+    rows = profile.rows()
+    scale = summary['p50'] or max((r['offset'] + (r['p50'] or 0) for r in rows), default=1.0) or 1.0
+    error_color = RED if summary['error_rate'] > 0.05 else YELLOW if summary['failed'] else GREEN
+    print(f"{BOLD}{profile.name}{RESET} {GRAY}{profile.workflow_id}{RESET}")
+    print(f"  {summary['executions']} executions in {window} · wall p50 {format_ms(summary['p50'])} "
+          f"p95 {format_ms(summary['p95'])} p99 {format_ms(summary['p99'])} · "
+          f"{error_color}{summary['error_rate']:.1%} failed{RESET}")
+    print(f"  {GRAY}{'node':<{NAME_WIDTH}} {'runs':>5} {'items':>6} {'err%':>5} {'p50':>9} {'p95':>9} "
+          f"{'p99':>9} {'share':>6}  0{' ' * (BAR_WIDTH - 2)}{format_ms(scale)}{RESET}")
+
+    dominant = max(rows, key=lambda r: r['share'], default=None)
+    for row in rows:
+        name = row['node'] if len(row['node']) <= NAME_WIDTH else row['node'][:NAME_WIDTH - 1] + '…'
+        start = min(BAR_WIDTH - 1, int(row['offset'] / scale * BAR_WIDTH))
+        length = max(1, min(BAR_WIDTH - start, round((row['p50'] or 0) / scale * BAR_WIDTH)))
+        color = RED if row['share'] >= 0.5 else YELLOW if row['share'] >= 0.2 else CYAN
+        bar = ' ' * start + color + '█' * length + RESET + ' ' * (BAR_WIDTH - start - length)
+        errors = f"{RED}{row['error_rate'] * 100:>5.1f}{RESET}" if row['error_rate'] else f"{row['error_rate'] * 100:>5.1f}"
+        mark = f" {RED}◀{RESET}" if row is dominant and row['share'] >= 0.2 else ""
+        print(f"  {name:<{NAME_WIDTH}} {row['runs_per_execution']:>5.1f} {row['items_per_execution']:>6.1f} "
+              f"{errors} {format_ms(row['p50']):>9} {format_ms(row['p95']):>9} {format_ms(row['p99']):>9} "
+              f"{row['share']:>6.1%} |{bar}|{mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-node latency profile from n8n execution data')
+    parser.add_argument('--workflow', action='append', default=[], metavar='NAME|ID')
+    parser.add_argument('--tag', action='append', default=[], metavar='NAME')
+    parser.add_argument('--active-only', action='store_true')
+    parser.add_argument('--since', default='24h', metavar='WINDOW')
+    parser.add_argument('--status', choices=('success', 'error'))
+    parser.add_argument('--limit', type=int, default=500, metavar='N')
+    parser.add_argument('--page-size', type=int, metavar='N')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--save-timings', type=Path, metavar='PATH')
+    args = parser.parse_args()
+
+    try:
+        window = parse_duration(args.since)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.page_size is not None and not 1 <= args.page_size <= 250:
+        parser.error('--page-size must be between 1 and 250')
+
+    load_env()
+    api_url, api_key = api_settings(os.getenv('N8N_API_URL', 'https://hub.descomplicador.pt/api/v1'),
+                                    os.getenv('N8N_API_KEY'))
+    if not api_key:
+        print(f"{RED}✗ Error: N8N_API_KEY not found in environment or .env file{RESET}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        workflow_map = load_workflow_map_file(WORKFLOW_MAP_FILE)
+    except (OSError, ValueError):
+        workflow_map = {'workflows': {}}
+    names = {wf_id: entry.get('name') or wf_id for wf_id, entry in workflow_map['workflows'].items()}
+    try:
+        wanted = resolve_workflow_specs(args.workflow, names) if args.workflow else None
+    except ValueError as e:
+        parser.error(str(e))
+    selection = WorkflowSelection(args.tag, args.active_only)
+    if selection:
+        allowed = list_selected_ids(api_url, api_key, selection)
+        if allowed is None:
+            print(f"{RED}✗ Could not list workflows ({selection.describe()}){RESET}", file=sys.stderr)
+            sys.exit(1)
+        wanted = [wf_id for wf_id in wanted if wf_id in allowed] if wanted is not None else sorted(allowed)
+
+    since = datetime.now(timezone.utc) - window
+    started = time.perf_counter()
+    profiles: dict[str, WorkflowProfile] = {}
+    streams = wanted if wanted is not None else [None]
+    try:
+        for wf_id in streams:
+            for execution, _ in iter_executions(api_url, api_key, workflow_id=wf_id, status=args.status,
+                                                include_data=True, page_size=args.page_size, newer_than=since):
+                if execution.get('status') not in FINISHED_STATUSES:
+                    continue
+                key = str(execution.get('workflowId'))
+                profile = profiles.get(key)
+                if profile is None:
+                    profile = profiles[key] = WorkflowProfile(key, names.get(key))
+                if profile.executions < args.limit:
+                    profile.add(execution)
+                elif wf_id is not None:
+                    break  # this workflow's stream is done
+    except ExecutionApiError as e:
+        print(f"{RED}✗ {e}{RESET}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(profiles.values(), key=lambda p: -(p.summary()['p50'] or 0))
+    if args.save_timings:
+        args.save_timings.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.save_timings, 'w', encoding='utf-8') as f:
+            json.dump({p.workflow_id: p.timings() for p in ordered}, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps([{'workflowId': p.workflow_id, 'name': p.name, **p.summary(), 'nodes': p.rows()}
+                          for p in ordered], indent=2, ensure_ascii=False))
+        return
+    for profile in ordered:
+        print_profile(profile, args.since)
+        print()
+    executions = sum(p.executions for p in ordered)
+    color = GREEN if ordered else YELLOW
+    saved = f" → timings in {args.save_timings}" if args.save_timings else ""
+    print(f"{color}{len(ordered)} workflow(s), {executions} execution(s) since "
+          f"{since.strftime('%Y-%m-%d %H:%M')} UTC{RESET} {GRAY}in {elapsed:.1f}s{saved}{RESET}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+prune-n8n.py — Delete old executions from the VM by retention policy
+
+docker-compose.yml saves every execution with its full data, so n8n's
+execution tables grow without bound and slow the UI and API. This command
+pages through the execution history (`GET /executions`, newest first) and
+deletes, one `DELETE /executions/{id}` at a time, the executions past their
+retention: per workflow and per status, from `.n8n-retention.json` and/or
+--older-than (see n8n_retention.py). Unfinished executions are never
+touched.
+
+Deletes go in batches of --batch-size at --rate requests/second (the
+client's token bucket), with a --pause between batches, so the VM keeps
+serving webhooks. After each batch the page cursor is saved to
+`.n8n-cache/prune-state[.<instance>].json`; --resume continues an
+interrupted run there, with the same policy and cut-off time.
+
+Space is estimated from a few executions per workflow and status fetched
+with their data (--sample). --dry-run only reports what would go, and how
+much. Postgres reuses the freed space for new executions; the database
+files only shrink after a `VACUUM FULL` of execution_entity and
+execution_data (which locks them: do it in a quiet hour).
+
+Usage:
+    python commands/prune-n8n.py [OPTIONS]
+
+Options:
+    --older-than AGE    Default retention: 12h, 30d, 2w (overrides the policy
+                        file's "default")
+    --policy PATH       Policy file (default: .n8n-retention.json, if present)
+    --workflow NAME|ID  Only this workflow (repeatable; name substring or ID)
+    --status STATUS     Only this status (repeatable)
+    --dry-run           Report what would be deleted, delete nothing
+    --batch-size N      Deletes per batch (default: 50)
+    --pause SECONDS     Pause between batches (default: 1.0)
+    --rate N            API requests per second (default: 5)
+    --limit N           Stop after deleting N executions
+    --sample N          Executions per workflow/status fetched to estimate size
+                        (default: 3; 0 for counts only)
+    --page-size N       Executions per listing page (default: 100, max 250)
+    --resume            Continue the interrupted run from its saved cursor
+                        (asks first, like a new run, unless --yes)
+    --yes               Don't ask for confirmation
+    --json              Print the report as JSON
+
+Examples:
+    python commands/prune-n8n.py --older-than 30d --dry-run
+    python commands/prune-n8n.py --older-than 14d --status success --yes
+    python commands/prune-n8n.py --resume --yes
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from n8n_client import api_request, client_summary
+from n8n_executions import FINISHED_STATUSES, ExecutionApiError, iter_executions, parse_duration
+from n8n_instances import active_instance, api_settings, instance_label
+from n8n_retention import POLICY_FILE, RetentionPolicy, SizeEstimate, format_bytes
+from n8n_snapshots import CACHE_DIR
+from n8n_workflow_map import load_workflow_map_file, resolve_workflow_specs
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+WORKFLOW_MAP_FILE = PROJECT_ROOT / '.n8n-workflow-map.json'
+
+STATE_VERSION = 1
+# Cursor value of a stream walked to the end
+DONE = 'done'
+
+
+class PruneInterrupted(Exception):
+    """A delete failed; the run can be resumed from the last saved cursor."""
+
+
+def load_env():
+    """Load environment variables from .env file in project root."""
+    env_file = PROJECT_ROOT / '.env'
+    if env_file.exists():
+        with open(env_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    os.environ.setdefault(key.strip(), value.strip())
+
+
+def confirm_action(prompt: str, default_yes: bool = False) -> bool:
+    """Ask user for confirmation."""
+    suffix = " [Y/n]: " if default_yes else " [y/N]: "
+    try:
+        response = input(f"{YELLOW}{prompt}{suffix}{RESET}").strip().lower()
+    except EOFError:
+        return False
+
+    if not response:
+        return default_yes
+    return response in ['y', 'yes']
+
+
+def state_file() -> Path:
+    """Resume state of the active instance profile."""
+    instance = active_instance()
+    suffix = f".{instance['name']}" if instance else ""
+    return CACHE_DIR / f"prune-state{suffix}.json"
+
+
+def load_state() -> dict | None:
+    try:
+        with open(state_file(), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and state.get('state') == STATE_VERSION else None
+
+
+def save_state(state: dict) -> None:
+    """Write the resume state atomically."""
+    path = state_file()
+    path.parent.mkdir(exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def clear_state() -> None:
+    try:
+        state_file().unlink()
+    except FileNotFoundError:
+        pass
+
+
+def read_policy(args, names: dict[str, str]) -> tuple[dict, RetentionPolicy]:
+    """(raw policy dict, parsed policy) from --policy / .n8n-retention.json and --older-than."""
+    path = args.policy or PROJECT_ROOT / POLICY_FILE
+    raw = {}
+    if args.policy or path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    if args.older_than:
+        raw = dict(raw, default=args.older_than)
+    return raw, RetentionPolicy.from_dict(raw, names)
+
+
+def execution_size(api_url: str, headers: dict, execution_id: str) -> int | None:
+    """Bytes of an execution with its data (None if it can't be read)."""
+    try:
+        status, _, body = api_request('GET', f"{api_url}/executions/{execution_id}?includeData=true",
+                                      headers, timeout=60)
+    except Exception:
+        return None
+    return len(body) if status < 400 else None
+
+
+def delete_execution(api_url: str, headers: dict, execution_id: str) -> bool:
+    """Delete one execution; False if it was already gone. Raises PruneInterrupted on errors."""
+    try:
+        status, reason, _ = api_request('DELETE', f"{api_url}/executions/{execution_id}", headers, timeout=30)
+    except Exception as e:
+        raise PruneInterrupted(f"Connection error deleting execution {execution_id}: {e}") from e
+    if status == 404:
+        return False
+    if status >= 400:
+        raise PruneInterrupted(f"API Error {status} deleting execution {execution_id}: {reason}")
+    return True
+
+
+def print_report(estimate: SizeEstimate, names: dict[str, str], dry_run: bool, sampled: bool) -> None:
+    verb = 'would free' if dry_run else 'freed'
+    rows = sorted(estimate.counts, key=lambda g: -estimate.bytes(g))
+    if rows:
+        print(f"  {GRAY}{'workflow':<44} {'status':<9} {'executions':>10} {'~size':>10}{RESET}")
+    for group in rows:
+        wf_id, status = group
+        name = names.get(wf_id, wf_id)
+        name = name if len(name) <= 44 else name[:43] + '…'
+        size = format_bytes(estimate.bytes(group)) if sampled else '-'
+        print(f"  {name:<44} {status:<9} {estimate.counts[group]:>10} {size:>10}")
+    total = f"{estimate.total()} execution(s)"
+    if sampled:
+        total += f", {verb} ~{format_bytes(estimate.total_bytes())} of execution data"
+    print(f"{GREEN if rows else YELLOW}{total}{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Delete old n8n executions by retention policy')
+    parser.add_argument('--older-than', metavar='AGE')
+    parser.add_argument('--policy', type=Path, metavar='PATH')
+    parser.add_argument('--workflow', action='append', default=[], metavar='NAME|ID')
+    parser.add_argument('--status', action='append', default=[], choices=FINISHED_STATUSES)
+    parser.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--batch-size', type=int, default=50, metavar='N')
+    parser.add_argument('--pause', type=float, default=1.0, metavar='SECONDS')
+    parser.add_argument('--rate', type=float, default=5.0, metavar='N')
+    parser.add_argument('--limit', type=int, metavar='N')
+    parser.add_argument('--sample', type=int, default=3, metavar='N')
+    parser.add_argument('--page-size', type=int, metavar='N')
+    parser.add_argument('--resume', action='store_true')
+    parser.add_argument('--yes', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+
+    if args.batch_size < 1 or args.rate <= 0 or args.pause < 0 or args.sample < 0:
+        parser.error('--batch-size and --rate must be positive, --pause and --sample not negative')
+    if args.page_size is not None and not 1 <= args.page_size <= 250:
+        parser.error('--page-size must be between 1 and 250')
+    if args.resume and (args.dry_run or args.older_than or args.policy or args.workflow or args.status):
+        parser.error('--resume continues the interrupted run with its own policy and filters')
+    if args.older_than:
+        try:
+            parse_duration(args.older_than)
+        except ValueError as e:
+            parser.error(str(e))
+
+    load_env()
+    # Deletes are heavy on the VM's database: throttle every request of this run
+    os.environ['N8N_API_RATE'] = str(args.rate)
+    api_url, api_key = api_settings(os.getenv('N8N_API_URL', 'https://hub.descomplicador.pt/api/v1'),
+                                    os.getenv('N8N_API_KEY'))
+    if not api_key:
+        print(f"{RED}✗ Error: N8N_API_KEY not found in environment or .env file{RESET}", file=sys.stderr)
+        sys.exit(1)
+    headers = {"X-N8N-API-KEY": api_key, "Accept": "application/json"}
+
+    try:
+        workflow_map = load_workflow_map_file(WORKFLOW_MAP_FILE)
+    except (OSError, ValueError):
+        workflow_map = {'workflows': {}}
+    names = {wf_id: entry.get('name') or wf_id for wf_id, entry in workflow_map['workflows'].items()}
+
+    if args.resume:
+        state = load_state()
+        if state is None:
+            print(f"{YELLOW}No interrupted prune{instance_label()} to resume{RESET}")
+            return
+        policy = RetentionPolicy.from_dict(state['policy'], names)
+        if not args.json:
+            print(f"{CYAN}Resuming prune{instance_label()} started {state['started_at']}: "
+                  f"{state['deleted']} execution(s) deleted so far{RESET}")
+        if not args.yes and not confirm_action(f"Continue deleting executions past retention on {api_url}?"):
+            print(f"{YELLOW}Cancelled{RESET}")
+            return
+    else:
+        try:
+            raw_policy, policy = read_policy(args, names)
+        except (OSError, ValueError) as e:
+            parser.error(f"cannot read retention policy: {e}")
+        try:
+            wanted = resolve_workflow_specs(args.workflow, names) if args.workflow else [None]
+        except ValueError as e:
+            parser.error(str(e))
+        if policy.is_empty():
+            parser.error(f"no retention given: use --older-than or a {POLICY_FILE} policy file")
+        for key in policy.unknown_workflows(names):
+            print(f"{YELLOW}⚠ Policy workflow '{key}' is not in the workflow map (taken as an ID){RESET}",
+                  file=sys.stderr)
+        now = datetime.now(timezone.utc)
+        streams = [[wf_id, status] for wf_id in wanted for status in (args.status or [None])]
+        state = {
+            'state': STATE_VERSION,
+            'started_at': now.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'policy': raw_policy,
+            'streams': [{'workflowId': wf_id, 'status': status, 'cursor': None} for wf_id, status in streams],
+            'estimate': {'samples_per_group': args.sample, 'groups': []},
+            'deleted': 0,
+            'missing': 0,
+        }
+        if not args.dry_run and not args.yes:
+            scope = ', '.join(names.get(w, w) for w in wanted if w) or 'all workflows'
+            statuses = ', '.join(args.status) or 'finished'
+            if not confirm_action(f"Delete {statuses} executions past retention ({scope}) on {api_url}?"):
+                print(f"{YELLOW}Cancelled{RESET}")
+                return
+
+    now = datetime.fromisoformat(state['started_at'].replace('Z', '+00:00'))
+    estimate = SizeEstimate.from_dict(state['estimate'])
+    dry_run = args.dry_run
+    deleted = 0
+    started = time.perf_counter()
+    if not args.json:
+        mode = f"{YELLOW}[DRY RUN] {RESET}" if dry_run else ""
+        print(f"{mode}{BOLD}Pruning executions{instance_label()}{RESET} {GRAY}(cut-off from "
+              f"{state['started_at']}, batches of {args.batch_size} at {args.rate:g} req/s){RESET}")
+
+    def process(batch: list[dict]) -> None:
+        nonlocal deleted
+        for execution in batch:
+            group = (str(execution.get('workflowId')), execution.get('status'))
+            if estimate.wants_sample(group):
+                size = execution_size(api_url, headers, execution['id'])
+                if size is not None:
+                    estimate.add_sample(group, size)
+            if not dry_run and not delete_execution(api_url, headers, execution['id']):
+                state['missing'] += 1
+                continue
+            estimate.add(group)
+            deleted += 1
+
+    def checkpoint(stream: dict, cursor) -> None:
+        # The cursor also tells whether the run is complete; a dry run just doesn't save it
+        stream['cursor'] = cursor
+        if dry_run:
+            return
+        state['estimate'] = estimate.to_dict()
+        state['deleted'] = estimate.total()
+        save_state(state)
+
+    def walk(stream: dict) -> bool:
+        """Prune one (workflow, status) stream from its cursor; True if --limit was reached."""
+        batch: list[dict] = []
+        for execution, page_cursor in iter_executions(api_url, api_key, workflow_id=stream['workflowId'],
+                                                      status=stream['status'], page_size=args.page_size,
+                                                      cursor=stream['cursor']):
+            if not policy.is_due(execution, now):
+                continue
+            if args.limit is not None and deleted + len(batch) >= args.limit:
+                process(batch)
+                checkpoint(stream, page_cursor)
+                return True
+            batch.append(execution)
+            if len(batch) >= args.batch_size:
+                process(batch)
+                batch = []
+                # Resuming here re-reads this page: what was deleted is gone from it
+                checkpoint(stream, page_cursor)
+                if not args.json:
+                    print(f"  {GRAY}{deleted} {'due' if dry_run else 'deleted'}…{RESET}", flush=True)
+                if args.pause and not dry_run:
+                    time.sleep(args.pause)
+        process(batch)
+        checkpoint(stream, DONE)
+        return False
+
+    interrupted = None
+    try:
+        for stream in state['streams']:
+            if stream['cursor'] != DONE and walk(stream):
+                break
+    except (ExecutionApiError, PruneInterrupted) as e:
+        interrupted = str(e)
+    except KeyboardInterrupt:
+        interrupted = 'Interrupted'
+    elapsed = time.perf_counter() - started
+
+    if interrupted and not dry_run:
+        # Keep the last checkpoint's cursors, with the counts up to now
+        state['estimate'] = estimate.to_dict()
+        state['deleted'] = estimate.total()
+        save_state(state)
+    finished = not interrupted and all(s['cursor'] == DONE for s in state['streams'])
+    if finished and not dry_run:
+        clear_state()
+
+    sampled = args.sample > 0 or any(estimate.samples.values())
+    if args.json:
+        print(json.dumps({
+            'dry_run': dry_run,
+            'cutoff_from': state['started_at'],
+            'complete': finished,
+            'error': interrupted,
+            'executions': estimate.total(),
+            'bytes': estimate.total_bytes() if sampled else None,
+            'missing': state['missing'],
+            'groups': [{'workflowId': wf_id, 'name': names.get(wf_id), 'status': status,
+                        'executions': count, 'bytes': estimate.bytes((wf_id, status)) if sampled else None}
+                       for (wf_id, status), count in sorted(estimate.counts.items())],
+        }, indent=2, ensure_ascii=False))
+    else:
+        print()
+        print_report(estimate, names, dry_run, sampled)
+        if state['missing']:
+            print(f"{GRAY}{state['missing']} execution(s) were already gone{RESET}")
+        print(f"{GRAY}{client_summary()} in {elapsed:.1f}s{RESET}")
+        if not dry_run and estimate.total():
+            print(f"{GRAY}Postgres reuses the space for new executions; VACUUM FULL execution_entity, "
+                  f"execution_data returns it to the disk{RESET}")
+    if interrupted:
+        print(f"{RED}✗ {interrupted}{RESET}", file=sys.stderr)
+        if not dry_run:
+            print(f"{YELLOW}Run again with --resume to continue{RESET}", file=sys.stderr)
+        sys.exit(1)
+    if not finished and not dry_run and not args.json:
+        print(f"{YELLOW}Stopped at --limit {args.limit}: --resume continues{RESET}")
+
+
+if __name__ == '__main__':
+    main()
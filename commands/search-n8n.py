@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+search-n8n.py — Search the local workflows by node type, URL, credential, ...
+
+Queries the inverted index of n8n_index.py (`.n8n-cache/search-index.json`),
+updating it first: only files changed since the last run are re-read, so a
+query over the whole checkout takes milliseconds. Workflow files are found
+with the same rules as the sync scripts (n8n_discovery.py).
+
+Every clause must match the same workflow. Each argument is one clause,
+`field:text` or just `text` (any field), matched case-insensitively as a
+substring; quote clauses with spaces for the shell. Fields: type, node,
+webhook, url, credential, subworkflow.
+
+Usage:
+    python commands/search-n8n.py QUERY [OPTIONS]
+    python commands/search-n8n.py --stats | --rebuild
+
+Options:
+    --json          Print hits as JSON
+    --files         Print only the matching files (one per line, for xargs)
+    --no-update     Query the saved index as is (don't look for changed files)
+    --rebuild       Re-index every file from scratch
+    --stats         Print index size per field
+
+Examples:
+    python commands/search-n8n.py pinecone                    # anything mentioning Pinecone
+    python commands/search-n8n.py webhook:book-appointment    # where a webhook path is served
+    python commands/search-n8n.py credential:"Gmail account"  # nodes using a credential
+    python commands/search-n8n.py type:httpRequest url:flowise
+    python commands/search-n8n.py subworkflow:"Check Calendar"
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from n8n_discovery import find_workflow_files
+from n8n_index import FIELDS, INDEX_FILE, SearchIndex
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.resolve()
+
+# Node names listed per match before '+N more'
+MAX_NODES_SHOWN = 4
+
+
+def print_hits(hits: list[dict]) -> None:
+    for hit in hits:
+        print(f"{BOLD}{hit['name']}{RESET} {GRAY}{hit['file']}{RESET}")
+        for field, term, nodes in hit['matches']:
+            shown = ', '.join(nodes[:MAX_NODES_SHOWN])
+            if len(nodes) > MAX_NODES_SHOWN:
+                shown += f", +{len(nodes) - MAX_NODES_SHOWN} more"
+            print(f"  {CYAN}{field:<11}{RESET} {term}  {GRAY}← {shown}{RESET}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the local n8n workflows')
+    parser.add_argument('query', nargs='*', help="Clauses: 'field:text' or 'text'")
+    parser.add_argument('--json', action='store_true', help='Print hits as JSON')
+    parser.add_argument('--files', action='store_true', help='Print only the matching files')
+    parser.add_argument('--no-update', action='store_true', help="Don't look for changed files")
+    parser.add_argument('--rebuild', action='store_true', help='Re-index every file')
+    parser.add_argument('--stats', action='store_true', help='Print index size per field')
+    args = parser.parse_args()
+
+    if not args.query and not (args.stats or args.rebuild):
+        parser.error('a query (or --stats / --rebuild) is required')
+
+    started = time.perf_counter()
+    index = SearchIndex(INDEX_FILE) if args.rebuild else SearchIndex.load(INDEX_FILE)
+    counts = None
+    if not args.no_update:
+        counts = index.update(find_workflow_files(PROJECT_ROOT), PROJECT_ROOT)
+        if args.rebuild or any(counts[k] for k in ('indexed', 'removed', 'skipped')) or not INDEX_FILE.exists():
+            index.save()
+    indexed = time.perf_counter()
+
+    if args.stats or (args.rebuild and not args.query):
+        stats = index.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+        else:
+            print(f"{BOLD}{stats['workflows']} workflows{RESET} {GRAY}({stats['files']} files) in {INDEX_FILE}{RESET}")
+            for field in FIELDS:
+                print(f"  {field:<11} {stats['terms'][field]:>6} terms")
+            if counts:
+                print(f"{GRAY}Updated in {(indexed - started) * 1000:.0f} ms: {counts['indexed']} indexed, "
+                      f"{counts['unchanged']} unchanged, {counts['removed']} removed{RESET}")
+        if not args.query:
+            return
+
+    try:
+        # One clause per argument: the shell has already removed the quotes
+        hits = index.search(args.query)
+    except ValueError as e:
+        parser.error(str(e))
+    searched = time.perf_counter()
+
+    if args.json:
+        print(json.dumps([dict(hit, matches=[{'field': f, 'term': t, 'nodes': n} for f, t, n in hit['matches']])
+                          for hit in hits], indent=2, ensure_ascii=False))
+    elif args.files:
+        for hit in hits:
+            print(hit['file'])
+    else:
+        print_hits(hits)
+        color = GREEN if hits else YELLOW
+        refreshed = f", {counts['indexed']} file(s) re-indexed" if counts and counts['indexed'] else ""
+        print(f"{color}{len(hits)} workflow(s){RESET} {GRAY}in {(searched - started) * 1000:.1f} ms "
+              f"(search {(searched - indexed) * 1000:.1f} ms{refreshed}){RESET}")
+    sys.exit(0 if hits else 1)
+
+
+if __name__ == '__main__':
+    main()
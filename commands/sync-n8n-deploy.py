@@ -6,7 +6,7 @@ Pushes local workflow JSON files to the n8n instance running on the VM.
 This is the reverse operation of sync-n8n-export.py (local → VM instead of VM → local).
 
 Usage:
-    python sync-n8n-deploy.py [--activate] [--yes] [--force] [--dry-run] [--quiet]
+    python sync-n8n-deploy.py [--activate] [--yes] [--force] [--dry-run] [--quiet] [--resume]
 
 Options:
     --activate    Activate workflows after deployment
@@ -14,6 +14,18 @@ Options:
     --force       Deploy even if VM version is newer (dangerous)
     --dry-run     Preview what would be deployed without making changes
     --quiet       Suppress progress output
+    --shard i/n   Deploy only shard i of n (workflows partitioned by hashed ID)
+    --tag NAME    Only workflows with this n8n tag on the VM (repeatable)
+    --active-only Only workflows active on the VM
+    --dir PATH    Only local files under PATH (repeatable)
+    --resume      Continue an interrupted deploy from its checkpoint journal
+                  (no re-discovery; deployed workflows are skipped, pushed but
+                  not yet activated ones are only activated)
+    --instance NAMES        Deploy to these instance profiles (.n8n-instances.json)
+    --promote-from NAME     Deploy another instance's workflows instead of local files
+                            (e.g. --promote-from staging --instance production)
+    --metrics PATH          Write JSON run report (phase timings, requests, bytes)
+    --metrics-prom PATH     Write Prometheus textfile with the same metrics
 
 Safety Features:
     - Checks for uncommitted local changes (aborts unless --force)
@@ -39,20 +51,42 @@ Examples:
 
     # Force deploy even if VM is newer (dangerous)
     python sync-n8n-deploy.py --force --yes
+
+    # Finish a deploy that was interrupted (Ctrl-C, VPN drop)
+    python sync-n8n-deploy.py --resume --yes
+
+    # Deploy only the client projects' active workflows
+    python sync-n8n-deploy.py --dir "Projetos de Clientes" --active-only --dry-run
+
+    # Promote two workflows from staging to production
+    python sync-n8n-deploy.py --promote-from staging --instance production "Hotel Concierge" "Sales Assistant"
 """
 
 import os
 import sys
 import json
-import hashlib
-import requests
 import subprocess
 from pathlib import Path
 from datetime import datetime
 import io
 
-# Windows UTF-8 console fix
-if sys.platform == 'win32':
+from n8n_client import api_request, client_summary
+from n8n_hash import workflow_hash
+from n8n_instances import (
+    InstanceError, has_instance_profiles, select_instances, api_settings, map_file_path, use_instance,
+    instance_label
+)
+from n8n_journal import Journal
+from n8n_metrics import get_metrics, start_run, report_at_exit
+from n8n_selection import WorkflowSelection, list_selected_ids
+from n8n_shard import parse_shard, in_shard, shard_key, shard_label
+from n8n_workflow_map import (
+    load_workflow_map_file, name_index, file_index, relative_path, resolve_workflow_id
+)
+from n8n_sync_state import load_sync_state, save_sync_state, get_base_hash, record_synced
+
+# Windows UTF-8 console fix (once, even when imported by sync-n8n-full.py)
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
@@ -84,10 +118,13 @@ load_env()
 N8N_BASE_URL = os.getenv('N8N_API_URL', 'https://hub.descomplicador.pt/api/v1')
 N8N_API_KEY = os.getenv('N8N_API_KEY')
 
-if not N8N_API_KEY:
+if not N8N_API_KEY and not has_instance_profiles():
     print(f"{RED}✗ Error: N8N_API_KEY not found in environment or .env file{RESET}", file=sys.stderr)
     sys.exit(1)
 
+# Checkpoint stage between the PUT and activation (see n8n_journal.py)
+PUSHED = 'pushed'
+
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 WORKFLOW_MAP_FILE = PROJECT_ROOT / ".n8n-workflow-map.json"
@@ -95,34 +132,32 @@ WORKFLOW_MAP_FILE = PROJECT_ROOT / ".n8n-workflow-map.json"
 
 def get_json_hash(data: dict) -> str:
     """Calculate MD5 hash of essential workflow fields."""
-    essential = {
-        'name': data.get('name', ''),
-        'nodes': data.get('nodes', []),
-        'connections': data.get('connections', {}),
-        'settings': data.get('settings', {})
-    }
-    json_str = json.dumps(essential, sort_keys=True, separators=(',', ':'))
-    return hashlib.md5(json_str.encode()).hexdigest()
+    with get_metrics().phase('hash'):
+        return workflow_hash(data)
 
 
 def fetch_workflow_from_vm(workflow_id: str) -> dict:
     """Fetch workflow from n8n API."""
-    url = f"{N8N_BASE_URL}/workflows/{workflow_id}"
-    headers = {"X-N8N-API-KEY": N8N_API_KEY}
+    base_url, api_key = api_settings(N8N_BASE_URL, N8N_API_KEY)
+    url = f"{base_url}/workflows/{workflow_id}"
+    headers = {"X-N8N-API-KEY": api_key, "Accept": "application/json"}
 
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to fetch workflow from VM: {e}")
+    with get_metrics().phase('fetch'):
+        try:
+            status, reason, body = api_request('GET', url, headers, timeout=10)
+        except Exception as e:
+            raise Exception(f"Failed to fetch workflow from VM: {e}")
+        if status >= 400:
+            raise Exception(f"Failed to fetch workflow from VM: {status} {reason}")
+        return json.loads(body)
 
 
 def deploy_workflow_to_vm(workflow_id: str, workflow_data: dict) -> dict:
     """Deploy workflow to n8n API via PUT."""
-    url = f"{N8N_BASE_URL}/workflows/{workflow_id}"
+    base_url, api_key = api_settings(N8N_BASE_URL, N8N_API_KEY)
+    url = f"{base_url}/workflows/{workflow_id}"
     headers = {
-        "X-N8N-API-KEY": N8N_API_KEY,
+        "X-N8N-API-KEY": api_key,
         "Content-Type": "application/json"
     }
 
@@ -134,29 +169,39 @@ def deploy_workflow_to_vm(workflow_id: str, workflow_data: dict) -> dict:
         'settings': workflow_data.get('settings', {})
     }
 
-    try:
-        response = requests.put(url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to deploy workflow to VM: {e}")
+    body = json.dumps(payload).encode('utf-8')
+
+    with get_metrics().phase('push'):
+        try:
+            status, reason, response = api_request('PUT', url, headers, body=body, timeout=30)
+        except Exception as e:
+            raise Exception(f"Failed to deploy workflow to VM: {e}")
+        if status >= 400:
+            raise Exception(f"Failed to deploy workflow to VM: {status} {reason}")
+        return json.loads(response)
 
 
 def activate_workflow(workflow_id: str) -> bool:
     """Activate a workflow via n8n API."""
-    url = f"{N8N_BASE_URL}/workflows/{workflow_id}/activate"
-    headers = {"X-N8N-API-KEY": N8N_API_KEY}
+    base_url, api_key = api_settings(N8N_BASE_URL, N8N_API_KEY)
+    url = f"{base_url}/workflows/{workflow_id}/activate"
+    headers = {"X-N8N-API-KEY": api_key}
 
-    try:
-        response = requests.post(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        return True
-    except requests.exceptions.RequestException:
-        return False
+    with get_metrics().phase('push'):
+        try:
+            status, _, _ = api_request('POST', url, headers, timeout=10)
+        except Exception:
+            return False
+        return status < 400
 
 
 def get_git_status(file_path: Path) -> dict:
     """Check git status for a file."""
+    with get_metrics().phase('git'):
+        return _get_git_status(file_path)
+
+
+def _get_git_status(file_path: Path) -> dict:
     try:
         # Check if file has uncommitted changes
         result = subprocess.run(
@@ -213,8 +258,29 @@ def show_diff_summary(local_data: dict, vm_data: dict) -> None:
 
 def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
                    dry_run: bool = False, force: bool = False, auto_yes: bool = False,
-                   activate: bool = False, quiet: bool = False) -> tuple[bool, str]:
-    """Deploy a single workflow to VM."""
+                   activate: bool = False, quiet: bool = False,
+                   vm_data: dict | None = None,
+                   sync_state: dict | None = None,
+                   journal: Journal | None = None) -> tuple[bool, str]:
+    """Deploy a single workflow to VM.
+
+    ``vm_data`` is the current VM version if the caller already fetched it
+    (sync-n8n-full.py passes the payload from its status run).
+
+    If ``sync_state`` holds a last-synced base for this workflow, the conflict
+    check asks "did the VM change since the last sync?" instead of comparing
+    ``updatedAt`` timestamps, and a successful deploy records the new base.
+
+    With a ``journal`` (keyed by local file), the push is checkpointed before
+    activation, and a workflow the interrupted run already pushed is only
+    activated.
+    """
+    journal_key = relative_path(local_file, PROJECT_ROOT)
+    if journal is not None and journal.stage(journal_key) == PUSHED:
+        if not activate:
+            return True, "Deployed by the interrupted run"
+        activated = activate_workflow(workflow_id)
+        return True, f"Deployed by the interrupted run ({'activated' if activated else 'failed to activate'})"
 
     # Load local file
     try:
@@ -235,10 +301,11 @@ def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
         return False, f"Local file has uncommitted changes ({git_status['status_code']}). Commit first or use --force"
 
     # Fetch current VM version
-    try:
-        vm_data = fetch_workflow_from_vm(workflow_id)
-    except Exception as e:
-        return False, f"Failed to fetch VM version: {e}"
+    if vm_data is None:
+        try:
+            vm_data = fetch_workflow_from_vm(workflow_id)
+        except Exception as e:
+            return False, f"Failed to fetch VM version: {e}"
 
     # Calculate hashes
     local_hash = get_json_hash(local_data)
@@ -246,10 +313,19 @@ def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
 
     # Check if already synced
     if local_hash == vm_hash:
+        if sync_state is not None and not dry_run:
+            record_synced(sync_state, workflow_id, workflow_name, local_hash, local_data)
         return True, "Already synced (skipped)"
 
+    base_hash = get_base_hash(sync_state, workflow_id) if sync_state is not None else None
+
+    # Check if VM changed since the last sync (conflict)
+    if not force and base_hash:
+        if vm_hash != base_hash:
+            return False, "VM version changed since last sync. Use --force to overwrite or run sync-n8n-export.py first"
+
     # Check if VM is newer (conflict)
-    if not force:
+    elif not force:
         local_updated = local_data.get('updatedAt', '')
         vm_updated = vm_data.get('updatedAt', '')
 
@@ -261,7 +337,8 @@ def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
         print(f"\n{BOLD}{workflow_name}{RESET}")
         print(f"{GRAY}Local:  {local_hash[:8]}  ({local_file.name}){RESET}")
         print(f"{GRAY}VM:     {vm_hash[:8]}  (production){RESET}")
-        show_diff_summary(local_data, vm_data)
+        with get_metrics().phase('diff'):
+            show_diff_summary(local_data, vm_data)
 
     # Confirm deployment
     if not auto_yes and not quiet:
@@ -278,6 +355,13 @@ def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
     except Exception as e:
         return False, f"Deployment failed: {e}"
 
+    if sync_state is not None:
+        record_synced(sync_state, workflow_id, workflow_name, local_hash, local_data)
+    if journal is not None:
+        journal.record(journal_key, PUSHED)
+        if sync_state is not None:
+            save_sync_state(sync_state)
+
     # Activate if requested
     activation_msg = ""
     if activate:
@@ -290,14 +374,14 @@ def deploy_workflow(workflow_id: str, workflow_name: str, local_file: Path,
 
 
 def load_workflow_map() -> dict:
-    """Load workflow name → ID mapping."""
-    if not WORKFLOW_MAP_FILE.exists():
-        print(f"{RED}✗ Error: {WORKFLOW_MAP_FILE} not found{RESET}")
+    """Load the ID-keyed workflow map (of the active instance, if any)."""
+    map_file = map_file_path(WORKFLOW_MAP_FILE)
+    if not map_file.exists():
+        print(f"{RED}✗ Error: {map_file} not found{RESET}")
         print(f"{YELLOW}Run sync-n8n-status.py first to generate the workflow map.{RESET}")
         sys.exit(1)
 
-    with open(WORKFLOW_MAP_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_workflow_map_file(map_file)
 
 
 def find_local_workflows() -> list[tuple[str, Path]]:
@@ -318,7 +402,7 @@ def find_local_workflows() -> list[tuple[str, Path]]:
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
-            if 'nodes' in data and 'connections' in data and 'name' in data:
+            if isinstance(data, dict) and 'nodes' in data and 'connections' in data and 'name' in data:
                 workflow_name = data['name']
                 workflows.append((workflow_name, json_file))
         except (json.JSONDecodeError, KeyError):
@@ -327,39 +411,44 @@ def find_local_workflows() -> list[tuple[str, Path]]:
     return workflows
 
 
-def main():
-    import argparse
-
-    parser = argparse.ArgumentParser(
-        description='Deploy local n8n workflows to production VM',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=__doc__
-    )
-    parser.add_argument('--activate', action='store_true', help='Activate workflows after deployment')
-    parser.add_argument('--yes', action='store_true', help='Auto-confirm all deployments')
-    parser.add_argument('--force', action='store_true', help='Deploy even if VM version is newer')
-    parser.add_argument('--dry-run', action='store_true', help='Preview without deploying')
-    parser.add_argument('--quiet', action='store_true', help='Suppress progress output')
-
-    args = parser.parse_args()
-
-    # Header
-    if not args.quiet:
-        print(f"\n{BOLD}{BLUE}n8n Workflow Deployment{RESET}")
-        print(f"{GRAY}{'=' * 60}{RESET}\n")
-
-        if args.dry_run:
-            print(f"{YELLOW}[DRY RUN MODE]{RESET}\n")
-
-    # Load workflow map
-    workflow_map = load_workflow_map()
-
-    # Find local workflows
-    local_workflows = find_local_workflows()
-
-    if not local_workflows:
-        print(f"{RED}✗ No workflows found in local directory{RESET}")
-        sys.exit(1)
+def select_targets(targets: list[tuple[str, Path, str | None]],
+                   selection: WorkflowSelection) -> list[tuple[str, Path, str | None]] | None:
+    """Narrow deploy targets to --dir, then --tag/--active-only (one filtered listing).
+
+    Returns None if the VM listing failed.
+    """
+    targets = [t for t in targets if selection.matches_file(relative_path(t[1], PROJECT_ROOT))]
+    if not selection.needs_listing or not targets:
+        return targets
+    allowed_ids = list_selected_ids(*api_settings(N8N_BASE_URL, N8N_API_KEY), selection)
+    if allowed_ids is None:
+        print(f"{RED}✗ Could not list workflows ({selection.describe()}){RESET}", file=sys.stderr)
+        return None
+    return [t for t in targets if t[2] in allowed_ids]
+
+
+def run_deploy(targets: list[tuple[str, Path, str | None]], activate: bool = False,
+               auto_yes: bool = False, force: bool = False, dry_run: bool = False,
+               quiet: bool = False, vm_payloads: dict | None = None,
+               journal: Journal | None = None, sync_state: dict | None = None) -> dict:
+    """Deploy (workflow_name, local_file, workflow_id) targets and print a summary.
+
+    Targets without a workflow ID are local-only and counted as skipped.
+    ``vm_payloads`` maps workflow ID → already-fetched VM version.
+    With a ``journal`` (see n8n_journal.py), workflows it marks done are
+    skipped, each finished one is checkpointed, and the journal is removed
+    once all are done.
+    ``sync_state`` is the caller's loaded sync state, shared so bases other
+    steps of the same run record are not overwritten (default: loaded here).
+
+    Returns:
+        Counts dict with total, deployed, skipped and errors.
+    """
+    vm_payloads = vm_payloads or {}
+    metrics = get_metrics()
+    if sync_state is None:
+        sync_state = load_sync_state()
+    state_before = json.dumps(sync_state, sort_keys=True)
 
     # Deploy workflows
     total = 0
@@ -367,43 +456,63 @@ def main():
     skipped = 0
     errors = 0
 
-    for workflow_name, local_file in sorted(local_workflows, key=lambda x: x[0]):
+    for workflow_name, local_file, workflow_id in targets:
         # Check if workflow exists on VM
-        if workflow_name not in workflow_map:
-            if not args.quiet:
+        if not workflow_id:
+            if not quiet:
                 print(f"{GRAY}⊘ {workflow_name} — not deployed to VM (local-only){RESET}")
             skipped += 1
             continue
 
-        workflow_id = workflow_map[workflow_name]
         total += 1
 
+        journal_key = relative_path(local_file, PROJECT_ROOT)
+        if journal is not None and journal.is_done(journal_key):
+            if not quiet:
+                print(f"{GRAY}⊙ {workflow_name} — Deployed by the interrupted run (skipped){RESET}")
+            skipped += 1
+            continue
+
         # Deploy
-        success, message = deploy_workflow(
-            workflow_id, workflow_name, local_file,
-            dry_run=args.dry_run,
-            force=args.force,
-            auto_yes=args.yes,
-            activate=args.activate,
-            quiet=args.quiet
-        )
+        with metrics.workflow(workflow_id):
+            success, message = deploy_workflow(
+                workflow_id, workflow_name, local_file,
+                dry_run=dry_run,
+                force=force,
+                auto_yes=auto_yes,
+                activate=activate,
+                quiet=quiet,
+                vm_data=vm_payloads.get(workflow_id),
+                sync_state=sync_state,
+                journal=journal
+            )
+
+        if journal is not None and success and message != "Skipped by user":
+            journal.record(journal_key)
 
         # Report result
         if success:
             if "skipped" in message.lower():
-                if not args.quiet:
+                if not quiet:
                     print(f"{GRAY}⊙ {workflow_name} — {message}{RESET}")
                 skipped += 1
             else:
-                if not args.quiet:
+                if not quiet:
                     print(f"{GREEN}✓ {workflow_name} — {message}{RESET}")
                 deployed += 1
         else:
             print(f"{RED}✗ {workflow_name} — {message}{RESET}")
             errors += 1
 
+    # Record new last-synced bases
+    if json.dumps(sync_state, sort_keys=True) != state_before:
+        save_sync_state(sync_state)
+
+    if journal is not None and journal.remaining() == 0:
+        journal.finish()
+
     # Summary
-    if not args.quiet:
+    if not quiet:
         print(f"\n{GRAY}{'=' * 60}{RESET}")
         print(f"{BOLD}Summary:{RESET}")
         print(f"  Total workflows checked: {total}")
@@ -411,8 +520,278 @@ def main():
         print(f"  {GRAY}Skipped: {skipped}{RESET}")
         if errors > 0:
             print(f"  {RED}Errors: {errors}{RESET}")
+        print(f"  {GRAY}{client_summary()}{RESET}")
         print()
 
+    return {'total': total, 'deployed': deployed, 'skipped': skipped, 'errors': errors}
+
+
+def promote_workflows(source: dict, targets: list[dict], names: list[str] | None = None,
+                      activate: bool = False, auto_yes: bool = False, dry_run: bool = False,
+                      quiet: bool = False, source_payloads: dict | None = None) -> dict:
+    """Deploy workflows from one instance to others (e.g. staging → production).
+
+    Each source workflow is fetched once and that payload is deployed to
+    every target instance, matched by name through each instance's map.
+    ``source_payloads`` (source workflow ID → workflow) lets a caller that
+    already fetched the source, e.g. a status run, skip even that fetch.
+    Local files and the sync state are not touched.
+
+    Returns:
+        Counts dict with total, deployed, skipped and errors.
+    """
+    source_payloads = dict(source_payloads or {})
+    metrics = get_metrics()
+
+    with use_instance(source):
+        with metrics.phase('discover'):
+            source_map = name_index(load_workflow_map())
+        names = names or sorted(source_map)
+
+        for name in names:
+            source_id = source_map.get(name)
+            if source_id and source_id not in source_payloads:
+                try:
+                    source_payloads[source_id] = fetch_workflow_from_vm(source_id)
+                except Exception as e:
+                    print(f"{RED}✗ {name} — {e}{RESET}")
+
+    total = deployed = skipped = errors = 0
+
+    for target in targets:
+        if not quiet:
+            print(f"\n{BOLD}{source['name']} → {target['name']}{RESET}")
+
+        with use_instance(target):
+            with metrics.phase('discover'):
+                target_map = name_index(load_workflow_map())
+
+            for name in names:
+                source_id = source_map.get(name)
+                payload = source_payloads.get(source_id) if source_id else None
+                target_id = target_map.get(name)
+                if payload is None or not target_id:
+                    where = source['name'] if payload is None else target['name']
+                    if not quiet:
+                        print(f"{GRAY}⊘ {name} — not on {where}{RESET}")
+                    skipped += 1
+                    continue
+
+                total += 1
+                with metrics.workflow(target_id):
+                    try:
+                        target_data = fetch_workflow_from_vm(target_id)
+                    except Exception as e:
+                        print(f"{RED}✗ {name} — {e}{RESET}")
+                        errors += 1
+                        continue
+
+                    source_hash = get_json_hash(payload)
+                    if source_hash == get_json_hash(target_data):
+                        if not quiet:
+                            print(f"{GRAY}⊙ {name} — Already synced (skipped){RESET}")
+                        skipped += 1
+                        continue
+
+                    if not quiet:
+                        print(f"\n{BOLD}{name}{RESET}")
+                        print(f"{GRAY}{source['name']}: {source_hash[:8]}  →  "
+                              f"{target['name']}: {get_json_hash(target_data)[:8]}{RESET}")
+                        with metrics.phase('diff'):
+                            show_diff_summary(payload, target_data)
+
+                    if not auto_yes and not quiet:
+                        if not confirm_action(f"Promote '{name}' to {target['name']}?", default_yes=True):
+                            skipped += 1
+                            continue
+
+                    if dry_run:
+                        if not quiet:
+                            print(f"{YELLOW}⊙ {name} — Would promote (dry-run){RESET}")
+                        deployed += 1
+                        continue
+
+                    try:
+                        deploy_workflow_to_vm(target_id, payload)
+                    except Exception as e:
+                        print(f"{RED}✗ {name} — Promotion failed: {e}{RESET}")
+                        errors += 1
+                        continue
+
+                    activation_msg = ""
+                    if activate:
+                        activation_msg = " (activated)" if activate_workflow(target_id) else " (failed to activate)"
+                    if not quiet:
+                        print(f"{GREEN}✓ {name} — Promoted{activation_msg}{RESET}")
+                    deployed += 1
+
+    if not quiet:
+        print(f"\n{GRAY}{'=' * 60}{RESET}")
+        print(f"{BOLD}Summary:{RESET}")
+        print(f"  Total workflows checked: {total}")
+        print(f"  {GREEN}{'Would promote' if dry_run else 'Promoted'}: {deployed}{RESET}")
+        print(f"  {GRAY}Skipped: {skipped}{RESET}")
+        if errors > 0:
+            print(f"  {RED}Errors: {errors}{RESET}")
+        print(f"  {GRAY}{client_summary()}{RESET}")
+        print()
+
+    return {'total': total, 'deployed': deployed, 'skipped': skipped, 'errors': errors}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Deploy local n8n workflows to production VM',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--activate', action='store_true', help='Activate workflows after deployment')
+    parser.add_argument('--yes', action='store_true', help='Auto-confirm all deployments')
+    parser.add_argument('--force', action='store_true', help='Deploy even if VM version is newer')
+    parser.add_argument('--dry-run', action='store_true', help='Preview without deploying')
+    parser.add_argument('--quiet', action='store_true', help='Suppress progress output')
+    parser.add_argument('--shard', metavar='i/n', type=parse_shard,
+                        help='Deploy only shard i of n (workflows partitioned by hashed ID)')
+    parser.add_argument('--tag', action='append', metavar='NAME',
+                        help='Only workflows with this n8n tag (repeatable or comma-separated)')
+    parser.add_argument('--active-only', action='store_true', help='Only workflows active on the VM')
+    parser.add_argument('--dir', action='append', metavar='PATH',
+                        help='Only local files under this directory (repeatable)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted deploy from its checkpoint journal')
+    parser.add_argument('--instance', metavar='NAMES',
+                        help="Deploy to these instance profiles (comma-separated or 'all')")
+    parser.add_argument('--promote-from', metavar='NAME',
+                        help='Deploy from this instance instead of local files (needs --instance)')
+    parser.add_argument('workflows', nargs='*', metavar='NAME',
+                        help='With --promote-from: workflow names to promote (default: all)')
+    parser.add_argument('--metrics', metavar='PATH', help='Write JSON run report')
+    parser.add_argument('--metrics-prom', metavar='PATH', help='Write Prometheus textfile')
+
+    args = parser.parse_args()
+
+    if args.promote_from and not args.instance:
+        parser.error('--promote-from needs --instance (the target instances)')
+    if args.workflows and not args.promote_from:
+        parser.error('workflow names are only used with --promote-from')
+    if args.shard and (args.promote_from or args.resume):
+        parser.error('--shard applies to a new local deploy (no --promote-from or --resume)')
+    if args.resume and (args.promote_from or args.dry_run):
+        parser.error('--resume continues an interrupted local deploy (no --promote-from or --dry-run)')
+    selection = WorkflowSelection(args.tag, args.active_only, args.dir)
+    if selection and (args.promote_from or args.resume):
+        parser.error('--tag/--active-only/--dir apply to a new local deploy (no --promote-from or --resume)')
+
+    metrics = start_run('sync-n8n-deploy')
+    report_at_exit(metrics, args.metrics, args.metrics_prom)
+
+    instances = None
+    if args.instance:
+        try:
+            instances = select_instances(args.instance)
+            source = select_instances(args.promote_from)[0] if args.promote_from else None
+        except InstanceError as e:
+            print(f"{RED}✗ {e}{RESET}", file=sys.stderr)
+            sys.exit(1)
+
+    # Header
+    if not args.quiet:
+        print(f"\n{BOLD}{BLUE}n8n Workflow Deployment{RESET}")
+        print(f"{GRAY}{'=' * 60}{RESET}\n")
+
+        if args.dry_run:
+            print(f"{YELLOW}[DRY RUN MODE]{RESET}\n")
+
+    # Promotion: instance → instances, no local files involved
+    if args.promote_from:
+        counts = promote_workflows(
+            source, [i for i in instances if i['name'] != source['name']],
+            names=args.workflows or None,
+            activate=args.activate,
+            auto_yes=args.yes,
+            dry_run=args.dry_run,
+            quiet=args.quiet
+        )
+        sys.exit(1 if counts['errors'] > 0 else 0)
+
+    # Find local workflows (a resumed run takes its plan from the journal instead)
+    local_workflows = None
+    if not args.resume:
+        with metrics.phase('discover'):
+            local_workflows = find_local_workflows()
+
+        if not local_workflows:
+            print(f"{RED}✗ No workflows found in local directory{RESET}")
+            sys.exit(1)
+
+    errors = 0
+    try:
+        for instance in instances or [None]:
+            with use_instance(instance):
+                if instance and not args.quiet:
+                    print(f"{BOLD}Instance: {instance['name']}{RESET} {GRAY}({instance['url']}){RESET}")
+
+                journal = None if args.dry_run else Journal('sync-n8n-deploy')
+                force, activate = args.force, args.activate
+                if args.resume:
+                    if not journal.load():
+                        print(f"{YELLOW}No interrupted deploy{instance_label()} to resume{RESET}")
+                        continue
+                    if not args.quiet:
+                        print(f"{CYAN}Resuming deploy{instance_label()} started {journal.started_at}: "
+                              f"{journal.remaining()} of {len(journal.plan)} workflow(s) left{RESET}")
+                    # Continue with the interrupted run's plan and options
+                    targets = [(item['name'], PROJECT_ROOT / item['file'], item['id']) for item in journal.plan]
+                    force = force or journal.header['options'].get('force', False)
+                    activate = activate or journal.header['options'].get('activate', False)
+                else:
+                    with metrics.phase('discover'):
+                        workflow_map = load_workflow_map()
+                    lookups = (file_index(workflow_map), name_index(workflow_map))
+
+                    # Resolve IDs by recorded file first, so renamed workflows still match
+                    targets = [
+                        (workflow_name, local_file,
+                         resolve_workflow_id(workflow_map, lookups, relative_path(local_file, PROJECT_ROOT),
+                                             workflow_name))
+                        for workflow_name, local_file in sorted(local_workflows, key=lambda x: x[0])
+                    ]
+                    if args.shard:
+                        targets = [t for t in targets
+                                   if in_shard(shard_key(t[2], relative_path(t[1], PROJECT_ROOT)), args.shard)]
+                        if not args.quiet:
+                            print(f"{GRAY}{len(targets)} workflow file(s){shard_label(args.shard)}{RESET}")
+                    if selection:
+                        targets = select_targets(targets, selection)
+                        if targets is None:
+                            errors += 1
+                            continue
+                        if not args.quiet:
+                            print(f"{GRAY}{len(targets)} workflow file(s) selected ({selection.describe()}){RESET}")
+                    if journal is not None:
+                        journal.begin(
+                            [{'key': relative_path(local_file, PROJECT_ROOT), 'id': workflow_id, 'name': name,
+                              'file': relative_path(local_file, PROJECT_ROOT)}
+                             for name, local_file, workflow_id in targets if workflow_id],
+                            {'force': force, 'activate': activate}
+                        )
+
+                counts = run_deploy(
+                    targets,
+                    activate=activate,
+                    auto_yes=args.yes,
+                    force=force,
+                    dry_run=args.dry_run,
+                    quiet=args.quiet,
+                    journal=journal
+                )
+                errors += counts['errors']
+    except KeyboardInterrupt:
+        print(f"\n{YELLOW}Interrupted — continue with: python commands/sync-n8n-deploy.py --resume{RESET}")
+        sys.exit(130)
+
     # Exit code
     sys.exit(1 if errors > 0 else 0)
 
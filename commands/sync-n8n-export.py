@@ -15,12 +15,24 @@ Options:
     --dry-run       Show what would be exported without making changes
     --quiet         Suppress progress output
     --no-backup     Don't create .bak files before overwriting
+    --shard i/n     Export only shard i of n (workflows partitioned by hashed ID)
+    --tag NAME      Only workflows with this n8n tag (repeatable / comma-separated)
+    --active-only   Only workflows active on the VM
+    --dir PATH      Only workflows whose local file is under PATH (repeatable)
+    --resume        Continue an interrupted export from its checkpoint journal
+                    (no re-discovery; workflows already exported are skipped)
+    --instance NAMES        Export from these instance profiles (.n8n-instances.json),
+                            comma-separated or 'all'; drift is checked concurrently
+    --metrics PATH          Write JSON run report (phase timings, requests, bytes)
+    --metrics-prom PATH     Write Prometheus textfile with the same metrics
 
 Examples:
     python commands/sync-n8n-export.py                    # Interactive mode
     python commands/sync-n8n-export.py --dry-run          # Preview changes
     python commands/sync-n8n-export.py 42 37              # Export specific workflows
     python commands/sync-n8n-export.py --yes              # Auto-confirm all
+    python commands/sync-n8n-export.py --resume --yes     # Finish an interrupted run
+    python commands/sync-n8n-export.py --tag vapi --dry-run  # Only the Vapi tool workflows
 """
 
 import json
@@ -31,13 +43,24 @@ import hashlib
 import subprocess
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
-import urllib.request
-import urllib.error
 from datetime import datetime
 import io
 
-# Force UTF-8 encoding for Windows console
-if sys.platform == 'win32':
+from n8n_client import api_request, client_summary
+from n8n_hash import workflow_hash
+from n8n_instances import (
+    InstanceError, has_instance_profiles, select_instances, pop_instance_args,
+    api_settings, map_file_path, run_per_instance, use_instance, instance_label
+)
+from n8n_journal import Journal
+from n8n_metrics import get_metrics, start_run, pop_metrics_args, report_at_exit
+from n8n_selection import WorkflowSelection, pop_selection_args, list_selected_ids
+from n8n_shard import Shard, pop_shard_args, in_shard, shard_key
+from n8n_workflow_map import load_workflow_map_file, workflow_file, relative_path
+from n8n_sync_state import load_sync_state, save_sync_state, record_synced
+
+# Force UTF-8 encoding for Windows console (once, even when imported by sync-n8n-full.py)
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
@@ -69,7 +92,7 @@ load_env()
 N8N_API_URL = os.getenv('N8N_API_URL', 'https://hub.descomplicador.pt/api/v1')
 N8N_API_KEY = os.getenv('N8N_API_KEY')
 
-if not N8N_API_KEY:
+if not N8N_API_KEY and not has_instance_profiles():
     print(f"{Colors.RED}✗ Error: N8N_API_KEY not found in environment or .env file{Colors.RESET}", file=sys.stderr)
     sys.exit(1)
 
@@ -78,50 +101,54 @@ WORKFLOW_MAP_FILE = ".n8n-workflow-map.json"
 
 def get_json_hash(data: dict) -> str:
     """Get deterministic hash of JSON data (ignoring field order)."""
-    essential = {
-        'name': data.get('name', ''),
-        'nodes': data.get('nodes', []),
-        'connections': data.get('connections', {}),
-        'settings': data.get('settings', {})
-    }
-    json_str = json.dumps(essential, sort_keys=True, separators=(',', ':'))
-    return hashlib.md5(json_str.encode()).hexdigest()
+    with get_metrics().phase('hash'):
+        return workflow_hash(data)
 
 
 def call_n8n_api(endpoint: str, method: str = "GET") -> Optional[dict]:
     """Call n8n API and return JSON response."""
-    url = f"{N8N_API_URL}/{endpoint}"
-    req = urllib.request.Request(url, method=method)
-    req.add_header("X-N8N-API-KEY", N8N_API_KEY)
-    req.add_header("Accept", "application/json")
+    api_url, api_key = api_settings(N8N_API_URL, N8N_API_KEY)
+    url = f"{api_url}/{endpoint}"
+    headers = {"X-N8N-API-KEY": api_key, "Accept": "application/json"}
+    metrics = get_metrics()
 
-    try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
+    with metrics.phase('fetch'):
+        try:
+            status, reason, body = api_request(method, url, headers, timeout=10)
+        except Exception as e:
+            print(f"{Colors.RED}Connection error: {e}{Colors.RESET}", file=sys.stderr)
             return None
-        print(f"{Colors.RED}API Error {e.code}: {e.reason}{Colors.RESET}", file=sys.stderr)
-        return None
-    except Exception as e:
-        print(f"{Colors.RED}Connection error: {e}{Colors.RESET}", file=sys.stderr)
-        return None
 
+        if status == 404:
+            return None
+        if status >= 400:
+            print(f"{Colors.RED}API Error {status}: {reason}{Colors.RESET}", file=sys.stderr)
+            return None
+        try:
+            return json.loads(body.decode())
+        except ValueError as e:
+            print(f"{Colors.RED}Invalid API response: {e}{Colors.RESET}", file=sys.stderr)
+            return None
 
-def load_workflow_map() -> Dict[str, str]:
-    """Load workflow name -> ID mapping."""
-    map_file = Path(WORKFLOW_MAP_FILE)
+
+def load_workflow_map() -> dict:
+    """Load the ID-keyed workflow map (of the active instance, if any)."""
+    map_file = map_file_path(Path(WORKFLOW_MAP_FILE))
     if not map_file.exists():
-        print(f"{Colors.RED}Error: {WORKFLOW_MAP_FILE} not found{Colors.RESET}")
+        print(f"{Colors.RED}Error: {map_file.name} not found{Colors.RESET}")
         print(f"Run sync-n8n-status.py first to generate the workflow map")
         sys.exit(1)
 
-    with open(map_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_workflow_map_file(map_file)
 
 
 def get_git_status(file_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
     """Check if file has uncommitted changes, last commit date, and committed hash."""
+    with get_metrics().phase('git'):
+        return _get_git_status(file_path)
+
+
+def _get_git_status(file_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
     try:
         # Check if file is tracked
         result = subprocess.run(
@@ -174,8 +201,18 @@ def get_git_status(file_path: Path) -> Tuple[bool, Optional[str], Optional[str]]
         return False, None, None
 
 
-def find_workflow_file(workflow_name: str) -> Optional[Path]:
-    """Find local JSON file for a workflow by name."""
+def find_workflow_file(workflow_name: str, workflow_map: Optional[dict] = None,
+                       workflow_id: Optional[str] = None) -> Optional[Path]:
+    """Find local JSON file for a workflow: its file in the map, else by name (full scan)."""
+    with get_metrics().phase('discover'):
+        if workflow_map is not None and workflow_id:
+            local_file = workflow_file(workflow_map, workflow_id, Path.cwd())
+            if local_file:
+                return local_file
+        return _find_workflow_file(workflow_name)
+
+
+def _find_workflow_file(workflow_name: str) -> Optional[Path]:
     base_path = Path.cwd()
     search_dirs = ["MVP's", "Ferramentas", "Projetos de Clientes", "Módulos reutilizáveis"]
 
@@ -261,21 +298,31 @@ def export_workflow(
     force: bool = False,
     auto_yes: bool = False,
     create_backup_file: bool = True,
-    quiet: bool = False
+    quiet: bool = False,
+    vm_workflow: Optional[dict] = None,
+    local_file: Optional[Path] = None,
+    sync_state: Optional[dict] = None
 ) -> Tuple[bool, str]:
     """
     Export a single workflow from VM to local file.
 
+    ``vm_workflow`` and ``local_file`` may be passed in by callers that have
+    already fetched the VM payload / located the file (sync-n8n-full.py);
+    otherwise they are fetched and searched for here. If ``sync_state`` is
+    given, the exported hash is recorded as the new last-synced base.
+
     Returns:
         (success: bool, message: str)
     """
     # Fetch workflow from VM
-    vm_workflow = call_n8n_api(f"workflows/{workflow_id}")
+    if vm_workflow is None:
+        vm_workflow = call_n8n_api(f"workflows/{workflow_id}")
     if not vm_workflow:
         return False, "Failed to fetch from VM API"
 
     # Find local file
-    local_file = find_workflow_file(workflow_name)
+    if local_file is None:
+        local_file = find_workflow_file(workflow_name)
     if not local_file:
         return False, f"Local file not found for workflow '{workflow_name}'"
 
@@ -291,6 +338,8 @@ def export_workflow(
     vm_hash = get_json_hash(vm_workflow)
 
     if local_hash == vm_hash:
+        if sync_state is not None and not dry_run:
+            record_synced(sync_state, workflow_id, workflow_name, vm_hash, vm_workflow)
         return True, "Already in sync (skipped)"
 
     # Check git status
@@ -315,7 +364,8 @@ def export_workflow(
             print(f"  {Colors.YELLOW}⚠️  Has uncommitted changes{Colors.RESET}")
 
         print(f"\n{Colors.CYAN}Changes from VM:{Colors.RESET}")
-        changes = show_diff_summary(local_data, vm_workflow)
+        with get_metrics().phase('diff'):
+            changes = show_diff_summary(local_data, vm_workflow)
         for change in changes[:10]:  # Limit to 10 changes
             print(change)
         if len(changes) > 10:
@@ -329,87 +379,64 @@ def export_workflow(
         if not confirm_action(f"\n{Colors.BOLD}Export from VM?{Colors.RESET}", default_yes=True):
             return True, "Skipped by user"
 
-    # Create backup
-    if create_backup_file:
+    with get_metrics().phase('write'):
+        # Create backup
+        if create_backup_file:
+            try:
+                backup_path = create_backup(local_file)
+                if not quiet:
+                    print(f"{Colors.GREEN}✓ Backup created: {backup_path.name}{Colors.RESET}")
+            except Exception as e:
+                return False, f"Failed to create backup: {e}"
+
+        # Write VM data to local file (preserving formatting)
         try:
-            backup_path = create_backup(local_file)
-            if not quiet:
-                print(f"{Colors.GREEN}✓ Backup created: {backup_path.name}{Colors.RESET}")
+            with open(local_file, 'w', encoding='utf-8') as f:
+                json.dump(vm_workflow, f, indent=2, ensure_ascii=False)
+                f.write('\n')  # Add trailing newline
         except Exception as e:
-            return False, f"Failed to create backup: {e}"
-
-    # Write VM data to local file (preserving formatting)
-    try:
-        with open(local_file, 'w', encoding='utf-8') as f:
-            json.dump(vm_workflow, f, indent=2, ensure_ascii=False)
-            f.write('\n')  # Add trailing newline
-
-        return True, f"{Colors.GREEN}✓ Exported from VM{Colors.RESET}"
-    except Exception as e:
-        return False, f"Failed to write file: {e}"
-
-
-def main():
-    """Main entry point."""
-    # Parse arguments
-    args = sys.argv[1:]
-
-    dry_run = '--dry-run' in args
-    force = '--force' in args
-    auto_yes = '--yes' in args
-    quiet = '--quiet' in args
-    no_backup = '--no-backup' in args
-
-    # Filter out flags to get workflow IDs
-    workflow_ids = [arg for arg in args if not arg.startswith('--')]
+            return False, f"Failed to write file: {e}"
 
-    # Change to script directory
-    os.chdir(Path(__file__).parent.parent)
-
-    # Load workflow map
-    workflow_map = load_workflow_map()
+    if sync_state is not None:
+        record_synced(sync_state, workflow_id, workflow_name, vm_hash, vm_workflow)
+    return True, f"{Colors.GREEN}✓ Exported from VM{Colors.RESET}"
 
-    # Reverse map (ID -> name)
-    id_to_name = {v: k for k, v in workflow_map.items()}
-
-    # Determine which workflows to export
-    if workflow_ids:
-        # Export specific workflows
-        workflows_to_export = []
-        for wf_id in workflow_ids:
-            if wf_id in id_to_name:
-                workflows_to_export.append((wf_id, id_to_name[wf_id]))
-            else:
-                print(f"{Colors.YELLOW}Warning: Workflow ID {wf_id} not found in map{Colors.RESET}")
-    else:
-        # Export all workflows (that need it)
-        # Run status check to find workflows with drift
-        workflows_to_export = []
 
-        for name, wf_id in workflow_map.items():
-            local_file = find_workflow_file(name)
-            if not local_file:
-                continue
-
-            try:
-                with open(local_file, 'r', encoding='utf-8') as f:
-                    local_data = json.load(f)
-            except:
-                continue
+def run_export(
+    workflows_to_export: List[Tuple[str, str]],
+    dry_run: bool = False,
+    force: bool = False,
+    auto_yes: bool = False,
+    create_backup_file: bool = True,
+    quiet: bool = False,
+    vm_payloads: Optional[Dict[str, dict]] = None,
+    local_files: Optional[Dict[str, Path]] = None,
+    journal: Optional[Journal] = None,
+    sync_state: Optional[dict] = None
+) -> List[Tuple[str, bool, str]]:
+    """
+    Export a list of (workflow_id, workflow_name) pairs and print a summary.
 
-            vm_workflow = call_n8n_api(f"workflows/{wf_id}")
-            if not vm_workflow:
-                continue
+    ``vm_payloads`` and ``local_files`` (keyed by workflow ID) let
+    sync-n8n-full.py hand over what its status run already fetched, so
+    nothing is fetched or searched for twice.
 
-            local_hash = get_json_hash(local_data)
-            vm_hash = get_json_hash(vm_workflow)
+    With a ``journal`` (see n8n_journal.py), workflows it marks done are
+    skipped, each finished workflow is checkpointed (together with its
+    sync base), and the journal is removed once all succeeded.
 
-            if local_hash != vm_hash:
-                workflows_to_export.append((wf_id, name))
+    ``sync_state`` is the caller's loaded sync state, shared so bases other
+    steps of the same run record are not overwritten (default: loaded here).
 
-    if not workflows_to_export:
-        print(f"{Colors.GREEN}✓ All workflows are already in sync!{Colors.RESET}")
-        sys.exit(0)
+    Returns:
+        List of (workflow_name, success, message)
+    """
+    vm_payloads = vm_payloads or {}
+    local_files = local_files or {}
+    metrics = get_metrics()
+    if sync_state is None:
+        sync_state = load_sync_state()
+    state_before = json.dumps(sync_state, sort_keys=True)
 
     # Print header
     if not quiet:
@@ -430,27 +457,47 @@ def main():
     # Export workflows
     results = []
     for wf_id, wf_name in workflows_to_export:
+        if journal is not None and journal.is_done(wf_id):
+            results.append((wf_name, True, "Exported by the interrupted run (skipped)"))
+            continue
+
         if not quiet:
             print(f"{Colors.CYAN}Processing: {wf_name}...{Colors.RESET}")
 
-        success, message = export_workflow(
-            wf_id,
-            wf_name,
-            dry_run=dry_run,
-            force=force,
-            auto_yes=auto_yes,
-            create_backup_file=not no_backup,
-            quiet=quiet
-        )
+        with metrics.workflow(wf_id):
+            success, message = export_workflow(
+                wf_id,
+                wf_name,
+                dry_run=dry_run,
+                force=force,
+                auto_yes=auto_yes,
+                create_backup_file=create_backup_file,
+                quiet=quiet,
+                vm_workflow=vm_payloads.get(wf_id),
+                local_file=local_files.get(wf_id),
+                sync_state=sync_state
+            )
 
         results.append((wf_name, success, message))
 
+        if journal is not None and success and message != "Skipped by user":
+            journal.record(wf_id)
+            # Keep the base in step with the checkpoint, so it survives an interruption
+            save_sync_state(sync_state)
+
         if not quiet:
             if success:
                 print(f"  {message}\n")
             else:
                 print(f"  {Colors.RED}✗ {message}{Colors.RESET}\n")
 
+    # Record new last-synced bases
+    if json.dumps(sync_state, sort_keys=True) != state_before:
+        save_sync_state(sync_state)
+
+    if journal is not None and journal.remaining() == 0:
+        journal.finish()
+
     # Print summary
     if not quiet:
         print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
@@ -468,6 +515,7 @@ def main():
                 for name, success, message in results:
                     if not success:
                         print(f"  • {name}: {message}")
+        print(client_summary())
 
         print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
 
@@ -480,6 +528,280 @@ def main():
             print("  git push                      # Sync to GitHub")
             print()
 
+    return results
+
+
+def select_workflows(
+    workflow_map: dict,
+    workflow_ids: Optional[List[str]] = None,
+    warn: bool = True,
+    shard: Optional[Shard] = None,
+    selection: Optional[WorkflowSelection] = None
+) -> Tuple[List[Tuple[str, str]], Dict[str, dict], Dict[str, Path]]:
+    """
+    Pick the workflows to export: the given IDs, or every mapped workflow
+    whose local file differs from the VM. Local files come from the map
+    where recorded, so only unlinked workflows trigger a scan by name.
+    With ``shard`` or ``selection`` (--tag/--active-only/--dir), workflows
+    outside them are dropped before any per-workflow fetch.
+
+    Returns:
+        (workflows_to_export, vm_payloads, local_files) for run_export()
+    """
+    vm_payloads = {}
+    local_files = {}
+    workflows_to_export = []
+    entries = {wf_id: entry for wf_id, entry in workflow_map['workflows'].items()
+               if in_shard(shard_key(wf_id), shard)}
+    if selection and selection.needs_listing:
+        allowed_ids = list_selected_ids(*api_settings(N8N_API_URL, N8N_API_KEY), selection)
+        if allowed_ids is None:
+            print(f"{Colors.RED}✗ Could not list workflows ({selection.describe()}){Colors.RESET}",
+                  file=sys.stderr)
+            return workflows_to_export, vm_payloads, local_files
+        entries = {wf_id: entry for wf_id, entry in entries.items() if wf_id in allowed_ids}
+    if selection and selection.dirs:
+        # Mapped files are matched as recorded; unlinked ones once found by name, below
+        entries = {wf_id: entry for wf_id, entry in entries.items()
+                   if not entry.get('file') or selection.matches_file(entry['file'])}
+
+    if workflow_ids:
+        # Export specific workflows
+        for wf_id in workflow_ids:
+            if not in_shard(shard_key(wf_id), shard):
+                continue
+            if wf_id in entries:
+                local_file = workflow_file(workflow_map, wf_id, Path.cwd())
+                if selection and selection.dirs and not (
+                        local_file and selection.matches_file(relative_path(local_file, Path.cwd()))):
+                    continue
+                workflows_to_export.append((wf_id, entries[wf_id]['name']))
+                if local_file:
+                    local_files[wf_id] = local_file
+            elif warn and wf_id not in workflow_map['workflows']:
+                print(f"{Colors.YELLOW}Warning: Workflow ID {wf_id} not found in map{Colors.RESET}")
+        return workflows_to_export, vm_payloads, local_files
+
+    # Export all workflows (that need it)
+    for wf_id, entry in entries.items():
+        name = entry['name']
+        local_file = find_workflow_file(name, workflow_map, wf_id)
+        if not local_file:
+            continue
+        if selection and selection.dirs and not selection.matches_file(relative_path(local_file, Path.cwd())):
+            continue
+
+        try:
+            with open(local_file, 'r', encoding='utf-8') as f:
+                local_data = json.load(f)
+        except:
+            continue
+
+        vm_workflow = call_n8n_api(f"workflows/{wf_id}")
+        if not vm_workflow:
+            continue
+
+        local_hash = get_json_hash(local_data)
+        vm_hash = get_json_hash(vm_workflow)
+
+        if local_hash != vm_hash:
+            workflows_to_export.append((wf_id, name))
+            vm_payloads[wf_id] = vm_workflow
+            local_files[wf_id] = local_file
+
+    return workflows_to_export, vm_payloads, local_files
+
+
+def journal_plan(workflows: List[Tuple[str, str]], local_files: Dict[str, Path]) -> List[dict]:
+    """Plan for the checkpoint journal: [{'key', 'id', 'name', 'file'}] (file relative to the project root)."""
+    root = Path.cwd().resolve()
+    return [{'key': wf_id, 'id': wf_id, 'name': name,
+             'file': relative_path(local_files[wf_id], root) if wf_id in local_files else None}
+            for wf_id, name in workflows]
+
+
+def workflows_from_journal(journal: Journal) -> Tuple[List[Tuple[str, str]], Dict[str, dict], Dict[str, Path]]:
+    """(workflows_to_export, vm_payloads, local_files) from a journal's plan, for --resume."""
+    workflows = [(item['id'], item['name']) for item in journal.plan]
+    local_files = {item['id']: Path.cwd() / item['file'] for item in journal.plan if item.get('file')}
+    return workflows, {}, local_files
+
+
+def open_journal(resume: bool, quiet: bool) -> Optional[Journal]:
+    """The interrupted run's journal for --resume (None, with a message, if there is none)."""
+    journal = Journal('sync-n8n-export')
+    if not resume:
+        return journal
+    if not journal.load():
+        print(f"{Colors.YELLOW}No interrupted export{instance_label()} to resume{Colors.RESET}")
+        return None
+    if not quiet:
+        print(f"{Colors.CYAN}Resuming export{instance_label()} started {journal.started_at}: "
+              f"{journal.remaining()} of {len(journal.plan)} workflow(s) left{Colors.RESET}")
+    return journal
+
+
+def export_instances(
+    instance_spec: str,
+    workflow_ids: List[str],
+    dry_run: bool = False,
+    force: bool = False,
+    auto_yes: bool = False,
+    create_backup_file: bool = True,
+    quiet: bool = False,
+    resume: bool = False,
+    shard: Optional[Shard] = None,
+    selection: Optional[WorkflowSelection] = None
+) -> int:
+    """
+    Export from several instance profiles (see n8n_instances.py).
+
+    The drift scan (one fetch per workflow) runs for all instances
+    concurrently; the exports then run per instance. A local file that more
+    than one instance would overwrite with different content is skipped and
+    reported — export it from one instance with --instance NAME.
+
+    Returns:
+        Exit code (1 if any export failed or was ambiguous)
+    """
+    try:
+        instances = select_instances(instance_spec)
+    except InstanceError as e:
+        print(f"{Colors.RED}✗ {e}{Colors.RESET}", file=sys.stderr)
+        return 1
+
+    journals = {}
+
+    def scan(instance):
+        journal = journals[instance['name']] = None if dry_run else open_journal(resume, quiet)
+        if resume:
+            return workflows_from_journal(journal) if journal else ([], {}, {})
+        with get_metrics().phase('discover'):
+            workflow_map = load_workflow_map()
+        return select_workflows(workflow_map, workflow_ids, warn=False, shard=shard, selection=selection)
+
+    scans = run_per_instance(instances, scan)
+
+    # Local files claimed by more than one instance with different content
+    claims: Dict[Path, Dict[str, str]] = {}
+    for name, (workflows, vm_payloads, local_files) in scans.items():
+        for wf_id, _ in workflows:
+            if wf_id in local_files and wf_id in vm_payloads:  # (resumed plans were checked already)
+                claims.setdefault(local_files[wf_id], {})[name] = get_json_hash(vm_payloads[wf_id])
+    ambiguous = {path for path, hashes in claims.items() if len(set(hashes.values())) > 1}
+
+    failed = bool(ambiguous)
+    for path in sorted(ambiguous):
+        print(f"{Colors.RED}✗ {path}: differs on {', '.join(claims[path])} — "
+              f"export it from one instance with --instance NAME{Colors.RESET}")
+
+    by_name = {instance['name']: instance for instance in instances}
+    for name, (workflows, vm_payloads, local_files) in scans.items():
+        workflows = [(wf_id, wf_name) for wf_id, wf_name in workflows
+                     if local_files.get(wf_id) not in ambiguous]
+        if not workflows:
+            if not quiet:
+                print(f"{Colors.GREEN}✓ [{name}] All workflows are already in sync!{Colors.RESET}")
+            continue
+
+        if not quiet:
+            print(f"\n{Colors.BOLD}Instance: {name}{Colors.RESET} ({by_name[name]['url']})")
+        journal = journals[name]
+        if journal is not None and not resume:
+            journal.begin(journal_plan(workflows, local_files), {'force': force})
+        with use_instance(by_name[name]):
+            results = run_export(
+                workflows,
+                dry_run=dry_run,
+                force=force,
+                auto_yes=auto_yes,
+                create_backup_file=create_backup_file,
+                quiet=quiet,
+                vm_payloads=vm_payloads,
+                local_files=local_files,
+                journal=journal
+            )
+        failed = failed or any(not s for _, s, _ in results)
+
+    return 1 if failed else 0
+
+
+def main():
+    """Main entry point."""
+    # Parse arguments
+    args, metrics_json, metrics_prom = pop_metrics_args(sys.argv[1:])
+    args, instance_spec = pop_instance_args(args)
+    try:
+        args, shard = pop_shard_args(args)
+    except ValueError as e:
+        print(f"{Colors.RED}✗ {e}{Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+    args, selection = pop_selection_args(args)
+
+    dry_run = '--dry-run' in args
+    force = '--force' in args
+    auto_yes = '--yes' in args
+    quiet = '--quiet' in args
+    no_backup = '--no-backup' in args
+    resume = '--resume' in args
+
+    # Filter out flags to get workflow IDs
+    workflow_ids = [arg for arg in args if not arg.startswith('--')]
+
+    metrics = start_run('sync-n8n-export')
+    report_at_exit(metrics, metrics_json, metrics_prom)
+
+    # Change to script directory
+    os.chdir(Path(__file__).parent.parent)
+
+    if resume and (dry_run or workflow_ids or selection):
+        print(f"{Colors.RED}✗ --resume continues the interrupted run as planned "
+              f"(no --dry-run, workflow IDs or selectors){Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+
+    try:
+        if instance_spec:
+            sys.exit(export_instances(instance_spec, workflow_ids, dry_run=dry_run, force=force,
+                                      auto_yes=auto_yes, create_backup_file=not no_backup, quiet=quiet,
+                                      resume=resume, shard=shard, selection=selection))
+
+        journal = None if dry_run else open_journal(resume, quiet)
+        if resume:
+            if journal is None:
+                sys.exit(0)
+            # The interrupted run's plan replaces discovery
+            workflows_to_export, vm_payloads, local_files = workflows_from_journal(journal)
+            force = force or journal.header['options'].get('force', False)
+        else:
+            # Load workflow map
+            with metrics.phase('discover'):
+                workflow_map = load_workflow_map()
+
+            # Determine which workflows to export
+            workflows_to_export, vm_payloads, local_files = select_workflows(workflow_map, workflow_ids,
+                                                                             shard=shard, selection=selection)
+
+            if not workflows_to_export:
+                print(f"{Colors.GREEN}✓ All workflows are already in sync!{Colors.RESET}")
+                sys.exit(0)
+            if journal is not None:
+                journal.begin(journal_plan(workflows_to_export, local_files), {'force': force})
+
+        results = run_export(
+            workflows_to_export,
+            dry_run=dry_run,
+            force=force,
+            auto_yes=auto_yes,
+            create_backup_file=not no_backup,
+            quiet=quiet,
+            vm_payloads=vm_payloads,
+            local_files=local_files,
+            journal=journal
+        )
+    except KeyboardInterrupt:
+        print(f"\n{Colors.YELLOW}Interrupted — continue with: python commands/sync-n8n-export.py --resume{Colors.RESET}")
+        sys.exit(130)
+
     # Exit with error code if any failed
     sys.exit(1 if any(not s for _, s, _ in results) else 0)
 
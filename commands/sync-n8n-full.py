@@ -18,9 +18,34 @@ Options:
     --dry-run                        Preview what would happen
     --skip-git                       Skip git commit/push steps
     --quiet                          Suppress progress output
+    --subprocess                     Run status/export/deploy as child processes
+                                     (legacy mode; default is in-process)
+    --daemon                         Keep running, one sync cycle every --interval
+    --interval SECONDS               Seconds between daemon cycles (default: 300)
+    --jitter SECONDS                 Random cycle-start offset (default: 10% of interval)
+    --metrics PATH                   Write JSON run report (phase timings, requests, bytes)
+    --metrics-prom PATH              Write Prometheus textfile with the same metrics
+
+In-process mode (default):
+    The status, export and deploy scripts are imported rather than spawned,
+    so .env, the workflow map and the file scan are loaded once, and the VM
+    payloads fetched by the status check are handed straight to export or
+    deploy. A full sync does one discovery and one fetch per workflow.
+
+Daemon mode (--daemon):
+    Long-running process for continuous drift monitoring. HTTP connections,
+    the local file index (path → mtime/size/hash, plus git status) and the VM
+    snapshot cache stay warm between cycles: a cycle lists workflows once and
+    only re-fetches those whose updatedAt changed. A lock file
+    (.n8n-sync.lock) keeps cycles and manual runs from overlapping.
+    Without --yes it only reports drift; with --yes each cycle syncs.
 
 Direction Modes:
-    auto    - Automatically determine direction based on timestamps
+    auto    - Decide per workflow from the last-synced base in .n8n-sync-state.json:
+              VM changed → export, local changed → deploy, both → node-level
+              three-way merge (only real per-node conflicts are left for a human).
+              Export and deploy run for their subsets in the same pass.
+              (With --subprocess: one direction for the repo, from git status.)
     export  - Force pull from VM (VM → local → GitHub)
     deploy  - Force push to VM (local → VM, then commit + push)
 
@@ -42,18 +67,35 @@ Examples:
 
     # Sync without git operations
     python commands/sync-n8n-full.py --skip-git
+
+    # Watch for drift every 5 minutes (add --yes to sync automatically)
+    python commands/sync-n8n-full.py --daemon --interval 300
 """
 
 import os
 import sys
 import subprocess
 import json
+import time
+import random
+import signal
+import threading
+import tempfile
 from pathlib import Path
 from datetime import datetime
 import io
 
+from n8n_client import client_summary
+from n8n_merge import merge_workflows
+from n8n_metrics import get_metrics, start_run, report_at_exit, resolve_report_path
+from n8n_scripts import load_sync_module
+from n8n_sync_state import (
+    load_sync_state, save_sync_state, get_base_hash, load_base_snapshot, record_synced,
+    classify_change, essential_fields, LOCAL_CHANGED, VM_CHANGED, BOTH_CHANGED, NO_BASE
+)
+
 # Windows UTF-8 console fix
-if sys.platform == 'win32':
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
@@ -70,9 +112,23 @@ GRAY = "\033[90m"
 # Project root
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 
+# Sync ledger: files the sync scripts maintain, committed with the workflows
+SYNC_LEDGER_PATHS = ['.n8n-workflow-map.json', '.n8n-sync-state.json', '.n8n-sync-base']
+
+# Held while a sync runs, so a daemon cycle and a manual run never overlap
+LOCK_FILE = PROJECT_ROOT / ".n8n-sync.lock"
+# A lock older than this is left over from a crashed run
+LOCK_STALE_SECONDS = 3600
+
+
 
 def run_command(cmd: list, description: str, capture_output: bool = False, check: bool = True):
     """Run a subprocess command with optional output capture."""
+    with get_metrics().phase('git' if cmd[0] == 'git' else 'subprocess'):
+        return _run_command(cmd, description, capture_output, check)
+
+
+def _run_command(cmd: list, description: str, capture_output: bool, check: bool):
     try:
         if capture_output:
             result = subprocess.run(
@@ -123,24 +179,250 @@ def check_drift_status(quiet: bool = False) -> dict:
         return {'error': True, 'workflows': []}
 
     try:
-        workflows = json.loads(result.stdout)
-
-        drift = [w for w in workflows if w['status'] in ['drift', 'drift_uncommitted']]
-        synced = [w for w in workflows if w['status'] in ['synced', 'synced_uncommitted']]
-        not_deployed = [w for w in workflows if w['status'] == 'not_deployed']
-
-        return {
-            'error': False,
-            'workflows': workflows,
-            'drift': drift,
-            'synced': synced,
-            'not_deployed': not_deployed,
-            'has_drift': len(drift) > 0
-        }
+        return summarize_drift(json.loads(result.stdout))
     except json.JSONDecodeError:
         return {'error': True, 'workflows': []}
 
 
+def summarize_drift(workflows: list) -> dict:
+    """Group status results into the drift-status dict used by main()."""
+    drift = [w for w in workflows if w['status'] in ['drift', 'drift_uncommitted']]
+    synced = [w for w in workflows if w['status'] in ['synced', 'synced_uncommitted']]
+    not_deployed = [w for w in workflows if w['status'] == 'not_deployed']
+
+    return {
+        'error': False,
+        'workflows': workflows,
+        'drift': drift,
+        'synced': synced,
+        'not_deployed': not_deployed,
+        'has_drift': len(drift) > 0
+    }
+
+
+def check_drift_status_in_process(quiet: bool = False, warm: dict | None = None) -> dict:
+    """Run the status check in-process, keeping the fetched VM payloads.
+
+    The returned dict has an extra 'vm_payloads' key (workflow ID → VM
+    workflow) for export_from_vm_in_process / deploy_to_vm_in_process.
+    With ``warm`` (daemon mode), its file index and VM snapshot cache are
+    reused and updated, so only changed files are re-hashed and only
+    workflows whose `updatedAt` moved are fetched again.
+    """
+    if not quiet:
+        print(f"{CYAN}🔍 Checking workflow drift status...{RESET}")
+
+    status = load_sync_module('sync-n8n-status.py')
+    vm_payloads = {}
+
+    try:
+        if warm is not None:
+            workflows = status.collect_status(vm_payloads=vm_payloads, file_index=warm['file_index'],
+                                              vm_cache=warm['vm_cache'])
+        else:
+            workflows = status.collect_status(vm_payloads=vm_payloads)
+    except Exception as e:
+        print(f"{RED}✗ Check drift status failed{RESET}")
+        print(f"{GRAY}{e}{RESET}")
+        return {'error': True, 'workflows': []}
+
+    if status.is_offline():
+        # Drift against cached snapshots is fine to report, not to act on
+        print(f"{RED}✗ VM unreachable - not syncing against cached snapshots{RESET}")
+        return {'error': True, 'workflows': []}
+
+    drift_status = summarize_drift(workflows)
+    drift_status['vm_payloads'] = vm_payloads
+    return drift_status
+
+
+def record_synced_bases(drift_status: dict, sync_state: dict) -> bool:
+    """Record every workflow where local == VM as its last-synced base.
+
+    Returns True if the state changed.
+    """
+    changed = False
+    for w in drift_status['synced']:
+        changed = record_synced(
+            sync_state, w['id'], w['name'], w['local_hash'], drift_status['vm_payloads'].get(w['id'])
+        ) or changed
+    return changed
+
+
+def resolve_directions(drift_status: dict, sync_state: dict) -> dict:
+    """Decide, per drifted workflow, whether to export, deploy or flag a conflict.
+
+    Each workflow is compared with its last-synced base hash: only the VM
+    changed → export, only local changed → deploy, both → conflict. Without a
+    base, the workflow's own git status decides (uncommitted → deploy).
+    """
+    plan = {'export': [], 'deploy': [], 'conflict': []}
+
+    for w in drift_status['drift']:
+        change = classify_change(w['local_hash'], w['vm_hash'], get_base_hash(sync_state, w['id']))
+        w['change'] = change
+
+        if change == VM_CHANGED:
+            plan['export'].append(w)
+        elif change == LOCAL_CHANGED:
+            plan['deploy'].append(w)
+        elif change == BOTH_CHANGED:
+            plan['conflict'].append(w)
+        elif w['git_uncommitted']:
+            plan['deploy'].append(w)
+        else:
+            plan['export'].append(w)
+
+    return plan
+
+
+def print_plan(plan: dict, auto: bool = True) -> None:
+    """Print the per-workflow sync plan."""
+    labels = {
+        VM_CHANGED: "VM changed",
+        LOCAL_CHANGED: "local changed",
+        NO_BASE: "no base, by git status",
+    }
+
+    print(f"{CYAN}Sync plan{' (auto-detected per workflow)' if auto else ''}:{RESET}")
+    for action, arrow, color in (('export', '📥 VM → local', BLUE),
+                                 ('deploy', '📤 local → VM', BLUE),
+                                 ('conflict', '🔀 both changed, merge', YELLOW)):
+        if not plan[action]:
+            continue
+        print(f"  {color}{arrow} ({len(plan[action])}){RESET}")
+        for w in plan[action]:
+            reason = labels.get(w.get('change'), '')
+            print(f"{GRAY}      {w['name']}{f'  [{reason}]' if reason and auto else ''}{RESET}")
+    print()
+
+
+def export_from_vm_in_process(workflows: list, vm_payloads: dict, sync_state: dict, yes: bool = False,
+                              quiet: bool = False, dry_run: bool = False) -> bool:
+    """Export status results using the payloads from the status run (bases go into ``sync_state``)."""
+    export = load_sync_module('sync-n8n-export.py')
+
+    if not quiet:
+        print(f"\n{BLUE}📥 Exporting workflows from VM...{RESET}")
+
+    results = export.run_export(
+        [(w['id'], w['name']) for w in workflows],
+        dry_run=dry_run,
+        auto_yes=yes,
+        quiet=quiet,
+        vm_payloads=vm_payloads,
+        local_files={w['id']: Path(w['file']) for w in workflows},
+        sync_state=sync_state
+    )
+    return all(success for _, success, _ in results)
+
+
+def deploy_to_vm_in_process(workflows: list, vm_payloads: dict, sync_state: dict, activate: bool = False,
+                            yes: bool = False, quiet: bool = False, dry_run: bool = False) -> bool:
+    """Deploy status results using the payloads from the status run (bases go into ``sync_state``)."""
+    deploy = load_sync_module('sync-n8n-deploy.py')
+
+    if not quiet:
+        print(f"\n{BLUE}📤 Deploying workflows to VM...{RESET}")
+
+    counts = deploy.run_deploy(
+        [(w['name'], Path(w['file']), w['id']) for w in workflows],
+        activate=activate,
+        auto_yes=yes,
+        dry_run=dry_run,
+        quiet=quiet,
+        vm_payloads=vm_payloads,
+        sync_state=sync_state
+    )
+    return counts['errors'] == 0
+
+
+def merge_in_process(workflows: list, vm_payloads: dict, sync_state: dict, activate: bool = False,
+                     yes: bool = False, quiet: bool = False, dry_run: bool = False) -> list:
+    """Three-way merge workflows changed on both sides, against their base snapshot.
+
+    Clean merges are written to the local file (with a .bak backup), deployed
+    to the VM and recorded as the new base. Returns the workflows that still
+    need a human, each with 'merge_conflicts' describing why.
+    """
+    export = load_sync_module('sync-n8n-export.py')
+    deploy = load_sync_module('sync-n8n-deploy.py')
+
+    if not quiet:
+        print(f"\n{BLUE}🔀 Merging workflows changed on both sides...{RESET}")
+
+    unresolved = []
+    state_before = json.dumps(sync_state, sort_keys=True)
+
+    for w in workflows:
+        base = load_base_snapshot(sync_state, w['id'])
+        if base is None:
+            w['merge_conflicts'] = [{'field': 'workflow', 'reason': 'no base snapshot to merge against'}]
+            unresolved.append(w)
+            continue
+
+        local_file = Path(w['file'])
+        try:
+            with open(local_file, 'r', encoding='utf-8') as f:
+                local_data = json.load(f)
+        except Exception as e:
+            w['merge_conflicts'] = [{'field': 'workflow', 'reason': f"failed to read local file: {e}"}]
+            unresolved.append(w)
+            continue
+
+        with get_metrics().phase('merge'):
+            result = merge_workflows(base, essential_fields(local_data), essential_fields(vm_payloads[w['id']]))
+        if result['conflicts']:
+            w['merge_conflicts'] = result['conflicts']
+            unresolved.append(w)
+            continue
+
+        merged = result['merged']
+        summary = result['summary']
+        if not quiet:
+            print(f"\n{BOLD}{w['name']}{RESET}")
+            print(f"{GRAY}  {summary['from_local']} node(s) from local, {summary['from_remote']} from VM, "
+                  f"{summary['merged']} merged key by key{RESET}")
+
+        if dry_run:
+            if not quiet:
+                print(f"{YELLOW}  [DRY RUN] Would write merged version and deploy to VM{RESET}")
+            continue
+
+        if not yes and not quiet:
+            if not confirm_action(f"Write merged '{w['name']}' locally and deploy to VM?", default_yes=True):
+                w['merge_conflicts'] = [{'field': 'workflow', 'reason': 'merge skipped by user'}]
+                unresolved.append(w)
+                continue
+
+        try:
+            with get_metrics().phase('write'):
+                export.create_backup(local_file)
+                local_data.update(merged)
+                with open(local_file, 'w', encoding='utf-8') as f:
+                    json.dump(local_data, f, indent=2, ensure_ascii=False)
+                    f.write('\n')
+            deploy.deploy_workflow_to_vm(w['id'], merged)
+        except Exception as e:
+            print(f"{RED}✗ {w['name']} — merge failed: {e}{RESET}")
+            w['merge_conflicts'] = [{'field': 'workflow', 'reason': f"merge failed: {e}"}]
+            unresolved.append(w)
+            continue
+
+        activation_msg = ""
+        if activate:
+            activation_msg = " (activated)" if deploy.activate_workflow(w['id']) else " (failed to activate)"
+
+        record_synced(sync_state, w['id'], merged['name'], export.get_json_hash(merged), merged)
+        if not quiet:
+            print(f"{GREEN}✓ {w['name']} — Merged and deployed{activation_msg}{RESET}")
+
+    if json.dumps(sync_state, sort_keys=True) != state_before:
+        save_sync_state(sync_state)
+
+    return unresolved
+
+
 def export_from_vm(yes: bool = False, quiet: bool = False, dry_run: bool = False) -> bool:
     """Run sync-n8n-export.py to pull from VM."""
     cmd = ['python', 'commands/sync-n8n-export.py']
@@ -179,39 +461,87 @@ def deploy_to_vm(activate: bool = False, yes: bool = False, quiet: bool = False,
     return result is not None and result.returncode == 0
 
 
-def git_commit_and_push(message: str, quiet: bool = False, dry_run: bool = False) -> bool:
-    """Commit changes and push to GitHub."""
-    if not quiet:
-        print(f"\n{BLUE}📝 Committing changes to git...{RESET}")
+def write_pathspec_file(paths: list) -> Path:
+    """Write paths as a NUL-separated literal pathspec file for --pathspec-from-file."""
+    pathspecs = []
+    for path in paths:
+        path = Path(path)
+        if not path.is_absolute():
+            path = PROJECT_ROOT / path
+        if path.exists():
+            # :(literal) so names with [ ] * ? are not treated as globs
+            pathspecs.append(':(literal)' + path.relative_to(PROJECT_ROOT).as_posix())
 
-    # Check if there are changes to commit
-    git_status = check_git_status()
+    fd, pathspec_file = tempfile.mkstemp(prefix='sync-n8n-', suffix='.pathspec')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write('\0'.join(sorted(set(pathspecs))))
+    return Path(pathspec_file)
 
-    if not git_status['has_changes']:
-        if not quiet:
-            print(f"{GRAY}  No changes to commit{RESET}")
-        return True
 
-    if dry_run:
-        if not quiet:
-            print(f"{YELLOW}  [DRY RUN] Would commit: {message}{RESET}")
-            print(f"{GRAY}  Files to commit:{RESET}")
-            for file in git_status['files']:
-                print(f"{GRAY}    {file}{RESET}")
-        return True
+def sync_paths(workflows: list) -> list:
+    """Paths a sync run may have touched: the given workflows' files plus the sync ledger."""
+    return [w['file'] for w in workflows if w.get('file')] + SYNC_LEDGER_PATHS
 
-    # Add all changes
-    result = run_command(['git', 'add', '.'], "Git add", capture_output=True)
-    if not result:
-        return False
 
-    # Commit with message
+def list_changed_paths(pathspec_file: Path) -> list:
+    """List paths from the pathspec file that `git add` would stage."""
     result = run_command(
-        ['git', 'commit', '-m', message],
-        "Git commit",
+        ['git', 'add', '--dry-run', f'--pathspec-from-file={pathspec_file}', '--pathspec-file-nul'],
+        "Git add (dry run)",
         capture_output=True,
         check=False
     )
+    if not result or result.returncode != 0:
+        return []
+
+    # Output lines look like: add 'path/to/file.json'
+    return [line[len("add '"):-1] for line in result.stdout.splitlines() if line.startswith("add '")]
+
+
+def git_commit_and_push(message: str, paths: list, quiet: bool = False, dry_run: bool = False) -> bool:
+    """Commit exactly ``paths`` (files touched by this run) and push to GitHub.
+
+    Only these paths are staged (`git add --pathspec-from-file`) and
+    committed, so the rest of the tree is neither walked nor swept into the
+    sync commit.
+    """
+    if not quiet:
+        print(f"\n{BLUE}📝 Committing changes to git...{RESET}")
+
+    pathspec_file = write_pathspec_file(paths)
+    pathspec_args = [f'--pathspec-from-file={pathspec_file}', '--pathspec-file-nul']
+
+    try:
+        if pathspec_file.stat().st_size == 0:
+            if not quiet:
+                print(f"{GRAY}  No changes to commit{RESET}")
+            return True
+
+        if dry_run:
+            if not quiet:
+                changed = list_changed_paths(pathspec_file)
+                if not changed:
+                    print(f"{GRAY}  No changes to commit{RESET}")
+                    return True
+                print(f"{YELLOW}  [DRY RUN] Would commit: {message}{RESET}")
+                print(f"{GRAY}  Files to commit:{RESET}")
+                for file in changed:
+                    print(f"{GRAY}    {file}{RESET}")
+            return True
+
+        # Stage and commit only the files touched by this run
+        result = run_command(['git', 'add'] + pathspec_args, "Git add", capture_output=True)
+        if not result:
+            return False
+
+        result = run_command(
+            ['git', 'commit', '-m', message] + pathspec_args,
+            "Git commit",
+            capture_output=True,
+            check=False
+        )
+    finally:
+        pathspec_file.unlink()
 
     if not result or result.returncode != 0:
         if not quiet:
@@ -236,6 +566,54 @@ def git_commit_and_push(message: str, quiet: bool = False, dry_run: bool = False
     return True
 
 
+def _lock_is_stale() -> bool:
+    """True if the lock's owner is gone (or the lock is too old to be live)."""
+    try:
+        if time.time() - LOCK_FILE.stat().st_mtime > LOCK_STALE_SECONDS:
+            return True
+        pid = int(LOCK_FILE.read_text(encoding='utf-8').strip() or 0)
+    except (OSError, ValueError):
+        return True
+
+    if sys.platform == 'win32':
+        return False  # os.kill() would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # Exists, owned by another user
+    return False
+
+
+def acquire_lock() -> bool:
+    """Create the lock file with our PID; False if another live sync holds it."""
+    for _ in range(2):
+        try:
+            fd = os.open(LOCK_FILE, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if not _lock_is_stale():
+                return False
+            try:
+                LOCK_FILE.unlink()
+            except FileNotFoundError:
+                pass
+            continue
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def release_lock() -> None:
+    """Remove the lock file if we hold it."""
+    try:
+        if LOCK_FILE.read_text(encoding='utf-8').strip() == str(os.getpid()):
+            LOCK_FILE.unlink()
+    except OSError:
+        pass
+
+
 def confirm_action(prompt: str, default_yes: bool = False) -> bool:
     """Ask user for confirmation."""
     suffix = " [Y/n]: " if default_yes else " [y/N]: "
@@ -251,32 +629,13 @@ def confirm_action(prompt: str, default_yes: bool = False) -> bool:
     return response in ['y', 'yes']
 
 
-def main():
-    import argparse
-
-    parser = argparse.ArgumentParser(
-        description='Complete n8n workflow synchronization orchestrator',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog=__doc__
-    )
-    parser.add_argument('--direction', choices=['auto', 'export', 'deploy'], default='auto',
-                       help='Sync direction (default: auto)')
-    parser.add_argument('--activate', action='store_true',
-                       help='Activate workflows after deploy')
-    parser.add_argument('--yes', action='store_true',
-                       help='Auto-confirm all actions')
-    parser.add_argument('--dry-run', action='store_true',
-                       help='Preview without making changes')
-    parser.add_argument('--skip-git', action='store_true',
-                       help='Skip git commit/push steps')
-    parser.add_argument('--quiet', action='store_true',
-                       help='Suppress progress output')
-
-    args = parser.parse_args()
-
-    # Change to project root
-    os.chdir(PROJECT_ROOT)
+def run_sync(args, warm: dict | None = None, monitor: bool = False) -> int:
+    """One full sync pass; returns the exit code.
 
+    ``warm`` carries the daemon's caches between cycles (see run_daemon).
+    With ``monitor``, drift is reported but nothing is exported, deployed
+    or committed.
+    """
     # Header
     if not args.quiet:
         print(f"\n{BOLD}{BLUE}n8n Full Sync Orchestrator{RESET}")
@@ -286,11 +645,20 @@ def main():
             print(f"{YELLOW}[DRY RUN MODE]{RESET}\n")
 
     # Step 1: Check drift status
-    drift_status = check_drift_status(quiet=args.quiet)
+    if args.subprocess:
+        drift_status = check_drift_status(quiet=args.quiet)
+    else:
+        drift_status = check_drift_status_in_process(quiet=args.quiet, warm=warm)
 
     if drift_status['error']:
         print(f"{RED}✗ Failed to check drift status{RESET}")
-        sys.exit(1)
+        return 1
+
+    # Workflows already in sync become the base for the next run
+    sync_state = load_sync_state()
+    if (not args.subprocess and record_synced_bases(drift_status, sync_state)
+            and not args.dry_run and not monitor):
+        save_sync_state(sync_state)
 
     if not args.quiet:
         drift_count = len(drift_status['drift'])
@@ -306,15 +674,20 @@ def main():
         if not args.quiet:
             print(f"{GREEN}✅ All workflows in sync - nothing to do!{RESET}")
 
-        # Check for uncommitted changes
-        git_status = check_git_status()
-        if git_status['has_changes'] and not args.skip_git:
+        # Check for uncommitted workflow (or sync ledger) changes
+        paths = sync_paths([w for w in drift_status['workflows'] if w.get('git_uncommitted')])
+        pathspec_file = write_pathspec_file(paths)
+        has_changes = bool(list_changed_paths(pathspec_file))
+        pathspec_file.unlink()
+
+        if has_changes and not args.skip_git and not monitor:
             if not args.quiet:
                 print(f"\n{YELLOW}⚠ Uncommitted changes detected{RESET}")
 
             if args.yes or args.dry_run or confirm_action("Commit and push changes?", default_yes=True):
                 success = git_commit_and_push(
                     "Update workflows (sync-n8n-full.py)",
+                    paths,
                     quiet=args.quiet,
                     dry_run=args.dry_run
                 )
@@ -322,17 +695,34 @@ def main():
                 if success:
                     if not args.quiet:
                         print(f"\n{GREEN}✅ Full sync complete{RESET}")
-                    sys.exit(0)
+                    return 0
                 else:
                     print(f"{RED}✗ Git operations failed{RESET}")
-                    sys.exit(1)
+                    return 1
 
-        sys.exit(0)
+        return 0
 
     # Determine direction
     direction = args.direction
+    plan = None
 
-    if direction == 'auto':
+    if not args.subprocess:
+        # Per-workflow plan: {'export': [...], 'deploy': [...], 'conflict': [...]}
+        if direction == 'auto':
+            plan = resolve_directions(drift_status, sync_state)
+        else:
+            plan = {'export': [], 'deploy': [], 'conflict': []}
+            plan[direction] = list(drift_status['drift'])
+
+        if not args.quiet:
+            print_plan(plan, auto=direction == 'auto')
+
+        if monitor:
+            print(f"{YELLOW}⚠ {len(drift_status['drift'])} workflow(s) drifted "
+                  f"(monitoring only — run with --yes to sync){RESET}")
+            return 1
+
+    elif direction == 'auto':
         # Simple heuristic: if we have uncommitted local changes, deploy. Otherwise export.
         git_status = check_git_status()
 
@@ -347,15 +737,52 @@ def main():
 
     # Confirm action
     if not args.yes and not args.quiet and not args.dry_run:
-        action_desc = "export from VM and commit to GitHub" if direction == 'export' else "deploy to VM and commit to GitHub"
+        if plan is not None:
+            action_desc = (f"export {len(plan['export'])}, deploy {len(plan['deploy'])} and merge "
+                           f"{len(plan['conflict'])} workflow(s), then commit to GitHub")
+        elif direction == 'export':
+            action_desc = "export from VM and commit to GitHub"
+        else:
+            action_desc = "deploy to VM and commit to GitHub"
 
         if not confirm_action(f"Ready to {action_desc}. Continue?", default_yes=True):
             print(f"{YELLOW}Cancelled by user{RESET}")
-            sys.exit(0)
+            return 0
         print()
 
     # Step 3: Execute sync operation
-    if direction == 'export':
+    if plan is not None:
+        success = True
+        if plan['export']:
+            success = export_from_vm_in_process(
+                plan['export'], drift_status['vm_payloads'], sync_state,
+                yes=args.yes, quiet=args.quiet, dry_run=args.dry_run
+            ) and success
+        if plan['deploy']:
+            success = deploy_to_vm_in_process(
+                plan['deploy'], drift_status['vm_payloads'], sync_state,
+                activate=args.activate,
+                yes=args.yes,
+                quiet=args.quiet,
+                dry_run=args.dry_run
+            ) and success
+
+        if plan['conflict']:
+            plan['conflict'] = merge_in_process(
+                plan['conflict'], drift_status['vm_payloads'], sync_state,
+                activate=args.activate,
+                yes=args.yes,
+                quiet=args.quiet,
+                dry_run=args.dry_run
+            )
+
+        if plan['export'] and plan['deploy']:
+            commit_msg = "Export and deploy workflows (sync-n8n-full.py)"
+        elif plan['deploy']:
+            commit_msg = "Deploy workflows to VM (sync-n8n-full.py)"
+        else:
+            commit_msg = "Export latest workflows from VM (sync-n8n-full.py)"
+    elif direction == 'export':
         success = export_from_vm(yes=args.yes, quiet=args.quiet, dry_run=args.dry_run)
         commit_msg = "Export latest workflows from VM (sync-n8n-full.py)"
     else:  # deploy
@@ -369,26 +796,160 @@ def main():
 
     if not success:
         print(f"{RED}✗ Sync operation failed{RESET}")
-        sys.exit(1)
+        return 1
 
     # Step 4: Git commit and push
     if not args.skip_git:
-        success = git_commit_and_push(commit_msg, quiet=args.quiet, dry_run=args.dry_run)
+        success = git_commit_and_push(
+            commit_msg, sync_paths(drift_status['drift']), quiet=args.quiet, dry_run=args.dry_run
+        )
 
         if not success:
             print(f"{RED}✗ Git operations failed{RESET}")
-            sys.exit(1)
+            return 1
+
+    # Workflows that could not be merged need a human
+    if plan is not None and plan['conflict']:
+        print(f"\n{RED}✗ {len(plan['conflict'])} workflow(s) changed on both sides could not be merged:{RESET}")
+        for w in plan['conflict']:
+            print(f"{RED}    {w['name']} (ID: {w['id']}){RESET}")
+            for c in w.get('merge_conflicts', []):
+                where = f"{c['node_name']} → " if c.get('node_name') else ""
+                print(f"{GRAY}      {where}{c['field']}: {c['reason']}{RESET}")
+        print(f"{YELLOW}  Resolve manually, then re-run with --direction export or deploy{RESET}")
+        return 1
 
     # Success
     if not args.quiet:
         print(f"\n{GREEN}{'=' * 60}{RESET}")
         print(f"{GREEN}{BOLD}✅ Full sync complete!{RESET}")
+        if not args.subprocess:
+            print(f"{GRAY}{client_summary()}{RESET}")
         print(f"{GREEN}{'=' * 60}{RESET}\n")
 
         if args.dry_run:
             print(f"{YELLOW}Note: This was a dry run. No actual changes were made.{RESET}\n")
 
-    sys.exit(0)
+    return 0
+
+
+def run_daemon(args) -> int:
+    """Run sync cycles every ``args.interval`` seconds until interrupted.
+
+    The process (and so the keep-alive HTTP connections, the file index and
+    the VM snapshot cache) lives across cycles, so each cycle only pays for
+    what changed. Cycle starts are jittered so several daemons against the
+    same n8n do not fire together, and the lock file makes a cycle skip
+    while another sync is running. Without --yes, drift is only reported.
+    """
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    warm = {'file_index': {}, 'vm_cache': {}}
+    metrics_json = resolve_report_path(args.metrics)
+    metrics_prom = resolve_report_path(args.metrics_prom)
+    jitter = args.jitter if args.jitter is not None else args.interval * 0.1
+    mode = "sync" if args.yes else "monitor"
+
+    print(f"{BOLD}{BLUE}n8n sync daemon{RESET} {GRAY}(pid {os.getpid()}, {mode} every "
+          f"{args.interval}s ± {jitter:.0f}s){RESET}")
+
+    delay = random.uniform(0, jitter)
+    while not stop.wait(delay):
+        started = time.monotonic()
+        metrics = start_run('sync-n8n-full', fresh=True)
+
+        if not acquire_lock():
+            exit_code = None
+            print(f"{YELLOW}⚠ Another sync is running — skipping this cycle{RESET}")
+        else:
+            try:
+                exit_code = run_sync(args, warm=warm, monitor=not args.yes)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                exit_code = 1
+                print(f"{RED}✗ Sync cycle failed: {e}{RESET}")
+            finally:
+                release_lock()
+
+            if metrics_json:
+                metrics.write_json(metrics_json)
+            if metrics_prom:
+                metrics.write_prometheus(metrics_prom)
+
+        elapsed = time.monotonic() - started
+        print(f"{GRAY}[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] cycle done in {elapsed:.1f}s "
+              f"(exit {exit_code}){RESET}", flush=True)
+
+        delay = max(0.0, args.interval - elapsed + random.uniform(-jitter, jitter))
+
+    print(f"{GRAY}Daemon stopped{RESET}")
+    return 0
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Complete n8n workflow synchronization orchestrator',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--direction', choices=['auto', 'export', 'deploy'], default='auto',
+                       help='Sync direction (default: auto)')
+    parser.add_argument('--activate', action='store_true',
+                       help='Activate workflows after deploy')
+    parser.add_argument('--yes', action='store_true',
+                       help='Auto-confirm all actions')
+    parser.add_argument('--dry-run', action='store_true',
+                       help='Preview without making changes')
+    parser.add_argument('--skip-git', action='store_true',
+                       help='Skip git commit/push steps')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Suppress progress output')
+    parser.add_argument('--subprocess', action='store_true',
+                       help='Run status/export/deploy as child processes (legacy mode)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Keep running and sync every --interval seconds')
+    parser.add_argument('--interval', type=int, default=300, metavar='SECONDS',
+                       help='Seconds between daemon cycles (default: 300)')
+    parser.add_argument('--jitter', type=float, metavar='SECONDS',
+                       help='Random offset added to each cycle start (default: 10%% of --interval)')
+    parser.add_argument('--metrics', metavar='PATH',
+                       help='Write JSON run report (file, or directory for one file per run)')
+    parser.add_argument('--metrics-prom', metavar='PATH',
+                       help='Write Prometheus textfile (node_exporter textfile collector)')
+
+    args = parser.parse_args()
+
+    if args.daemon and args.subprocess:
+        parser.error('--daemon runs in-process; it cannot be combined with --subprocess')
+    if args.interval <= 0:
+        parser.error('--interval must be positive')
+
+    # Change to project root
+    os.chdir(PROJECT_ROOT)
+
+    if args.daemon:
+        sys.exit(run_daemon(args))
+
+    # Started before the sync modules are loaded, so their phases land in this run
+    report_at_exit(start_run('sync-n8n-full'), args.metrics, args.metrics_prom)
+
+    if not acquire_lock():
+        print(f"{RED}✗ Another sync is running (lock: {LOCK_FILE.name}){RESET}")
+        sys.exit(1)
+    try:
+        exit_code = run_sync(args)
+    finally:
+        release_lock()
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
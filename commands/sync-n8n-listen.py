@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+sync-n8n-listen.py — Export workflows as soon as n8n reports them updated
+
+A small local HTTP listener for "workflow updated" notifications. Each
+notification queues a targeted export of just that workflow (through
+sync-n8n-export.py's export_workflow(): same safety checks, backup and
+sync-base update), so the repo follows edits made in the n8n UI without
+sweeping every workflow.
+
+Saves come in bursts (every click on "Save", autosave), so a workflow is
+exported once it has been quiet for --debounce seconds, and at the latest
+--max-wait seconds after its first notification. Exports run one at a time
+and skip (and retry later) while another sync holds .n8n-sync.lock.
+
+Notifications:
+    POST /workflow-updated        JSON body with the workflow ID, any of:
+                                  {"id": "..."}, {"workflowId": "..."},
+                                  {"workflow": {"id": "...", ...}}, {"ids": [...]},
+                                  or a list of those; or ?id=... in the URL
+    GET  /health                  Queue and export counters (JSON)
+
+    With a token (--token or N8N_LISTEN_TOKEN), requests must carry it as
+    `X-Sync-Token: TOKEN` or `Authorization: Bearer TOKEN`. Listening on a
+    non-loopback address requires a token.
+
+Usage:
+    python commands/sync-n8n-listen.py [OPTIONS]
+
+Options:
+    --host HOST            Address to listen on (default: 127.0.0.1)
+    --port N               Port (default: 5679)
+    --token TOKEN          Shared secret required on every request
+                           (default: $N8N_LISTEN_TOKEN)
+    --debounce SECONDS     Quiet time before a workflow is exported (default: 5)
+    --max-wait SECONDS     Export at the latest this long after the first
+                           notification of a burst (default: 60)
+    --force                Overwrite files with uncommitted changes (dangerous!)
+    --no-backup            Don't create .bak files before overwriting
+    --dry-run              Only report what would be exported
+    --quiet                Only print failures
+
+Examples:
+    python commands/sync-n8n-listen.py
+    python commands/sync-n8n-listen.py --host 0.0.0.0 --token "$SECRET" --debounce 10
+    curl -X POST localhost:5679/workflow-updated -d '{"id": "Fx9aBc12dE3fGh45"}'
+"""
+
+import argparse
+import hmac
+import io
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from ipaddress import ip_address
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from n8n_scripts import load_sync_module
+from n8n_sync_state import load_sync_state, save_sync_state
+
+# Force UTF-8 encoding for Windows console
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+# Colors
+RESET = '\033[0m'
+BOLD = '\033[1m'
+RED = '\033[31m'
+GREEN = '\033[32m'
+YELLOW = '\033[33m'
+BLUE = '\033[34m'
+CYAN = '\033[36m'
+GRAY = '\033[90m'
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+MAX_BODY_BYTES = 8 * 1024 * 1024  # a full workflow payload fits comfortably
+
+# Seconds to wait before retrying while another sync holds the lock
+LOCK_RETRY_SECONDS = 10
+
+
+def log(message: str) -> None:
+    print(f"{GRAY}{datetime.now().strftime('%H:%M:%S')}{RESET} {message}", flush=True)
+
+
+def notification_ids(payload, query: dict) -> list[str]:
+    """Workflow IDs named by a notification (body and/or ?id=)."""
+    ids = list(query.get('id', []))
+    items = payload if isinstance(payload, list) else [payload]
+    for item in items:
+        if isinstance(item, (str, int)):
+            ids.append(item)
+        elif isinstance(item, dict):
+            workflow = item.get('workflow') if isinstance(item.get('workflow'), dict) else {}
+            for value in (item.get('id'), item.get('workflowId'), workflow.get('id')):
+                if value:
+                    ids.append(value)
+                    break
+            ids.extend(item.get('ids') or [])
+    return list(dict.fromkeys(str(i) for i in ids if str(i).strip()))
+
+
+class ExportQueue:
+    """Debounced queue of workflow IDs, exported one at a time by a worker thread.
+
+    A workflow is due ``debounce`` seconds after its latest notification, but
+    no later than ``max_wait`` seconds after the first one still pending.
+    """
+
+    def __init__(self, export, debounce: float = 5.0, max_wait: float = 60.0):
+        self.export = export
+        self.debounce = debounce
+        self.max_wait = max_wait
+        self.pending: dict[str, tuple[float, float]] = {}  # id → (first seen, due)
+        self.counters = {'notifications': 0, 'exported': 0, 'in_sync': 0, 'failed': 0, 'deferred': 0}
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name='export-queue', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout=30)
+
+    def notify(self, workflow_ids: list[str]) -> None:
+        now = time.monotonic()
+        with self._cond:
+            for workflow_id in workflow_ids:
+                self.counters['notifications'] += 1
+                first = self.pending.get(workflow_id, (now, 0))[0]
+                self.pending[workflow_id] = (first, min(now + self.debounce, first + self.max_wait))
+            self._cond.notify()
+
+    def defer(self, workflow_id: str, delay: float) -> None:
+        with self._cond:
+            now = time.monotonic()
+            first, due = self.pending.get(workflow_id, (now, now))
+            self.pending[workflow_id] = (first, max(due, now + delay))
+            self.counters['deferred'] += 1
+
+    def status(self) -> dict:
+        with self._cond:
+            return {'pending': len(self.pending), **self.counters}
+
+    def _next_due(self) -> str | None:
+        """Wait until a workflow is due; its ID (None once stopped)."""
+        with self._cond:
+            while not self._stop:
+                if self.pending:
+                    workflow_id, (_, due) = min(self.pending.items(), key=lambda item: item[1][1])
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        del self.pending[workflow_id]
+                        return workflow_id
+                    self._cond.wait(wait)
+                else:
+                    self._cond.wait()
+            return None
+
+    def _run(self) -> None:
+        while True:
+            workflow_id = self._next_due()
+            if workflow_id is None:
+                return
+            try:
+                outcome = self.export(workflow_id)
+            except (Exception, SystemExit) as e:  # (SystemExit: no workflow map yet)
+                outcome = 'failed'
+                log(f"{RED}✗ {workflow_id}: export crashed: {e}{RESET}")
+            if outcome == 'locked':
+                self.defer(workflow_id, LOCK_RETRY_SECONDS)
+            else:
+                with self._cond:
+                    self.counters[outcome] += 1
+
+
+def make_exporter(args):
+    """export(workflow_id) → 'exported' | 'in_sync' | 'failed' | 'locked', via sync-n8n-export.py."""
+    exporter = load_sync_module('sync-n8n-export.py')
+    full = load_sync_module('sync-n8n-full.py')
+
+    def export(workflow_id: str) -> str:
+        if not args.dry_run and not full.acquire_lock():
+            log(f"{YELLOW}⚠ {workflow_id}: another sync is running — retrying in {LOCK_RETRY_SECONDS}s{RESET}")
+            return 'locked'
+        try:
+            vm_workflow = exporter.call_n8n_api(f"workflows/{workflow_id}")
+            if not vm_workflow:
+                log(f"{RED}✗ {workflow_id}: could not fetch from VM (deleted or unreachable){RESET}")
+                return 'failed'
+            name = vm_workflow.get('name', workflow_id)
+            workflow_map = exporter.load_workflow_map()
+            local_file = exporter.find_workflow_file(name, workflow_map, workflow_id)
+            sync_state = load_sync_state()
+            state_before = json.dumps(sync_state, sort_keys=True)
+
+            success, message = exporter.export_workflow(
+                workflow_id, name,
+                dry_run=args.dry_run, force=args.force, auto_yes=True,
+                create_backup_file=not args.no_backup, quiet=True,
+                vm_workflow=vm_workflow, local_file=local_file, sync_state=sync_state)
+
+            if json.dumps(sync_state, sort_keys=True) != state_before:
+                save_sync_state(sync_state)
+        finally:
+            if not args.dry_run:
+                full.release_lock()
+
+        if not success:
+            log(f"{RED}✗ {name}: {message}{RESET}")
+            return 'failed'
+        if message.startswith('Already in sync'):
+            if not args.quiet:
+                log(f"{GRAY}· {name}: already in sync{RESET}")
+            return 'in_sync'
+        if not args.quiet:
+            where = f" → {local_file.relative_to(PROJECT_ROOT)}" if local_file else ""
+            action = 'would export (dry run)' if args.dry_run else 'exported'
+            log(f"{GREEN}✓{RESET} {name}: {action}{GRAY}{where}{RESET}")
+        return 'exported'
+
+    return export
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, payload: dict) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        bearer = self.headers.get('Authorization', '')
+        if bearer.startswith('Bearer '):
+            supplied = bearer[len('Bearer '):]
+        else:
+            supplied = self.headers.get('X-Sync-Token', '')
+        # Constant-time, so response timing doesn't leak the secret
+        return hmac.compare_digest(supplied.encode('utf-8'), token.encode('utf-8'))
+
+    def do_GET(self):
+        if not self._authorized():
+            return self._send(401, {'message': 'unauthorized'})
+        if urlsplit(self.path).path.rstrip('/') == '/health':
+            return self._send(200, self.server.queue.status())
+        self._send(404, {'message': 'not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            return self._send(413, {'message': 'body too large'})
+        raw = self.rfile.read(length) if length else b''
+        if not self._authorized():
+            return self._send(401, {'message': 'unauthorized'})
+        url = urlsplit(self.path)
+        if url.path.rstrip('/') != '/workflow-updated':
+            return self._send(404, {'message': 'not found'})
+        try:
+            payload = json.loads(raw) if raw.strip() else None
+        except ValueError:
+            return self._send(400, {'message': 'body must be JSON'})
+
+        ids = notification_ids(payload, parse_qs(url.query))
+        if not ids:
+            return self._send(400, {'message': 'no workflow id in notification'})
+        queue: ExportQueue = self.server.queue
+        queue.notify(ids)
+        if not self.server.quiet:
+            log(f"{CYAN}← updated:{RESET} {', '.join(ids)}")
+        self._send(202, {'queued': ids, 'pending': queue.status()['pending']})
+
+
+def is_loopback(host: str) -> bool:
+    if host == 'localhost':
+        return True
+    try:
+        return ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export workflows as soon as n8n reports them updated',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5679)
+    parser.add_argument('--token', default=os.getenv('N8N_LISTEN_TOKEN'),
+                        help='Shared secret required on every request')
+    parser.add_argument('--debounce', type=float, default=5.0, metavar='SECONDS')
+    parser.add_argument('--max-wait', type=float, default=60.0, metavar='SECONDS')
+    parser.add_argument('--force', action='store_true', help='Overwrite files with uncommitted changes')
+    parser.add_argument('--no-backup', action='store_true', help="Don't create .bak files")
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would be exported')
+    parser.add_argument('--quiet', action='store_true', help='Only print failures')
+    args = parser.parse_args()
+
+    if args.debounce < 0 or args.max_wait < args.debounce:
+        parser.error('--debounce must be >= 0 and --max-wait >= --debounce')
+    if not args.token and not is_loopback(args.host):
+        parser.error('listening on a non-loopback address requires --token (or N8N_LISTEN_TOKEN)')
+
+    os.chdir(PROJECT_ROOT)
+
+    queue = ExportQueue(make_exporter(args), debounce=args.debounce, max_wait=args.max_wait)
+    server = ThreadingHTTPServer((args.host, args.port), _Handler)
+    server.daemon_threads = True
+    server.queue = queue
+    server.token = args.token
+    server.quiet = args.quiet
+    queue.start()
+
+    mode = " (dry run)" if args.dry_run else ""
+    print(f"{BOLD}{BLUE}n8n update listener{RESET}{mode} {GRAY}on http://{args.host}:{args.port}/workflow-updated "
+          f"(debounce {args.debounce:g}s, max wait {args.max_wait:g}s; Ctrl-C to stop){RESET}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        queue.stop()
+        status = queue.status()
+        print(f"\n{GRAY}Stopped: {status['exported']} exported, {status['in_sync']} already in sync, "
+              f"{status['failed']} failed, {status['pending']} still pending{RESET}")
+
+
+if __name__ == '__main__':
+    main()
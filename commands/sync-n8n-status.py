@@ -9,26 +9,77 @@ Checks for differences (drift) between:
 3. Production VM deployed workflows
 
 Usage:
-    python commands/sync-n8n-status.py [--quiet] [--json]
+    python commands/sync-n8n-status.py [--quiet] [--json|--ndjson] [--staged] [--cache-ttl SECONDS] [--offline]
+                                       [--shard i/n] [--tag NAME] [--active-only] [--dir PATH] [--db URL]
+                                       [--refresh-map] [--instance NAME[,NAME...]|all]
+                                       [--metrics PATH] [--metrics-prom PATH]
+    python commands/sync-n8n-status.py --watch [--poll] [--ndjson] [--cache-ttl SECONDS] [selectors]
+    python commands/sync-n8n-status.py --merge-reports [--json] [--quiet] REPORT...
 
 Options:
-    --quiet    Exit with code 1 if drift detected (for pre-commit hooks)
-    --json     Output JSON instead of colored text
+    --quiet                Exit with code 1 if drift detected (for pre-commit hooks)
+    --json                 Output JSON instead of colored text
+    --ndjson               Output one JSON object per workflow per line
+    --tag NAME             Only workflows with this n8n tag (repeatable / comma-separated)
+    --active-only          Only workflows active on the VM
+    --dir PATH             Only files under this directory (repeatable)
+    --shard i/n            Check only shard i of n (workflows partitioned by hashed ID)
+    --watch                Stay running: report everything once, then re-check each
+                           workflow as its file is saved and print its status
+                           transition (inotify on Linux, else mtime polling)
+    --poll                 With --watch: poll mtimes instead of using inotify
+    --merge-reports FILES  Combine --json/--ndjson shard reports into one report
+                           (with --quiet: exit 1 if any shard found drift)
+    --staged               Check only workflow files staged for commit (pre-commit),
+                           as staged in the index rather than in the working tree;
+                           exits at once if none, trusts VM snapshots < --cache-ttl
+    --cache-ttl SECONDS    Use cached VM snapshots younger than this instead of
+                           fetching (default with --staged: 600)
+    --db URL               Read the VM versions from n8n's database in one query
+                           (postgresql://... or a SQLite file; see n8n_db.py)
+    --offline              Don't contact the VM; compare against the last cached
+                           VM snapshots (also automatic after a connection error)
+    --refresh-map          Rebuild .n8n-workflow-map.json from all pages of
+                           GET /workflows (adds, removes, renames, duplicates), then exit
+    --instance NAMES       Check these instance profiles (.n8n-instances.json)
+                           concurrently, or 'all'; results carry an 'instance' key
+    --metrics PATH         Write JSON run report (phase timings, requests, bytes)
+    --metrics-prom PATH    Write Prometheus textfile with the same metrics
 """
 
 import json
 import os
 import sys
-import hashlib
 import subprocess
+import threading
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
-import urllib.request
-import urllib.error
+from typing import Dict, List, Set, Tuple, Optional
 import io
 
-# Force UTF-8 encoding for Windows console
-if sys.platform == 'win32':
+from n8n_client import api_request, client_summary
+from n8n_db import WorkflowDbError, load_workflows
+from n8n_discovery import (
+    WORKFLOW_DIRS, is_workflow_file, find_workflow_files, staged_contents, staged_workflow_files
+)
+from n8n_hash import workflow_hash
+from n8n_instances import (
+    InstanceError, has_instance_profiles, select_instances, pop_instance_args,
+    api_settings, map_file_path, run_per_instance
+)
+from n8n_metrics import get_metrics, start_run, pop_metrics_args, report_at_exit
+from n8n_selection import WorkflowSelection, pop_selection_args, selected_ids, list_workflows
+from n8n_shard import Shard, pop_shard_args, in_shard, shard_key
+from n8n_snapshots import (
+    DEFAULT_TTL, load_snapshots, save_snapshots, record_snapshot, fresh_snapshot, snapshot_age, format_age
+)
+from n8n_workflow_map import (
+    empty_map, load_workflow_map_file, save_workflow_map_file, refresh_workflow_map,
+    name_index, file_index as map_file_index, relative_path, resolve_workflow_id
+)
+
+# Force UTF-8 encoding for Windows console (once, even when imported by sync-n8n-full.py)
+if sys.platform == 'win32' and (sys.stdout.encoding or '').lower() != 'utf-8':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
@@ -39,6 +90,7 @@ class Colors:
     YELLOW = '\033[1;33m'
     BLUE = '\033[0;34m'
     CYAN = '\033[0;36m'
+    GRAY = '\033[90m'
     BOLD = '\033[1m'
     RESET = '\033[0m'
 
@@ -60,96 +112,158 @@ load_env()
 N8N_API_URL = os.getenv('N8N_API_URL', 'https://hub.descomplicador.pt/api/v1')
 N8N_API_KEY = os.getenv('N8N_API_KEY')
 
-if not N8N_API_KEY:
+# (merging shard reports needs no API access)
+if not N8N_API_KEY and not has_instance_profiles() and '--merge-reports' not in sys.argv:
     print(f"{Colors.RED}✗ Error: N8N_API_KEY not found in environment or .env file{Colors.RESET}", file=sys.stderr)
     sys.exit(1)
 
-WORKFLOW_DIRS = ["MVP's", "Ferramentas", "Projetos de Clientes", "Módulos reutilizáveis"]
 WORKFLOW_MAP_FILE = ".n8n-workflow-map.json"
 
+# Offline mode: API URLs that failed to connect in this run (every URL with
+# --offline). No further requests go to them; status comes from VM snapshots.
+_offline = {'all': False, 'urls': set()}
+_offline_lock = threading.Lock()
+
 
 def get_json_hash(data: dict) -> str:
     """Get deterministic hash of JSON data (ignoring field order)."""
-    # Only hash the essential workflow fields
-    essential = {
-        'name': data.get('name', ''),
-        'nodes': data.get('nodes', []),
-        'connections': data.get('connections', {}),
-        'settings': data.get('settings', {})
-    }
-    json_str = json.dumps(essential, sort_keys=True, separators=(',', ':'))
-    return hashlib.md5(json_str.encode()).hexdigest()
+    with get_metrics().phase('hash'):
+        return workflow_hash(data)
+
+
+def set_offline(offline: bool = True) -> None:
+    """Force offline mode for every instance (--offline), or clear it."""
+    with _offline_lock:
+        _offline['all'] = offline
+        if not offline:
+            _offline['urls'].clear()
+
+
+def is_offline() -> bool:
+    """True if the active instance's API is not to be contacted in this run."""
+    api_url, _ = api_settings(N8N_API_URL, N8N_API_KEY)
+    return _offline['all'] or api_url in _offline['urls']
+
+
+def reset_offline() -> None:
+    """Give the active instance's API another chance (start of a daemon cycle)."""
+    api_url, _ = api_settings(N8N_API_URL, N8N_API_KEY)
+    with _offline_lock:
+        _offline['urls'].discard(api_url)
 
 
 def call_n8n_api(endpoint: str, method: str = "GET") -> Optional[dict]:
-    """Call n8n API and return JSON response."""
-    url = f"{N8N_API_URL}/{endpoint}"
-    req = urllib.request.Request(url, method=method)
-    req.add_header("X-N8N-API-KEY", N8N_API_KEY)
-    req.add_header("Accept", "application/json")
+    """Call n8n API and return JSON response.
 
-    try:
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return json.loads(response.read().decode())
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            return None
-        print(f"{Colors.RED}API Error {e.code}: {e.reason}{Colors.RESET}", file=sys.stderr)
-        return None
-    except Exception as e:
-        print(f"{Colors.RED}Connection error: {e}{Colors.RESET}", file=sys.stderr)
+    After a connection failure the instance is marked offline (is_offline())
+    and later calls return None at once instead of waiting for a timeout each.
+    """
+    api_url, api_key = api_settings(N8N_API_URL, N8N_API_KEY)
+    if is_offline():
         return None
+    url = f"{api_url}/{endpoint}"
+    headers = {"X-N8N-API-KEY": api_key, "Accept": "application/json"}
+    metrics = get_metrics()
+
+    with metrics.phase('fetch'):
+        try:
+            status, reason, body = api_request(method, url, headers, timeout=10)
+        except Exception as e:
+            with _offline_lock:
+                _offline['urls'].add(api_url)
+            print(f"{Colors.RED}Connection error: {e}{Colors.RESET}", file=sys.stderr)
+            print(f"{Colors.YELLOW}Offline mode: using cached VM snapshots for the rest of this run{Colors.RESET}",
+                  file=sys.stderr)
+            return None
 
+        if status == 404:
+            return None
+        if status >= 400:
+            print(f"{Colors.RED}API Error {status}: {reason}{Colors.RESET}", file=sys.stderr)
+            return None
+        try:
+            return json.loads(body.decode())
+        except ValueError as e:
+            print(f"{Colors.RED}Invalid API response: {e}{Colors.RESET}", file=sys.stderr)
+            return None
 
-def find_workflow_files() -> List[Path]:
-    """Find all workflow JSON files in configured directories."""
-    workflows = []
-    base_path = Path.cwd()
 
-    for dir_name in WORKFLOW_DIRS:
-        dir_path = base_path / dir_name
-        if dir_path.exists():
-            # Find all .json files, excluding evaluators and test files
-            for json_file in dir_path.rglob("*.json"):
-                # Skip node_modules, .claude, and test/evaluator files
-                if any(skip in str(json_file) for skip in ['node_modules', '.claude', 'evaluator', 'Evaluator', 'test']):
-                    continue
-                workflows.append(json_file)
+def list_all_workflows(query: str = "") -> Optional[List[dict]]:
+    """Every workflow on the instance (n8n_selection.list_workflows() over call_n8n_api()).
 
-    return sorted(workflows)
+    ``query`` adds listing filters (e.g. 'active=true&tags=vapi').
+    Returns None if any page cannot be fetched (never a silently truncated list).
+    """
+    return list_workflows(call_n8n_api, query)
 
 
-def load_or_create_workflow_map() -> Dict[str, str]:
-    """Load or create workflow name -> ID mapping."""
-    map_file = Path(WORKFLOW_MAP_FILE)
+def scan_local_workflows() -> List[Tuple[str, dict]]:
+    """(relative path, {'name', 'id'}) for every local workflow file."""
+    root = Path.cwd().resolve()
+    local = []
+    for file_path in find_workflow_files():
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            local.append((relative_path(file_path, root), {'name': data.get('name', file_path.stem),
+                                                             'id': data.get('id')}))
+    return local
 
-    if map_file.exists():
-        with open(map_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
 
-    # Create new map by fetching all workflows from n8n API
-    print(f"{Colors.CYAN}Creating workflow map from n8n API...{Colors.RESET}")
-    workflows = call_n8n_api("workflows")
+def refresh_map(workflow_map: dict, quiet: bool = False) -> Optional[dict]:
+    """Merge the instance's full workflow list into ``workflow_map`` and save it.
 
-    if not workflows or 'data' not in workflows:
+    Returns the refresh report, or None if the list could not be fetched.
+    """
+    map_file = map_file_path(Path(WORKFLOW_MAP_FILE))
+    remote = list_all_workflows()
+    if remote is None:
         print(f"{Colors.YELLOW}Warning: Could not fetch workflows from API{Colors.RESET}")
-        return {}
+        return None
 
-    # Map workflow names to IDs
-    workflow_map = {}
-    for wf in workflows['data']:
-        workflow_map[wf['name']] = wf['id']
+    report = refresh_workflow_map(workflow_map, remote, Path.cwd().resolve(), scan_local_workflows)
+    save_workflow_map_file(map_file, workflow_map)
+
+    if not quiet:
+        print(f"{Colors.GREEN}✓ {map_file.name}: {len(workflow_map['workflows'])} workflows "
+              f"({len(report['added'])} added, {len(report['removed'])} removed, "
+              f"{len(report['renamed'])} renamed){Colors.RESET}")
+        for old, new in report['renamed']:
+            print(f"   {Colors.CYAN}↻{Colors.RESET} {old} → {new}")
+        for name in report['removed']:
+            print(f"   {Colors.YELLOW}-{Colors.RESET} {name} (no longer on the VM)")
+        for name, ids in report['duplicates'].items():
+            print(f"   {Colors.RED}!{Colors.RESET} Duplicate name on the VM: {name} ({', '.join(ids)})")
+            print(f"      {Colors.RED}→ Matched by file/id only; rename one of them in n8n{Colors.RESET}")
+        if report['unmatched']:
+            print(f"   {Colors.CYAN}?{Colors.RESET} {len(report['unmatched'])} workflow(s) without a local file")
+    return report
+
+
+def load_or_create_workflow_map() -> dict:
+    """Load or create the ID-keyed workflow map (of the active instance, if any)."""
+    map_file = map_file_path(Path(WORKFLOW_MAP_FILE))
 
-    # Save the map
-    with open(map_file, 'w', encoding='utf-8') as f:
-        json.dump(workflow_map, f, indent=2, ensure_ascii=False)
+    if map_file.exists():
+        return load_workflow_map_file(map_file)
 
-    print(f"{Colors.GREEN}✓ Created {WORKFLOW_MAP_FILE} with {len(workflow_map)} workflows{Colors.RESET}")
+    # Create new map by listing all workflows from n8n API
+    print(f"{Colors.CYAN}Creating {map_file.name} from n8n API...{Colors.RESET}")
+    workflow_map = empty_map()
+    refresh_map(workflow_map)
     return workflow_map
 
 
 def get_git_status(file_path: Path) -> Tuple[bool, Optional[str]]:
     """Check if file has uncommitted changes and get last commit date."""
+    with get_metrics().phase('git'):
+        return _get_git_status(file_path)
+
+
+def _get_git_status(file_path: Path) -> Tuple[bool, Optional[str]]:
     try:
         # Check if file is tracked
         result = subprocess.run(
@@ -185,12 +299,106 @@ def get_git_status(file_path: Path) -> Tuple[bool, Optional[str]]:
         return False, None
 
 
-def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict:
-    """Check sync status for a single workflow file."""
+def get_git_state_key() -> Optional[tuple]:
+    """Key that changes whenever a file's git status could (HEAD or index moved).
+
+    Used to reuse per-file git status across daemon cycles; None disables reuse.
+    """
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD', '--git-path', 'index'],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            return None
+        head, index_path = result.stdout.split()[:2]
+        return head, Path(index_path).stat().st_mtime_ns
+    except (OSError, ValueError):
+        return None
+
+
+def read_local_workflow(file_path: Path, file_index: Optional[dict] = None,
+                        content: Optional[bytes] = None) -> Tuple[str, str, dict]:
+    """Return (name, hash, index entry) for a local workflow file.
+
+    With a ``file_index`` (path → entry), a file whose mtime and size are
+    unchanged is not read or hashed again. ``content`` (the staged blob,
+    for --staged) is hashed instead of the file on disk.
+    """
+    if content is not None:
+        local_data = json.loads(content)
+        entry = {'key': None, 'name': local_data.get('name', file_path.stem), 'id': local_data.get('id'),
+                 'hash': get_json_hash(local_data)}
+        return entry['name'], entry['hash'], entry
+
+    stat = file_path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    entry = file_index.get(str(file_path)) if file_index is not None else None
+    if entry and entry['key'] == key:
+        return entry['name'], entry['hash'], entry
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        local_data = json.load(f)
+
+    entry = {'key': key, 'name': local_data.get('name', file_path.stem), 'id': local_data.get('id'),
+             'hash': get_json_hash(local_data)}
+    if file_index is not None:
+        file_index[str(file_path)] = entry
+    return entry['name'], entry['hash'], entry
+
+
+def refresh_vm_cache(vm_cache: Dict[str, dict]) -> bool:
+    """Drop cached VM workflows whose `updatedAt` changed (or that were deleted).
+
+    Costs one paginated GET /workflows instead of one GET per workflow.
+    If the list cannot be fetched, the whole cache is dropped and False returned.
+    """
+    remote = list_all_workflows()
+    if remote is None:
+        vm_cache.clear()
+        return False
+    updated_at = {wf['id']: wf.get('updatedAt') for wf in remote}
+
+    for workflow_id in list(vm_cache):
+        stamp = updated_at.get(workflow_id)
+        if not stamp or vm_cache[workflow_id]['updatedAt'] != stamp:
+            del vm_cache[workflow_id]
+    return True
+
+
+def check_workflow_status(file_path: Path, workflow_map: dict,
+                          vm_payloads: Optional[Dict[str, dict]] = None,
+                          file_index: Optional[dict] = None,
+                          vm_cache: Optional[Dict[str, dict]] = None,
+                          git_key: Optional[tuple] = None,
+                          lookups: Optional[tuple] = None,
+                          snapshots: Optional[Dict[str, dict]] = None,
+                          snapshot_ttl: Optional[float] = None,
+                          allowed_ids: Optional[Set[str]] = None,
+                          content: Optional[bytes] = None) -> Optional[dict]:
+    """Check sync status for a single workflow file.
+
+    The workflow ID comes from the ID-keyed ``workflow_map`` (by recorded
+    file, then the file's `id`, then name); pass ``lookups`` from
+    map_lookups() when checking many files.
+
+    If ``vm_payloads`` is given, the fetched VM workflow is stored in it
+    (keyed by workflow ID) so callers can reuse it without a second fetch.
+    ``file_index``, ``vm_cache`` and ``git_key`` let a long-running caller
+    (sync-n8n-full.py --daemon) skip work for anything unchanged since the
+    previous check.
+
+    Every fetched VM version is recorded in ``snapshots`` (n8n_snapshots.py).
+    With ``snapshot_ttl``, a snapshot younger than that is used instead of
+    fetching (the result then has 'vm_snapshot_age' and no VM payload).
+    In offline mode the last snapshot is used whatever its age, and the
+    result is marked 'offline'.
+
+    With ``allowed_ids`` (--tag / --active-only), a workflow not in it is
+    skipped (None) before its git status or VM version is looked up.
+    ``content`` replaces the file on disk (--staged: the index version).
+    """
     # Read local file
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            local_data = json.load(f)
+        workflow_name, local_hash, entry = read_local_workflow(file_path, file_index, content)
     except Exception as e:
         return {
             'file': str(file_path),
@@ -198,14 +406,21 @@ def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict
             'error': f"Failed to read local file: {e}"
         }
 
-    workflow_name = local_data.get('name', file_path.stem)
-    local_hash = get_json_hash(local_data)
+    # Get workflow ID from map
+    if lookups is None:
+        lookups = map_lookups(workflow_map)
+    workflow_id = resolve_workflow_id(workflow_map, lookups, relative_path(file_path, Path.cwd().resolve()),
+                                      workflow_name, entry.get('id'))
+    if allowed_ids is not None and workflow_id not in allowed_ids:
+        return None
 
     # Get git status
-    has_uncommitted, last_commit = get_git_status(file_path)
-
-    # Get workflow ID from map
-    workflow_id = workflow_map.get(workflow_name)
+    if git_key is not None and entry.get('git_key') == git_key:
+        has_uncommitted, last_commit = entry['git_status']
+    else:
+        has_uncommitted, last_commit = get_git_status(file_path)
+        if git_key is not None:
+            entry['git_key'], entry['git_status'] = git_key, (has_uncommitted, last_commit)
 
     if not workflow_id:
         return {
@@ -220,10 +435,31 @@ def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict
             'message': 'Not found on VM (may need to deploy)'
         }
 
-    # Fetch workflow from VM
-    vm_workflow = call_n8n_api(f"workflows/{workflow_id}")
-
-    if not vm_workflow:
+    # Fetch workflow from VM (unless cached and unchanged since)
+    cached = vm_cache.get(workflow_id) if vm_cache is not None else None
+    snapshot = None
+    if snapshots is not None and snapshot_ttl:
+        snapshot = fresh_snapshot(snapshots, workflow_id, snapshot_ttl)
+
+    vm_hash = None
+    offline = False
+    if cached:
+        vm_workflow = cached['workflow']
+    elif snapshot:
+        vm_workflow = None
+        vm_hash = snapshot['hash']
+    else:
+        vm_workflow = call_n8n_api(f"workflows/{workflow_id}")
+        if vm_workflow and vm_cache is not None and vm_workflow.get('updatedAt'):
+            vm_cache[workflow_id] = {'updatedAt': vm_workflow['updatedAt'], 'workflow': vm_workflow}
+        elif not vm_workflow and is_offline():
+            # VM unreachable: fall back to the last known version, any age
+            offline = True
+            snapshot = snapshots.get(workflow_id) if snapshots is not None else None
+            if snapshot:
+                vm_hash = snapshot['hash']
+
+    if not vm_workflow and not vm_hash:
         return {
             'file': str(file_path),
             'name': workflow_name,
@@ -233,10 +469,15 @@ def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict
             'git_uncommitted': has_uncommitted,
             'git_last_commit': last_commit,
             'status': 'vm_error',
-            'message': 'Could not fetch from VM'
+            'message': 'VM unreachable and no cached snapshot' if offline else 'Could not fetch from VM'
         }
 
-    vm_hash = get_json_hash(vm_workflow)
+    if vm_workflow:
+        if vm_payloads is not None:
+            vm_payloads[workflow_id] = vm_workflow
+        vm_hash = get_json_hash(vm_workflow)
+        if snapshots is not None:
+            record_snapshot(snapshots, workflow_id, vm_workflow, vm_hash)
 
     # Determine status
     if local_hash == vm_hash:
@@ -254,7 +495,7 @@ def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict
             status = 'drift'
             message = 'Drift detected (local ≠ VM)'
 
-    return {
+    result = {
         'file': str(file_path),
         'name': workflow_name,
         'id': workflow_id,
@@ -265,6 +506,27 @@ def check_workflow_status(file_path: Path, workflow_map: Dict[str, str]) -> dict
         'status': status,
         'message': message
     }
+    if snapshot and not vm_workflow:
+        result['vm_snapshot_age'] = round(snapshot_age(snapshot))
+        result['message'] += (f" ({'offline, ' if offline else ''}"
+                              f"VM snapshot from {format_age(result['vm_snapshot_age'])} ago)")
+        if offline:
+            result['offline'] = True
+    return result
+
+
+def _label(result: dict) -> str:
+    """Workflow name for the report, with its instance when several are checked."""
+    if result.get('instance'):
+        return f"{result['name']} [{result['instance']}]"
+    return result['name']
+
+
+def _snapshot_note(result: dict) -> str:
+    """' (VM snapshot 5m old)' for results answered from a cached snapshot."""
+    if 'vm_snapshot_age' in result:
+        return f" {Colors.YELLOW}(VM snapshot {format_age(result['vm_snapshot_age'])} old){Colors.RESET}"
+    return ""
 
 
 def print_status_report(results: List[dict], quiet: bool = False):
@@ -280,6 +542,11 @@ def print_status_report(results: List[dict], quiet: bool = False):
     print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
     print()
 
+    if any(r.get('offline') for r in results):
+        print(f"{Colors.YELLOW}{Colors.BOLD}📴 Offline: VM state below is from cached snapshots "
+              f"(age shown per workflow){Colors.RESET}")
+        print()
+
     # Group by status
     synced = [r for r in results if r['status'] == 'synced']
     synced_uncommitted = [r for r in results if r['status'] == 'synced_uncommitted']
@@ -293,14 +560,14 @@ def print_status_report(results: List[dict], quiet: bool = False):
         print(f"{Colors.GREEN}{Colors.BOLD}✅ Synced ({len(synced)}){Colors.RESET}")
         for r in synced:
             commit_info = f" (last commit: {r['git_last_commit']})" if r['git_last_commit'] else ""
-            print(f"   {Colors.GREEN}✓{Colors.RESET} {r['name']}{commit_info}")
+            print(f"   {Colors.GREEN}✓{Colors.RESET} {_label(r)}{commit_info}{_snapshot_note(r)}")
         print()
 
     # Print synced but uncommitted
     if synced_uncommitted:
         print(f"{Colors.YELLOW}{Colors.BOLD}⚠️  Synced with VM but uncommitted changes ({len(synced_uncommitted)}){Colors.RESET}")
         for r in synced_uncommitted:
-            print(f"   {Colors.YELLOW}△{Colors.RESET} {r['name']}")
+            print(f"   {Colors.YELLOW}△{Colors.RESET} {_label(r)}{_snapshot_note(r)}")
             print(f"      {Colors.YELLOW}→ Local matches VM but not committed to GitHub{Colors.RESET}")
         print()
 
@@ -308,7 +575,7 @@ def print_status_report(results: List[dict], quiet: bool = False):
     if drift:
         print(f"{Colors.RED}{Colors.BOLD}❌ Drift detected ({len(drift)}){Colors.RESET}")
         for r in drift:
-            print(f"   {Colors.RED}✗{Colors.RESET} {r['name']} (ID: {r['id']})")
+            print(f"   {Colors.RED}✗{Colors.RESET} {_label(r)} (ID: {r['id']})")
             print(f"      {Colors.RED}→ {r['message']}{Colors.RESET}")
             commit_info = f" (last commit: {r['git_last_commit']})" if r['git_last_commit'] else ""
             print(f"      Local: {r['local_hash'][:8]}{commit_info}")
@@ -319,7 +586,7 @@ def print_status_report(results: List[dict], quiet: bool = False):
     if drift_uncommitted:
         print(f"{Colors.RED}{Colors.BOLD}🔥 Critical: Drift + uncommitted ({len(drift_uncommitted)}){Colors.RESET}")
         for r in drift_uncommitted:
-            print(f"   {Colors.RED}⚠{Colors.RESET} {r['name']} (ID: {r['id']})")
+            print(f"   {Colors.RED}⚠{Colors.RESET} {_label(r)} (ID: {r['id']})")
             print(f"      {Colors.RED}→ {r['message']}{Colors.RESET}")
             print(f"      Local: {r['local_hash'][:8]} (uncommitted)")
             print(f"      VM:    {r['vm_hash'][:8]}")
@@ -329,7 +596,7 @@ def print_status_report(results: List[dict], quiet: bool = False):
     if not_deployed:
         print(f"{Colors.CYAN}{Colors.BOLD}📤 Not deployed to VM ({len(not_deployed)}){Colors.RESET}")
         for r in not_deployed:
-            print(f"   {Colors.CYAN}?{Colors.RESET} {r['name']}")
+            print(f"   {Colors.CYAN}?{Colors.RESET} {_label(r)}")
             print(f"      {Colors.CYAN}→ {r['message']}{Colors.RESET}")
         print()
 
@@ -337,7 +604,7 @@ def print_status_report(results: List[dict], quiet: bool = False):
     if errors:
         print(f"{Colors.RED}{Colors.BOLD}💥 Errors ({len(errors)}){Colors.RESET}")
         for r in errors:
-            print(f"   {Colors.RED}!{Colors.RESET} {r['name']}")
+            print(f"   {Colors.RED}!{Colors.RESET} {_label(r)}")
             print(f"      {Colors.RED}→ {r.get('error', r.get('message', 'Unknown error'))}{Colors.RESET}")
         print()
 
@@ -350,6 +617,8 @@ def print_status_report(results: List[dict], quiet: bool = False):
         print(f"{Colors.GREEN}{Colors.BOLD}✅ All {total} workflows in sync!{Colors.RESET}")
     else:
         print(f"{Colors.YELLOW}{Colors.BOLD}⚠️  {issues}/{total} workflows need attention{Colors.RESET}")
+    if get_metrics().requests:  # (none when merging shard reports)
+        print(client_summary())
 
     print(f"{Colors.BOLD}{'='*70}{Colors.RESET}")
     print()
@@ -367,42 +636,435 @@ def print_status_report(results: List[dict], quiet: bool = False):
         print()
 
 
-def main():
-    """Main entry point."""
-    args = sys.argv[1:]
-    quiet = '--quiet' in args
-    output_json = '--json' in args
-
-    # Change to script directory
-    os.chdir(Path(__file__).parent.parent)
+def print_instance_summary(results: List[dict]):
+    """Print one line of counts per instance (multi-instance runs)."""
+    print(f"{Colors.BOLD}Per instance:{Colors.RESET}")
+    for instance in dict.fromkeys(r['instance'] for r in results):
+        rows = [r for r in results if r['instance'] == instance]
+        count = lambda *statuses: sum(1 for r in rows if r.get('status') in statuses)
+        print(f"  {instance:<20} {Colors.GREEN}{count('synced', 'synced_uncommitted')} synced{Colors.RESET}, "
+              f"{Colors.RED}{count('drift', 'drift_uncommitted')} drift{Colors.RESET}, "
+              f"{Colors.CYAN}{count('not_deployed')} not deployed{Colors.RESET}, "
+              f"{Colors.RED}{sum(1 for r in rows if r.get('status') == 'vm_error' or 'error' in r)} errors{Colors.RESET}")
+    print()
 
-    # Find workflow files
-    workflow_files = find_workflow_files()
 
+def map_lookups(workflow_map: dict) -> tuple:
+    """(file → id, name → id) indexes of the workflow map, for check_workflow_status()."""
+    return map_file_index(workflow_map), name_index(workflow_map)
+
+
+def collect_status(show_progress: bool = False,
+                   vm_payloads: Optional[Dict[str, dict]] = None,
+                   file_index: Optional[dict] = None,
+                   vm_cache: Optional[Dict[str, dict]] = None,
+                   files: Optional[List[Path]] = None,
+                   snapshot_ttl: Optional[float] = None,
+                   shard: Optional[Shard] = None,
+                   selection: Optional[WorkflowSelection] = None,
+                   db_url: Optional[str] = None,
+                   contents: Optional[Dict[Path, bytes]] = None) -> List[dict]:
+    """Run discovery and check every workflow file.
+
+    Expects the current directory to be the project root. Used by main()
+    and, in-process, by sync-n8n-full.py (which passes ``vm_payloads`` to
+    collect the fetched VM workflows for export/deploy). The daemon also
+    passes a ``file_index`` and ``vm_cache`` it keeps between cycles.
+
+    ``files`` limits the check to those files (--staged), and ``contents``
+    gives what to check for them instead of the working tree (their
+    staged blobs, n8n_discovery.staged_contents()); ``snapshot_ttl``
+    lets VM snapshots younger than that stand in for a fetch. An instance
+    found unreachable earlier gets one new connection attempt per call.
+    With ``shard`` (n8n_shard.py), only that shard's workflows are checked;
+    ``selection`` (n8n_selection.py) narrows them by directory, tag and
+    active state, all before any per-workflow fetch. With ``db_url``
+    (n8n_db.py), the VM versions come from one query on n8n's database
+    instead of a GET per workflow.
+    """
+    metrics = get_metrics()
+    reset_offline()
+
+    if files is None:
+        with metrics.phase('discover'):
+            files = find_workflow_files()
+    workflow_files = files
     if not workflow_files:
-        print(f"{Colors.YELLOW}No workflow files found in configured directories{Colors.RESET}")
-        sys.exit(0)
+        return []
 
     # Load or create workflow map
-    workflow_map = load_or_create_workflow_map()
+    with metrics.phase('discover'):
+        workflow_map = load_or_create_workflow_map()
+
+    lookups = map_lookups(workflow_map)
+    if shard:
+        root = Path.cwd().resolve()
+        by_file = lookups[0]
+
+        def key(file_path: Path) -> str:
+            # Partition by workflow ID, as export and deploy do; the path only for unmapped files
+            rel = relative_path(file_path, root)
+            workflow_id = by_file.get(rel)
+            if workflow_id is None:
+                try:
+                    if contents and file_path in contents:
+                        data = json.loads(contents[file_path])
+                    else:
+                        with open(file_path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                except (OSError, ValueError):
+                    data = {}
+                if not isinstance(data, dict):
+                    data = {}
+                workflow_id = resolve_workflow_id(workflow_map, lookups, rel, data.get('name', ''), data.get('id'))
+            return shard_key(workflow_id, rel)
+
+        workflow_files = [f for f in workflow_files if in_shard(key(f), shard)]
+
+    allowed_ids = None
+    if selection:
+        root = Path.cwd().resolve()
+        workflow_files = [f for f in workflow_files if selection.matches_file(relative_path(f, root))]
+        if selection.needs_listing and workflow_files:
+            # Tags / active state: one filtered listing instead of a fetch per workflow
+            listing = list_all_workflows(selection.query())
+            if listing is None:
+                print(f"{Colors.RED}✗ Could not list workflows ({selection.describe()}){Colors.RESET}",
+                      file=sys.stderr)
+                return []
+            allowed_ids = selected_ids(listing, selection)
+
+    git_key = None
+    if file_index is not None:
+        # Forget files that no longer exist
+        present = {str(f) for f in workflow_files}
+        for path in [p for p in file_index if p not in present]:
+            del file_index[path]
+        with metrics.phase('git'):
+            git_key = get_git_state_key()
+
+    if db_url:
+        # Every VM version from one query on n8n's database (hashes as over REST)
+        with metrics.phase('fetch'):
+            try:
+                rows = load_workflows(db_url, ids=allowed_ids if allowed_ids is not None
+                                      else workflow_map['workflows'].keys())
+            except WorkflowDbError as e:
+                print(f"{Colors.RED}✗ {e}{Colors.RESET}", file=sys.stderr)
+                return []
+        vm_cache = {wf_id: {'updatedAt': wf['updatedAt'], 'workflow': wf} for wf_id, wf in rows.items()}
+    elif vm_cache:
+        refresh_vm_cache(vm_cache)
+
+    snapshots = load_snapshots()
+    snapshots_before = dict(snapshots)
 
     # Check each workflow
     results = []
     for wf_file in workflow_files:
-        if not quiet and not output_json:
+        if show_progress:
             print(f"{Colors.CYAN}Checking {wf_file.name}...{Colors.RESET}", end='\r')
-        result = check_workflow_status(wf_file, workflow_map)
+        started = time.perf_counter()
+        result = check_workflow_status(wf_file, workflow_map, vm_payloads=vm_payloads,
+                                       file_index=file_index, vm_cache=vm_cache, git_key=git_key,
+                                       lookups=lookups, snapshots=snapshots, snapshot_ttl=snapshot_ttl,
+                                       allowed_ids=allowed_ids,
+                                       content=contents.get(wf_file) if contents else None)
+        if result is None:
+            continue
+        metrics.record_workflow(result.get('id') or result['name'], time.perf_counter() - started)
         results.append(result)
 
+    if snapshots != snapshots_before:
+        try:
+            save_snapshots(snapshots)
+        except OSError as e:
+            print(f"{Colors.YELLOW}Warning: could not save VM snapshots: {e}{Colors.RESET}", file=sys.stderr)
+
     # Clear progress line
-    if not quiet and not output_json:
+    if show_progress:
         print(" " * 80, end='\r')
 
+    return results
+
+
+# --watch: how each status is shown in a transition line
+STATUS_MARKS = {
+    'synced': (Colors.GREEN, '✓'),
+    'synced_uncommitted': (Colors.YELLOW, '△'),
+    'drift': (Colors.RED, '✗'),
+    'drift_uncommitted': (Colors.RED, '⚠'),
+    'not_deployed': (Colors.CYAN, '?'),
+    'vm_error': (Colors.RED, '!'),
+    'error': (Colors.RED, '!'),
+    'removed': (Colors.GRAY, '-'),
+}
+
+
+def _watch_status(result: Optional[dict]) -> Optional[str]:
+    if result is None:
+        return None
+    return 'error' if 'error' in result else result['status']
+
+
+def print_transition(previous: Optional[dict], result: dict, output_ndjson: bool = False) -> None:
+    """One line for a re-checked workflow: 'HH:MM:SS ✗ Name: synced → drift (...)'."""
+    before, after = _watch_status(previous), _watch_status(result)
+    if output_ndjson:
+        print(json.dumps(dict(result, previous_status=before, checked_at=time.strftime('%Y-%m-%dT%H:%M:%S')),
+                         ensure_ascii=False), flush=True)
+        return
+
+    color, mark = STATUS_MARKS.get(after, (Colors.RESET, '·'))
+    stamp = f"{Colors.GRAY}{time.strftime('%H:%M:%S')}{Colors.RESET}"
+    detail = result.get('error') or result.get('message', '')
+    if after in ('drift', 'drift_uncommitted'):
+        detail += f" — local {result['local_hash'][:8]}, VM {result['vm_hash'][:8]}"
+    if before == after:
+        print(f"{stamp} {Colors.GRAY}{mark} {result['name']}: still {after}{Colors.RESET}", flush=True)
+    elif before is None:
+        print(f"{stamp} {color}{mark}{Colors.RESET} {result['name']}: {Colors.BOLD}new{Colors.RESET} → "
+              f"{color}{after}{Colors.RESET} {Colors.GRAY}({detail}){Colors.RESET}", flush=True)
+    else:
+        print(f"{stamp} {color}{mark}{Colors.RESET} {result['name']}: {before} → "
+              f"{color}{Colors.BOLD}{after}{Colors.RESET} {Colors.GRAY}({detail}){Colors.RESET}", flush=True)
+
+
+def watch_status(quiet: bool = False, output_ndjson: bool = False, snapshot_ttl: Optional[float] = None,
+                 shard: Optional[Shard] = None, selection: Optional[WorkflowSelection] = None,
+                 polling: bool = False, db_url: Optional[str] = None) -> int:
+    """--watch: check everything once, then re-check each workflow file as it is saved.
+
+    Files are watched with inotify where available (n8n_watch.py), otherwise
+    by polling mtimes. A save costs one local hash, one git status and one
+    VM fetch for that workflow only, and prints its status transition.
+    Changes made on the VM alone are not noticed until the file is touched.
+    """
+    from n8n_watch import FileWatcher
+
+    file_index: dict = {}
+    show_progress = not quiet and not output_ndjson
+    results = collect_status(show_progress=show_progress, file_index=file_index,
+                             snapshot_ttl=snapshot_ttl, shard=shard, selection=selection, db_url=db_url)
+    if output_ndjson:
+        for r in results:
+            print(json.dumps(r, ensure_ascii=False), flush=True)
+    elif not quiet:
+        print_status_report(results)
+    by_file = {r['file']: r for r in results}
+
+    # New files can only be placed when the selection doesn't depend on the VM side
+    accept_new = shard is None and not (selection and selection.needs_listing)
+    workflow_map = load_or_create_workflow_map()
+    lookups = map_lookups(workflow_map)
+    root = Path.cwd().resolve()
+    watcher = FileWatcher([Path.cwd() / d for d in WORKFLOW_DIRS], polling=polling)
+    if not output_ndjson:
+        print(f"{Colors.BOLD}👀 Watching {len(by_file)} workflows{Colors.RESET} "
+              f"{Colors.GRAY}({watcher.backend}; Ctrl-C to stop){Colors.RESET}", flush=True)
+
+    try:
+        while True:
+            changed = watcher.changes()
+            reset_offline()
+            snapshots = load_snapshots()
+            snapshots_before = dict(snapshots)
+            for path in sorted(changed):
+                key = str(path)
+                previous = by_file.get(key)
+                if not path.exists():
+                    if previous is not None:
+                        del by_file[key]
+                        print_transition(previous, dict(previous, status='removed', message='File removed'),
+                                         output_ndjson)
+                    continue
+                if not is_workflow_file(path):
+                    continue
+                if previous is None and not (accept_new and (not selection
+                                                             or selection.matches_file(relative_path(path, root)))):
+                    continue
+                result = check_workflow_status(path, workflow_map, file_index=file_index, lookups=lookups,
+                                               snapshots=snapshots, snapshot_ttl=snapshot_ttl)
+                if result is None:
+                    continue
+                by_file[key] = result
+                print_transition(previous, result, output_ndjson)
+            if snapshots != snapshots_before:
+                try:
+                    save_snapshots(snapshots)
+                except OSError as e:
+                    print(f"{Colors.YELLOW}Warning: could not save VM snapshots: {e}{Colors.RESET}",
+                          file=sys.stderr)
+    except KeyboardInterrupt:
+        if not output_ndjson:
+            print(f"\n{Colors.GRAY}Stopped watching{Colors.RESET}")
+    finally:
+        watcher.close()
+    return 0
+
+
+def pop_option(args: List[str], flag: str) -> Tuple[List[str], Optional[str]]:
+    """Strip ``flag VALUE`` / ``flag=VALUE`` from a raw argv list; returns (args, value)."""
+    remaining = []
+    value = None
+    i = 0
+    while i < len(args):
+        name, _, inline = args[i].partition('=')
+        if name == flag:
+            if not inline and i + 1 < len(args):
+                i += 1
+                inline = args[i]
+            value = inline or None
+        else:
+            remaining.append(args[i])
+        i += 1
+    return remaining, value
+
+
+def load_reports(paths: List[str]) -> List[dict]:
+    """Results from --json (array) or --ndjson (one object per line) report files.
+
+    A workflow found in several reports (overlapping shards) is kept once.
+    """
+    merged = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        try:
+            rows = json.loads(text)
+        except ValueError:
+            rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+        if isinstance(rows, dict):
+            rows = [rows]
+        for r in rows:
+            merged[(r.get('instance'), r['file'])] = r
+    return list(merged.values())
+
+
+def main():
+    """Main entry point."""
+    args, metrics_json, metrics_prom = pop_metrics_args(sys.argv[1:])
+    args, instance_spec = pop_instance_args(args)
+    args, cache_ttl = pop_option(args, '--cache-ttl')
+    args, db_url = pop_option(args, '--db')
+    try:
+        args, shard = pop_shard_args(args)
+    except ValueError as e:
+        print(f"{Colors.RED}✗ {e}{Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+    args, selection = pop_selection_args(args)
+    quiet = '--quiet' in args
+    output_json = '--json' in args
+    output_ndjson = '--ndjson' in args
+    refresh = '--refresh-map' in args
+    staged = '--staged' in args
+    watch = '--watch' in args
+    if db_url and (instance_spec or '--offline' in args):
+        print(f"{Colors.RED}✗ --db reads one n8n database; it cannot be combined with --instance or --offline"
+              f"{Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+    if watch and (instance_spec or staged or output_json or '--merge-reports' in args):
+        print(f"{Colors.RED}✗ --watch cannot be combined with --instance, --staged, --json or --merge-reports"
+              f"{Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+    if '--offline' in args:
+        set_offline()
+
+    try:
+        snapshot_ttl = float(cache_ttl) if cache_ttl is not None else (DEFAULT_TTL if staged else None)
+    except ValueError:
+        print(f"{Colors.RED}✗ --cache-ttl needs a number of seconds{Colors.RESET}", file=sys.stderr)
+        sys.exit(2)
+
+    if '--merge-reports' in args:
+        # Combine shard reports (paths relative to the caller's directory)
+        paths = [arg for arg in args if not arg.startswith('--')]
+        try:
+            results = load_reports(paths)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"{Colors.RED}✗ Cannot read report: {e}{Colors.RESET}", file=sys.stderr)
+            sys.exit(2)
+        results.sort(key=lambda r: (r.get('instance') or '', r['file']))
+        if output_json:
+            print(json.dumps(results, indent=2))
+        else:
+            print_status_report(results, quiet=quiet)
+            if any(r.get('instance') for r in results):
+                print_instance_summary(results)
+        sys.exit(0)
+
+    report_at_exit(start_run('sync-n8n-status'), metrics_json, metrics_prom)
+
+    # Change to script directory
+    os.chdir(Path(__file__).parent.parent)
+
+    files = None
+    contents = None
+    if staged:
+        # Pre-commit: only the staged workflow files, nothing at all if none
+        with get_metrics().phase('git'):
+            files = staged_workflow_files()
+            # Check what is being committed, not the working tree (git add -p)
+            contents = staged_contents(files)
+        if not files:
+            if output_json:
+                print('[]')
+            elif not quiet and not output_ndjson:
+                print(f"{Colors.GREEN}✓ No workflow files staged{Colors.RESET}")
+            sys.exit(0)
+
+    instances = None
+    if instance_spec:
+        try:
+            instances = select_instances(instance_spec)
+        except InstanceError as e:
+            print(f"{Colors.RED}✗ {e}{Colors.RESET}", file=sys.stderr)
+            sys.exit(1)
+
+    if refresh:
+        # Rebuild the map(s) from the full paginated workflow list, then stop
+        def refresh_instance(instance):
+            map_file = map_file_path(Path(WORKFLOW_MAP_FILE))
+            workflow_map = load_workflow_map_file(map_file) if map_file.exists() else empty_map()
+            return refresh_map(workflow_map, quiet=quiet)
+
+        if instances:
+            reports = run_per_instance(instances, refresh_instance)
+        else:
+            reports = {None: refresh_instance(None)}
+        sys.exit(0 if all(report is not None for report in reports.values()) else 1)
+
+    if watch:
+        sys.exit(watch_status(quiet=quiet, output_ndjson=output_ndjson, snapshot_ttl=snapshot_ttl,
+                              shard=shard, selection=selection, polling='--poll' in args,
+                              db_url=db_url))
+
+    if instances:
+        # Check every selected instance concurrently, then report them together
+
+        by_instance = run_per_instance(
+            instances, lambda instance: collect_status(files=files, snapshot_ttl=snapshot_ttl, shard=shard,
+                                                       selection=selection, contents=contents))
+        results = [dict(r, instance=name) for name, rows in by_instance.items() for r in rows]
+    else:
+        results = collect_status(show_progress=not quiet and not output_json and not output_ndjson,
+                                 files=files, snapshot_ttl=snapshot_ttl, shard=shard,
+                                 selection=selection, db_url=db_url, contents=contents)
+
+    if not results and not shard and not selection:
+        print(f"{Colors.YELLOW}No workflow files found in configured directories{Colors.RESET}")
+        sys.exit(0)
+
     # Output results
     if output_json:
         print(json.dumps(results, indent=2))
+    elif output_ndjson:
+        for r in results:
+            print(json.dumps(r))
     else:
         print_status_report(results, quiet=quiet)
+        if instance_spec:
+            print_instance_summary(results)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures for the sync script tests
+
+The tests run the real scripts against FakeN8nApi (n8n_fake_api.py) in a
+throwaway project built from a seeded corpus (n8n_corpus.py), like
+bench-n8n-sync.py does. Project directories come from mkdtemp, not pytest's
+tmp_path: workflow discovery skips paths containing 'test'.
+
+Run from the project root:
+    python -m pytest commands/tests
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+COMMANDS_DIR = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(COMMANDS_DIR))
+
+from n8n_fake_api import FakeN8nApi  # noqa: E402
+
+API_KEY = 'tests-key'
+
+
+@pytest.fixture
+def make_project():
+    """make_project(corpus) → root of a git project holding the scripts and the corpus's local side."""
+    roots = []
+
+    def make(corpus, git: bool = True) -> Path:
+        root = Path(tempfile.mkdtemp(prefix='n8n-project-'))
+        roots.append(root)
+        (root / 'commands').mkdir()
+        for script in COMMANDS_DIR.glob('*.py'):
+            shutil.copy2(script, root / 'commands' / script.name)
+        (root / '.gitignore').write_text('.n8n-cache/\n__pycache__/\n', encoding='utf-8')
+        corpus.write_tree(root, git=git)
+        return root
+
+    yield make
+    for root in roots:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+@pytest.fixture
+def fake_api():
+    """A running FakeN8nApi (load workflows/executions into it)."""
+    with FakeN8nApi(api_key=API_KEY, seed=0) as api:
+        yield api
+
+
+@pytest.fixture
+def run_script(fake_api):
+    """run_script(root, 'script.py', *args) → CompletedProcess, against ``fake_api``."""
+    def run(root: Path, script: str, *args: str, stdin: str = '') -> subprocess.CompletedProcess:
+        env = {**os.environ, 'N8N_API_URL': fake_api.url, 'N8N_API_KEY': API_KEY,
+               'N8N_API_RATE': '1000', 'PYTHONIOENCODING': 'utf-8'}
+        return subprocess.run([sys.executable, str(root / 'commands' / script), *args], cwd=root, env=env,
+                              input=stdin, capture_output=True, text=True, encoding='utf-8', timeout=120)
+    return run
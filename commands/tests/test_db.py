@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""n8n_db.py: ids= filters in SQL, and Postgres connection errors become WorkflowDbError."""
+
+import sqlite3
+import tempfile
+import types
+from pathlib import Path
+
+import pytest
+
+import n8n_db
+from n8n_corpus import generate_corpus
+from n8n_db import WorkflowDbError, connect, load_workflows, write_sqlite_fixture
+from n8n_hash import workflow_hash
+
+
+@pytest.fixture
+def db_file():
+    corpus = generate_corpus(30, seed=4)
+    path = Path(tempfile.mkdtemp(prefix='n8n-db-')) / 'n8n.db'
+    write_sqlite_fixture(path, corpus.workflows)
+    yield path, corpus.workflows
+    path.unlink(missing_ok=True)
+    path.parent.rmdir()
+
+
+def test_ids_filter_runs_in_sql(db_file, monkeypatch):
+    path, workflows = db_file
+    statements = []
+    connect_sqlite = sqlite3.connect
+
+    def traced(*args, **kwargs):
+        conn = connect_sqlite(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(n8n_db.sqlite3, 'connect', traced)
+    monkeypatch.setattr(n8n_db, 'IDS_PER_QUERY', 4)
+    wanted = [w['id'] for w in workflows[::3]]
+    rows = load_workflows(str(path), ids=wanted + ['not-there'])
+
+    assert sorted(rows) == sorted(wanted)
+    by_id = {w['id']: w for w in workflows}
+    assert all(workflow_hash(rows[wf_id]) == workflow_hash(by_id[wf_id]) for wf_id in rows)
+    selects = [s for s in statements if s.startswith('SELECT')]
+    assert len(selects) == 3 and all('WHERE id IN (' in s for s in selects)
+
+
+def test_no_ids_reads_nothing(db_file):
+    path, _ = db_file
+    assert load_workflows(str(path), ids=[]) == {}
+    assert len(load_workflows(str(path))) == 30
+
+
+def test_psycopg_connection_error_is_wrapped(monkeypatch):
+    class Error(Exception):
+        pass
+
+    class OperationalError(Error):
+        pass
+
+    def refuse(url):
+        raise OperationalError('connection refused')
+
+    fake = types.ModuleType('psycopg')
+    fake.Error, fake.OperationalError, fake.connect = Error, OperationalError, refuse
+    monkeypatch.setitem(n8n_db.sys.modules, 'psycopg', fake)
+    with pytest.raises(WorkflowDbError, match='connection refused'):
+        connect('postgresql://n8n@127.0.0.1:1/n8n')
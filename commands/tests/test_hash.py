@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""workflow_hash(): the streaming digest equals the json.dumps() reference."""
+
+import json
+import random
+
+import pytest
+
+import n8n_sync_state
+from n8n_corpus import generate_corpus
+from n8n_discovery import find_workflow_files
+from n8n_hash import dumps_hash, essential_fields, workflow_hash
+
+from conftest import COMMANDS_DIR
+
+EDGE_CASES = [
+    {},
+    {'name': 'Só nome — ünïcödé ✓ 🚀'},
+    {'name': 'x', 'nodes': [], 'connections': {}, 'settings': None},
+    {'name': 'floats', 'nodes': [{'position': [0.1, -2.5e-8], 'parameters': {'n': 1e300, 'b': True}}]},
+    {'name': 'escapes', 'nodes': [{'parameters': {'jsCode': 'const s = "a\\"b\\n\\t\\u0000";\n// </script>'}}]},
+    {'name': 'order', 'nodes': [{'b': 1, 'a': {'z': [3, {'y': None, 'x': 'é'}]}}],
+     'connections': {'Z': {'main': [[]]}, 'A': {'main': [[{'node': 'Z', 'type': 'main', 'index': 0}]]}}},
+    {'name': 'int keys', 'nodes': [], 'connections': {}, 'settings': {1: 'a', 2: 'b'}},
+    {'name': 'extra fields ignored', 'id': 'abc', 'active': True, 'updatedAt': '2025-01-01T00:00:00.000Z'},
+]
+
+
+@pytest.mark.parametrize('workflow', EDGE_CASES, ids=range(len(EDGE_CASES)))
+def test_edge_cases_match_reference(workflow):
+    assert workflow_hash(workflow) == dumps_hash(workflow)
+
+
+def test_corpus_matches_reference():
+    corpus = generate_corpus(60, seed=3, drift=0.3)
+    workflows = corpus.workflows + [w for edits in corpus.edits.values() for w in edits.values()]
+    assert [workflow_hash(w) for w in workflows] == [dumps_hash(w) for w in workflows]
+
+
+def test_large_code_node_matches_reference():
+    rng = random.Random(1)
+    code = ''.join(rng.choice('abc "\\\n\té€') for _ in range(300_000))
+    workflow = {'name': 'big', 'nodes': [{'name': 'Code', 'parameters': {'jsCode': code}}] * 3}
+    assert workflow_hash(workflow) == dumps_hash(workflow)
+
+
+def test_repository_workflows_match_reference():
+    files = find_workflow_files(COMMANDS_DIR.parent)
+    for path in files:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        if isinstance(data, dict):
+            assert workflow_hash(data) == dumps_hash(data), path
+
+
+def test_one_essential_fields_definition():
+    # Base snapshots and merges use the fields the drift hash covers
+    assert n8n_sync_state.essential_fields is essential_fields
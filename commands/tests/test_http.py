@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""n8n_http.http_exchange: a reused keep-alive connection honours each request's timeout."""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from n8n_http import _drop_connection, http_exchange
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+
+    def do_GET(self):
+        if self.path == '/slow':
+            time.sleep(1.5)
+        body = b'{}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    netloc = f"127.0.0.1:{httpd.server_address[1]}"
+    yield f"http://{netloc}"
+    _drop_connection('http', netloc)
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reused_connection_takes_the_new_timeout(server):
+    assert http_exchange('GET', f"{server}/fast", {}, timeout=0.5)[0] == 200
+    # Same thread and host: the keep-alive socket opened with timeout=0.5 is reused
+    assert http_exchange('GET', f"{server}/slow", {}, timeout=10)[0] == 200
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""n8n_journal.Journal: a resumed run sees the plan and the stages recorded before the crash."""
+
+import pytest
+
+import n8n_journal
+from n8n_journal import Journal
+
+PLAN = [{'key': "MVP's/Hotel Concierge/Hotel Concierge.json"}, {'key': 'abc123'}, {'key': 'def456'}]
+
+
+@pytest.fixture
+def journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(n8n_journal, 'CACHE_DIR', tmp_path)
+    journal = Journal('sync-n8n-deploy')
+    journal.begin(PLAN, {'activate': True})
+    return journal
+
+
+def test_load_restores_plan_and_stages(journal):
+    journal.record(PLAN[0]['key'], 'pushed')
+    journal.record(PLAN[0]['key'])
+    journal.record(PLAN[1]['key'], 'pushed')
+
+    resumed = Journal('sync-n8n-deploy')
+    assert resumed.load()
+    assert resumed.plan == PLAN and resumed.header['options'] == {'activate': True}
+    assert resumed.is_done(PLAN[0]['key'])
+    assert resumed.stage(PLAN[1]['key']) == 'pushed'
+    assert resumed.stage(PLAN[2]['key']) is None
+    assert resumed.remaining() == 2
+
+
+def test_torn_last_line_is_ignored(journal):
+    journal.record(PLAN[0]['key'])
+    with open(journal.path, 'a', encoding='utf-8') as f:
+        f.write('{"key": "abc123", "sta')  # crash mid-write
+
+    resumed = Journal('sync-n8n-deploy')
+    assert resumed.load()
+    assert resumed.is_done(PLAN[0]['key']) and resumed.stage(PLAN[1]['key']) is None
+
+
+def test_finish_removes_the_journal(journal):
+    journal.finish()
+    assert not journal.path.exists()
+    assert not Journal('sync-n8n-deploy').load()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""lint-n8n.py --staged: lints, and compares with HEAD, what is being committed."""
+
+import copy
+import json
+import subprocess
+
+from n8n_corpus import SyntheticCorpus, generate_corpus
+
+LOOP = {'name': 'Loop', 'type': 'n8n-nodes-base.splitInBatches', 'typeVersion': 3,
+        'position': [0, 0], 'parameters': {'batchSize': 1}}
+
+
+def with_loop(workflow: dict, **changes) -> dict:
+    edited = copy.deepcopy(workflow)
+    edited['nodes'].append(dict(copy.deepcopy(LOOP), **changes))
+    return edited
+
+
+def write(root, rel: str, workflow: dict, stage: bool = False) -> None:
+    (root / rel).write_text(json.dumps(workflow, indent=2, ensure_ascii=False), encoding='utf-8')
+    if stage:
+        subprocess.run(['git', 'add', '--', rel], cwd=root, check=True)
+
+
+def loop_findings(run_script, root) -> list:
+    result = run_script(root, 'lint-n8n.py', '--staged', '--changed-nodes', '--format', 'json')
+    assert result.returncode in (0, 1), result.stderr
+    return [f for r in json.loads(result.stdout) for f in r['findings'] if f['node'] == 'Loop']
+
+
+def test_staged_finding_not_hidden_by_working_tree(make_project, run_script):
+    workflow = generate_corpus(1, seed=8).workflows[0]
+    corpus = SyntheticCorpus([workflow], {}, seed=8)
+    root = make_project(corpus)
+    rel = corpus.paths[workflow['id']]
+
+    write(root, rel, with_loop(workflow), stage=True)
+    write(root, rel, workflow)  # undone, but only in the working tree
+    assert [f['rule'] for f in loop_findings(run_script, root)] == ['split-batch-size-1']
+
+
+def test_unstaged_edit_does_not_block(make_project, run_script):
+    workflow = with_loop(generate_corpus(1, seed=8).workflows[0])
+    corpus = SyntheticCorpus([workflow], {}, seed=8)
+    root = make_project(corpus)
+    rel = corpus.paths[workflow['id']]
+
+    moved = copy.deepcopy(workflow)
+    moved['nodes'][-1]['position'] = [200, 0]
+    write(root, rel, moved, stage=True)  # the commit only moves the node
+    edited = copy.deepcopy(moved)
+    edited['nodes'][-1]['notes'] = 'not staged yet'
+    write(root, rel, edited)
+    assert loop_findings(run_script, root) == []
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""prune-n8n.py: dry runs complete, and a --limit run plus --resume deletes exactly what is due."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from n8n_corpus import generate_corpus, generate_executions
+from n8n_executions import parse_timestamp
+
+RETENTION = timedelta(days=10)
+FLAGS = ('--json', '--sample', '0', '--pause', '0', '--batch-size', '7')
+
+
+@pytest.fixture
+def history(make_project, fake_api):
+    """(project root, IDs of the executions due) for 20 days of executions of 4 workflows."""
+    corpus = generate_corpus(4, seed=6)
+    root = make_project(corpus, git=False)
+    fake_api.load(corpus.vm_workflows())
+    now = datetime.now(timezone.utc)
+    cutoff = now - RETENTION
+    # Nothing within an hour of the cut-off, so the run's own clock can't flip one
+    executions = [e for e in generate_executions(corpus.workflows, 40, seed=6, days=20, end=now)
+                  if abs(parse_timestamp(e['startedAt']) - cutoff) > timedelta(hours=1)]
+    fake_api.load_executions(executions)
+    due = {int(e['id']) for e in executions if parse_timestamp(e['startedAt']) < cutoff}
+    assert 0 < len(due) < len(executions)
+    return root, due
+
+
+def prune(run_script, root, *args, stdin=''):
+    result = run_script(root, 'prune-n8n.py', *FLAGS, *args, stdin=stdin)
+    return result, json.loads(result.stdout[result.stdout.index('{'):]) if '{' in result.stdout else None
+
+
+def test_dry_run_is_complete(history, fake_api, run_script):
+    root, due = history
+    before = set(fake_api.executions)
+    result, report = prune(run_script, root, '--older-than', '10d', '--dry-run')
+    assert result.returncode == 0, result.stderr
+    assert report['complete'] is True
+    assert report['executions'] == len(due)
+    assert set(fake_api.executions) == before
+
+
+def test_limit_then_resume_deletes_everything_due(history, fake_api, run_script):
+    root, due = history
+    kept = set(fake_api.executions) - due
+
+    result, first = prune(run_script, root, '--older-than', '10d', '--limit', '25', '--yes')
+    assert result.returncode == 0, result.stderr
+    assert (first['complete'], first['executions']) == (False, 25)
+    assert len(set(fake_api.executions) & due) == len(due) - 25
+
+    # --resume asks before deleting more, unless --yes
+    result, _ = prune(run_script, root, '--resume', stdin='n\n')
+    assert result.returncode == 0 and 'Cancelled' in result.stdout
+    assert len(set(fake_api.executions) & due) == len(due) - 25
+
+    result, resumed = prune(run_script, root, '--resume', '--yes')
+    assert result.returncode == 0, result.stderr
+    assert resumed['complete'] is True
+    assert resumed['executions'] == len(due)  # the resumed run's totals include the first run's
+    assert set(fake_api.executions) == kept
+
+    result, again = prune(run_script, root, '--older-than', '10d', '--dry-run')
+    assert (again['complete'], again['executions']) == (True, 0)
+    assert not (root / '.n8n-cache' / 'prune-state.json').exists()
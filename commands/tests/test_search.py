@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""search-n8n.py: each argument is one clause, spaces and apostrophes included."""
+
+import copy
+
+import pytest
+
+from n8n_corpus import SyntheticCorpus, generate_corpus
+from n8n_index import parse_query
+
+
+def with_node(workflow: dict, name: str, node_type: str = 'n8n-nodes-base.noOp') -> dict:
+    edited = copy.deepcopy(workflow)
+    edited['nodes'].append({'name': name, 'type': node_type, 'typeVersion': 1,
+                            'position': [0, 0], 'parameters': {}})
+    return edited
+
+
+@pytest.fixture
+def project(make_project):
+    first, second, third = generate_corpus(3, seed=1).workflows
+    workflows = [
+        with_node(first, 'Send Email', 'n8n-nodes-base.emailSend'),
+        # 'send' in one node, 'email' in another: only a split clause matches it
+        with_node(with_node(second, 'Send SMS'), 'Email Log'),
+        with_node(third, "Client's Notes"),
+    ]
+    corpus = SyntheticCorpus(workflows, {}, seed=1)
+    return make_project(corpus, git=False), corpus, workflows
+
+
+def search_files(run_script, root, *query):
+    result = run_script(root, 'search-n8n.py', '--files', *query)
+    assert result.returncode in (0, 1), result.stderr
+    return result.stdout.splitlines()
+
+
+def test_multi_word_clause_stays_one_clause(project, run_script):
+    root, corpus, workflows = project
+    # What the shell passes for: search-n8n.py node:"Send Email"
+    assert search_files(run_script, root, 'node:Send Email') == [corpus.paths[workflows[0]['id']]]
+
+
+def test_apostrophe_is_searchable(project, run_script):
+    root, corpus, workflows = project
+    assert search_files(run_script, root, "client's") == [corpus.paths[workflows[2]['id']]]
+
+
+def test_query_string_is_split_shell_style():
+    assert parse_query('node:"Send Email" type:emailSend') == [('node', 'send email'), ('type', 'emailsend')]
+    assert parse_query(['node:Send Email', "it's"]) == [('node', 'send email'), (None, "it's")]
+    with pytest.raises(ValueError, match='quote clauses'):
+        parse_query("it's")
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""--shard i/n: status partitions workflows by ID, like export and deploy."""
+
+import json
+
+import pytest
+
+from n8n_corpus import generate_corpus
+from n8n_shard import in_shard, parse_shard
+
+SHARDS = 3
+
+
+def status_ids(run_script, root, shard: str) -> list:
+    result = run_script(root, 'sync-n8n-status.py', '--json', '--shard', shard)
+    assert result.returncode in (0, 1), result.stderr
+    return [r['id'] for r in json.loads(result.stdout)]
+
+
+@pytest.mark.parametrize('legacy_map', [False, True], ids=['v2-map', 'legacy-map'])
+def test_status_shards_by_workflow_id(make_project, fake_api, run_script, legacy_map):
+    corpus = generate_corpus(24, seed=5)
+    root = make_project(corpus, git=False)
+    if legacy_map:
+        # {name: id}, as committed before the v2 map: no recorded files
+        legacy = {w['name']: w['id'] for w in corpus.workflows}
+        (root / '.n8n-workflow-map.json').write_text(json.dumps(legacy), encoding='utf-8')
+    fake_api.load(corpus.vm_workflows())
+    ids = sorted(w['id'] for w in corpus.workflows)
+
+    seen = []
+    for index in range(1, SHARDS + 1):
+        spec = f"{index}/{SHARDS}"
+        got = status_ids(run_script, root, spec)
+        # The same partition sync-n8n-export.py applies (shard_key = workflow ID)
+        assert sorted(got) == [wf_id for wf_id in ids if in_shard(wf_id, parse_shard(spec))]
+        seen += got
+    assert sorted(seen) == ids
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""--staged checks what is being committed (the index), not the working tree."""
+
+import copy
+import json
+import subprocess
+
+from n8n_corpus import SyntheticCorpus, generate_corpus
+from n8n_hash import workflow_hash
+
+
+def moved(workflow: dict, dx: int) -> dict:
+    edited = copy.deepcopy(workflow)
+    x, y = edited['nodes'][0]['position']
+    edited['nodes'][0]['position'] = [x + dx, y]
+    return edited
+
+
+def write(root, rel: str, workflow: dict) -> None:
+    (root / rel).write_text(json.dumps(workflow, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def stage(root, rel: str) -> None:
+    subprocess.run(['git', 'add', '--', rel], cwd=root, check=True)
+
+
+def test_staged_status_hashes_the_index(make_project, fake_api, run_script):
+    exported, reverted = generate_corpus(2, seed=9).workflows
+    corpus = SyntheticCorpus([exported, reverted], {}, seed=9)
+    root = make_project(corpus)
+    a, b = corpus.paths[exported['id']], corpus.paths[reverted['id']]
+
+    # A: the VM's new version is staged, then edited further without staging
+    fake_api.load([moved(exported, 40), reverted])
+    write(root, a, moved(exported, 40))
+    stage(root, a)
+    write(root, a, moved(exported, 80))
+    # B: a change is staged, then undone in the working tree only
+    write(root, b, moved(reverted, 40))
+    stage(root, b)
+    write(root, b, reverted)
+
+    result = run_script(root, 'sync-n8n-status.py', '--staged', '--json')
+    assert result.returncode in (0, 1), result.stderr
+    by_id = {r['id']: r for r in json.loads(result.stdout)}
+    assert by_id[exported['id']]['local_hash'] == workflow_hash(moved(exported, 40))
+    assert by_id[exported['id']]['status'].startswith('synced')
+    assert by_id[reverted['id']]['local_hash'] == workflow_hash(moved(reverted, 40))
+    assert by_id[reverted['id']]['status'].startswith('drift')
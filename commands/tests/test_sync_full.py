@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""sync-n8n-full.py: one pass that exports, deploys and merges keeps every new base."""
+
+import copy
+import json
+
+from n8n_corpus import SyntheticCorpus, generate_corpus
+from n8n_hash import workflow_hash
+
+
+def moved(workflow: dict, index: int, updated_at: str) -> dict:
+    """The workflow with node ``index`` moved (a change n8n would save)."""
+    edited = copy.deepcopy(workflow)
+    x, y = edited['nodes'][index]['position']
+    edited['nodes'][index]['position'] = [x + 40, y]
+    edited['updatedAt'] = updated_at
+    return edited
+
+
+def test_export_deploy_and_merge_bases_all_kept(make_project, fake_api, run_script):
+    base = generate_corpus(3, seed=11).workflows
+    exported, deployed, merged = base
+    later = '2026-01-01T00:00:00.000Z'
+    corpus = SyntheticCorpus(base, {
+        # VM only → export; local (committed) only → deploy; both, on different nodes → merge
+        'vm': {exported['id']: moved(exported, 0, later), merged['id']: moved(merged, 0, later)},
+        'git': {deployed['id']: moved(deployed, 0, later), merged['id']: moved(merged, -1, later)},
+    }, seed=11)
+    root = make_project(corpus)
+    fake_api.load(corpus.vm_workflows())
+
+    result = run_script(root, 'sync-n8n-full.py', '--yes', '--quiet', '--skip-git')
+    assert result.returncode == 0, result.stdout + result.stderr
+
+    state = json.loads((root / '.n8n-sync-state.json').read_text(encoding='utf-8'))['workflows']
+    for workflow in base:
+        local = json.loads((root / corpus.paths[workflow['id']]).read_text(encoding='utf-8'))
+        synced = workflow_hash(local)
+        assert synced != workflow_hash(workflow), f"{workflow['name']} was not synced"
+        assert workflow_hash(fake_api.workflows[workflow['id']]) == synced
+        # The base recorded for each workflow is the version both sides now hold
+        assert state[workflow['id']]['hash'] == synced, f"base of {workflow['name']} lost"
+        snapshot = json.loads((root / '.n8n-sync-base' / f"{workflow['id']}.json").read_text(encoding='utf-8'))
+        assert snapshot['hash'] == synced